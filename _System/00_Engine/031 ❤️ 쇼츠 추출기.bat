@@ -0,0 +1,3 @@
+python ShortsDeriver.py
+pause
+
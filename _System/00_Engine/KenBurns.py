@@ -1,10 +1,14 @@
 import os
 import glob
-import subprocess
 import time
 import random
 import gspread
 from oauth2client.service_account import ServiceAccountCredentials
+from ffmpeg_runner import run_ffmpeg, print_summary, write_report
+from engine_cli import get_engine_options, run_main, select_go_sheet, resolve_channel
+from stream_queue import mark_ready, follow_ready, is_stage_done, STREAM_POLL_SEC
+from run_manifest import RunManifest, hash_inputs, file_fingerprint
+from sheet_backend import open_sheet_backend
 
 # ==========================================
 # 1. 설정 및 경로 정의 (YTFactory9 구조 대응)
@@ -108,11 +112,24 @@ def load_spreadsheet(client):
         return client.open_by_key(raw)
 
 
+_MANIFESTS = {}
+
+
+def get_manifest(folder):
+    """ 출력 폴더별 켄번 매니페스트 (프로세스당 1개) """
+    if folder not in _MANIFESTS:
+        _MANIFESTS[folder] = RunManifest(folder, "kenburns")
+    return _MANIFESTS[folder]
+
+
 def create_zoom_video(image_path):
     base_name = os.path.splitext(image_path)[0]
     output_path = f"{base_name}.mp4"
+    manifest = get_manifest(os.path.dirname(image_path))
+    # 입력 = 원본 이미지 (이미지가 다시 생성되면 크기/시각이 바뀌어 재변환)
+    input_hash = hash_inputs(file_fingerprint(image_path))
     
-    if os.path.exists(output_path):
+    if manifest.is_valid(output_path, input_hash):
         print(f"⏩ [Skip] 이미 변환됨: {os.path.basename(output_path)}")
         return
 
@@ -180,16 +197,18 @@ def create_zoom_video(image_path):
             "-c:v", "libx264",
             "-pix_fmt", "yuv420p",
             "-preset", "faster",
-            "-threads", "0",
-            output_path
+            "-threads", "0"
         ]
 
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        if result.returncode != 0:
-            print(f"   ❌ 실패! (FFmpeg 에러 코드: {result.returncode})")
-            if result.stderr:
+        # 임시 파일에 인코딩 후 이름 변경 (중간에 끊겨도 반쪽 mp4 가 남지 않음)
+        with manifest.produce(output_path, input_hash) as out:
+            result = run_ffmpeg(cmd + [out.path], label=os.path.basename(image_path), stage="KenBurns", total_duration=10, check=False)
+            out.ok = result["returncode"] == 0
+        if result["returncode"] != 0:
+            print(f"   ❌ 실패! (FFmpeg 에러 코드: {result['returncode']})")
+            if result["stderr"]:
                 # 에러 메시지의 마지막 몇 줄만 출력
-                error_lines = result.stderr.strip().split('\n')
+                error_lines = result["stderr"].strip().split('\n')
                 print(f"   에러 내용:")
                 for line in error_lines[-5:]:
                     if line.strip():
@@ -201,49 +220,77 @@ def create_zoom_video(image_path):
         print(f"   ❌ 실패! (원인: {e})")
         return False
 
+def follow_image_groups(target_folder, stream_dir):
+    """
+    [스트리밍 모드] 이미지메이커가 그룹을 완성할 때마다 바로 켄번 변환
+    - 변환이 끝난(또는 변환할 이미지가 없는) 그룹은 머지파이에 바로 알림
+    반환: 종료 코드 (0=성공, 1=변환 실패 그룹 있음)
+    """
+    print(f"📡 스트리밍 모드: 이미지 그룹이 완성되는 대로 변환합니다.")
+    failed_groups = []
+
+    def convert_group(gid):
+        img_path = os.path.join(target_folder, f"{gid}_image_group.png")
+        if os.path.exists(img_path) and create_zoom_video(img_path) == False:
+            failed_groups.append(gid)
+            return
+        mark_ready(stream_dir, "kenburns", gid)
+
+    # 출력 폴더는 이미지메이커가 만듦 (이미지메이커가 먼저 끝났으면 더 기다리지 않음)
+    while not os.path.exists(target_folder) and not is_stage_done(stream_dir, "image"):
+        time.sleep(STREAM_POLL_SEC)
+
+    handled = follow_ready(stream_dir, "image", convert_group)
+
+    print_summary()
+    report_path = write_report(os.path.join(target_folder, "Reports"), "KenBurns")
+    if report_path:
+        print(f"📝 타이밍 리포트: {report_path}")
+
+    print(f"\n🎉 스트리밍 변환 종료 (그룹 {len(handled)}개, 실패 {len(failed_groups)}개)")
+    return 1 if failed_groups else 0
+
+
 # ==========================================
 # 3. 메인 실행
 # ==========================================
-def main():
+def main(sheet_name=None, channel=None, options=None):
+    """
+    켄번 변환 실행
+    - sheet_name: 작업 시트 이름 (없으면 번호 입력), channel: 채널 ID (없으면 시트 이름에서 추출)
+    - options["stream_dir"]: 스트리밍 모드면 이미지메이커가 완성한 그룹부터 바로 변환
+    반환: 종료 코드 (0=성공, 1=실패)
+    """
+    options = get_engine_options(sheet_name, options)
+    stream_dir = options["stream_dir"]
     print(f"🚀 EffectMaker v1.5 (Ultimate Stabilizer - Anti-Shake Pro)")
     
     if not FFMPEG_CMD:
         print("🚨 ffmpeg.exe 를 찾을 수 없습니다. (PROJECT_ROOT 또는 PATH 확인)")
-        return
+        return 1
 
     # 1. 시트 연결
-    try:
+    def connect():
         scope = ['https://spreadsheets.google.com/feeds', 'https://www.googleapis.com/auth/drive']
         creds = ServiceAccountCredentials.from_json_keyfile_name(JSON_KEY_FILE, scope)
-        client = gspread.authorize(creds)
-        doc = load_spreadsheet(client)
+        return load_spreadsheet(gspread.authorize(creds))
+
+    try:
+        # 시트 백엔드 (기본: 구글 시트 로컬 미러, YTF_SHEET_BACKEND 로 로컬 CSV/XLSX/SQLite)
+        doc = open_sheet_backend(SHEET_URL_FILE, connect)
     except Exception as e:
-        print(f"❌ 시트 접속 실패: {e}"); return
+        print(f"❌ 시트 접속 실패: {e}"); return 1
 
     # 2. 시트 선택
     all_worksheets = doc.worksheets()
     go_sheets = [ws for ws in all_worksheets if "go" in ws.title.lower()]
 
     if not go_sheets:
-        print("❌ 'go' 시트가 없습니다."); return
+        print("❌ 'go' 시트가 없습니다."); return 1
 
-    print("\n" + "="*40)
-    print(" 🎬 [EffectMaker] 작업할 시트를 선택하세요")
-    print("="*40)
-    
-    for idx, ws in enumerate(go_sheets):
-        print(f" [{idx+1}] {ws.title}")
-    
-    selected_sheet = None
-    while selected_sheet is None:
-        try:
-            choice = input("\n번호 입력 >> ").strip()
-            idx = int(choice) - 1
-            if 0 <= idx < len(go_sheets):
-                selected_sheet = go_sheets[idx]
-        except: pass
-
-    print(f"✅ 선택된 시트: '{selected_sheet.title}'")
+    selected_sheet = select_go_sheet(go_sheets, sheet_name, " 🎬 [EffectMaker] 작업할 시트를 선택하세요")
+    if selected_sheet is None:
+        return 1
 
     # 채널별 출력 폴더 계산
     sheet_title = selected_sheet.title  # 예: "Ch01_1go"
@@ -253,17 +300,18 @@ def main():
     # 2) 없고, 시트명이 "ChXX_..." 형식이면 C:\YTFACTORY9\ChXX\03_Output 을 자동 추론
     if not (ENV_OUTPUT_ROOT and ENV_OUTPUT_ROOT.strip()):
         # "Ch01_1go" 같은 패턴에서 "Ch01"만 분리
-        parts = sheet_title.split("_", 1)
-        if len(parts) == 2 and parts[0].startswith("Ch"):
-            ch_id = parts[0]  # "Ch01"
+        ch_id = resolve_channel(sheet_title, channel)  # "Ch01"
+        if ch_id:
             guessed_root = os.path.join(PROJECT_ROOT, ch_id, "03_Output")
             if os.path.isdir(guessed_root):
                 channel_output_root = guessed_root
 
     target_folder = os.path.join(channel_output_root, sheet_title)
+    if stream_dir:
+        return follow_image_groups(target_folder, stream_dir)
     if not os.path.exists(target_folder):
         print(f"❌ 폴더가 없습니다: {target_folder}")
-        return
+        return 1
 
     # 이미지 탐색
     image_files = glob.glob(os.path.join(target_folder, "*_image_group.png"))
@@ -271,19 +319,28 @@ def main():
 
     if not image_files:
         print("🤷‍♂️ 변환할 이미지가 없습니다.")
-        return
+        return 0
 
     print(f"🎯 총 {len(image_files)}개의 이미지를 변환합니다.")
 
     # 변환 시작
+    failed = False
     for img_path in image_files:
         if create_zoom_video(img_path) == False:
+            failed = True
             break
 
+    # 📊 처리 통계 + 실행 리포트 저장
+    print_summary()
+    report_path = write_report(os.path.join(target_folder, "Reports"), "KenBurns")
+    if report_path:
+        print(f"📝 타이밍 리포트: {report_path}")
+
     print("\n" + "="*50)
     print("🎉 변환 완료! (안정화 필터 적용됨)")
     print("👉 다음 단계: Mergy.py 실행!")
     print("="*50 + "\n")
+    return 1 if failed else 0
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    run_main(main, "KenBurns 켄번 변환")
\ No newline at end of file
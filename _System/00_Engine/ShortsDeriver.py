@@ -0,0 +1,174 @@
+"""
+ShortsDeriver 롱폼 → 쇼츠 추출 (완성된 롱폼 회차에서 세로 쇼츠 만들기)
+- 롱폼 시트의 행 범위/하이라이트 행만 골라 세로 영상(720x1280)으로 조립
+- 재료는 롱폼이 이미 만든 것을 그대로 사용: Voice/{ID}.mp3, 켄번 영상/이미지 (1~6순위), 역재생 캐시
+  → 이미지/음성 API 호출 없음, TTS 중복 없음, 쇼츠 전용 시트/이미지메이커/머지파이 실행 불필요
+- 가로 재료 배치: 기본 블랙바(레터박스, 프로파일 shorts) / --crop 이면 세로 화면을 꽉 채워 가운데 잘라냄 (shorts_crop)
+- 조립은 mergy_renderer 공용 렌더러 (자막 스타일 default_Shorts, 쇼츠 UI 안전 영역 적용)
+- 결과: {회차 폴더}\\Shorts\\{이름}\\Mergy\\Final_Complete.mp4 (클립은 같은 폴더의 Clip, 재실행 시 재사용)
+- 사용법: python ShortsDeriver.py --sheet Ch01_19go --rows 12-30 [--name hook] [--crop]
+          python ShortsDeriver.py --sheet Ch01_19go --rows 3,5,9-12   (하이라이트 행 목록, 시트 행 번호)
+"""
+import os
+import re
+import gspread
+from oauth2client.service_account import ServiceAccountCredentials
+from ffmpeg_runner import print_summary, write_report
+from engine_cli import get_engine_options, run_main, select_go_sheet, resolve_channel
+from sheet_backend import open_sheet_backend
+from mergy_renderer import (
+    OUTPUT_PROFILES, JSON_KEY_FILE, SHEET_URL_FILE, load_spreadsheet, check_required_files,
+    collect_tasks, report_missing, build_targets, make_clip_renderer, finalize_targets, get_audio_duration
+)
+
+# 쇼츠 최대 길이 (초) - 넘으면 경고만 (플랫폼에서 일반 영상으로 분류됨)
+SHORTS_MAX_SEC = 180
+STAGE = "ShortsDeriver"
+
+
+def parse_row_spec(spec):
+    """
+    행 지정 문자열 → 시트 행 번호 목록 (입력 순서 유지, 중복 제거)
+    - "12-30" (범위), "3,5,9-12" (하이라이트 목록), 시트 행 번호 기준 (헤더 = 1행)
+    """
+    rows = []
+    for part in re.split(r"[,\s]+", (spec or "").strip()):
+        if not part:
+            continue
+        match = re.fullmatch(r"(\d+)(?:-(\d+))?", part)
+        if not match:
+            raise ValueError(f"행 지정 형식이 잘못되었습니다: '{part}' (예: 12-30 또는 3,5,9-12)")
+        start = int(match.group(1))
+        end = int(match.group(2) or start)
+        if start < 2 or end < start:
+            raise ValueError(f"행 번호는 2 이상, 범위는 작은 수부터: '{part}'")
+        rows.extend(range(start, end + 1))
+    if not rows:
+        raise ValueError("추출할 행이 없습니다.")
+    return list(dict.fromkeys(rows))
+
+
+def default_short_name(row_numbers):
+    """ 결과 폴더 이름 기본값 (예: rows_12-30) """
+    return f"rows_{row_numbers[0]}-{row_numbers[-1]}"
+
+
+def add_deriver_arguments(parser):
+    parser.add_argument("--rows", help="추출할 시트 행 번호 (예: 12-30 또는 3,5,9-12)")
+    parser.add_argument("--name", help="쇼츠 이름 = 결과 폴더 이름 (기본: rows_시작-끝)")
+    parser.add_argument("--crop", action="store_true", help="블랙바 대신 세로 화면을 꽉 채워 가운데 잘라내기")
+
+
+def main(sheet_name=None, channel=None, options=None):
+    """
+    롱폼 회차 → 쇼츠 추출 실행
+    - options: engine_cli 공통 옵션 + {"rows": 행 지정, "name": 쇼츠 이름, "crop": 가운데 잘라내기}
+    반환: 종료 코드 (0=성공, 1=실패)
+    """
+    options = get_engine_options(sheet_name, options)
+    profile = OUTPUT_PROFILES["shorts_crop" if options.get("crop") else "shorts"]
+    print("\n🚀 [ShortsDeriver] 롱폼 → 쇼츠 추출기 시작 (API 호출 없음, 기존 음성/이미지 재사용)")
+    print("=" * 60)
+
+    if not check_required_files(options):
+        return 1
+
+    # 1. 시트 연결 (롱폼 시트)
+    def connect():
+        scope = ['https://spreadsheets.google.com/feeds', 'https://www.googleapis.com/auth/drive']
+        creds = ServiceAccountCredentials.from_json_keyfile_name(JSON_KEY_FILE, scope)
+        return load_spreadsheet(gspread.authorize(creds))
+
+    try:
+        doc = open_sheet_backend(SHEET_URL_FILE, connect)
+    except Exception as e:
+        print(f"❌ 시트 접속 실패: {e}"); return 1
+
+    go_sheets = [ws for ws in doc.worksheets() if "go" in ws.title.lower()]
+    if not go_sheets:
+        print("❌ 'go' 시트가 없습니다."); return 1
+
+    selected_sheet = select_go_sheet(go_sheets, sheet_name, " ✂️ 쇼츠를 뽑을 롱폼 시트를 선택하세요")
+    if selected_sheet is None:
+        return 1
+    sheet_title = selected_sheet.title
+    channel_name = resolve_channel(sheet_title, channel)
+    if not channel_name:
+        print(f"❌ 시트 이름에서 채널명을 추출할 수 없습니다: {sheet_title}")
+        return 1
+
+    rows = selected_sheet.get_all_values()[1:]  # 헤더 제외
+
+    # 2. 추출할 행 (인자가 없으면 대화형 입력)
+    row_spec = options.get("rows")
+    if not row_spec:
+        if not options["pause"]:
+            print("❌ --rows 인자가 필요합니다. (예: --rows 12-30)"); return 1
+        print(f"📋 시트 행: 2 ~ {len(rows) + 1}")
+        try:
+            row_spec = input("추출할 행 입력 (예: 12-30 또는 3,5,9-12) >> ").strip()
+        except EOFError:
+            print("❌ 행 번호를 입력받을 수 없습니다. --rows 인자를 지정하세요."); return 1
+    try:
+        row_numbers = parse_row_spec(row_spec)
+    except ValueError as e:
+        print(f"❌ {e}")
+        if options["pause"]: input("엔터 키를 누르면 종료합니다...")
+        return 1
+
+    out_of_range = [n for n in row_numbers if n > len(rows) + 1]
+    if out_of_range:
+        print(f"⚠️ 시트에 없는 행은 제외합니다: {', '.join(map(str, out_of_range))}")
+
+    # 📂 롱폼 회차 폴더 (재료) / 쇼츠 결과 폴더
+    ROOT_OUTPUT = f"C:\\YtFactory9\\{channel_name}\\03_Output\\{sheet_title}"
+    VOICE_DIR = os.path.join(ROOT_OUTPUT, "Voice")
+    REVERSE_DIR = os.path.join(ROOT_OUTPUT, "Reverse")  # 롱폼 머지파이가 만든 역재생 캐시 공유
+    REPORT_DIR = os.path.join(ROOT_OUTPUT, "Reports")
+    short_name = re.sub(r'[\\/:*?"<>|\s]+', "_", options.get("name") or default_short_name(row_numbers))
+    SHORT_DIR = os.path.join(ROOT_OUTPUT, "Shorts", short_name)
+
+    if not os.path.isdir(ROOT_OUTPUT):
+        print(f"❌ 롱폼 회차 폴더가 없습니다: {ROOT_OUTPUT}")
+        print("👉 먼저 롱폼 파이프라인(이미지/켄번/음성)을 완료해주세요.")
+        return 1
+
+    # 3. 재료 전수 조사 (롱폼 결과물만 사용, 없으면 만들지 않고 중단)
+    print(f"\n🧐 [무결성 검사] {len(row_numbers)}개 행의 롱폼 재료 확인 중...", end="")
+    tasks, missing_log = collect_tasks(rows, ROOT_OUTPUT, VOICE_DIR, row_numbers=set(row_numbers))
+    if missing_log:
+        report_missing(missing_log, options)
+        return 1
+    if not tasks:
+        print(" [실패] 💥\n❌ 선택한 행에 조립할 컷이 없습니다. (A열 ID / C열 그룹 확인)")
+        return 1
+
+    # 하이라이트 목록은 입력한 순서대로 이어붙임
+    order = {n: i for i, n in enumerate(row_numbers)}
+    tasks.sort(key=lambda t: order[t["row"]])
+
+    total_sec = sum(get_audio_duration(t["audio"]) for t in tasks)
+    print(" [통과] ✨")
+    print(f"✅ {len(tasks)}개 컷, 약 {total_sec:.1f}초 → {profile['resolution'][0]}x{profile['resolution'][1]} ({profile['fit']})")
+    if total_sec > SHORTS_MAX_SEC:
+        print(f"⚠️ 쇼츠 최대 길이({SHORTS_MAX_SEC}초)를 넘습니다. 행 범위를 줄이는 것을 권장합니다.")
+    print(f"📂 결과 폴더: {SHORT_DIR}\n")
+
+    # 4. 조립 (롱폼과 같은 렌더러, 쇼츠 프로파일)
+    targets = build_targets([profile], SHORT_DIR)
+    render_clip = make_clip_renderer(targets, REVERSE_DIR, STAGE)
+    for task in tasks:
+        render_clip(task)
+    success = finalize_targets(targets, tasks)
+
+    print_summary()
+    report_path = write_report(REPORT_DIR, f"{STAGE}_{short_name}")
+    if report_path:
+        print(f"📝 타이밍 리포트: {report_path}")
+
+    if success and options["open_folder"]:
+        os.startfile(targets[0]["final_dir"])
+    return 0 if success else 1
+
+
+if __name__ == "__main__": run_main(main, "ShortsDeriver 롱폼 → 쇼츠 추출", add_deriver_arguments)
@@ -4,6 +4,8 @@ import subprocess
 import re
 import gspread
 from oauth2client.service_account import ServiceAccountCredentials
+from ffmpeg_runner import run_ffmpeg, print_summary, write_report
+from sheet_backend import open_sheet_backend
 
 # ==========================================
 # 1. 설정 및 경로 정의
@@ -52,6 +54,9 @@ if ENV_AUTO_SHEET and ENV_AUTO_SHEET.strip():
 else:
     AUTO_SHEET_FILE = os.path.join(CURRENT_DIR, "_auto_sheet.txt")
 
+# 서브 믹스 1개당 묶을 효과음 큐 개수 (큐가 많을 때 amix 입력 수 제한)
+SUBMIX_SIZE = 16
+
 # ==========================================
 # 2. 유틸리티 함수
 # ==========================================
@@ -88,6 +93,180 @@ def get_audio_duration(audio_path):
     except:
         return 0.0
 
+def get_stream_duration(media_path, stream_spec):
+    """ 특정 스트림(v:0 / a:0)의 길이 측정 (ffprobe, 없으면 0.0) """
+    try:
+        cmd = [
+            FFPROBE_CMD, "-v", "error", "-select_streams", stream_spec,
+            "-show_entries", "stream=duration", "-of", "default=noprint_wrappers=1:nokey=1", media_path
+        ]
+        result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+        return float(result.stdout.strip().splitlines()[0])
+    except:
+        return 0.0
+
+def verify_av_sync(input_video, output_video, tolerance=0.1):
+    """
+    [결과 검증] 효과음 삽입 후 길이와 A/V 싱크가 원본과 같은지 확인
+    - 전체 길이 차이가 tolerance(초) 이내
+    - 출력의 (오디오 길이 - 비디오 길이) 차이가 원본 대비 tolerance 이상 벌어지지 않음
+    반환: (통과 여부, 메시지 리스트)
+    """
+    in_total = get_audio_duration(input_video)
+    out_total = get_audio_duration(output_video)
+    in_drift = get_stream_duration(input_video, "a:0") - get_stream_duration(input_video, "v:0")
+    out_drift = get_stream_duration(output_video, "a:0") - get_stream_duration(output_video, "v:0")
+
+    messages = [
+        f"전체 길이: 원본 {in_total:.3f}s → 결과 {out_total:.3f}s",
+        f"A/V 차이: 원본 {in_drift:+.3f}s → 결과 {out_drift:+.3f}s",
+    ]
+    ok = abs(out_total - in_total) <= tolerance and abs(out_drift - in_drift) <= tolerance
+    return ok, messages
+
+def _normalize_sound_name(name):
+    """ 시트/파일 이름 정규화: 일반 공백, 전각 공백, BOM, 제로 너비 공백 제거 """
+    return name.replace(' ', '').replace('　', '').replace('\ufeff', '').replace('\u200b', '')
+
+
+class SoundLibrary:
+    """
+    효과음/BGM 폴더 인덱스 (실행당 1회 구축, 폴더 mtime이 바뀌면 자동 재구축)
+    - 파일별로 정규화 이름 / 숫자 키 / BGM 여부를 미리 계산
+    - find()는 딕셔너리 조회로 기존 find_sound_file과 같은 매칭 규칙을 그대로 재현
+      (폴더 순서: Sound → BGM, 폴더 내에서는 glob 순서상 먼저 걸리는 파일 우선)
+    - 같은 이름이 여러 파일에 걸리면 find_ambiguous()로 미리 확인 가능
+    """
+    EXTENSIONS = ['*.mp3', '*.wav', '*.m4a', '*.ogg']
+
+    def __init__(self, sound_dir, bgm_dir):
+        self.dirs = [(sound_dir, False), (bgm_dir, True)]
+        self.dir_mtimes = None
+        self.cache = {}
+        self.build()
+
+    def _get_dir_mtimes(self):
+        return [os.path.getmtime(d) if os.path.exists(d) else 0.0 for d, _ in self.dirs]
+
+    def build(self):
+        """ 두 폴더를 한 번만 스캔하여 조회용 인덱스 생성 """
+        self.libraries = []
+        for folder, is_bgm in self.dirs:
+            # 1차(정확한 파일명) 조회용: 폴더 내 모든 파일 (Windows처럼 대소문자 무시)
+            exact = {}
+            if os.path.exists(folder):
+                for file_name in os.listdir(folder):
+                    exact.setdefault(file_name.lower(), os.path.join(folder, file_name))
+
+            # 2차(이름/공백/숫자 매칭) 조회용: 기존 glob 순서 그대로 번호 부여
+            files = []
+            for ext in self.EXTENSIONS:
+                files.extend(glob.glob(os.path.join(folder, ext)))
+                files.extend(glob.glob(os.path.join(folder, ext.upper())))
+
+            by_base = {}
+            by_no_space = {}
+            by_digits = {}
+            entries = []
+            for order, file_path in enumerate(files):
+                base = os.path.splitext(os.path.basename(file_path))[0].lower()
+                no_space = base.replace(' ', '').replace('　', '')
+                digits = ''.join(filter(str.isdigit, base))
+                entries.append((file_path, base))
+                by_base.setdefault(base, order)
+                by_no_space.setdefault(no_space, order)
+                if digits:
+                    by_digits.setdefault(digits, []).append(order)
+
+            self.libraries.append({
+                "is_bgm": is_bgm,
+                "exact": exact,
+                "entries": entries,
+                "by_base": by_base,
+                "by_no_space": by_no_space,
+                "by_digits": by_digits,
+            })
+        self.dir_mtimes = self._get_dir_mtimes()
+        self.cache = {}
+
+    def refresh_if_changed(self):
+        """ 폴더에 파일이 추가/삭제되었으면 인덱스 재구축 """
+        if self._get_dir_mtimes() != self.dir_mtimes:
+            self.build()
+
+    def _match_orders(self, library, sound_name_base):
+        """ 폴더 내에서 이름이 걸리는 파일 번호들 (작은 번호가 우선) """
+        key = sound_name_base.lower()
+        orders = set()
+        if key in library["by_base"]:
+            orders.add(library["by_base"][key])
+        if key in library["by_no_space"]:
+            orders.add(library["by_no_space"][key])
+        # 부분 매칭은 숫자 부분이 같은 파일만 후보 (예: "2.상큼뿅" vs "2.상큼뿅.mp3")
+        sound_num = ''.join(filter(str.isdigit, sound_name_base))
+        for order in library["by_digits"].get(sound_num, []) if sound_num else []:
+            file_base = library["entries"][order][1]
+            if key in file_base or file_base in key:
+                orders.add(order)
+        return sorted(orders)
+
+    def _candidates(self, sound_name):
+        # 확장자가 없으면 .mp3, .wav 등을 시도
+        if not os.path.splitext(sound_name)[1]:
+            return [f"{sound_name}.mp3", f"{sound_name}.wav", f"{sound_name}.m4a"]
+        return [sound_name]
+
+    def find_all(self, sound_name):
+        """ 이름에 걸리는 모든 파일을 우선순위 순서로 반환: [(file_path, is_bgm), ...] """
+        sound_name = sound_name.strip().replace('\ufeff', '').replace('\u200b', '')
+        sound_name_base = os.path.splitext(_normalize_sound_name(sound_name))[0]
+        matches = []
+        for library in self.libraries:
+            for candidate in self._candidates(sound_name):
+                path = library["exact"].get(candidate.lower())
+                if path:
+                    matches.append((path, library["is_bgm"]))
+            for order in self._match_orders(library, sound_name_base):
+                matches.append((library["entries"][order][0], library["is_bgm"]))
+
+        unique = []
+        seen = set()
+        for path, is_bgm in matches:
+            if os.path.normcase(path) not in seen:
+                seen.add(os.path.normcase(path))
+                unique.append((path, is_bgm))
+        return unique
+
+    def find(self, sound_name):
+        """ find_sound_file과 동일: (file_path, is_bgm) 또는 (None, False) """
+        if not sound_name or not sound_name.strip():
+            return None, False
+        if sound_name not in self.cache:
+            matches = self.find_all(sound_name)
+            self.cache[sound_name] = matches[0] if matches else (None, False)
+        return self.cache[sound_name]
+
+    def find_ambiguous(self, sound_names):
+        """ 여러 파일에 걸리는 이름 목록: {sound_name: [file_path, ...]} """
+        ambiguous = {}
+        for name in sorted(set(n for n in sound_names if n and n.strip())):
+            matches = self.find_all(name)
+            if len(matches) > 1:
+                ambiguous[name] = [path for path, _ in matches]
+        return ambiguous
+
+
+_SOUND_LIBRARY = None
+
+def get_sound_library():
+    """ 공유 SoundLibrary 인스턴스 (최초 호출 시 구축, 이후 폴더 변경 시에만 재구축) """
+    global _SOUND_LIBRARY
+    if _SOUND_LIBRARY is None:
+        _SOUND_LIBRARY = SoundLibrary(SOUND_DIR, BGM_DIR)
+    else:
+        _SOUND_LIBRARY.refresh_if_changed()
+    return _SOUND_LIBRARY
+
 def find_sound_file(sound_name):
     """
     효과음/BGM 파일 찾기
@@ -96,92 +275,7 @@ def find_sound_file(sound_name):
     sound_name: K열에 적힌 파일 이름 (확장자 포함/미포함 모두 지원)
     반환: (file_path, is_bgm) 튜플 또는 (None, False)
     """
-    if not sound_name or not sound_name.strip():
-        return None, False
-    
-    # 공백 제거 및 정규화 (보이지 않는 문자 제거)
-    sound_name = sound_name.strip().replace('\ufeff', '').replace('\u200b', '')
-    
-    # 확장자가 없으면 .mp3, .wav 등을 시도
-    if not os.path.splitext(sound_name)[1]:
-        candidates = [f"{sound_name}.mp3", f"{sound_name}.wav", f"{sound_name}.m4a"]
-    else:
-        candidates = [sound_name]
-    
-    # 1차: Sound 폴더에서 정확한 매칭 시도
-    for candidate in candidates:
-        sound_path = os.path.join(SOUND_DIR, candidate)
-        if os.path.exists(sound_path):
-            return sound_path, False
-    
-    # Sound 폴더에서 대소문자 무시 검색 (한글 포함)
-    all_files = []
-    for ext in ['*.mp3', '*.wav', '*.m4a', '*.ogg']:
-        all_files.extend(glob.glob(os.path.join(SOUND_DIR, ext)))
-        all_files.extend(glob.glob(os.path.join(SOUND_DIR, ext.upper())))
-    
-    # 시트에서 읽은 이름 정규화 (공백, 특수문자 제거)
-    sound_name_normalized = sound_name.replace(' ', '').replace('　', '').replace('\ufeff', '').replace('\u200b', '')  # 일반 공백, 전각 공백, BOM, 제로 너비 공백 제거
-    sound_name_base = os.path.splitext(sound_name_normalized)[0]
-    
-    for file_path in all_files:
-        file_name = os.path.basename(file_path)
-        file_name_base = os.path.splitext(file_name)[0]
-        
-        # 정확한 매칭 (대소문자 무시)
-        if sound_name_base.lower() == file_name_base.lower():
-            return file_path, False
-        
-        # 공백 제거 후 매칭 (한글 파일명의 공백 처리)
-        file_name_no_space = file_name_base.replace(' ', '').replace('　', '')
-        if sound_name_base.lower() == file_name_no_space.lower():
-            return file_path, False
-        
-        # 부분 매칭: 시트 이름이 파일명에 포함되거나 파일명이 시트 이름에 포함되는 경우
-        if sound_name_base.lower() in file_name_base.lower() or file_name_base.lower() in sound_name_base.lower():
-            # 숫자로 시작하는 경우 숫자 부분도 일치하는지 확인 (예: "2.상큼뿅" vs "2.상큼뿅.mp3")
-            if sound_name_base and file_name_base:
-                # 숫자 부분 추출
-                sound_num = ''.join(filter(str.isdigit, sound_name_base))
-                file_num = ''.join(filter(str.isdigit, file_name_base))
-                if sound_num and file_num and sound_num == file_num:
-                    return file_path, False
-    
-    # 2차: BGM 폴더에서 검색 (배경음악)
-    for candidate in candidates:
-        bgm_path = os.path.join(BGM_DIR, candidate)
-        if os.path.exists(bgm_path):
-            return bgm_path, True
-    
-    # BGM 폴더에서 대소문자 무시 검색
-    bgm_files = []
-    for ext in ['*.mp3', '*.wav', '*.m4a', '*.ogg']:
-        bgm_files.extend(glob.glob(os.path.join(BGM_DIR, ext)))
-        bgm_files.extend(glob.glob(os.path.join(BGM_DIR, ext.upper())))
-    
-    for file_path in bgm_files:
-        file_name = os.path.basename(file_path)
-        file_name_base = os.path.splitext(file_name)[0]
-        
-        # 정확한 매칭 (대소문자 무시)
-        if sound_name_base.lower() == file_name_base.lower():
-            return file_path, True
-        
-        # 공백 제거 후 매칭
-        file_name_no_space = file_name_base.replace(' ', '').replace('　', '')
-        if sound_name_base.lower() == file_name_no_space.lower():
-            return file_path, True
-        
-        # 부분 매칭: 시트 이름이 파일명에 포함되거나 파일명이 시트 이름에 포함되는 경우
-        if sound_name_base.lower() in file_name_base.lower() or file_name_base.lower() in sound_name_base.lower():
-            # 숫자로 시작하는 경우 숫자 부분도 일치하는지 확인
-            if sound_name_base and file_name_base:
-                sound_num = ''.join(filter(str.isdigit, sound_name_base))
-                file_num = ''.join(filter(str.isdigit, file_name_base))
-                if sound_num and file_num and sound_num == file_num:
-                    return file_path, True
-    
-    return None, False
+    return get_sound_library().find(sound_name)
 
 def parse_duration(duration_str):
     """
@@ -271,11 +365,13 @@ def get_clip_timings(rows, voice_dir, sound_col_idx):
 def create_sound_mix_command(final_video, timings, output_path, sound_volume=0.1, bgm_volume=0.3):
     """
     ffmpeg 명령어 생성: 최종 영상에 효과음/BGM 오버레이
+    - 오디오만 믹싱하고 비디오는 -c:v copy 로 그대로 재사용 (영상 재인코딩 없음)
     - 각 효과음은 해당 클립의 시작 지점에 삽입
     - BGM은 15초 재생, 마지막 6초 페이드아웃, 30% 볼륨
     - 메인 오디오와 효과음/BGM을 믹싱
     - sound_volume: 효과음 볼륨 조절 (0.0 ~ 1.0, 기본 0.1 = 10%)
     - bgm_volume: BGM 볼륨 조절 (0.0 ~ 1.0, 기본 0.3 = 30%)
+    - 같은 효과음 파일은 한 번만 디코딩 (asplit), 큐가 많으면 서브 믹스로 계층화
     """
     if not timings:
         # 효과음이 없으면 그냥 복사
@@ -285,44 +381,74 @@ def create_sound_mix_command(final_video, timings, output_path, sound_volume=0.1
     # 효과음/BGM이 있는 경우: 필터 컴플렉스 사용
     filter_parts = []
     input_args = ["-i", final_video]
-    
-    # 각 효과음/BGM을 입력으로 추가하고 필터 구성
+
+    # 같은 파일은 입력 1개로만 열고(1회 디코딩) asplit으로 큐 개수만큼 분기
+    cue_timings = [t for t in timings if t["sound_file"]]
+    file_uses = {}
+    for timing in cue_timings:
+        file_uses[timing["sound_file"]] = file_uses.get(timing["sound_file"], 0) + 1
+
+    source_labels = {}  # sound_file -> 아직 사용하지 않은 분기 라벨 목록
+    for file_no, (sound_file, uses) in enumerate(file_uses.items()):
+        input_idx = len(input_args) // 2  # 현재 입력 인덱스
+        input_args.extend(["-i", sound_file])
+        if uses == 1:
+            source_labels[sound_file] = [f"[{input_idx}:a]"]
+        else:
+            labels = [f"[f{file_no}_{j}]" for j in range(uses)]
+            filter_parts.append(f"[{input_idx}:a]asplit={uses}{''.join(labels)}")
+            source_labels[sound_file] = labels
+
+    # 각 큐를 타임라인에 배치 (volume/fade/delay 체인은 기존과 동일)
     sound_inputs = []
-    for idx, timing in enumerate(timings):
-        if timing["sound_file"]:
-            input_idx = len(input_args) // 2  # 현재 입력 인덱스
-            input_args.extend(["-i", timing["sound_file"]])
-            start_time = timing["start_time"]
-            is_bgm = timing.get("is_bgm", False)
-            
-            # adelay는 밀리초 단위로 작동 (스테레오: 채널1|채널2)
-            delay_ms = int(start_time * 1000)  # 초를 밀리초로 변환
-            
-            if is_bgm:
-                # BGM 처리: 15초 재생, 마지막 6초 페이드아웃, 30% 볼륨
-                # atrim: 0부터 15초까지 자르기
-                # afade: 마지막 6초 페이드아웃 (9초부터 15초까지)
-                # volume: 30% 볼륨
-                # adelay: 시작 시간 딜레이 (밀리초 단위, 스테레오 지원)
-                filter_parts.append(
-                    f"[{input_idx}:a]atrim=0:15,afade=t=out:st=9:d=6,volume={bgm_volume},adelay={delay_ms}|{delay_ms}[s{idx}]"
-                )
-            else:
-                # 효과음 처리: 볼륨 조절 + 딜레이 (밀리초 단위, 스테레오 지원)
-                filter_parts.append(
-                    f"[{input_idx}:a]volume={sound_volume},adelay={delay_ms}|{delay_ms}[s{idx}]"
-                )
-            
-            sound_inputs.append(f"[s{idx}]")
+    for idx, timing in enumerate(cue_timings):
+        source = source_labels[timing["sound_file"]].pop(0)
+        start_time = timing["start_time"]
+        is_bgm = timing.get("is_bgm", False)
+
+        # adelay는 밀리초 단위로 작동 (스테레오: 채널1|채널2)
+        delay_ms = int(start_time * 1000)  # 초를 밀리초로 변환
+
+        if is_bgm:
+            # BGM 처리: 15초 재생, 마지막 6초 페이드아웃, 30% 볼륨
+            # atrim: 0부터 15초까지 자르기
+            # afade: 마지막 6초 페이드아웃 (9초부터 15초까지)
+            # volume: 30% 볼륨
+            # adelay: 시작 시간 딜레이 (밀리초 단위, 스테레오 지원)
+            filter_parts.append(
+                f"{source}atrim=0:15,afade=t=out:st=9:d=6,volume={bgm_volume},adelay={delay_ms}|{delay_ms}[s{idx}]"
+            )
+        else:
+            # 효과음 처리: 볼륨 조절 + 딜레이 (밀리초 단위, 스테레오 지원)
+            filter_parts.append(
+                f"{source}volume={sound_volume},adelay={delay_ms}|{delay_ms}[s{idx}]"
+            )
+
+        sound_inputs.append(f"[s{idx}]")
+
+    # 큐가 많으면 SUBMIX_SIZE개씩 서브 믹스로 묶어 최종 amix 입력 수를 줄임
+    # (normalize=0 합산이므로 단계를 나눠도 볼륨은 동일)
+    if len(sound_inputs) > SUBMIX_SIZE:
+        submix_inputs = []
+        for group_no, group_start in enumerate(range(0, len(sound_inputs), SUBMIX_SIZE)):
+            group = sound_inputs[group_start:group_start + SUBMIX_SIZE]
+            if len(group) == 1:
+                submix_inputs.append(group[0])
+                continue
+            filter_parts.append(
+                f"{''.join(group)}amix=inputs={len(group)}:duration=longest:normalize=0[sub{group_no}]"
+            )
+            submix_inputs.append(f"[sub{group_no}]")
+        sound_inputs = submix_inputs
     
     if sound_inputs:
         # 모든 효과음/BGM을 메인 오디오와 믹싱
         # amix: 여러 오디오 스트림을 하나로 믹싱
-        # duration=longest: 가장 긴 오디오만큼 길이 유지
+        # duration=first: 메인 오디오 길이 유지 (끝에 걸친 BGM이 영상 길이를 늘리지 않음 → A/V 싱크 보존)
         # normalize=0: 자동 정규화 비활성화 (메인 오디오 볼륨 유지)
         # dropout_transition=2: 효과음이 끝날 때 페이드아웃
         mix_inputs = "[0:a]" + "".join(sound_inputs)
-        filter_complex = ";".join(filter_parts) + f";{mix_inputs}amix=inputs={len(sound_inputs)+1}:duration=longest:dropout_transition=2:normalize=0[aout]"
+        filter_complex = ";".join(filter_parts) + f";{mix_inputs}amix=inputs={len(sound_inputs)+1}:duration=first:dropout_transition=2:normalize=0[aout]"
         
         cmd = [
             FFMPEG_CMD, "-y",
@@ -330,8 +456,9 @@ def create_sound_mix_command(final_video, timings, output_path, sound_volume=0.1
             "-filter_complex", filter_complex,
             "-map", "0:v",  # 비디오는 원본 사용
             "-map", "[aout]",  # 믹싱된 오디오
-            "-c:v", "libx264", "-preset", "fast", "-pix_fmt", "yuv420p",  # 비디오 재인코딩 (호환성 향상)
-            "-c:a", "aac", "-b:a", "192k",  # 오디오는 인코딩
+            "-c:v", "copy",  # 비디오는 스트림 복사 (재인코딩 없음)
+            "-c:a", "aac", "-b:a", "192k",  # 오디오만 인코딩
+            "-movflags", "+faststart",
             output_path
         ]
     else:
@@ -364,11 +491,14 @@ def main():
         os.makedirs(BGM_DIR)
 
     # 1. 구글 시트 연결
-    try:
+    def connect():
         scope = ['https://spreadsheets.google.com/feeds', 'https://www.googleapis.com/auth/drive']
         creds = ServiceAccountCredentials.from_json_keyfile_name(JSON_KEY_FILE, scope)
-        client = gspread.authorize(creds)
-        doc = load_spreadsheet(client)
+        return load_spreadsheet(gspread.authorize(creds))
+
+    try:
+        # 시트 백엔드 (기본: 구글 시트 로컬 미러, YTF_SHEET_BACKEND 로 로컬 CSV/XLSX/SQLite)
+        doc = open_sheet_backend(SHEET_URL_FILE, connect)
     except Exception as e:
         print(f"❌ 시트 접속 실패: {e}")
         input("엔터 키를 누르면 종료합니다...")
@@ -520,7 +650,17 @@ def main():
         print(f"👉 효과음 폴더 위치: {SOUND_DIR}")
         print(f"👉 BGM 폴더 위치: {BGM_DIR}")
         print("👉 계속 진행합니다...\n")
-    
+
+    # 여러 파일에 걸리는 이름 확인 (첫 번째 파일이 사용되므로 의도와 다를 수 있음)
+    ambiguous = get_sound_library().find_ambiguous([t["sound_name"] for t in timings])
+    if ambiguous:
+        print("\n⚠️ [경고] 다음 이름은 여러 파일과 일치합니다 (첫 번째 파일 사용):")
+        for name, paths in ambiguous.items():
+            print(f"  - '{name}' → ✅ {os.path.basename(paths[0])}")
+            for path in paths[1:]:
+                print(f"       (후보: {os.path.basename(path)})")
+        print("👉 정확한 파일명(확장자 포함)으로 K열을 적으면 모호함이 사라집니다.\n")
+
     # 4. 효과음 삽입 실행
     print("\n" + "="*60)
     print("🎵 [효과음 삽입] 최종 영상에 효과음 믹싱 중...")
@@ -541,8 +681,11 @@ def main():
     
     if sound_timings:
         print(f"\n🔊 효과음/BGM 삽입 정보:")
+        sound_durations = {}  # 같은 파일은 한 번만 측정
         for timing in sound_timings:
-            sound_duration = get_audio_duration(timing["sound_file"])
+            if timing["sound_file"] not in sound_durations:
+                sound_durations[timing["sound_file"]] = get_audio_duration(timing["sound_file"])
+            sound_duration = sound_durations[timing["sound_file"]]
             file_type = "🎵 BGM" if timing.get("is_bgm", False) else "🔊 효과음"
             if timing.get("is_bgm", False):
                 print(f"  [{timing['id']}] {timing['start_time']:.2f}s 시작 - {file_type} {os.path.basename(timing['sound_file'])} (15초 재생, 마지막 6초 페이드아웃, 30% 볼륨)")
@@ -572,8 +715,20 @@ def main():
     
     print("\n⚙️ ffmpeg 실행 중... (시간이 걸릴 수 있습니다)")
     try:
-        # stderr를 출력하여 디버깅 정보 확인 가능하게
-        subprocess.run(cmd, check=True)
+        # -progress 파싱으로 진행률/속도/ETA 출력 (실패 시 stderr 마지막 로그 확인 가능)
+        run_ffmpeg(cmd, label=os.path.basename(output_video), stage="SoundInserter",
+                   total_duration=get_audio_duration(final_video))
+        print_summary()
+        write_report(os.path.join(ROOT_OUTPUT, "Reports"), "SoundInserter")
+
+        # 길이 / A/V 싱크 검증
+        sync_ok, sync_messages = verify_av_sync(final_video, output_video)
+        print(f"\n🔍 [싱크 검증] {'통과 ✅' if sync_ok else '불일치 ⚠️'}")
+        for msg in sync_messages:
+            print(f"   {msg}")
+        if not sync_ok:
+            print("   👉 결과 영상의 길이/싱크가 원본과 다릅니다. 확인 후 사용해주세요.")
+
         print(f"\n🎉 [성공] 효과음이 삽입된 영상 생성 완료!")
         print(f"📁 파일: {os.path.basename(output_video)}")
         print(f"📂 위치: {MERGY_DIR}")
@@ -584,6 +739,8 @@ def main():
     except subprocess.CalledProcessError as e:
         print(f"\n💥 [실패] 효과음 삽입 중 오류 발생")
         print(f"오류 코드: {e.returncode}")
+        if e.stderr:
+            print(f"오류 메시지:\n{e.stderr}")
         print("\n👉 디버깅 정보:")
         print(f"  - 최종 영상: {final_video}")
         print(f"  - 효과음 개수: {len(sound_timings)}")
@@ -9,6 +9,7 @@ import yt_dlp
 import re
 import gspread
 from oauth2client.service_account import ServiceAccountCredentials
+from sheet_backend import open_sheet_backend
 import threading
 
 # ==========================================
@@ -469,10 +470,13 @@ def select_project_sheet(worksheets):
 def main():
     print("🚀 Source Hunter v8.3 (Precise Cut)")
     
-    scope = ['https://spreadsheets.google.com/feeds', 'https://www.googleapis.com/auth/drive']
-    creds = ServiceAccountCredentials.from_json_keyfile_name(JSON_KEY_FILE, scope)
-    client = gspread.authorize(creds)
-    sh = load_spreadsheet(client)
+    def connect():
+        scope = ['https://spreadsheets.google.com/feeds', 'https://www.googleapis.com/auth/drive']
+        creds = ServiceAccountCredentials.from_json_keyfile_name(JSON_KEY_FILE, scope)
+        return load_spreadsheet(gspread.authorize(creds))
+
+    # 시트 백엔드 (기본: 구글 시트 로컬 미러, YTF_SHEET_BACKEND 로 로컬 CSV/XLSX/SQLite)
+    sh = open_sheet_backend(SHEET_URL_FILE, connect)
     
     target_sheet, sheet_name = select_project_sheet(sh.worksheets())
     if not target_sheet: return
@@ -3,8 +3,13 @@ import glob
 import subprocess
 import re
 import json
+from decimal import Decimal, InvalidOperation
 import gspread
 from oauth2client.service_account import ServiceAccountCredentials
+from ffmpeg_runner import run_ffmpeg, print_summary, write_report
+from text_overlay import render_text_overlay
+from style_registry import get_style_registry
+from sheet_backend import open_sheet_backend
 
 # ==========================================
 # 1. 설정 및 경로 정의
@@ -19,6 +24,40 @@ ASSET_DIR = r"C:\YtFactory9\_System\04_Co_Asset"
 FFMPEG_CMD = r"C:\YtFactory9\ffmpeg.exe"
 FFPROBE_CMD = r"C:\YtFactory9\ffprobe.exe"
 FONT_PATH = os.path.join(ASSET_DIR, "Sub", "Fonts", "BMJUA_ttf.ttf")
+# 제목 PNG 캐시 (Mergy 자막 캐시와 공유)
+TEXT_CACHE_DIR = os.path.join(ASSET_DIR, "Sub", "_TextCache")
+
+# 제목 표시 구간 (초) - 스타일 JSON 첫 객체의 "start"/"duration"으로 덮어쓰기 가능
+# TITLE_WINDOW_DURATION = None 이면 영상 전체에 제목 표시 (전체 재인코딩)
+# 값이 있으면 그 구간을 덮는 GOP 구간만 재인코딩하고 나머지는 스트림 복사
+TITLE_WINDOW_START = 0.0
+TITLE_WINDOW_DURATION = None
+
+# 제목/부제목 스타일 폴더 (Mergy 와 같은 스타일 레지스트리 사용)
+STYLES_DIR = os.path.join(ASSET_DIR, "Sub", "Styles")
+FONTS_DIR = os.path.join(ASSET_DIR, "Sub", "Fonts")
+
+# 스타일 파일에 값이 없을 때 쓰는 제목/부제목 기본값
+TITLE_STYLE_DEFAULTS = {
+    "fontsize": 60,
+    "fontcolor": "white",
+    "x": "(w-text_w)/2",
+    "y": 100,
+    "box": 1,
+    "boxcolor": "black@1.0",
+    "boxborderw": 10,
+    "start": TITLE_WINDOW_START,
+    "duration": TITLE_WINDOW_DURATION
+}
+SUBTITLE_STYLE_DEFAULTS = {
+    "fontsize": 40,
+    "fontcolor": "white",
+    "x": "(w-text_w)/2",
+    "y": 180,
+    "box": 1,
+    "boxcolor": "black@1.0",
+    "boxborderw": 10
+}
 
 # 공통 키/시트 설정
 JSON_KEY_FILE = r"C:\YtFactory9\_System\02_Key\service_account.json"
@@ -45,238 +84,96 @@ def load_spreadsheet(client):
         return client.open_by_key(raw)
 
 
-def clean_text_for_ffmpeg(text):
-    """ 자막 특수문자 이스케이프 처리 """
-    if not text: return ""
-    text = text.replace("\\", "\\\\").replace(":", "\\:").replace("'", "\\'").replace('"', '\\"')
-    text = text.replace("%", "\\%")
-    return text
+def get_video_duration(video_path):
+    """ 비디오 파일 길이 측정 (ffprobe, float 리턴) - 진행률/ETA 계산용 """
+    try:
+        cmd = [
+            FFPROBE_CMD, "-v", "error", "-show_entries",
+            "format=duration", "-of", "default=noprint_wrappers=1:nokey=1", video_path
+        ]
+        result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+        return float(result.stdout.strip())
+    except:
+        return 0.0
 
 
-def clean_json_content(content):
-    """JSON 파일에서 주석(//)과 후행 쉼표를 제거"""
-    lines = content.split('\n')
-    cleaned_lines = []
-    for line in lines:
-        # // 주석 제거
-        if '//' in line:
-            comment_idx = line.find('//')
-            # 문자열 안에 있는 //는 제거하지 않음 (간단한 처리)
-            if line[:comment_idx].count('"') % 2 == 0:
-                line = line[:comment_idx]
-        cleaned_lines.append(line.rstrip())
-    return '\n'.join(cleaned_lines)
+def get_video_size(video_path):
+    """ 비디오 해상도 (가로, 세로) - 제목 PNG를 같은 크기로 렌더링하기 위함 """
+    try:
+        cmd = [
+            FFPROBE_CMD, "-v", "error", "-select_streams", "v:0",
+            "-show_entries", "stream=width,height", "-of", "csv=p=0:s=x", video_path
+        ]
+        result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+        width, height = result.stdout.strip().splitlines()[0].split("x")[:2]
+        return int(width), int(height)
+    except:
+        return 1280, 720
 
 
 def load_title_styles(style_name):
     """
     P열의 스타일명을 기반으로 제목/부제목 스타일을 로드합니다.
     JSON 파일은 첫 번째 객체가 제목, 두 번째 객체가 부제목 스타일입니다.
+    (파싱/폰트 확인은 Mergy 와 같은 스타일 레지스트리에서 한 번만 수행)
     
     반환값: (title_style, subtitle_style) 튜플
     """
-    styles_dir = os.path.join(ASSET_DIR, "Sub", "Styles")
-    fonts_dir = os.path.join(ASSET_DIR, "Sub", "Fonts")
+    registry = get_style_registry(STYLES_DIR, FONTS_DIR, FONT_PATH)
+    objects = registry.get(style_name)
+    if not objects:
+        print(f"   ⚠️ 스타일 파일 없음/로드 실패: {style_name}.json, 기본값 사용")
+        return get_default_title_styles()
     
-    style_json = os.path.join(styles_dir, f"{style_name}.json")
+    print(f"   📂 스타일 적용: {style_name}.json")
     
-    if not os.path.exists(style_json):
-        print(f"   ⚠️ 스타일 파일 없음: {style_name}.json, 기본값 사용")
-        return get_default_title_styles()
+    # 제목 스타일 (첫 번째 객체)
+    title_style = registry.build_style(objects[0], TITLE_STYLE_DEFAULTS)
     
-    try:
-        print(f"   📂 스타일 파일 로드: {style_name}.json")
-        with open(style_json, "r", encoding="utf-8") as f:
-            content = f.read()
-        
-        # 주석 제거
-        cleaned_content = clean_json_content(content)
-        # 후행 쉼표 제거
-        cleaned_content = re.sub(r',(\s*[}\]])', r'\1', cleaned_content)
-        
-        # JSON 파싱 - 배열 또는 연속 객체 처리
-        # title_1.json은 두 개의 객체가 연속으로 있을 수 있음
-        title_data = {}
-        subtitle_data = {}
-        
-        try:
-            # 먼저 배열 형태로 파싱 시도
-            data = json.loads(cleaned_content)
-            if isinstance(data, list):
-                title_data = data[0] if len(data) > 0 else {}
-                subtitle_data = data[1] if len(data) > 1 else {}
-            else:
-                # 단일 객체인 경우
-                title_data = data
-        except json.JSONDecodeError:
-            # 배열 파싱 실패 시, 두 개의 독립 객체를 분리해서 파싱
-            # 첫 번째 { } 블록과 두 번째 { } 블록 찾기
-            brace_start = cleaned_content.find('{')
-            if brace_start == -1:
-                raise Exception("JSON 객체를 찾을 수 없습니다")
-            
-            # 첫 번째 객체 찾기
-            brace_count = 0
-            first_end = -1
-            for i in range(brace_start, len(cleaned_content)):
-                if cleaned_content[i] == '{':
-                    brace_count += 1
-                elif cleaned_content[i] == '}':
-                    brace_count -= 1
-                    if brace_count == 0:
-                        first_end = i + 1
-                        break
-            
-            if first_end > brace_start:
-                title_str = cleaned_content[brace_start:first_end]
-                try:
-                    title_data = json.loads(title_str)
-                except:
-                    pass
-            
-            # 두 번째 객체 찾기
-            second_start = cleaned_content.find('{', first_end)
-            if second_start != -1:
-                brace_count = 0
-                second_end = -1
-                for i in range(second_start, len(cleaned_content)):
-                    if cleaned_content[i] == '{':
-                        brace_count += 1
-                    elif cleaned_content[i] == '}':
-                        brace_count -= 1
-                        if brace_count == 0:
-                            second_end = i + 1
-                            break
-                if second_end > second_start:
-                    subtitle_str = cleaned_content[second_start:second_end]
-                    try:
-                        subtitle_data = json.loads(subtitle_str)
-                    except:
-                        pass
-        
-        # 폰트 경로 처리
-        def get_font_path(font_name):
-            if not font_name:
-                return FONT_PATH
-            font_candidate = os.path.join(fonts_dir, font_name)
-            if os.path.exists(font_candidate):
-                return font_candidate
-            print(f"   ⚠️ 폰트 파일을 찾을 수 없습니다: {font_name}, 기본 폰트 사용")
-            return FONT_PATH
-        
-        # 제목 스타일 (첫 번째 객체)
-        title_font_name = title_data.get("fontfile") or title_data.get("font")
-        title_style = {
-            "fontfile": get_font_path(title_font_name),
-            "fontsize": title_data.get("fontsize", 60),
-            "fontcolor": title_data.get("fontcolor", "white"),
-            "x": title_data.get("x", "(w-text_w)/2"),
-            "y": title_data.get("y", 100),
-            "box": title_data.get("box", 1),
-            "boxcolor": title_data.get("boxcolor", "black@1.0"),
-            "boxborderw": title_data.get("boxborderw", 10)
-        }
-        
-        # 부제목 스타일 (두 번째 객체, 없으면 기본값)
-        if subtitle_data:
-            subtitle_font_name = subtitle_data.get("fontfile") or subtitle_data.get("font")
-            subtitle_style = {
-                "fontfile": get_font_path(subtitle_font_name),
-                "fontsize": subtitle_data.get("fontsize", 40),
-                "fontcolor": subtitle_data.get("fontcolor", "white"),
-                "x": subtitle_data.get("x", "(w-text_w)/2"),
-                "y": subtitle_data.get("y", 180),
-                "box": subtitle_data.get("box", 1),
-                "boxcolor": subtitle_data.get("boxcolor", "black@1.0"),
-                "boxborderw": subtitle_data.get("boxborderw", 10)
-            }
-        else:
-            # 부제목 스타일이 없으면 제목 스타일을 기반으로 생성 (y와 fontsize만 다름)
-            subtitle_style = title_style.copy()
-            subtitle_style["fontsize"] = 40
-            subtitle_style["y"] = 180
-        
-        print(f"   ✅ 제목 스타일: fontsize={title_style['fontsize']}, y={title_style['y']}")
-        print(f"   ✅ 부제목 스타일: fontsize={subtitle_style['fontsize']}, y={subtitle_style['y']}")
-        
-        return title_style, subtitle_style
-        
-    except Exception as e:
-        print(f"   ⚠️ 스타일 로드 실패 ({style_name}): {e}")
-        return get_default_title_styles()
+    # 부제목 스타일 (두 번째 객체, 없으면 기본값)
+    if len(objects) > 1:
+        subtitle_style = registry.build_style(objects[1], SUBTITLE_STYLE_DEFAULTS)
+    else:
+        # 부제목 스타일이 없으면 제목 스타일을 기반으로 생성 (y와 fontsize만 다름)
+        subtitle_style = title_style.copy()
+        subtitle_style["fontsize"] = 40
+        subtitle_style["y"] = 180
+    
+    print(f"   ✅ 제목 스타일: fontsize={title_style['fontsize']}, y={title_style['y']}")
+    print(f"   ✅ 부제목 스타일: fontsize={subtitle_style['fontsize']}, y={subtitle_style['y']}")
+    
+    return title_style, subtitle_style
 
 
 def get_default_title_styles():
     """기본 제목/부제목 스타일 반환"""
     return (
-        {
-            "fontfile": FONT_PATH,
-            "fontsize": 60,
-            "fontcolor": "white",
-            "x": "(w-text_w)/2",
-            "y": 100,
-            "box": 1,
-            "boxcolor": "black@1.0",
-            "boxborderw": 10
-        },
-        {
-            "fontfile": FONT_PATH,
-            "fontsize": 40,
-            "fontcolor": "white",
-            "x": "(w-text_w)/2",
-            "y": 180,
-            "box": 1,
-            "boxcolor": "black@1.0",
-            "boxborderw": 10
-        }
+        {"fontfile": FONT_PATH, **TITLE_STYLE_DEFAULTS},
+        {"fontfile": FONT_PATH, **SUBTITLE_STYLE_DEFAULTS}
     )
 
 
-def create_title_overlay_command(input_video, title_text, subtitle_text, title_style, subtitle_style, output_video):
+def build_overlay_filter(window=None):
     """
-    FFmpeg 명령어 생성: 비디오에 제목/부제목 오버레이
+    제목 PNG(입력 1번)를 영상(입력 0번) 위에 합성하는 overlay 필터
+    - window: (시작초, 끝초) 이면 해당 구간에만 표시 (enable=between), None 이면 항상 표시
+    """
+    enable = ""
+    if window:
+        enable = f":enable='between(t,{window[0]:.3f},{window[1]:.3f})'"
+    return f"[0:v][1:v]overlay=0:0{enable}[v]"
+
+
+def create_title_overlay_command(input_video, overlay_png, output_video, window=None):
+    """
+    FFmpeg 명령어 생성: 비디오에 제목/부제목 PNG 오버레이 (영상 전체 재인코딩)
+    - window: (시작초, 끝초) 이면 해당 구간에만 제목 표시
     """
-    # 텍스트 이스케이프 처리
-    safe_title = clean_text_for_ffmpeg(title_text)
-    safe_subtitle = clean_text_for_ffmpeg(subtitle_text)
-    
-    # 폰트 경로 이스케이프 처리
-    safe_title_font = title_style['fontfile'].replace("\\", "/").replace(":", "\\:")
-    safe_subtitle_font = subtitle_style['fontfile'].replace("\\", "/").replace(":", "\\:")
-    
-    # 제목 drawtext 필터
-    title_filter = (
-        f"drawtext=fontfile='{safe_title_font}':"
-        f"text='{safe_title}':"
-        f"fontcolor={title_style['fontcolor']}:"
-        f"fontsize={title_style['fontsize']}:"
-        f"x={title_style['x']}:"
-        f"y={title_style['y']}:"
-        f"box={title_style['box']}:"
-        f"boxcolor={title_style['boxcolor']}:"
-        f"boxborderw={title_style['boxborderw']}"
-    )
-    
-    # 부제목 drawtext 필터
-    subtitle_filter = (
-        f"drawtext=fontfile='{safe_subtitle_font}':"
-        f"text='{safe_subtitle}':"
-        f"fontcolor={subtitle_style['fontcolor']}:"
-        f"fontsize={subtitle_style['fontsize']}:"
-        f"x={subtitle_style['x']}:"
-        f"y={subtitle_style['y']}:"
-        f"box={subtitle_style['box']}:"
-        f"boxcolor={subtitle_style['boxcolor']}:"
-        f"boxborderw={subtitle_style['boxborderw']}"
-    )
-    
-    # 필터 체인 구성 (두 개의 drawtext를 순차적으로 적용)
-    filter_complex = f"[0:v]{title_filter},{subtitle_filter}[v]"
-    
     cmd = [
         FFMPEG_CMD, "-y",
         "-i", input_video,
-        "-filter_complex", filter_complex,
+        "-i", overlay_png,
+        "-filter_complex", build_overlay_filter(window),
         "-map", "[v]",
         "-map", "0:a?",  # 오디오가 있으면 포함
         "-c:v", "libx264", "-preset", "fast", "-pix_fmt", "yuv420p",
@@ -287,6 +184,168 @@ def create_title_overlay_command(input_video, title_text, subtitle_text, title_s
     return cmd
 
 
+def get_keyframe_times(video_path):
+    """
+    비디오 키프레임 시각 목록 (패킷 플래그만 읽으므로 디코딩 없음)
+    - ffprobe 가 찍은 pts_time 문자열 그대로 Decimal 로 보관 (float/반올림 없이 자르는 위치로 사용)
+    """
+    cmd = [
+        FFPROBE_CMD, "-v", "error", "-select_streams", "v:0",
+        "-show_entries", "packet=pts_time,flags", "-of", "csv=p=0", video_path
+    ]
+    result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+    times = []
+    for line in result.stdout.splitlines():
+        parts = line.strip().split(",")
+        if len(parts) >= 2 and "K" in parts[1]:
+            try:
+                times.append(Decimal(parts[0]))
+            except InvalidOperation:
+                pass
+    return sorted(times)
+
+
+def count_video_frames(video_path):
+    """ 비디오 프레임(패킷) 수 (디코딩 없이 세기, 실패 시 None) """
+    cmd = [
+        FFPROBE_CMD, "-v", "error", "-select_streams", "v:0", "-count_packets",
+        "-show_entries", "stream=nb_read_packets", "-of", "default=noprint_wrappers=1:nokey=1", video_path
+    ]
+    result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+    try:
+        return int(result.stdout.strip())
+    except ValueError:
+        return None
+
+
+def get_video_encode_args(video_path):
+    """
+    원본 비디오 스트림과 같은 파라미터로 재인코딩하기 위한 인자
+    (재인코딩 구간을 원본 구간과 스트림 복사로 이어붙일 수 있어야 함)
+    - 조각은 모두 MPEG-TS (타임베이스 1/90000 고정) 이므로 타임베이스는 여기서 지정하지 않음
+      → 최종 MP4 의 타임스케일은 get_video_timescale 로 concat 단계에서 원본과 맞춤
+    """
+    cmd = [
+        FFPROBE_CMD, "-v", "error", "-select_streams", "v:0",
+        "-show_entries", "stream=pix_fmt,profile,level,r_frame_rate",
+        "-of", "json", video_path
+    ]
+    result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+    stream = json.loads(result.stdout)["streams"][0]
+
+    args = ["-c:v", "libx264", "-preset", "fast", "-pix_fmt", stream.get("pix_fmt", "yuv420p")]
+    profile = (stream.get("profile") or "").lower()
+    if profile in ("baseline", "main", "high"):
+        args += ["-profile:v", profile]
+    if stream.get("level"):
+        args += ["-level:v", f"{int(stream['level']) / 10:.1f}"]
+    if stream.get("r_frame_rate"):
+        args += ["-r", stream["r_frame_rate"]]
+    return args
+
+
+def get_video_timescale(video_path):
+    """ 원본 MP4 비디오 트랙 타임스케일 (time_base 1/N 의 N, 못 구하면 None) """
+    cmd = [
+        FFPROBE_CMD, "-v", "error", "-select_streams", "v:0",
+        "-show_entries", "stream=time_base", "-of", "default=noprint_wrappers=1:nokey=1", video_path
+    ]
+    result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+    time_base = result.stdout.strip()
+    return time_base[2:] if time_base.startswith("1/") and time_base[2:].isdigit() else None
+
+
+def insert_title_segment(input_video, overlay_png, output_video, window_start, window_end, work_dir):
+    """
+    [구간 재인코딩 모드] 제목이 보이는 구간을 덮는 GOP 구간만 재인코딩
+    1) 제목 구간을 감싸는 키프레임 경계 [seg_start, seg_end) 계산
+       (ffprobe 가 준 키프레임 시각을 그대로 사용 → 반올림으로 GOP 가 두 번 들어가거나 빠지지 않음)
+    2) 앞/뒤 구간은 스트림 복사, 가운데 구간만 overlay 재인코딩 (모두 TS로 저장)
+    3) 비디오 조각을 concat -c copy 후 원본 오디오를 그대로 다시 붙임
+    반환: 성공 여부
+    """
+    total_duration = get_video_duration(input_video)
+    keyframes = get_keyframe_times(input_video)
+    if not keyframes or total_duration <= 0:
+        print("   ⚠️ 키프레임 정보를 읽을 수 없습니다.")
+        return False
+
+    window_end = min(window_end, total_duration)
+    # 경계는 키프레임 시각 문자열 그대로 (Decimal), 뒤쪽 키프레임이 없으면 끝까지 (뒤 구간 없음)
+    seg_start = max([k for k in keyframes if k <= Decimal(str(window_start))] or [Decimal(0)])
+    later = [k for k in keyframes if k >= Decimal(str(window_end))]
+    seg_end = min(later) if later else None
+    end_label = f"{seg_end}s" if seg_end is not None else "끝"
+    print(f"   ✂️ 재인코딩 구간: {seg_start}s ~ {end_label} (전체 {total_duration:.2f}s)")
+
+    if not os.path.exists(work_dir):
+        os.makedirs(work_dir)
+
+    annexb = ["-bsf:v", "h264_mp4toannexb", "-f", "mpegts"]
+    parts = []
+    body_duration = (seg_end - seg_start) if seg_end is not None else None
+    try:
+        # 앞 구간: 스트림 복사 (seg_start 키프레임 직전 프레임까지)
+        if seg_start > 0:
+            head = os.path.join(work_dir, "title_head.ts")
+            run_ffmpeg([FFMPEG_CMD, "-y", "-i", input_video, "-t", str(seg_start),
+                        "-map", "0:v", "-c", "copy", *annexb, head],
+                       label="head(copy)", stage="TitleInserter.copy", total_duration=float(seg_start))
+            parts.append(head)
+
+        # 제목 구간: 재인코딩 (구간 시작 기준 상대 시간으로 표시, 앞/뒤 구간과 같은 키프레임 시각으로 자름)
+        body = os.path.join(work_dir, "title_body.ts")
+        overlay_filter = build_overlay_filter((window_start - float(seg_start), window_end - float(seg_start)))
+        body_limit = ["-t", str(body_duration)] if body_duration is not None else []
+        run_ffmpeg([FFMPEG_CMD, "-y", "-ss", str(seg_start), *body_limit,
+                    "-i", input_video, "-i", overlay_png,
+                    "-filter_complex", overlay_filter, "-map", "[v]",
+                    *get_video_encode_args(input_video), *annexb, body],
+                   label="body(encode)", stage="TitleInserter.encode",
+                   total_duration=float(body_duration) if body_duration is not None else total_duration - float(seg_start))
+        parts.append(body)
+
+        # 뒤 구간: 스트림 복사 (seg_end 키프레임부터)
+        if seg_end is not None:
+            tail = os.path.join(work_dir, "title_tail.ts")
+            run_ffmpeg([FFMPEG_CMD, "-y", "-ss", str(seg_end), "-i", input_video,
+                        "-map", "0:v", "-c", "copy", *annexb, tail],
+                       label="tail(copy)", stage="TitleInserter.copy", total_duration=total_duration - float(seg_end))
+            parts.append(tail)
+
+        # 비디오 조각 이어붙이기 + 원본 오디오 그대로 복사 (MP4 타임스케일은 원본과 같게)
+        timescale = get_video_timescale(input_video)
+        timescale_args = ["-video_track_timescale", timescale] if timescale else []
+        list_txt = os.path.join(work_dir, "title_list.txt")
+        with open(list_txt, "w", encoding="utf-8") as f:
+            for part in parts:
+                safe_path = part.replace("\\", "/").replace("'", "'\\''")
+                f.write(f"file '{safe_path}'\n")
+        run_ffmpeg([FFMPEG_CMD, "-y", "-f", "concat", "-safe", "0", "-i", list_txt,
+                    "-i", input_video, "-map", "0:v", "-map", "1:a?",
+                    "-c", "copy", *timescale_args, "-movflags", "+faststart", output_video],
+                   label=os.path.basename(output_video), stage="TitleInserter.concat", total_duration=total_duration)
+
+        # 프레임 수가 원본과 다르면 (GOP 중복/누락) 오디오와 어긋나므로 실패 처리 → 전체 재인코딩
+        frames_before = count_video_frames(input_video)
+        frames_after = count_video_frames(output_video)
+        if frames_before is not None and frames_before != frames_after:
+            print(f"   ⚠️ 프레임 수가 원본과 다릅니다 (원본 {frames_before}, 결과 {frames_after})")
+            if os.path.exists(output_video):
+                os.remove(output_video)
+            return False
+        return True
+    except subprocess.CalledProcessError as e:
+        print(f"   ⚠️ 구간 재인코딩 실패: {e}")
+        if e.stderr:
+            print(f"   오류 메시지: {e.stderr}")
+        return False
+    finally:
+        for path in parts + [os.path.join(work_dir, "title_list.txt")]:
+            if os.path.exists(path):
+                os.remove(path)
+
+
 # ==========================================
 # 3. 메인 로직
 # ==========================================
@@ -302,11 +361,14 @@ def main():
         return
     
     # 1. 구글 시트 연결
-    try:
+    def connect():
         scope = ['https://spreadsheets.google.com/feeds', 'https://www.googleapis.com/auth/drive']
         creds = ServiceAccountCredentials.from_json_keyfile_name(JSON_KEY_FILE, scope)
-        client = gspread.authorize(creds)
-        doc = load_spreadsheet(client)
+        return load_spreadsheet(gspread.authorize(creds))
+
+    try:
+        # 시트 백엔드 (기본: 구글 시트 로컬 미러, YTF_SHEET_BACKEND 로 로컬 CSV/XLSX/SQLite)
+        doc = open_sheet_backend(SHEET_URL_FILE, connect)
     except Exception as e:
         print(f"❌ 시트 접속 실패: {e}")
         input("엔터 키를 누르면 종료합니다...")
@@ -448,20 +510,42 @@ def main():
     print(f"   입력: {os.path.basename(final_video)}")
     print(f"   출력: {os.path.basename(output_video)}")
     
-    cmd = create_title_overlay_command(
-        final_video, title_text, subtitle_text,
-        title_style, subtitle_style, output_video
+    # 제목/부제목을 영상 크기의 투명 PNG 한 장으로 렌더링 (같은 제목/스타일은 캐시 재사용)
+    overlay_png = render_text_overlay(
+        [(title_text, title_style), (subtitle_text, subtitle_style)],
+        get_video_size(final_video), TEXT_CACHE_DIR
     )
     
+    # 제목 표시 구간 (duration이 없으면 전체 구간)
+    window = None
+    if title_style.get("duration"):
+        window_start = float(title_style.get("start") or 0.0)
+        window = (window_start, window_start + float(title_style["duration"]))
+        print(f"   ⏱️ 제목 표시 구간: {window[0]:.2f}s ~ {window[1]:.2f}s")
+    
     try:
-        subprocess.run(cmd, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        done = False
+        if window:
+            # 구간 재인코딩 모드 (실패 시 전체 재인코딩으로 대체)
+            done = insert_title_segment(
+                final_video, overlay_png, output_video,
+                window[0], window[1], os.path.join(MERGY_DIR, "_title_work")
+            )
+            if not done:
+                print("   👉 전체 재인코딩 모드로 전환합니다...")
+        if not done:
+            cmd = create_title_overlay_command(final_video, overlay_png, output_video, window)
+            run_ffmpeg(cmd, label=os.path.basename(output_video), stage="TitleInserter",
+                       total_duration=get_video_duration(final_video))
+        print_summary()
+        write_report(os.path.join(ROOT_OUTPUT, "Reports"), "TitleInserter")
         print(f"\n🎉 [성공] {os.path.basename(output_video)} 생성 완료!")
         print(f"👉 저장 위치: {MERGY_DIR}")
         os.startfile(MERGY_DIR)
     except subprocess.CalledProcessError as e:
         print(f"\n💥 [실패] 제목/부제목 삽입 실패: {e}")
         if e.stderr:
-            print(f"오류 메시지: {e.stderr.decode('utf-8', errors='ignore')}")
+            print(f"오류 메시지: {e.stderr}")
         input("엔터 키를 누르면 종료합니다...")
     except Exception as e:
         print(f"\n💥 [실패] 예상치 못한 오류: {e}")
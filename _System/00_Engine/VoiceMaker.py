@@ -1,24 +1,33 @@
 import os
+import sys
 import glob
 import re
 import time
-import requests
 import gspread
 from oauth2client.service_account import ServiceAccountCredentials
-import random
 import subprocess
 import edge_tts
 import asyncio
 import html
-
-# 오디오 후처리용 (ElevenLabs 속도/피치 조절)
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from engine_cli import get_engine_options, run_main, select_go_sheet, resolve_channel
+from stream_queue import mark_ready
+from resource_slots import uses_resource
+from run_manifest import RunManifest, hash_inputs
+from sheet_backend import open_sheet_backend
+from silence_trim import NUMPY_AVAILABLE, get_trim_options, trim_silence_file, analyze_silence, kept_seconds
+from audio_prosody import apply_prosody
+from azure_tts_pool import AzureSynthesizerPool, DEFAULT_REGION as AZURE_DEFAULT_REGION
+from elevenlabs_tts import ElevenLabsKeyPool, load_elevenlabs_keys, stream_speech
+from voice_registry import get_voice_registry, looks_like_voice_id, DEFAULT_ELEVENLABS_MODEL
+
+# 묵음 오디오 생성용 (미드트로/아웃트로) - 속도/피치 조절은 audio_prosody (ffmpeg)
 try:
     from pydub import AudioSegment
-    from pydub.effects import speedup, normalize
     PYDUB_AVAILABLE = True
 except ImportError:
     PYDUB_AVAILABLE = False
-    print("⚠️ pydub가 설치되지 않았습니다. 속도/피치 조절을 위해 'pip install pydub' 실행이 필요합니다.")
+    print("⚠️ pydub가 설치되지 않았습니다. 묵음 생성을 위해 'pip install pydub' 실행이 필요합니다.")
 try:
     import azure.cognitiveservices.speech as speechsdk
     AZURE_AVAILABLE = True
@@ -44,6 +53,9 @@ JSON_KEY_FILE = r"C:\YtFactory9\_System\02_Key\service_account.json"
 SHEET_URL_FILE = r"C:\YtFactory9\_System\00_Engine\YtFactory9_URL.txt"
 FFPROBE_CMD = r"C:\YtFactory9\ffprobe.exe"
 
+# ElevenLabs 행 자동 동시 생성 수 상한 (--workers 가 없을 때)
+ELEVENLABS_AUTO_WORKERS = 8
+
 # 워크플로우별 고유 auto_sheet 파일 (환경변수 우선)
 ENV_AUTO_SHEET = os.environ.get("YTF_AUTO_SHEET_FILE")
 if ENV_AUTO_SHEET and ENV_AUTO_SHEET.strip():
@@ -52,393 +64,84 @@ else:
     AUTO_SHEET_FILE = os.path.join(CURRENT_DIR, "_auto_sheet.txt")
 
 # ==========================================
-# 2. Edge TTS 목소리 매핑 (voices_edge.txt 로드)
+# 2. 목소리 매핑 (voices_edge / voices_azure / voices_elevenlabs.txt → voice_registry)
 # ==========================================
-_edge_voice_map = {}  # {호출이름: {"id": "voice_id", "rate": "속도값", "pitch": "피치값"}}
+VOICE_FILES = {"edge": VOICES_EDGE_FILE, "azure": VOICES_AZURE_FILE, "elevenlabs": VOICES_ELEVENLABS_FILE}
 
-# ==========================================
-# 2-1. Azure TTS 목소리 매핑 (voices_azure.txt 로드)
-# ==========================================
-_azure_voice_map = {}  # {호출이름: {"id": "voice_id", "rate": "속도값", "pitch": "피치값"}}
 
-# ==========================================
-# 2-2. ElevenLabs TTS 목소리 매핑 (voices_elevenlabs.txt 로드)
-# ==========================================
-_elevenlabs_voice_map = {}  # {호출이름: {"id": "voice_id", "model": "모델명", "rate": "속도값", "pitch": "피치값"}}
+def get_voices():
+    """ 세 TTS 공용 목소리 레지스트리 (프로세스당 1번, 원본 파일이 그대로면 실행 간 캐시 사용) """
+    return get_voice_registry(VOICE_FILES)
 
-def load_edge_voices_map():
-    """voices_edge.txt 파일을 읽어서 호출이름 -> ID 매핑 생성
-    
-    파일 형식: 호출이름,스타일,성별,ID,속도,피치,설명
-    예: 선희_기본,General,여성,ko-KR-SunHiNeural,0,0,가장 깔끔한 아나운서 기본 톤
-    """
-    global _edge_voice_map
-    if _edge_voice_map:
-        return _edge_voice_map
-    
-    _edge_voice_map = {}
-    
-    if not os.path.exists(VOICES_EDGE_FILE):
-        print(f"⚠️ voices_edge.txt 파일을 찾을 수 없습니다: {VOICES_EDGE_FILE}")
-        return _edge_voice_map
-    
-    try:
-        with open(VOICES_EDGE_FILE, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-        
-        header_found = False
-        for line in lines:
-            line = line.strip()
-            
-            # 빈 줄 스킵
-            if not line:
-                continue
-            
-            # 주석 스킵
-            if line.startswith('#'):
-                continue
-            
-            # 헤더 줄 체크 (호출이름으로 시작하면 헤더)
-            if '호출이름' in line or 'call_name' in line.lower():
-                header_found = True
-                continue
-            
-            # 헤더 이후에만 데이터 파싱
-            if not header_found and not line.startswith('선희') and not line.startswith('인준') and not line.startswith('미국'):
-                continue
-            
-            # CSV 파싱: 호출이름,스타일,성별,ID,속도,피치,설명
-            # 설명 컬럼에 쉼표가 포함될 수 있으므로 maxsplit 사용
-            parts = [p.strip() for p in line.split(',', 6)]  # 최대 7개 필드로 분리
-            
-            # 최소 4개 필드 필요 (호출이름,스타일,성별,ID)
-            if len(parts) >= 4:
-                call_name = parts[0]  # 호출이름 (예: '선희_기본')
-                style = parts[1] if len(parts) > 1 else "General"  # 스타일 (예: 'General')
-                gender = parts[2]  # 성별 (예: '여성')
-                voice_id = parts[3]   # ID (예: 'ko-KR-SunHiNeural')
-                rate = parts[4] if len(parts) > 4 else "0"      # 속도 (예: "+20%", "-10%", "0")
-                pitch = parts[5] if len(parts) > 5 else "0"     # 피치 (예: "+5Hz", "-2Hz", "0")
-                
-                # 빈 값 체크
-                if call_name and voice_id:
-                    _edge_voice_map[call_name] = {
-                        "id": voice_id,
-                        "style": style,
-                        "gender": gender,
-                        "rate": rate,
-                        "pitch": pitch
-                    }
-                    # 매핑 정보 로드 (출력 제거)
-        
-        if _edge_voice_map:
-            print(f"✅ Edge TTS 목소리 매핑 로드 완료: {len(_edge_voice_map)}개")
-        else:
-            print(f"⚠️ voices_edge.txt에서 목소리를 찾지 못했습니다.")
-    except Exception as e:
-        print(f"❌ voices_edge.txt 파일 읽기 실패: {e}")
-        import traceback
-        traceback.print_exc()
-    
-    return _edge_voice_map
 
-def load_azure_voices_map():
-    """voices_azure.txt 파일을 읽어서 호출이름 -> ID 매핑 생성
-    
-    파일 형식: 호출이름,스타일,성별,ID,속도,피치,설명
-    예: 회장_쇼츠,General,남성,ko-KR-BongJinNeural,+15%,-5Hz,[쇼츠용] 회장님 목소리 빠르게
-    """
-    global _azure_voice_map
-    if _azure_voice_map:
-        return _azure_voice_map
-    
-    _azure_voice_map = {}
-    
-    if not os.path.exists(VOICES_AZURE_FILE):
-        print(f"⚠️ voices_azure.txt 파일을 찾을 수 없습니다: {VOICES_AZURE_FILE}")
-        return _azure_voice_map
-    
-    try:
-        with open(VOICES_AZURE_FILE, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-        
-        header_found = False
-        for line in lines:
-            line = line.strip()
-            
-            # 빈 줄 스킵
-            if not line:
-                continue
-            
-            # 주석 스킵
-            if line.startswith('#'):
-                continue
-            
-            # 헤더 줄 체크 (호출이름으로 시작하면 헤더)
-            if '호출이름' in line or 'call_name' in line.lower():
-                header_found = True
-                continue
-            
-            # 헤더 이후에만 데이터 파싱 (다양한 호출이름 시작 패턴 허용)
-            if not header_found and not any(line.startswith(prefix) for prefix in ['선희', '인준', '지민', '연우', '서현', '국민', '철수', '봉진', '회장', '이장', '도사', '다정', '음흉', '옥분', '말자']):
-                continue
-            
-            # CSV 파싱: 호출이름,스타일,성별,ID,속도,피치,설명
-            # 설명 컬럼에 쉼표가 포함될 수 있으므로 maxsplit 사용
-            parts = [p.strip() for p in line.split(',', 6)]  # 최대 7개 필드로 분리
-            
-            # 최소 4개 필드 필요 (호출이름,스타일,성별,ID)
-            if len(parts) >= 4:
-                call_name = parts[0]  # 호출이름 (예: '회장_쇼츠')
-                style = parts[1] if len(parts) > 1 else "General"  # 스타일 (예: 'General', 'News', 'Sad')
-                gender = parts[2]  # 성별 (예: '남성')
-                voice_id = parts[3]   # ID (예: 'ko-KR-BongJinNeural')
-                rate = parts[4] if len(parts) > 4 else "0"      # 속도 (예: "+15%", "-10%", "0")
-                pitch = parts[5] if len(parts) > 5 else "0"     # 피치 (예: "-5Hz", "+2Hz", "0")
-                
-                # 빈 값 체크
-                if call_name and voice_id:
-                    _azure_voice_map[call_name] = {
-                        "id": voice_id,
-                        "style": style,
-                        "gender": gender,
-                        "rate": rate,
-                        "pitch": pitch
-                    }
-                    # 매핑 정보 로드 (출력 제거)
-        
-        if _azure_voice_map:
-            print(f"✅ Azure TTS 목소리 매핑 로드 완료: {len(_azure_voice_map)}개")
-        else:
-            print(f"⚠️ voices_azure.txt에서 목소리를 찾지 못했습니다.")
-    except Exception as e:
-        print(f"❌ voices_azure.txt 파일 읽기 실패: {e}")
-        import traceback
-        traceback.print_exc()
-    
-    return _azure_voice_map
+def find_voice_info(tool, voice_input, default_name, default_id):
+    """ 목소리 조회 공통 (Edge/Azure/ElevenLabs)
 
-def get_azure_voice_info(voice_input):
-    """ Azure TTS 목소리 정보 가져오기 (voices_azure.txt 사용)
-    
     Args:
-        voice_input: I열에 입력된 호출이름 (예: '회장_쇼츠', '선희_기본')
-    
+        tool: "edge" / "azure" / "elevenlabs"
+        voice_input: I열에 입력된 호출이름 (예: '회장_쇼츠', '선희 기본', 'ko-KR-InJoonNeural')
+        default_name / default_id: 비어있거나 못 찾았을 때 쓸 기본 목소리
+
     Returns:
-        dict: {"id": "voice_id", "rate": "속도값", "pitch": "피치값"}
-              또는 voice_input이 전체 ID 형식이면 {"id": "voice_id", "rate": None, "pitch": None}
-    
-    Logic:
-        - L열에 'azure'가 적혀있으면 이 함수가 호출됨
-        - I열의 '회장_쇼츠' 같은 값을 voices_azure.txt에서 찾아서 ID, 속도, 피치 반환
+        dict: {"id": "voice_id", "rate": "속도값", "pitch": "피치값", ...}
+              전체 ID 형식이거나 기본값이면 rate/pitch 는 None
     """
-    # voices_azure.txt 매핑 로드
-    voice_map = load_azure_voices_map()
-    
+    voices = get_voices()
+    file_name = f"voices_{tool}.txt"
+    fallback = {"id": default_id, "rate": None, "pitch": None}
+    if tool == "elevenlabs":
+        fallback["model"] = DEFAULT_ELEVENLABS_MODEL
+
     if not voice_input or not voice_input.strip():
-        # 기본 목소리: 인준_기본
-        default_info = voice_map.get("인준_기본")
+        default_info = voices.entries[tool].get(default_name)
         if default_info:
             print(f"   ℹ️ voice가 비어있어 기본 목소리 사용: {default_info['id']}")
             return default_info
-        else:
-            return {"id": "ko-KR-InJoonNeural", "rate": None, "pitch": None}
-    
+        return fallback
+
     voice_input_clean = voice_input.strip()
-    
-    # voices_azure.txt에서 호출이름으로 찾기 (정확한 매칭)
-    if voice_input_clean in voice_map:
-        found_info = voice_map[voice_input_clean]
+
+    # 호출이름 → 정규화 이름 (대소문자/공백/_ 무시) → 목소리 ID 순서로 찾기
+    found_info, matched_by = voices.find(tool, voice_input_clean)
+    if found_info:
         rate_str = f", rate={found_info['rate']}" if found_info.get('rate') and found_info['rate'] != "0" else ""
         pitch_str = f", pitch={found_info['pitch']}" if found_info.get('pitch') and found_info['pitch'] != "0" else ""
-        print(f"   ✅ '{voice_input_clean}' -> '{found_info['id']}'{rate_str}{pitch_str} (voices_azure.txt에서 찾음)")
+        how = {"name": "", "normalized": ", 이름 표기 차이 무시", "id": ", ID로"}[matched_by]
+        print(f"   ✅ '{voice_input_clean}' -> '{found_info['id']}'{rate_str}{pitch_str} ({file_name}에서 찾음{how})")
         return found_info
-    
-    # 매핑에 없으면, 이미 전체 목소리 이름 형식인지 확인 (예: "ko-KR-InJoonNeural")
-    if "ko-" in voice_input_clean or "-Neural" in voice_input_clean or "en-" in voice_input_clean:
-        # 이미 전체 이름 형식으로 입력된 경우 그대로 사용 (속도/피치 없음)
+
+    # 매핑에 없으면, 이미 전체 목소리 ID 형식인지 확인 (예: "ko-KR-InJoonNeural") → 그대로 사용 (속도/피치 없음)
+    if looks_like_voice_id(tool, voice_input_clean):
         print(f"   ℹ️ 전체 Voice ID 형식으로 인식: {voice_input_clean}")
-        return {"id": voice_input_clean, "rate": None, "pitch": None}
-    
-    # 그 외의 경우 기본값 반환
-    default_info = voice_map.get("인준_기본")
-    if default_info:
-        default_id = default_info['id']
-    else:
-        default_id = "ko-KR-InJoonNeural"
-    
-    print(f"   ⚠️ '{voice_input_clean}' 목소리를 voices_azure.txt에서 찾지 못해 기본 목소리({default_id})로 진행합니다.")
-    if voice_map:
-        print(f"   💡 사용 가능한 목소리: {', '.join(sorted(voice_map.keys())[:10])}...")
-    
-    return {"id": default_id, "rate": None, "pitch": None}
+        return dict(fallback, id=voice_input_clean)
 
-def load_elevenlabs_voices_map():
-    """voices_elevenlabs.txt 파일을 읽어서 호출이름 -> ID 매핑 생성
-    
-    파일 형식: 호출이름,성별,ID,모델,속도,피치,특징
-    예: 일레븐_아기,여성,zrHiDhphv9ZnVXBq795h,eleven_multilingual_v2,0,0,이름:Mimi / 애니메이션 톤 (기본)
-    """
-    global _elevenlabs_voice_map
-    if _elevenlabs_voice_map:
-        return _elevenlabs_voice_map
-    
-    _elevenlabs_voice_map = {}
-    
-    if not os.path.exists(VOICES_ELEVENLABS_FILE):
-        print(f"⚠️ voices_elevenlabs.txt 파일을 찾을 수 없습니다: {VOICES_ELEVENLABS_FILE}")
-        return _elevenlabs_voice_map
-    
-    try:
-        with open(VOICES_ELEVENLABS_FILE, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-        
-        header_found = False
-        for line in lines:
-            line = line.strip()
-            
-            # 빈 줄 스킵
-            if not line:
-                continue
-            
-            # 주석/구분선 스킵
-            if line.startswith('#') or line.startswith('=') or line.startswith('['):
-                continue
-            
-            # 헤더 줄 체크
-            if '호출이름' in line or 'call_name' in line.lower():
-                header_found = True
-                continue
-            
-            # 헤더 이후에만 데이터 파싱
-            if not header_found and not line.startswith('일레븐_'):
-                continue
-            
-            # CSV 파싱: 호출이름,스타일,성별,ID,속도,피치,설명
-            # 설명 컬럼에 쉼표가 포함될 수 있으므로 maxsplit 사용
-            parts = [p.strip() for p in line.split(',', 6)]  # 최대 7개 필드로 분리
-            
-            # 최소 4개 필드 필요 (호출이름,스타일,성별,ID)
-            if len(parts) >= 4:
-                call_name = parts[0]  # 호출이름 (예: '레이첼_영어')
-                style = parts[1] if len(parts) > 1 else "General"  # 스타일 (예: 'General')
-                gender = parts[2]  # 성별 (예: '여성')
-                voice_id = parts[3]   # ID (예: '21m00Tcm4TlvDq8ikWAM')
-                rate = parts[4] if len(parts) > 4 else "0"      # 속도 (예: "+10%", "-15%", "0")
-                pitch = parts[5] if len(parts) > 5 else "0"     # 피치 (예: "+5Hz", "-5Hz", "0")
-                # 모델 컬럼은 없으므로 기본값 사용
-                model = "eleven_multilingual_v2"
-                
-                # 빈 값 체크
-                if call_name and voice_id:
-                    _elevenlabs_voice_map[call_name] = {
-                        "id": voice_id,
-                        "style": style,
-                        "gender": gender,
-                        "model": model,  # 기본값 고정
-                        "rate": rate,
-                        "pitch": pitch
-                    }
-                    # 매핑 정보 로드 (출력 제거)
-        
-        if _elevenlabs_voice_map:
-            print(f"✅ ElevenLabs TTS 목소리 매핑 로드 완료: {len(_elevenlabs_voice_map)}개")
-        else:
-            print(f"⚠️ voices_elevenlabs.txt에서 목소리를 찾지 못했습니다.")
-    except Exception as e:
-        print(f"❌ voices_elevenlabs.txt 파일 읽기 실패: {e}")
-        import traceback
-        traceback.print_exc()
-    
-    return _elevenlabs_voice_map
+    # Edge 에서 Azure 목소리 이름을 쓴 경우 (예: 봉진_산신령) → Edge 에는 없으므로 기본 목소리
+    if tool == "edge":
+        azure_info, _ = voices.find("azure", voice_input_clean)
+        if azure_info:
+            print(f"   ⚠️ '{voice_input_clean}'는 Edge TTS에 없지만 Azure 목소리({azure_info['id']})로 인식했습니다.")
+            print(f"   💡 Edge TTS는 이 목소리를 지원하지 않으므로 Azure TTS를 사용해야 합니다.")
+            return fallback
 
-def get_elevenlabs_voice_info(voice_input):
-    """ ElevenLabs TTS 목소리 정보 가져오기 (voices_elevenlabs.txt 사용)
-    
-    Args:
-        voice_input: I열에 입력된 호출이름 (예: '일레븐_아기', '일레븐_여자_쇼츠')
-    
-    Returns:
-        dict: {"id": "voice_id", "model": "모델명", "rate": "속도값", "pitch": "피치값"}
-    """
-    # voices_elevenlabs.txt 매핑 로드
-    voice_map = load_elevenlabs_voices_map()
-    
-    if not voice_input or not voice_input.strip():
-        # 기본 목소리: 일레븐_여자
-        default_info = voice_map.get("일레븐_여자")
-        if default_info:
-            print(f"   ℹ️ voice가 비어있어 기본 목소리 사용: {default_info['id']}")
-            return default_info
-        else:
-            return {"id": None, "model": "eleven_multilingual_v2", "rate": None, "pitch": None}
-    
-    voice_input_clean = voice_input.strip()
-    
-    # voices_elevenlabs.txt에서 호출이름으로 찾기 (정확한 매칭)
-    if voice_input_clean in voice_map:
-        found_info = voice_map[voice_input_clean]
-        rate_str = f", rate={found_info['rate']}" if found_info.get('rate') and found_info['rate'] != "0" else ""
-        pitch_str = f", pitch={found_info['pitch']}" if found_info.get('pitch') and found_info['pitch'] != "0" else ""
-        print(f"   ✅ '{voice_input_clean}' -> '{found_info['id']}'{rate_str}{pitch_str} (voices_elevenlabs.txt에서 찾음)")
-        return found_info
-    
-    # 매핑에 없으면 기본값 반환
-    default_info = voice_map.get("일레븐_여자")
-    if default_info:
-        default_id = default_info['id']
-    else:
-        default_id = None
-    
-    print(f"   ⚠️ '{voice_input_clean}' 목소리를 voices_elevenlabs.txt에서 찾지 못해 기본 목소리로 진행합니다.")
-    if voice_map:
-        print(f"   💡 사용 가능한 목소리: {', '.join(sorted(voice_map.keys())[:10])}...")
-    
-    return {"id": default_id, "model": "eleven_multilingual_v2", "rate": None, "pitch": None}
+    default_info = voices.entries[tool].get(default_name)
+    default_id = default_info['id'] if default_info else default_id
+    print(f"   ⚠️ '{voice_input_clean}' 목소리를 {file_name}에서 찾지 못해 기본 목소리({default_id or '없음'})로 진행합니다.")
+    if voices.entries[tool]:
+        print(f"   💡 사용 가능한 목소리: {', '.join(sorted(voices.names(tool))[:10])}...")
+    return dict(fallback, id=default_id)
+
+
+def get_azure_voice_info(voice_input):
+    """ Azure TTS 목소리 정보 (L열 'azure', 기본: 인준_기본) """
+    return find_voice_info("azure", voice_input, "인준_기본", "ko-KR-InJoonNeural")
 
-# ==========================================
-# 3. Key Manager (일레븐랩스 좀비 모드)
-# ==========================================
-class KeyManager:
-    def __init__(self):
-        self.keys = []
-        self.current_idx = 0
-        self._load_keys()
-
-    def _load_keys(self):
-        # KeyKey*.txt 파일 탐색
-        key_dir = r"C:\YtFactory9\_System\02_Key"
-        key_files = glob.glob(os.path.join(key_dir, "KeyKey*.txt"))
-        print(f"🔍 키 파일 탐색: {[os.path.basename(k) for k in key_files]}")
-        
-        for kf in key_files:
-            try:
-                with open(kf, "r", encoding="utf-8") as f:
-                    content = f.read()
-                    # sk_ 로 시작하는 키 패턴 찾기
-                    found = re.findall(r'(sk_[a-zA-Z0-9]{30,})', content)
-                    self.keys.extend(found)
-            except: pass
-        
-        self.keys = list(set(self.keys)) # 중복 제거
-        random.shuffle(self.keys) # 섞기
-        print(f"🔑 로드된 ElevenLabs 키: {len(self.keys)}개")
-
-    def get_current_key(self):
-        if not self.keys: return None
-        return self.keys[self.current_idx]
-
-    def switch_key(self):
-        if self.current_idx < len(self.keys) - 1:
-            self.current_idx += 1
-            print(f"🔄 [Key Change] 키 교체! ({self.current_idx+1}/{len(self.keys)})")
-            return True
-        else:
-            print("❌ [Key Exhausted] 모든 키가 소진되었습니다.")
-            return False
+
+def get_elevenlabs_voice_info(voice_input):
+    """ ElevenLabs 목소리 정보 (L열 'elevenlabs', 기본: 일레븐_여자, 못 찾으면 id 가 None 일 수 있음) """
+    return find_voice_info("elevenlabs", voice_input, "일레븐_여자", None)
 
 # ==========================================
-# 4. 유틸리티 함수
+# 3. 유틸리티 함수 (ElevenLabs 키 관리는 elevenlabs_tts)
 # ==========================================
 def load_spreadsheet(client):
     """
@@ -511,6 +214,18 @@ def get_voice_id_by_name(target_name: str):
 
     return _extract_voice_id_from_file(voice_file_path, target_name)
 
+
+def make_asset_voice_check():
+    """ 검사용: 04_Asset/Voice 성우 txt 로 찾을 수 있는 ElevenLabs 이름인지 (폴더는 한 번만 읽음) """
+    basenames = [os.path.basename(c) for c in glob.glob(os.path.join(ASSET_VOICE_DIR, "*.txt"))]
+
+    def check(tool, voice_name):
+        if tool == "elevenlabs":
+            return any(voice_name in name for name in basenames)
+        # Edge 에 Azure 이름 → 기본 목소리로 진행 (생성 때 경고만)
+        return tool == "edge" and get_voices().find("azure", voice_name)[0] is not None
+    return check
+
 def get_audio_duration(audio_path):
     """ 오디오 파일 길이 정밀 측정 (ffprobe, float 리턴) """
     try:
@@ -559,137 +274,78 @@ def generate_silent_audio(duration_seconds, save_path):
         print(f"   ❌ 묵음 오디오 생성 실패: {e}")
         return False
 
-def apply_audio_speed_pitch(audio_path, rate=None, pitch=None):
-    """ 오디오 파일에 속도/피치 조절 적용 (pydub 사용)
+def apply_audio_speed_pitch(source_path, save_path, rate=None, pitch=None, trim=None):
+    """ 오디오 파일에 속도/피치 조절 적용 (ffmpeg 1회, audio_prosody 참고)
     
     Args:
-        audio_path: 오디오 파일 경로
-        rate: 속도 조절 (예: "+10%" -> 1.1배, "-15%" -> 0.85배)
-        pitch: 피치 조절 (Hz 단위, 예: "+5Hz", "-5Hz")
+        source_path: 원본 오디오 파일 경로
+        save_path: 결과 저장 경로 (원본과 다른 경로)
+        rate: 속도 조절 (예: "+10%" -> 1.1배, "-15%" -> 0.85배), 높낮이는 유지
+        pitch: 피치 조절 (Hz 단위, 예: "+5Hz", "-5Hz"), 길이는 유지
+        trim: 무음 제거 구간 (silence_trim.analyze_silence 결과), 같은 ffmpeg 실행에서 먼저 잘라냄
     
     Returns:
-        bool: 성공 여부
+        float: 결과 길이(초, ffprobe 재측정 없음) / 조절할 게 없으면 0.0 / 실패 시 None
     """
-    if not PYDUB_AVAILABLE:
-        print(f"   ⚠️ pydub가 없어 속도/피치 조절을 건너뜁니다.")
-        return False
-    
-    if not rate and not pitch:
-        return False  # 조절할 게 없음
-    
-    try:
-        # 오디오 로드
-        audio = AudioSegment.from_mp3(audio_path)
-        
-        # 속도 조절
-        if rate and rate != "0":
-            try:
-                # "+20%" -> 1.2, "-15%" -> 0.85
-                rate_clean = rate.replace("%", "").strip()
-                rate_value = float(rate_clean)
-                rate_multiplier = 1.0 + (rate_value / 100.0)
-                
-                # 속도 조절 (pydub의 frame_rate 조절 사용)
-                audio = audio._spawn(audio.raw_data, overrides={
-                    "frame_rate": int(audio.frame_rate * rate_multiplier)
-                }).set_frame_rate(audio.frame_rate)
-                print(f"   🎵 속도 조절: {rate} ({rate_multiplier:.2f}배)")
-            except Exception as e:
-                print(f"   ⚠️ 속도 조절 실패: {e}")
-        
-        # 피치 조절 (Hz)
-        if pitch and pitch != "0":
-            try:
-                # "+5Hz" -> 5, "-5Hz" -> -5
-                pitch_clean = pitch.replace("Hz", "").strip()
-                pitch_hz = float(pitch_clean)
-                
-                # 피치 조절 (frame_rate 조절로 피치 변경)
-                # Hz를 semitone으로 근사 변환 (1Hz ≈ 0.25 semitone)
-                semitones = pitch_hz * 0.25
-                new_sample_rate = int(audio.frame_rate * (2 ** (semitones / 12.0)))
-                audio = audio._spawn(audio.raw_data, overrides={
-                    "frame_rate": new_sample_rate
-                }).set_frame_rate(audio.frame_rate)
-                print(f"   🎵 피치 조절: {pitch} ({semitones:.2f} semitones)")
-            except Exception as e:
-                print(f"   ⚠️ 피치 조절 실패: {e}")
-        
-        # 파일 저장
-        audio.export(audio_path, format="mp3")
-        return True
-        
-    except Exception as e:
-        print(f"   ❌ 오디오 후처리 에러: {e}")
-        return False
+    return apply_prosody(source_path, save_path, rate, pitch, label=os.path.basename(save_path), trim=trim)
 
-def generate_elevenlabs_audio(text, voice_id, save_path, key_manager, model_id="eleven_multilingual_v2", rate=None, pitch=None):
-    """ ElevenLabs API 호출 (Zombie Key 적용, 속도/피치 조절 지원)
+
+def trim_voice_file(audio_path, trim_options):
+    """ 무음 구간 제거 (앞/뒤 + 긴 쉼) → 잘랐으면 새 길이(초), 아니면 None """
+    trimmed = trim_silence_file(audio_path, trim_options)
+    if not trimmed:
+        return None
+    duration, removed_sec = trimmed
+    print(f"   ✂️ 무음 {removed_sec:.2f}초 제거")
+    return duration
+
+@uses_resource("tts")  # 배치 실행 시 전역 동시 요청 수 제한
+def generate_elevenlabs_audio(text, voice_id, save_path, key_pool, model_id="eleven_multilingual_v2", rate=None, pitch=None,
+                              trim_options=None):
+    """ ElevenLabs API 호출 (스트리밍 저장 + 키 풀, 속도/피치 조절 + 무음 제거 지원)
     
     Args:
         text: 음성으로 변환할 텍스트
         voice_id: ElevenLabs Voice ID
         save_path: 저장할 파일 경로
-        key_manager: KeyManager 객체
+        key_pool: ElevenLabsKeyPool 객체 (여러 행이 동시에 요청해도 키를 나눠 씀)
         model_id: 모델 ID (기본값: eleven_multilingual_v2)
         rate: 속도 (예: "+10%", "-15%")
         pitch: 피치 (예: "+5Hz", "-5Hz")
+        trim_options: 무음 제거 설정 (None 이면 안 함), 속도/피치 조절이 있으면 같은 ffmpeg 실행에서 처리
     """
-    url = f"https://api.elevenlabs.io/v1/text-to-speech/{voice_id}"
-    
-    # 임시 파일 경로 (후처리 전용)
+    # 속도/피치 조절이 있으면 원본을 임시 파일에 받고 후처리 결과를 save_path 에 저장
     temp_path = save_path + ".temp.mp3" if rate or pitch else save_path
     
-    while True:
-        api_key = key_manager.get_current_key()
-        if not api_key: return False, 0.0
-
-        headers = {
-            "Accept": "audio/mpeg",
-            "Content-Type": "application/json",
-            "xi-api-key": api_key
-        }
-        data = {
-            "text": text,
-            "model_id": model_id,
-            "voice_settings": {
-                "stability": 0.5,
-                "similarity_boost": 0.75
-            }
-        }
-
-        try:
-            response = requests.post(url, json=data, headers=headers)
-            
-            if response.status_code == 200:
-                with open(temp_path, 'wb') as f:
-                    f.write(response.content)
-                
-                # 속도/피치 조절이 있으면 후처리
-                if rate or pitch:
-                    apply_audio_speed_pitch(temp_path, rate, pitch)
-                    # 후처리된 파일을 최종 경로로 이동
-                    if os.path.exists(temp_path) and temp_path != save_path:
-                        import shutil
-                        shutil.move(temp_path, save_path)
-                        if os.path.exists(temp_path):
-                            os.remove(temp_path)
-                
-                # 오디오 길이 측정
-                duration = get_audio_duration(save_path)
-                return True, duration
-            
-            elif response.status_code in [401, 402, 429]: # 키 만료/잔액부족/제한
-                print(f"   ⚠️ 키 오류 ({response.status_code}). 교체 시도...")
-                if not key_manager.switch_key():
-                    return False, 0.0
-            else:
-                print(f"   ❌ API 오류: {response.status_code} - {response.text}")
-                return False, 0.0
-                
-        except Exception as e:
-            print(f"   ❌ 통신 에러: {e}")
-            return False, 0.0
+    if not stream_speech(text, voice_id, temp_path, key_pool, model_id):
+        if temp_path != save_path and os.path.exists(temp_path):
+            os.remove(temp_path)
+        return False, 0.0
+    
+    # 속도/피치 조절이 있으면 후처리 (무음 자르기도 같이 → mp3 인코딩 1번, 결과 길이도 같이 받음)
+    duration = 0.0
+    trimmed = False
+    if temp_path != save_path:
+        trim = analyze_silence(temp_path, trim_options) if trim_options else None
+        duration = apply_audio_speed_pitch(temp_path, save_path, rate, pitch, trim)
+        if not duration:
+            # 실패했거나 조절할 게 없으면 원본 그대로 사용
+            os.replace(temp_path, save_path)
+        else:
+            if trim:
+                trimmed = True
+                print(f"   ✂️ 무음 {trim[1] - kept_seconds(trim[0]):.2f}초 제거")
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+    
+    # 후처리 없이 받은 그대로면 여기서 무음 제거
+    if trim_options and not trimmed:
+        duration = trim_voice_file(save_path, trim_options) or duration
+    
+    # 후처리를 안 했으면 오디오 길이 측정
+    if not duration:
+        duration = get_audio_duration(save_path)
+    return True, duration
 
 def process_text_for_ssml(text):
     """ 대본 텍스트를 SSML용으로 처리 (pause 태그 변환 및 특수문자 이스케이프)
@@ -927,6 +583,7 @@ async def generate_edge_tts_audio_async(text, voice_name, save_path, rate=None,
     
     return False, 0.0
 
+@uses_resource("tts")  # 배치 실행 시 전역 동시 요청 수 제한
 def generate_edge_tts_audio(text, voice_name, save_path, rate=None, pitch=None):
     """ Edge TTS를 사용한 음성 생성 (동기 래퍼, 속도/피치 조절 지원)
     
@@ -1103,7 +760,8 @@ def create_azure_ssml_with_prosody(text, voice_name, rate=None, pitch=None, styl
     
     return ssml
 
-def generate_azure_tts_audio(text, voice_name, save_path, rate=None, pitch=None, style=None):
+@uses_resource("tts")  # 배치 실행 시 전역 동시 요청 수 제한
+def generate_azure_tts_audio(text, voice_name, save_path, rate=None, pitch=None, style=None, pool=None):
     """ Azure TTS를 사용한 음성 생성 (속도/피치/스타일 조절 지원)
     
     Args:
@@ -1113,84 +771,68 @@ def generate_azure_tts_audio(text, voice_name, save_path, rate=None, pitch=None,
         rate: 속도 (예: '+15%', '-10%')
         pitch: 피치 (예: '-5Hz', '+2Hz')
         style: 스타일 (예: 'News', 'Sad', 'Cheerful', 'CustomerService')
+        pool: AzureSynthesizerPool (없으면 키를 읽어 이번 호출용으로 만듦)
     """
     if not AZURE_AVAILABLE:
         print(f"   ❌ Azure Speech SDK가 설치되지 않았습니다.")
         return False, 0.0
     
+    own_pool = pool is None
     try:
-        azure_key, azure_region = get_azure_key_and_region()
-        
-        if not azure_key:
-            print(f"   ❌ Azure TTS 키를 찾을 수 없습니다. KeyKey*.txt 파일을 확인하세요.")
-            return False, 0.0
-        
-        if not azure_region:
-            azure_region = "koreacentral"  # 기본값
-            print(f"   ⚠️ Azure 리전을 찾지 못해 기본값({azure_region})을 사용합니다.")
-        
-        # Azure Speech SDK 설정
-        speech_config = speechsdk.SpeechConfig(subscription=azure_key, region=azure_region)
+        if own_pool:
+            azure_key, azure_region = get_azure_key_and_region()
+            if not azure_key:
+                print(f"   ❌ Azure TTS 키를 찾을 수 없습니다. KeyKey*.txt 파일을 확인하세요.")
+                return False, 0.0
+            if not azure_region:
+                print(f"   ⚠️ Azure 리전을 찾지 못해 기본값({AZURE_DEFAULT_REGION})을 사용합니다.")
+            pool = AzureSynthesizerPool(azure_key, azure_region)
         
-        # 목소리 설정
-        if voice_name:
-            speech_config.speech_synthesis_voice_name = voice_name
-            print(f"   🔍 Azure 설정: voice={voice_name}, region={azure_region}")
-        else:
+        if not voice_name:
             print(f"   ⚠️ voice_name이 비어있습니다!")
         
-        # 출력 파일 설정
-        audio_config = speechsdk.audio.AudioOutputConfig(filename=save_path)
-        
-        # Speech Synthesizer 생성
-        synthesizer = speechsdk.SpeechSynthesizer(speech_config=speech_config, audio_config=audio_config)
-        
-        # 속도나 피치나 스타일이 있으면 SSML 사용, 없으면 일반 텍스트 사용
-        # Azure TTS는 SSML을 통해 음수 rate/pitch 값을 지원하므로 모두 사용
-        if rate or pitch or (style and style != "General"):
-            ssml_text = create_azure_ssml_with_prosody(text, voice_name, rate, pitch, style)
-            # SSML 디버깅 (오류 발생 시 확인용)
-            print(f"   🔍 SSML 생성됨 (rate={rate}, pitch={pitch}, style={style})")
-            if len(ssml_text) > 500:
-                print(f"   🔍 SSML 미리보기: {ssml_text[:300]}...")
+        # 풀에서 합성기 빌려서 합성 (연결은 이미 열려 있음, 결과는 메모리로 받음)
+        with pool.acquire(voice_name) as synthesizer:
+            # 속도나 피치나 스타일이 있으면 SSML 사용, 없으면 일반 텍스트 사용
+            # Azure TTS는 SSML을 통해 음수 rate/pitch 값을 지원하므로 모두 사용
+            if rate or pitch or (style and style != "General"):
+                ssml_text = create_azure_ssml_with_prosody(text, voice_name, rate, pitch, style)
+                # SSML 디버깅 (오류 발생 시 확인용)
+                print(f"   🔍 SSML 생성됨 (rate={rate}, pitch={pitch}, style={style})")
+                if len(ssml_text) > 500:
+                    print(f"   🔍 SSML 미리보기: {ssml_text[:300]}...")
+                else:
+                    print(f"   🔍 SSML 전체: {ssml_text}")
+                try:
+                    result = synthesizer.speak_ssml_async(ssml_text).get()
+                except Exception as ssml_error:
+                    print(f"   ❌ SSML 실행 오류: {ssml_error}")
+                    # SSML 오류 시 간단한 텍스트로 재시도
+                    print(f"   🔄 간단한 텍스트로 재시도...")
+                    result = synthesizer.speak_text_async(text).get()
             else:
-                print(f"   🔍 SSML 전체: {ssml_text}")
-            try:
-                result = synthesizer.speak_ssml_async(ssml_text).get()
-            except Exception as ssml_error:
-                print(f"   ❌ SSML 실행 오류: {ssml_error}")
-                # SSML 오류 시 간단한 텍스트로 재시도
-                print(f"   🔄 간단한 텍스트로 재시도...")
+                # 기본 음성 합성 (SSML 없이)
+                print(f"   🔍 SSML 없이 일반 텍스트로 생성 시도: {text[:50]}...")
                 result = synthesizer.speak_text_async(text).get()
-        else:
-            # 기본 음성 합성 (SSML 없이)
-            print(f"   🔍 SSML 없이 일반 텍스트로 생성 시도: {text[:50]}...")
-            result = synthesizer.speak_text_async(text).get()
         
         # result 객체 안전성 검증
         if result is None:
             print(f"   ❌ Azure TTS: result가 None입니다.")
-            # 생성된 파일이 있으면 삭제
-            if os.path.exists(save_path):
-                try:
-                    os.remove(save_path)
-                except:
-                    pass
             return False, 0.0
         
         if result.reason == speechsdk.ResultReason.SynthesizingAudioCompleted:
-            # 오디오 길이 측정
-            duration = get_audio_duration(save_path)
             # 파일이 제대로 생성되었는지 확인 (크기가 0이면 실패)
-            if os.path.exists(save_path):
-                file_size = os.path.getsize(save_path)
-                if file_size == 0:
-                    print(f"   ❌ 생성된 파일이 비어있습니다 (0바이트).")
-                    try:
-                        os.remove(save_path)
-                    except:
-                        pass
-                    return False, 0.0
+            audio_data = result.audio_data
+            if not audio_data:
+                print(f"   ❌ 생성된 오디오가 비어있습니다 (0바이트).")
+                return False, 0.0
+            with open(save_path, "wb") as f:
+                f.write(audio_data)
+            # 오디오 길이 (SDK 가 알려준 값, 없으면 측정)
+            audio_duration = getattr(result, "audio_duration", None)
+            duration = audio_duration.total_seconds() if audio_duration else 0.0
+            if duration <= 0:
+                duration = get_audio_duration(save_path)
             return True, duration
         elif result.reason == speechsdk.ResultReason.Canceled:
             # CancellationDetails 생성 시 예외 처리 (SPXERR_INVALID_ARG 방지)
@@ -1219,30 +861,10 @@ def generate_azure_tts_audio(text, voice_name, save_path, rate=None, pitch=None,
                 else:
                     print(f"   💡 SSML 또는 음성 설정을 확인해주세요.")
             
-            # 오류 발생 시 생성된 손상된 파일 삭제 시도 (실패해도 계속 진행)
-            if os.path.exists(save_path):
-                file_size = os.path.getsize(save_path)
-                # 파일 삭제 시도 (최대 2회, 각 0.3초 대기)
-                for retry in range(2):
-                    try:
-                        time.sleep(0.3)  # 파일 핸들이 해제될 때까지 대기
-                        os.remove(save_path)
-                        break  # 성공하면 종료
-                    except Exception:
-                        if retry == 1:  # 마지막 시도
-                            # 삭제 실패해도 계속 진행 (파일이 남아있어도 다음 단계에서 덮어쓰기 가능)
-                            pass
-                        continue
-            
+            # 메모리로 받으므로 지울 손상 파일 없음
             return False, 0.0
         else:
             print(f"   ❌ Azure TTS 실패: {result.reason}")
-            # 실패 시 생성된 파일 삭제
-            if os.path.exists(save_path):
-                try:
-                    os.remove(save_path)
-                except:
-                    pass
             return False, 0.0
             
     except Exception as e:
@@ -1250,79 +872,54 @@ def generate_azure_tts_audio(text, voice_name, save_path, rate=None, pitch=None,
         import traceback
         traceback.print_exc()
         return False, 0.0
+    finally:
+        # 이번 호출용으로 만든 풀이면 연결 닫기
+        if own_pool and pool is not None:
+            pool.close()
 
 
 def get_edge_voice_info(voice_input):
-    """ Edge TTS 목소리 정보 가져오기 (voices_edge.txt 사용)
-    
-    Args:
-        voice_input: I열에 입력된 호출이름 (예: '선희_기본', '인준_기본')
-    
-    Returns:
-        dict: {"id": "voice_id", "rate": "속도값", "pitch": "피치값"}
-              또는 voice_input이 전체 ID 형식이면 {"id": "voice_id", "rate": None, "pitch": None}
-    
-    Logic:
-        - L열에 'edge'가 적혀있으면 이 함수가 호출됨
-        - I열의 '선희_기본' 같은 값을 voices_edge.txt에서 찾아서 ID, 속도, 피치 반환
-    """
-    # voices_edge.txt 매핑 로드
-    voice_map = load_edge_voices_map()
-    
-    if not voice_input or not voice_input.strip():
-        # 기본 진중한 남성 목소리: 인준_기본
-        default_info = voice_map.get("인준_기본")
-        if default_info:
-            print(f"   ℹ️ voice가 비어있어 기본 목소리 사용: {default_info['id']}")
-            return default_info
-        else:
-            return {"id": "ko-KR-InJoonNeural", "rate": None, "pitch": None}
-    
-    voice_input_clean = voice_input.strip()
-    
-    # voices_edge.txt에서 호출이름으로 찾기 (정확한 매칭)
-    if voice_input_clean in voice_map:
-        found_info = voice_map[voice_input_clean]
-        rate_str = f", rate={found_info['rate']}" if found_info.get('rate') and found_info['rate'] != "0" else ""
-        pitch_str = f", pitch={found_info['pitch']}" if found_info.get('pitch') and found_info['pitch'] != "0" else ""
-        print(f"   ✅ '{voice_input_clean}' -> '{found_info['id']}'{rate_str}{pitch_str} (voices_edge.txt에서 찾음)")
-        return found_info
-    
-    # 매핑에 없으면, 이미 전체 목소리 이름 형식인지 확인 (예: "ko-KR-InJoonNeural")
-    if "ko-" in voice_input_clean or "-Neural" in voice_input_clean or "en-" in voice_input_clean:
-        # 이미 전체 이름 형식으로 입력된 경우 그대로 사용 (속도/피치 없음)
-        print(f"   ℹ️ 전체 Voice ID 형식으로 인식: {voice_input_clean}")
-        return {"id": voice_input_clean, "rate": None, "pitch": None}
-    
-    # Azure 목소리 이름이면 Azure 목소리 ID 그대로 사용 (Edge TTS에는 없지만 매핑)
-    # 예: 봉진_산신령 -> ko-KR-BongJinNeural
-    azure_voice_map = load_azure_voices_map()
-    if voice_input_clean in azure_voice_map:
-        azure_info = azure_voice_map[voice_input_clean]
-        azure_id = azure_info["id"]
-        print(f"   ⚠️ '{voice_input_clean}'는 Edge TTS에 없지만 Azure 목소리({azure_id})로 인식했습니다.")
-        print(f"   💡 Edge TTS는 이 목소리를 지원하지 않으므로 Azure TTS를 사용해야 합니다.")
-        # Edge TTS에는 봉진 목소리가 없으므로 가장 비슷한 목소리로 매핑 (인준 기본)
-        return {"id": "ko-KR-InJoonNeural", "rate": None, "pitch": None}
-    
-    # 그 외의 경우 기본값 반환
-    default_info = voice_map.get("인준_기본")
-    if default_info:
-        default_id = default_info['id']
-    else:
-        default_id = "ko-KR-InJoonNeural"
-    
-    print(f"   ⚠️ '{voice_input_clean}' 목소리를 voices_edge.txt에서 찾지 못해 기본 목소리({default_id})로 진행합니다.")
-    if voice_map:
-        print(f"   💡 사용 가능한 목소리: {', '.join(sorted(voice_map.keys())[:10])}...")
-    
-    return {"id": default_id, "rate": None, "pitch": None}
+    """ Edge TTS 목소리 정보 (L열 'edge' 또는 비어있음, 기본: 인준_기본, Azure 전용 이름이면 기본 목소리) """
+    return find_voice_info("edge", voice_input, "인준_기본", "ko-KR-InJoonNeural")
+
 
 # ==========================================
 # 4. 메인 실행
 # ==========================================
-def main():
+def add_voice_arguments(parser):
+    parser.add_argument("--no-trim", action="store_true", help="TTS 앞/뒤 무음 제거 안 함")
+    parser.add_argument("--max-pause", type=float, help="문장 사이 무음 최대 길이 (초, 예: 0.6), 없으면 내부 무음은 그대로")
+    parser.add_argument("--silence-db", type=float, help="무음 판정 기준 (dBFS, 기본 -45)")
+    parser.add_argument("--workers", type=int, help="동시에 생성할 행 수 (기본 1, ElevenLabs 행이 있으면 키 동시 요청 한도만큼)")
+
+
+def get_silence_trim_options(options):
+    """ 무음 제거 설정 (끄기 또는 NumPy 없음 → None) """
+    if options.get("no_trim"):
+        return None
+    if not NUMPY_AVAILABLE:
+        print("⚠️ numpy가 설치되지 않아 무음 제거를 건너뜁니다. ('pip install numpy')")
+        return None
+    trim_options = get_trim_options(max_pause=options.get("max_pause"), threshold_db=options.get("silence_db"))
+    pause_info = f", 내부 쉼 최대 {trim_options['max_pause']}초" if trim_options["max_pause"] else ""
+    print(f"✂️ 무음 제거: 앞/뒤 (기준 {trim_options['threshold_db']}dB{pause_info})")
+    return trim_options
+
+
+def main(sheet_name=None, channel=None, options=None):
+    """
+    음성 생성 실행
+    - sheet_name: 작업 시트 이름 (없으면 번호 입력), channel: 채널 ID (없으면 시트 이름에서 추출)
+    - options["stream_dir"]: 스트리밍 모드면 행 음성이 완성될 때마다 머지파이에 알림
+    - options["no_trim"] / ["max_pause"] / ["silence_db"]: 무음 제거 설정 (silence_trim 참고)
+    - options["workers"]: 동시에 생성할 행 수 (Azure 합성기 풀 크기도 같음)
+      없으면 1, 단 ElevenLabs 행이 있으면 살아 있는 키들의 동시 요청 한도 합 (최대 ELEVENLABS_AUTO_WORKERS)
+    반환: 종료 코드 (0=성공, 1=실패 또는 생성 실패한 행이 있음)
+    """
+    options = get_engine_options(sheet_name, options)
+    stream_dir = options["stream_dir"]
     print(f"🚀 VoiceMaker v3.0 (ElevenLabs + Edge TTS + Azure TTS)")
+    trim_options = get_silence_trim_options(options)
     
     # === [자동 선택 로직] - 비활성화됨 ===
     # auto_sheet_file = AUTO_SHEET_FILE
@@ -1335,36 +932,37 @@ def main():
     #     except: pass
     # ========================
     
-    # 1. Edge TTS 목소리 매핑 로드
-    load_edge_voices_map()
-    
-    # 1-1. Azure TTS 목소리 매핑 로드
-    load_azure_voices_map()
+    # 1. 목소리 매핑 로드 (Edge / Azure / ElevenLabs 공용 레지스트리)
+    voices = get_voices()
     
-    # 1-2. ElevenLabs TTS 목소리 매핑 로드
-    load_elevenlabs_voices_map()
+    # 2. 키 로드 (ElevenLabs 전용, 키별 남은 글자 수는 첫 요청 때 조회)
+    km = ElevenLabsKeyPool(load_elevenlabs_keys())
     
-    # 2. 키 로드 (ElevenLabs 전용)
-    km = KeyManager()
-    
-    # 2-1. Azure 키 확인 (한 번만 확인)
+    # 동시 생성 행 수 (기본 1 = 한 행씩)
+    workers = max(1, options.get("workers") or 1)
+
+    # 2-1. Azure 키 확인 (한 번만 확인), 합성기 풀은 동시 생성 행 수가 정해진 뒤에 만듦
     azure_available_and_configured = False
+    azure_pool = None
     if AZURE_AVAILABLE:
         azure_key, azure_region = get_azure_key_and_region()
         if azure_key:
             azure_available_and_configured = True
-            print(f"✅ Azure TTS 설정 확인 완료 (region: {azure_region or 'koreacentral'})")
+            print(f"✅ Azure TTS 설정 확인 완료 (region: {azure_region or AZURE_DEFAULT_REGION})")
         else:
             print(f"⚠️ Azure TTS SDK는 설치되어 있지만 키가 없습니다. Edge TTS로 자동 전환됩니다.")
 
     # 3. 구글 시트 연결
-    try:
+    def connect():
         scope = ['https://spreadsheets.google.com/feeds', 'https://www.googleapis.com/auth/drive']
         creds = ServiceAccountCredentials.from_json_keyfile_name(JSON_KEY_FILE, scope)
-        client = gspread.authorize(creds)
-        doc = load_spreadsheet(client)
+        return load_spreadsheet(gspread.authorize(creds))
+
+    try:
+        # 시트 백엔드 (기본: 구글 시트 로컬 미러, YTF_SHEET_BACKEND 로 로컬 CSV/XLSX/SQLite)
+        doc = open_sheet_backend(SHEET_URL_FILE, connect)
     except Exception as e:
-        print(f"❌ 시트 접속 실패: {e}"); return
+        print(f"❌ 시트 접속 실패: {e}"); return 1
 
     # 4. 시트 선택
     all_worksheets = doc.worksheets()
@@ -1372,48 +970,26 @@ def main():
 
     if not go_sheets:
         print("❌ 'go' 시트가 없습니다.")
-        return
+        return 1
 
-    print("\n" + "="*40)
-    print(" 🎤 [VoiceMaker] 작업할 시트를 선택하세요")
-    print("="*40)
-    
-    for idx, ws in enumerate(go_sheets):
-        print(f" [{idx+1}] {ws.title}")
-    
-    selected_sheet = None
-    while selected_sheet is None:
-        # [자동 매칭] - 비활성화됨 --------------------------------
-        # if selected_sheet_name:
-        #     for ws in go_sheets:
-        #         if ws.title == selected_sheet_name:
-        #             selected_sheet = ws
-        #             break
-        #     if selected_sheet: break
-        # ---------------------------------------------
-        
-        try:
-            choice = input("\n번호 입력 >> ").strip()
-            idx = int(choice) - 1
-            if 0 <= idx < len(go_sheets):
-                selected_sheet = go_sheets[idx]
-        except: pass
-
-    print(f"✅ 선택된 시트: '{selected_sheet.title}'")
+    selected_sheet = select_go_sheet(go_sheets, sheet_name, " 🎤 [VoiceMaker] 작업할 시트를 선택하세요")
+    if selected_sheet is None:
+        return 1
 
     # 5. 시트 이름에서 채널명 추출 및 폴더 생성
     sheet_title = selected_sheet.title
-    channel_match = re.search(r'Ch\d+', sheet_title)
-    if not channel_match:
+    channel_name = resolve_channel(sheet_title, channel)  # 예: "Ch01"
+    if not channel_name:
         print(f"❌ 시트 이름에서 채널명을 추출할 수 없습니다: {sheet_title}")
-        return
-    channel_name = channel_match.group(0)  # 예: "Ch01"
+        return 1
     
     # 출력 경로: C:\YtFactory9\{channel_name}\03_Output\{sheet_title}\Voice
     voice_output_dir = f"C:\\YtFactory9\\{channel_name}\\03_Output\\{sheet_title}\\Voice"
     if not os.path.exists(voice_output_dir):
         os.makedirs(voice_output_dir)
         print(f"📂 폴더 생성: {voice_output_dir}")
+    # 📒 실행 매니페스트: 행별 입력 해시/상태 기록 → 재실행 시 바뀐 행만 다시 생성
+    manifest = RunManifest(voice_output_dir, "voice")
     
     # 6. 데이터 로드
     rows = selected_sheet.get_all_values()[1:] # 헤더 제외
@@ -1421,8 +997,10 @@ def main():
     print(f"🎯 총 {total_count}개 행 처리 시작")
 
     success_count = 0
+    fail_count = 0
     duration_updates = []  # D열(음성 길이) 업데이트용 리스트
 
+    jobs = []  # 생성이 필요한 행
     for i, row in enumerate(rows):
         # A열: ID (파일명), B열: Script (내용)
         # I열(index 8): voice (성우 이름 또는 목소리 이름, 예: '선희_기본')
@@ -1443,9 +1021,12 @@ def main():
 
         filename = f"{file_id}.mp3"
         save_path = os.path.join(voice_output_dir, filename)
+        # 입력 = 대본 + 음성 도구 + 성우 (바뀐 행만 다시 생성)
+        # 무음 제거 설정은 넣지 않음 (설정만 바꿨다고 TTS 를 다시 호출하지 않도록)
+        input_hash = hash_inputs(script, voice_tool, voice_name)
 
-        # 기존 파일이 있으면 길이만 측정해서 D열 업데이트
-        if os.path.exists(save_path):
+        # 기존 파일이 유효하면 길이만 측정해서 D열 업데이트
+        if manifest.is_valid(save_path, input_hash):
             # D열이 비어있거나 업데이트가 필요한 경우 (D열 = 인덱스 3)
             current_duration = row[3].strip() if len(row) > 3 else ""
             if not current_duration:
@@ -1456,164 +1037,251 @@ def main():
                         "col": 4,  # D열 (1-based)
                         "value": f"{duration:.2f}"
                     })
+            mark_ready(stream_dir, "voice", file_id)
             continue
 
+        jobs.append({
+            "i": i, "file_id": file_id, "script": script, "voice_name": voice_name,
+            "voice_tool": voice_tool, "save_path": save_path, "input_hash": input_hash
+        })
+
+    # 목소리 검사 (시트 전체 I열/L열, 합성 시작 전) → 생성할 행에 오타가 있으면 바로 중단
+    voice_problems = voices.validate_rows(rows, extra_check=make_asset_voice_check())
+    if voice_problems:
+        job_rows = {job["i"] + 2 for job in jobs}
+        blocking = [(row_num, message) for row_num, message in voice_problems if row_num in job_rows]
+        for row_num, message in voice_problems:
+            mark = "❌" if row_num in job_rows else "⚠️"
+            print(f"   {mark} [Row {row_num}] {message}")
+        if blocking:
+            print(f"❌ 생성할 행 중 {len(blocking)}개 행의 목소리/음성 도구를 확인할 수 없어 중단합니다. (I열/L열 확인)")
+            return 1
+        print(f"⚠️ 이미 생성된 행 {len(voice_problems)}개의 목소리를 확인할 수 없습니다. (다시 생성할 때 수정 필요)")
+
+    # 긴 대본을 키 하나로 순서대로 만들지 않고 여러 키에 나눠 동시에 요청
+    if not options.get("workers") and km.keys and any(job["voice_tool"] == "elevenlabs" for job in jobs):
+        km.load_budgets()
+        workers = max(1, min(km.capacity(), ELEVENLABS_AUTO_WORKERS))
+
+    # Azure 합성기 풀 (목소리별 합성기/연결 재사용, 최종 동시 생성 행 수만큼 동시 합성)
+    # 이번에 생성할 행에서 쓰는 목소리만 미리 준비 (연결까지 열어 둠)
+    if azure_available_and_configured:
+        azure_pool = AzureSynthesizerPool(azure_key, azure_region, size=workers)
+        azure_voice_names = {
+            job["voice_name"] for job in jobs
+            if job["voice_tool"] == "azure" and "(미드트로)" not in job["script"] and "(아웃트로)" not in job["script"]
+        }
+        azure_pool.warm(sorted({get_azure_voice_info(name)["id"] for name in azure_voice_names}))
+
+    def make_voice(job):
+        """ 행 1개 음성 생성 → (성공 여부, 길이), 스킵한 행은 None (작업 스레드에서 실행될 수 있음) """
+        i, file_id, script = job["i"], job["file_id"], job["script"]
+        voice_name, voice_tool = job["voice_name"], job["voice_tool"]
+        save_path, input_hash = job["save_path"], job["input_hash"]
+
         # 미드트로/아웃트로 체크: B열(script)에 키워드가 있으면 묵음 오디오 생성
         success = False
         duration = 0.0
         
-        if "(미드트로)" in script:
-            # 미드트로: Intro_Video.mp4 길이만큼 묵음 생성
-            intro_video_path = f"C:\\YtFactory9\\{channel_name}\\02_Input\\Intro_Video.mp4"
-            if os.path.exists(intro_video_path):
-                video_duration = get_video_duration(intro_video_path)
-                if video_duration > 0:
-                    print(f"🎙️ 생성 중 [{file_id}] (묵음, 미드트로, {video_duration:.2f}초)")
-                    success = generate_silent_audio(video_duration, save_path)
-                    if success:
-                        duration = video_duration
+        # 임시 파일에 생성 후 이름 변경 + 매니페스트 기록 (중단돼도 반쪽 mp3 가 완성본으로 남지 않음)
+        with manifest.produce(save_path, input_hash) as out:
+            if "(미드트로)" in script:
+                # 미드트로: Intro_Video.mp4 길이만큼 묵음 생성
+                intro_video_path = f"C:\\YtFactory9\\{channel_name}\\02_Input\\Intro_Video.mp4"
+                if os.path.exists(intro_video_path):
+                    video_duration = get_video_duration(intro_video_path)
+                    if video_duration > 0:
+                        print(f"🎙️ 생성 중 [{file_id}] (묵음, 미드트로, {video_duration:.2f}초)")
+                        success = generate_silent_audio(video_duration, out.path)
+                        if success:
+                            duration = video_duration
+                    else:
+                        print(f"   ⚠️ 미드트로 비디오 길이를 측정할 수 없습니다: {intro_video_path}")
                 else:
-                    print(f"   ⚠️ 미드트로 비디오 길이를 측정할 수 없습니다: {intro_video_path}")
-            else:
-                print(f"   ⚠️ 미드트로 비디오 파일을 찾을 수 없습니다: {intro_video_path}")
-        elif "(아웃트로)" in script:
-            # 아웃트로: Outro_Video.mp4 길이만큼 묵음 생성
-            outro_video_path = f"C:\\YtFactory9\\{channel_name}\\02_Input\\Outro_Video.mp4"
-            if os.path.exists(outro_video_path):
-                video_duration = get_video_duration(outro_video_path)
-                if video_duration > 0:
-                    print(f"🎙️ 생성 중 [{file_id}] (묵음, 아웃트로, {video_duration:.2f}초)")
-                    success = generate_silent_audio(video_duration, save_path)
-                    if success:
-                        duration = video_duration
+                    print(f"   ⚠️ 미드트로 비디오 파일을 찾을 수 없습니다: {intro_video_path}")
+            elif "(아웃트로)" in script:
+                # 아웃트로: Outro_Video.mp4 길이만큼 묵음 생성
+                outro_video_path = f"C:\\YtFactory9\\{channel_name}\\02_Input\\Outro_Video.mp4"
+                if os.path.exists(outro_video_path):
+                    video_duration = get_video_duration(outro_video_path)
+                    if video_duration > 0:
+                        print(f"🎙️ 생성 중 [{file_id}] (묵음, 아웃트로, {video_duration:.2f}초)")
+                        success = generate_silent_audio(video_duration, out.path)
+                        if success:
+                            duration = video_duration
+                    else:
+                        print(f"   ⚠️ 아웃트로 비디오 길이를 측정할 수 없습니다: {outro_video_path}")
                 else:
-                    print(f"   ⚠️ 아웃트로 비디오 길이를 측정할 수 없습니다: {outro_video_path}")
+                    print(f"   ⚠️ 아웃트로 비디오 파일을 찾을 수 없습니다: {outro_video_path}")
             else:
-                print(f"   ⚠️ 아웃트로 비디오 파일을 찾을 수 없습니다: {outro_video_path}")
-        else:
-            # 일반 TTS 생성 (기존 로직)
-            # voice_tool에 따라 분기 처리
-            if voice_tool == "edge":
-                # Edge TTS 사용
-                edge_voice_info = get_edge_voice_info(voice_name)
-                edge_voice_id = edge_voice_info["id"]
-                rate = parse_rate_for_ssml(edge_voice_info.get("rate"))
-                pitch = parse_pitch_for_ssml(edge_voice_info.get("pitch"))
-                
-                rate_info = f", rate={rate}" if rate else ""
-                pitch_info = f", pitch={pitch}" if pitch else ""
-                print(f"🎙️ 생성 중 [{file_id}] (Edge TTS, voice='{voice_name}' -> '{edge_voice_id}'{rate_info}{pitch_info}): {script[:20]}...")
-                success, duration = generate_edge_tts_audio(script, edge_voice_id, save_path, rate, pitch)
-                
-            elif voice_tool == "azure":
-                # Azure TTS 사용 (SDK 없거나 키가 없으면 Edge TTS로 자동 전환)
-                if not azure_available_and_configured:
-                    if not AZURE_AVAILABLE:
-                        print(f"   ⚠️ Azure SDK가 없어 Edge TTS로 자동 전환합니다.")
-                    else:
-                        print(f"   ⚠️ Azure 키가 없어 Edge TTS로 자동 전환합니다.")
-                    # Edge TTS로 폴백
+                # 일반 TTS 생성 (기존 로직)
+                # voice_tool에 따라 분기 처리
+                if voice_tool == "edge":
+                    # Edge TTS 사용
                     edge_voice_info = get_edge_voice_info(voice_name)
                     edge_voice_id = edge_voice_info["id"]
                     rate = parse_rate_for_ssml(edge_voice_info.get("rate"))
                     pitch = parse_pitch_for_ssml(edge_voice_info.get("pitch"))
-                    
+                
                     rate_info = f", rate={rate}" if rate else ""
                     pitch_info = f", pitch={pitch}" if pitch else ""
                     print(f"🎙️ 생성 중 [{file_id}] (Edge TTS, voice='{voice_name}' -> '{edge_voice_id}'{rate_info}{pitch_info}): {script[:20]}...")
-                    success, duration = generate_edge_tts_audio(script, edge_voice_id, save_path, rate, pitch)
-                else:
-                    # Azure TTS 사용
-                    azure_voice_info = get_azure_voice_info(voice_name)  # voices_azure.txt에서 정보 가져오기
-                    azure_voice_id = azure_voice_info["id"]
-                    style = azure_voice_info.get("style")  # 스타일 정보 추가
-                    rate = parse_rate_for_ssml(azure_voice_info.get("rate"))
-                    pitch = parse_pitch_for_ssml(azure_voice_info.get("pitch"))
-                    
-                    style_info = f", style={style}" if style and style != "General" else ""
-                    rate_info = f", rate={rate}" if rate else ""
-                    pitch_info = f", pitch={pitch}" if pitch else ""
-                    print(f"🎙️ 생성 중 [{file_id}] (Azure TTS, voice='{voice_name}' -> '{azure_voice_id}'{style_info}{rate_info}{pitch_info}): {script[:20]}...")
-                    success, duration = generate_azure_tts_audio(script, azure_voice_id, save_path, rate, pitch, style)
-                    
-                    # Azure TTS 실패 시 Edge TTS로 폴백 (한 번만 시도)
-                    if not success:
-                        print(f"   ⚠️ Azure TTS 실패, Edge TTS로 자동 전환합니다.")
-                        # 실패한 Azure 파일 삭제 시도 (실패해도 계속 진행)
-                        if os.path.exists(save_path):
-                            try:
-                                time.sleep(0.2)
-                                os.remove(save_path)
-                            except:
-                                pass  # 삭제 실패해도 계속 진행
-                        
+                    success, duration = generate_edge_tts_audio(script, edge_voice_id, out.path, rate, pitch)
+                
+                elif voice_tool == "azure":
+                    # Azure TTS 사용 (SDK 없거나 키가 없으면 Edge TTS로 자동 전환)
+                    if not azure_available_and_configured:
+                        if not AZURE_AVAILABLE:
+                            print(f"   ⚠️ Azure SDK가 없어 Edge TTS로 자동 전환합니다.")
+                        else:
+                            print(f"   ⚠️ Azure 키가 없어 Edge TTS로 자동 전환합니다.")
+                        # Edge TTS로 폴백
                         edge_voice_info = get_edge_voice_info(voice_name)
                         edge_voice_id = edge_voice_info["id"]
                         rate = parse_rate_for_ssml(edge_voice_info.get("rate"))
                         pitch = parse_pitch_for_ssml(edge_voice_info.get("pitch"))
-                        
+                    
                         rate_info = f", rate={rate}" if rate else ""
                         pitch_info = f", pitch={pitch}" if pitch else ""
                         print(f"🎙️ 생성 중 [{file_id}] (Edge TTS, voice='{voice_name}' -> '{edge_voice_id}'{rate_info}{pitch_info}): {script[:20]}...")
-                        success, duration = generate_edge_tts_audio(script, edge_voice_id, save_path, rate, pitch)
+                        success, duration = generate_edge_tts_audio(script, edge_voice_id, out.path, rate, pitch)
+                    else:
+                        # Azure TTS 사용
+                        azure_voice_info = get_azure_voice_info(voice_name)  # voices_azure.txt에서 정보 가져오기
+                        azure_voice_id = azure_voice_info["id"]
+                        style = azure_voice_info.get("style")  # 스타일 정보 추가
+                        rate = parse_rate_for_ssml(azure_voice_info.get("rate"))
+                        pitch = parse_pitch_for_ssml(azure_voice_info.get("pitch"))
+                    
+                        style_info = f", style={style}" if style and style != "General" else ""
+                        rate_info = f", rate={rate}" if rate else ""
+                        pitch_info = f", pitch={pitch}" if pitch else ""
+                        print(f"🎙️ 생성 중 [{file_id}] (Azure TTS, voice='{voice_name}' -> '{azure_voice_id}'{style_info}{rate_info}{pitch_info}): {script[:20]}...")
+                        success, duration = generate_azure_tts_audio(script, azure_voice_id, out.path, rate, pitch, style, azure_pool)
+                    
+                        # Azure TTS 실패 시 Edge TTS로 폴백 (한 번만 시도)
+                        if not success:
+                            print(f"   ⚠️ Azure TTS 실패, Edge TTS로 자동 전환합니다.")
+                            # 실패한 Azure 파일 삭제 시도 (실패해도 계속 진행)
+                            if os.path.exists(out.path):
+                                try:
+                                    time.sleep(0.2)
+                                    os.remove(out.path)
+                                except:
+                                    pass  # 삭제 실패해도 계속 진행
+                        
+                            edge_voice_info = get_edge_voice_info(voice_name)
+                            edge_voice_id = edge_voice_info["id"]
+                            rate = parse_rate_for_ssml(edge_voice_info.get("rate"))
+                            pitch = parse_pitch_for_ssml(edge_voice_info.get("pitch"))
+                        
+                            rate_info = f", rate={rate}" if rate else ""
+                            pitch_info = f", pitch={pitch}" if pitch else ""
+                            print(f"🎙️ 생성 중 [{file_id}] (Edge TTS, voice='{voice_name}' -> '{edge_voice_id}'{rate_info}{pitch_info}): {script[:20]}...")
+                            success, duration = generate_edge_tts_audio(script, edge_voice_id, out.path, rate, pitch)
                 
-            elif voice_tool == "elevenlabs":
-                # ElevenLabs 사용
-                if not km.keys:
-                    print(f"   💥 [Row {i+2}] ElevenLabs 키가 없어 이 행은 스킵합니다.")
-                    continue
-
-                # voices_elevenlabs.txt에서 정보 가져오기
-                elevenlabs_voice_info = get_elevenlabs_voice_info(voice_name)
-                voice_id = elevenlabs_voice_info.get("id")
-                model_id = elevenlabs_voice_info.get("model", "eleven_multilingual_v2")
-                rate = parse_rate_for_ssml(elevenlabs_voice_info.get("rate"))
-                pitch = parse_pitch_for_ssml(elevenlabs_voice_info.get("pitch"))
+                elif voice_tool == "elevenlabs":
+                    # ElevenLabs 사용
+                    if not km.keys:
+                        print(f"   💥 [Row {i+2}] ElevenLabs 키가 없어 이 행은 스킵합니다.")
+                        return None
+
+                    # voices_elevenlabs.txt에서 정보 가져오기
+                    elevenlabs_voice_info = get_elevenlabs_voice_info(voice_name)
+                    voice_id = elevenlabs_voice_info.get("id")
+                    model_id = elevenlabs_voice_info.get("model", "eleven_multilingual_v2")
+                    rate = parse_rate_for_ssml(elevenlabs_voice_info.get("rate"))
+                    pitch = parse_pitch_for_ssml(elevenlabs_voice_info.get("pitch"))
                 
-                if not voice_id:
-                    # 기존 방식으로도 시도 (04_Asset/Voice 폴더)
-                    if voice_name:
-                        voice_id = get_voice_id_by_name(voice_name)
-                        if not voice_id:
-                            print(f"   ⚠️ [Row {i+2}] '{voice_name}' 성우를 찾지 못해 이 행은 스킵합니다.")
-                            continue
-                    else:
-                        print(f"   💥 [Row {i+2}] ElevenLabs 사용 시 voice 열이 비어있어 이 행은 스킵합니다.")
-                        continue
+                    if not voice_id:
+                        # 기존 방식으로도 시도 (04_Asset/Voice 폴더)
+                        if voice_name:
+                            voice_id = get_voice_id_by_name(voice_name)
+                            if not voice_id:
+                                print(f"   ⚠️ [Row {i+2}] '{voice_name}' 성우를 찾지 못해 이 행은 스킵합니다.")
+                                return None
+                        else:
+                            print(f"   💥 [Row {i+2}] ElevenLabs 사용 시 voice 열이 비어있어 이 행은 스킵합니다.")
+                            return None
 
-                rate_info = f", rate={rate}" if rate else ""
-                pitch_info = f", pitch={pitch}" if pitch else ""
-                print(f"🎙️ 생성 중 [{file_id}] (ElevenLabs, voice='{voice_name}' -> '{voice_id}'{rate_info}{pitch_info}): {script[:20]}...")
-                success, duration = generate_elevenlabs_audio(script, voice_id, save_path, km, model_id, rate, pitch)
+                    rate_info = f", rate={rate}" if rate else ""
+                    pitch_info = f", pitch={pitch}" if pitch else ""
+                    print(f"🎙️ 생성 중 [{file_id}] (ElevenLabs, voice='{voice_name}' -> '{voice_id}'{rate_info}{pitch_info}): {script[:20]}...")
+                    success, duration = generate_elevenlabs_audio(script, voice_id, out.path, km, model_id, rate, pitch, trim_options)
                 
-            else:
-                # voice_tool이 비어있거나 잘못된 경우: Edge TTS 기본 목소리 사용
-                edge_voice_info = get_edge_voice_info(voice_name)
-                edge_voice_id = edge_voice_info["id"]
-                rate = parse_rate_for_ssml(edge_voice_info.get("rate"))
-                pitch = parse_pitch_for_ssml(edge_voice_info.get("pitch"))
+                else:
+                    # voice_tool이 비어있거나 잘못된 경우: Edge TTS 기본 목소리 사용
+                    edge_voice_info = get_edge_voice_info(voice_name)
+                    edge_voice_id = edge_voice_info["id"]
+                    rate = parse_rate_for_ssml(edge_voice_info.get("rate"))
+                    pitch = parse_pitch_for_ssml(edge_voice_info.get("pitch"))
                 
-                rate_info = f", rate={rate}" if rate else ""
-                pitch_info = f", pitch={pitch}" if pitch else ""
-                print(f"🎙️ 생성 중 [{file_id}] (Edge TTS 기본, voice='{voice_name}' -> '{edge_voice_id}'{rate_info}{pitch_info}): {script[:20]}...")
-                success, duration = generate_edge_tts_audio(script, edge_voice_id, save_path, rate, pitch)
-        
+                    rate_info = f", rate={rate}" if rate else ""
+                    pitch_info = f", pitch={pitch}" if pitch else ""
+                    print(f"🎙️ 생성 중 [{file_id}] (Edge TTS 기본, voice='{voice_name}' -> '{edge_voice_id}'{rate_info}{pitch_info}): {script[:20]}...")
+                    success, duration = generate_edge_tts_audio(script, edge_voice_id, out.path, rate, pitch)
+
+                # 무음 구간 제거 (앞/뒤 + 긴 쉼) → D열에는 잘라낸 뒤의 정확한 길이 기록
+                # ElevenLabs 는 속도/피치 후처리와 같이 generate_elevenlabs_audio 안에서 처리
+                if success and trim_options and voice_tool != "elevenlabs":
+                    duration = trim_voice_file(out.path, trim_options) or duration
+            out.ok = success
+        return out.ok, duration  # 빈 파일 등으로 이름 변경이 안 됐으면 실패
+
+    def handle_result(job, result):
+        """ 결과 집계 (메인 스레드) → 반환값 True 면 중단 """
+        nonlocal success_count, fail_count
+        if result is None:
+            return False
+        success, duration = result
+        file_id = job["file_id"]
         if success:
-            print(f"   ✅ 성공 (길이: {duration:.2f}초)")
+            print(f"   ✅ 성공 [{file_id}] (길이: {duration:.2f}초)")
             success_count += 1
+            mark_ready(stream_dir, "voice", file_id)
             
             # D열에 duration(음성 길이) 자동 채우기 (인덱스 3 = D열)
             if duration > 0:
                 duration_updates.append({
-                    "row": i + 2,  # 1-based + 헤더
+                    "row": job["i"] + 2,  # 1-based + 헤더
                     "col": 4,  # D열 (1-based, 인덱스 3이므로 4)
                     "value": f"{duration:.2f}"
                 })
-        else:
-            print(f"   💥 실패")
-            # ElevenLabs의 경우 키가 다 떨어지면 종료
-            if voice_tool == "elevenlabs" and not km.keys: 
+            return False
+        print(f"   💥 실패 [{file_id}]")
+        fail_count += 1
+        # ElevenLabs의 경우 키가 다 떨어지면 종료
+        return job["voice_tool"] == "elevenlabs" and not km.available()
+
+    def run_voice(job):
+        """ make_voice + 예외는 그 행의 실패로 처리 (한 행 오류로 D열 일괄 업데이트까지 잃지 않도록) """
+        try:
+            return make_voice(job)
+        except Exception as e:
+            print(f"   💥 [Row {job['i'] + 2}] 음성 생성 중 예외: {e}")
+            return False, 0.0
+
+    if workers <= 1 or len(jobs) <= 1:
+        for job in jobs:
+            if handle_result(job, run_voice(job)):
                 break
+    else:
+        # 여러 행 동시 생성 (Azure 는 풀 크기만큼 동시 합성, 배치 실행 시 tts 자원 슬롯으로 전역 제한)
+        print(f"⚙️ {len(jobs)}개 행 동시 생성 (작업 {workers}개)")
+        stopped = False
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(run_voice, job): job for job in jobs}
+            for future in as_completed(futures):
+                if future.cancelled():
+                    continue
+                # 이미 진행 중이던 행은 끝까지 받아서 집계 (D열/스트리밍 알림 누락 방지)
+                if handle_result(futures[future], future.result()) and not stopped:
+                    stopped = True
+                    cancelled = sum(1 for f in futures if f.cancel())
+                    print(f"   🛑 ElevenLabs 키 소진 → 아직 시작하지 않은 {cancelled}개 행 취소")
+
+    if azure_pool:
+        azure_pool.close()
     
     # D열 일괄 업데이트
     if duration_updates:
@@ -1630,15 +1298,21 @@ def main():
             print(f"⚠️ D열 업데이트 실패: {e}")
             
     print(f"\n🎉 작업 완료! (생성된 파일: {success_count}개)")
+    if fail_count:
+        print(f"⚠️ 생성 실패: {fail_count}개")
+        return 1
+    return 0
 
 if __name__ == "__main__":
     try:
-        main()
+        run_main(main, "VoiceMaker 음성 생성", add_voice_arguments)
     except KeyboardInterrupt:
         print("\n\n⚠️ 사용자에 의해 중단되었습니다.")
+        sys.exit(1)
     except Exception as e:
         print(f"\n\n❌ 예상치 못한 오류가 발생했습니다: {e}")
         import traceback
         traceback.print_exc()
+        sys.exit(1)
     finally:
         pass
\ No newline at end of file
@@ -0,0 +1,122 @@
+"""
+음성 속도/피치 후처리 (ffmpeg 한 번 실행)
+VoiceMaker (ElevenLabs - API 에 속도/피치 옵션이 없음) 가 사용
+
+- 예전 방식: pydub 디코딩 → frame_rate 바꿔 속도 조절 (목소리 높낮이도 같이 바뀜) → mp3 재인코딩 → ffprobe 로 길이 재측정
+- 지금 방식: 디코딩/필터/인코딩을 ffmpeg 1회로 처리
+    속도 = atempo (높낮이 유지), 피치 = asetrate + atempo 보정 (길이 유지)
+    ffmpeg 에 rubberband 필터가 있으면 그것을 사용 (음질이 더 좋음)
+- 결과 길이는 ffmpeg 진행 정보(out_time)에서 바로 얻음 → ffprobe 재측정 없음
+- 무음 제거(silence_trim) 구간을 같이 주면 자르기 필터 뒤에 속도/피치를 붙여 같은 실행에서 처리 (인코딩 1번)
+- 출력 규격 (44.1kHz 모노 mp3) 은 silence_trim.encode_args() 그대로 → 무음 제거만 한 파일과 같음
+- ffmpeg_runner 로 실행 → 배치 실행 시 "ffmpeg" 자원 슬롯으로 동시 실행 수 제한, 타이밍 리포트에 기록
+- 속도: "+10%" → 1.1배, 피치: "+4Hz" → 1 semitone (1Hz ≈ 0.25 semitone, 기존 근사 그대로)
+"""
+import os
+import re
+import subprocess
+from functools import lru_cache
+from ffmpeg_runner import run_ffmpeg
+from silence_trim import SAMPLE_RATE, build_trim_filter, encode_args
+
+FFMPEG_CMD = r"C:\YtFactory9\ffmpeg.exe"
+
+STAGE = "VoiceMaker.prosody"
+
+# atempo 한 번에 허용되는 배율 (구버전 ffmpeg 기준) - 벗어나면 여러 번 이어서 적용
+ATEMPO_MIN = 0.5
+ATEMPO_MAX = 2.0
+
+
+def parse_rate(rate):
+    """ "+10%" → 1.1, "-15%" → 0.85, 없음/0 → 1.0 """
+    match = re.fullmatch(r"\s*([+-]?\d+(?:\.\d+)?)\s*%?\s*", str(rate or "0"))
+    if not match:
+        raise ValueError(f"속도 형식이 잘못되었습니다: {rate}")
+    return 1.0 + float(match.group(1)) / 100.0
+
+
+def parse_pitch(pitch):
+    """ "+5Hz" → 1.25 semitones, 없음/0 → 0.0 """
+    match = re.fullmatch(r"\s*([+-]?\d+(?:\.\d+)?)\s*(?:hz)?\s*", str(pitch or "0"), re.IGNORECASE)
+    if not match:
+        raise ValueError(f"피치 형식이 잘못되었습니다: {pitch}")
+    return float(match.group(1)) * 0.25
+
+
+@lru_cache(maxsize=1)
+def has_rubberband():
+    """ 설치된 ffmpeg 에 rubberband 필터가 있는지 (한 번만 확인) """
+    try:
+        result = subprocess.run([FFMPEG_CMD, "-hide_banner", "-filters"], capture_output=True, text=True, errors="ignore")
+        return re.search(r"^\s*\S+\s+rubberband\s", result.stdout, re.MULTILINE) is not None
+    except OSError:
+        return False
+
+
+def atempo_chain(factor):
+    """ 배율 → atempo 필터 목록 (0.5~2.0 범위로 나눠서) """
+    filters = []
+    while factor > ATEMPO_MAX:
+        filters.append(f"atempo={ATEMPO_MAX}")
+        factor /= ATEMPO_MAX
+    while factor < ATEMPO_MIN:
+        filters.append(f"atempo={ATEMPO_MIN}")
+        factor /= ATEMPO_MIN
+    if abs(factor - 1.0) > 1e-4:
+        filters.append(f"atempo={factor:.6f}")
+    return filters
+
+
+def build_prosody_filter(tempo, semitones, rubberband=False):
+    """ 속도 배율 + 피치(semitone) → -af 필터 문자열 (조절할 게 없으면 None) """
+    if abs(tempo - 1.0) < 1e-4 and abs(semitones) < 1e-4:
+        return None
+    pitch_scale = 2 ** (semitones / 12.0)
+    if rubberband:
+        return f"rubberband=tempo={tempo:.6f}:pitch={pitch_scale:.6f}"
+
+    # 샘플레이트를 먼저 고정해야 asetrate 배율 계산에 원본 정보가 필요 없음
+    filters = [f"aresample={SAMPLE_RATE}"]
+    if abs(semitones) >= 1e-4:
+        # 샘플레이트만 바꾸면 높낮이와 속도가 같이 pitch_scale 배 → atempo 로 속도만 되돌림
+        filters += [f"asetrate={SAMPLE_RATE * pitch_scale:.3f}", f"aresample={SAMPLE_RATE}"]
+    filters += atempo_chain(tempo / pitch_scale)
+    return ",".join(filters)
+
+
+def apply_prosody(source_path, save_path, rate=None, pitch=None, label="", trim=None):
+    """
+    속도/피치 적용해서 save_path 에 mp3 저장 (source_path 와 다른 경로)
+    - trim: silence_trim.analyze_silence 결과 (남길 구간, 원본 길이) → 먼저 자르고 속도/피치 적용
+    반환: 결과 길이(초) / 조절할 게 없으면 0.0 (파일 안 만듦) / 실패 시 None
+    """
+    try:
+        tempo = parse_rate(rate)
+        semitones = parse_pitch(pitch)
+    except ValueError as e:
+        print(f"   ⚠️ {e}")
+        return None
+    audio_filter = build_prosody_filter(tempo, semitones, has_rubberband())
+    if audio_filter is None and not trim:
+        return 0.0
+
+    if trim:
+        ranges, total_sec = trim
+        graph = build_trim_filter(ranges, total_sec)
+        if audio_filter:
+            graph += f";[trimmed]{audio_filter}[shaped]"
+        filter_args = ["-filter_complex", graph, "-map", "[shaped]" if audio_filter else "[trimmed]"]
+    else:
+        filter_args = ["-af", audio_filter]
+    cmd = [
+        FFMPEG_CMD, "-y", "-v", "error", "-i", source_path, "-vn",
+        *filter_args, *encode_args(), save_path
+    ]
+    job = run_ffmpeg(cmd, label=label or os.path.basename(save_path), stage=STAGE, check=False, quiet=True)
+    if job["returncode"] != 0:
+        print(f"   ⚠️ 속도/피치 조절 실패: {job.get('stderr', '').strip()[-200:]}")
+        return None
+    if audio_filter:
+        print(f"   🎵 속도 {tempo:.2f}배 / 피치 {semitones:+.2f} semitones ({job['wall_sec']:.2f}초 소요)")
+    return job["media_sec"]
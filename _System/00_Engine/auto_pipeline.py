@@ -1,54 +1,117 @@
 """
-자동 파이프라인 실행 스크립트
-이미지메이커 -> 켄번 -> 보이스메이커 -> 머지파이 순서대로 실행
-시트 2번으로 전체 파이프라인 실행 후, 시트 3번으로도 자동 실행
-1시간 후에 시작
+자동 파이프라인 실행 스크립트 (의존성 그래프 기반)
+이미지메이커 -> 켄번 ─┐
+보이스메이커 ─────────┴-> 머지파이
+
+- 각 엔진은 --sheet / --channel / --no-pause 인자로 실행 (stdin 자동 입력 없음)
+- 의존 단계가 모두 성공한 단계부터 바로 시작, 서로 독립인 단계는 동시에 실행
+  (보이스메이커는 이미지메이커/켄번과 병렬)
+- 앞 단계가 실패하면 그 뒤에 걸린 단계만 건너뜀 (독립 단계는 계속 진행)
+- 단계별 종료 코드/소요 시간을 출력하고 JSON 리포트로 저장
+- --stream: 모든 단계를 동시에 띄우고 그룹(GID) 단위로 이어달리기 (stream_queue 참고)
+  → 이미지 1장이 나오면 바로 켄번, 켄번+음성이 준비된 그룹은 바로 클립 렌더링,
+    모든 클립이 준비되면 최종 병합 (완성 시간 ≈ 가장 느린 그룹 한 줄)
+- 배치 모드 (--max-sheets N): 여러 채널/회차 시트를 동시에 실행, 엔진 프로세스 전체가
+  ffmpeg 인코딩 / TTS 요청 / 이미지 요청 동시 실행 상한을 나눠 씀 (resource_slots 참고)
+
+사용법:
+  python auto_pipeline.py                      → 1시간 후 시트 2번, 3번 순서로 실행 (기존 동작)
+  python auto_pipeline.py Ch01_19go Ch02_3go   → 시트 이름(또는 목록 번호) 지정
+  python auto_pipeline.py Ch01_19go --delay-min 0
+  python auto_pipeline.py Ch01_19go --delay-min 0 --stream
+  python auto_pipeline.py --sheets-file 오늘밤.txt --max-sheets 3 --max-ffmpeg 2 --max-tts 4 --max-image 2
+  python auto_pipeline.py Ch01_19go --delay-min 0 --sheet-backend xlsx:C:\Test\book.xlsx   (오프라인 부하 테스트)
 """
 import os
 import sys
-import subprocess
+import json
 import time
+import argparse
+import threading
+import shutil
+import subprocess
 from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from engine_cli import resolve_channel
+from stream_queue import mark_stage_done
+from resource_slots import SLOT_DIR_ENV
 
 # 현재 스크립트의 디렉토리
 CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
 
-# 실행할 스크립트 목록 (순서대로)
-SCRIPTS = [
+# 실행 단계 (deps: 먼저 성공해야 하는 단계 key 목록)
+STAGES = [
     {
+        "key": "image",
         "name": "이미지메이커",
         "file": "ImageMaker.py",
-        "description": "이미지 생성"
+        "description": "이미지 생성",
+        "deps": []
     },
     {
+        "key": "kenburns",
         "name": "켄번",
         "file": "KenBurns.py",
-        "description": "켄번 효과 적용"
+        "description": "켄번 효과 적용",
+        "deps": ["image"]
     },
     {
+        "key": "voice",
         "name": "보이스메이커",
         "file": "VoiceMaker.py",
-        "description": "음성 생성"
+        "description": "음성 생성",
+        "deps": []
     },
     {
+        "key": "mergy",
         "name": "머지파이",
         "file": "Mergy.py",
-        "description": "최종 영상 조립"
+        "description": "최종 영상 조립",
+        "deps": ["kenburns", "voice"]
     }
 ]
 
+# 인자가 없을 때 실행할 시트 (목록 번호) / 시작 전 대기 시간 (기존 동작)
+DEFAULT_SHEETS = ["2", "3"]
+DEFAULT_DELAY_MIN = 60
+
+# 스트리밍 모드 표시 파일 폴더 (실행마다 하위 폴더 생성 후 삭제)
+STREAM_ROOT = os.path.join(CURRENT_DIR, "_stream")
+
+# 자원별 전역 동시 실행 상한 (모든 시트/엔진 프로세스 합계, 0 = 제한 없음)
+DEFAULT_CAPS = {
+    "ffmpeg": 2,   # libx264 인코딩 1건이 이미 코어 대부분을 사용
+    "tts": 4,      # ElevenLabs/Azure/Edge 동시 요청
+    "image": 2     # Gemini/FLUX/Fal 동시 요청
+}
+SLOT_ROOT = os.path.join(CURRENT_DIR, "_slots")
+
+# 파이프라인 안의 엔진이 시트 미러를 그대로 쓰는 시간(초) (sheet_mirror 참고)
+# 0 = 매번 스프레드시트 수정 시각(lastUpdateTime)만 확인 → 시트 수정이 바로 반영됨, 바뀐 게 없으면 값은 받지 않음
+# 환경변수 YTF_SHEET_MAX_AGE 로 늘릴 수 있음 (그 시간 동안은 시트 수정이 무시됨)
+SHEET_MAX_AGE_SEC = 0
+
+# 여러 단계 출력이 섞이지 않도록 줄 단위로 출력
+_PRINT_LOCK = threading.Lock()
+
+
+def log(message):
+    with _PRINT_LOCK:
+        print(message, flush=True)
+
+
 def wait_until_time(target_time):
     """지정된 시간까지 대기"""
     current_time = datetime.now()
     wait_seconds = (target_time - current_time).total_seconds()
-    
+
     if wait_seconds <= 0:
         print("⚠️ 지정된 시간이 이미 지났습니다. 즉시 시작합니다.")
         return
-    
+
     print(f"⏰ {target_time.strftime('%Y-%m-%d %H:%M:%S')}까지 대기 중...")
     print(f"   남은 시간: {timedelta(seconds=int(wait_seconds))}")
-    
+
     # 1분 단위로 남은 시간 출력
     while wait_seconds > 0:
         if wait_seconds > 60:
@@ -59,189 +122,329 @@ def wait_until_time(target_time):
         else:
             time.sleep(wait_seconds)
             wait_seconds = 0
-    
+
     print("✅ 시작 시간 도달! 파이프라인을 시작합니다.\n")
 
-def run_script(script_info, sheet_choice="2"):
-    """스크립트 실행 (자동으로 시트 선택 입력)"""
-    script_name = script_info["name"]
-    script_file = script_info["file"]
-    script_path = os.path.join(CURRENT_DIR, script_file)
-    
+
+def validate_stages(stages):
+    """
+    단계 그래프 검사 (없는 의존 단계 / 순환 의존)
+    반환: 실행 가능한 순서의 key 목록
+    """
+    keys = {s["key"] for s in stages}
+    for stage in stages:
+        for dep in stage["deps"]:
+            if dep not in keys:
+                raise ValueError(f"[{stage['key']}] 알 수 없는 의존 단계: {dep}")
+
+    order = []
+    remaining = {s["key"]: set(s["deps"]) for s in stages}
+    while remaining:
+        ready = [k for k, deps in remaining.items() if deps <= set(order)]
+        if not ready:
+            raise ValueError(f"순환 의존이 있습니다: {', '.join(remaining)}")
+        for key in ready:
+            order.append(key)
+            del remaining[key]
+    return order
+
+
+def run_stage(stage, sheet_name, channel=None, stream_dir=None):
+    """
+    엔진 1개를 인자 전달 방식으로 실행 (출력은 [단계명] 접두어로 실시간 중계)
+    반환: 실행 기록 dict (returncode, wall_sec, status ...)
+    """
+    script_path = os.path.join(CURRENT_DIR, stage["file"])
+    result = {
+        "key": stage["key"],
+        "name": stage["name"],
+        "file": stage["file"],
+        "started": datetime.now().isoformat(timespec="seconds"),
+        "wall_sec": 0.0,
+        "returncode": None,
+        "status": "failed",
+    }
+
+    tag = f"{sheet_name}·{stage['name']}"
     if not os.path.exists(script_path):
-        print(f"❌ 스크립트 파일을 찾을 수 없습니다: {script_path}")
-        return False
-    
-    print("=" * 60)
-    print(f"🚀 [{script_name}] 실행 시작: {script_info['description']}")
-    print("=" * 60)
-    print(f"   시트 선택: {sheet_choice}번 (자동 입력)")
-    print("=" * 60)
-    
+        log(f"❌ [{tag}] 스크립트 파일을 찾을 수 없습니다: {script_path}")
+        return result
+
+    cmd = [sys.executable, "-u", script_path, "--sheet", str(sheet_name), "--no-pause"]
+    if channel:
+        cmd += ["--channel", channel]
+    if stream_dir:
+        cmd += ["--stream-dir", stream_dir]
+
+    log(f"🚀 [{tag}] 실행 시작: {stage['description']}")
+    started = time.time()
     try:
-        import threading
-        
-        # stdout을 실시간으로 출력하기 위한 스레드
-        def read_output(pipe):
-            """stdout을 읽어서 실시간 출력"""
-            try:
-                for line in iter(pipe.readline, ''):
-                    if line:
-                        print(line, end='')
-                pipe.close()
-            except:
-                pass
-        
-        # stdin에 입력을 전달하기 위한 스레드
-        def write_input(pipe, input_value):
-            """stdin에 입력 전달"""
-            try:
-                # 약간의 지연 후 입력 전달 (스크립트가 input()을 호출할 때까지 대기)
-                time.sleep(2)  # 스크립트가 시작될 때까지 대기
-                # 여러 번 전달하여 안전하게 처리
-                for _ in range(5):
-                    pipe.write(f"{input_value}\n")
-                    pipe.flush()
-                    time.sleep(0.5)
-            except:
-                pass
-        
-        # Python 스크립트 실행
+        # 엔진 출력(이모지 포함)을 파이프로 받기 위해 UTF-8 고정
+        env = dict(os.environ, PYTHONIOENCODING="utf-8")
+        env.setdefault("YTF_SHEET_MAX_AGE", str(SHEET_MAX_AGE_SEC))
         process = subprocess.Popen(
-            [sys.executable, script_path],
-            stdin=subprocess.PIPE,
+            cmd,
+            stdin=subprocess.DEVNULL,
             stdout=subprocess.PIPE,
             stderr=subprocess.STDOUT,
             text=True,
+            encoding="utf-8",
+            errors="replace",
             bufsize=1,
-            universal_newlines=True,
-            cwd=CURRENT_DIR
+            cwd=CURRENT_DIR,
+            env=env
         )
-        
-        # stdout 읽기 스레드 시작
-        output_thread = threading.Thread(
-            target=read_output,
-            args=(process.stdout,),
-            daemon=True
-        )
-        output_thread.start()
-        
-        # stdin에 입력 전달 스레드 시작
-        input_thread = threading.Thread(
-            target=write_input,
-            args=(process.stdin, sheet_choice),
-            daemon=True
-        )
-        input_thread.start()
-        
-        # 프로세스 완료 대기
-        return_code = process.wait()
-        
-        # 스레드 종료 대기
-        output_thread.join(timeout=2)
-        input_thread.join(timeout=1)
-        
-        # stdin 닫기
-        try:
-            process.stdin.close()
-        except:
-            pass
-        
-        if return_code == 0:
-            print(f"\n✅ [{script_name}] 완료!")
-            return True
-        else:
-            print(f"\n❌ [{script_name}] 실패 (종료 코드: {return_code})")
-            return False
-            
+        for line in iter(process.stdout.readline, ''):
+            line = line.rstrip()
+            if line:
+                log(f"[{tag}] {line}")
+        process.stdout.close()
+        result["returncode"] = process.wait()
     except Exception as e:
-        print(f"❌ [{script_name}] 실행 중 오류 발생: {e}")
-        import traceback
-        traceback.print_exc()
-        return False
+        log(f"❌ [{tag}] 실행 중 오류 발생: {e}")
 
-def run_pipeline_for_sheet(sheet_number):
-    """특정 시트 번호로 전체 파이프라인 실행"""
-    print("\n" + "=" * 60)
-    print(f"📊 시트 {sheet_number}번 파이프라인 시작")
-    print("=" * 60)
-    
-    # 각 스크립트 순차 실행
-    for i, script in enumerate(SCRIPTS, 1):
-        print(f"\n{'='*60}")
-        print(f"📋 [시트 {sheet_number}번] [{i}/{len(SCRIPTS)}] {script['name']} 실행 중...")
-        print(f"{'='*60}\n")
-        
-        success = run_script(script, sheet_choice=str(sheet_number))
-        
-        if not success:
-            print(f"\n❌ [{script['name']}] 실패로 인해 파이프라인이 중단됩니다.")
-            print("다음 단계를 계속 진행하시겠습니까? (y/n): ", end="")
+    result["wall_sec"] = round(time.time() - started, 3)
+    result["status"] = "success" if result["returncode"] == 0 else "failed"
+    if result["status"] == "success":
+        log(f"✅ [{tag}] 완료! ({result['wall_sec']:.1f}초)")
+    else:
+        log(f"❌ [{tag}] 실패 (종료 코드: {result['returncode']}, {result['wall_sec']:.1f}초)")
+    return result
+
+
+def run_dag(stages, sheet_name, channel=None, stream_dir=None):
+    """
+    의존성 그래프대로 단계 실행 (준비된 단계는 동시에 실행)
+    - stream_dir 이 있으면 모든 단계를 바로 시작하고, 단계가 끝날 때마다 종료 표시를 남김
+      (아래 단계는 그룹 단위 표시 파일을 보고 진행하므로 의존 단계를 기다리지 않음)
+    반환: {key: 실행 기록} (실행 순서와 무관하게 STAGES 순서)
+    """
+    validate_stages(stages)
+    by_key = {s["key"]: s for s in stages}
+    pending = [s["key"] for s in stages]
+    results = {}
+    running = {}
+
+    with ThreadPoolExecutor(max_workers=len(stages)) as executor:
+        while pending or running:
+            for key in list(pending):
+                deps = by_key[key]["deps"]
+                if stream_dir:
+                    running[executor.submit(run_stage, by_key[key], sheet_name, channel, stream_dir)] = key
+                    pending.remove(key)
+                elif any(dep in results and results[dep]["status"] != "success" for dep in deps):
+                    # 앞 단계 실패 → 이 단계는 건너뜀 (뒤에 걸린 단계도 연쇄적으로 건너뜀)
+                    failed_deps = [d for d in deps if d in results and results[d]["status"] != "success"]
+                    log(f"⏭️ [{sheet_name}·{by_key[key]['name']}] 건너뜀 (앞 단계 실패: {', '.join(by_key[d]['name'] for d in failed_deps)})")
+                    results[key] = {
+                        "key": key, "name": by_key[key]["name"], "file": by_key[key]["file"],
+                        "started": None, "wall_sec": 0.0, "returncode": None, "status": "skipped",
+                    }
+                    pending.remove(key)
+                elif all(dep in results for dep in deps):
+                    running[executor.submit(run_stage, by_key[key], sheet_name, channel)] = key
+                    pending.remove(key)
+
+            if not running:
+                continue
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                key = running.pop(future)
+                results[key] = future.result()
+                if stream_dir:
+                    mark_stage_done(stream_dir, key, results[key]["returncode"])
+
+    return {s["key"]: results[s["key"]] for s in stages}
+
+
+def write_pipeline_report(sheet_name, channel, results, wall_sec, mode="dag"):
+    """
+    파이프라인 실행 리포트 저장
+    - 채널을 알면 시트 출력 폴더의 Reports (ffmpeg 리포트와 같은 위치), 모르면 엔진 폴더의 Reports
+    """
+    if channel:
+        report_dir = os.path.join(f"C:\\YtFactory9\\{channel}\\03_Output\\{sheet_name}", "Reports")
+    else:
+        report_dir = os.path.join(CURRENT_DIR, "Reports")
+    try:
+        if not os.path.exists(report_dir):
+            os.makedirs(report_dir)
+        report_path = os.path.join(report_dir, f"Pipeline_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+        with open(report_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "sheet": sheet_name,
+                "channel": channel,
+                "mode": mode,
+                "created": datetime.now().isoformat(timespec="seconds"),
+                "wall_sec": round(wall_sec, 3),
+                "stages": list(results.values()),
+            }, f, ensure_ascii=False, indent=2)
+        return report_path
+    except Exception as e:
+        print(f"⚠️ 리포트 저장 실패: {e}")
+        return None
+
+
+def run_pipeline_for_sheet(sheet_name, channel=None, stream=False):
+    """특정 시트로 전체 파이프라인 실행 (모든 단계 성공 시 True)"""
+    log("\n" + "=" * 60 + f"\n📊 시트 {sheet_name} 파이프라인 시작" + (" (스트리밍)" if stream else "") + "\n" + "=" * 60)
+
+    channel = resolve_channel(str(sheet_name), channel)
+    stream_dir = None
+    if stream:
+        stream_dir = os.path.join(STREAM_ROOT, f"{sheet_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+        os.makedirs(stream_dir)
+
+    started = time.time()
+    try:
+        results = run_dag(STAGES, sheet_name, channel, stream_dir)
+    finally:
+        if stream_dir:
+            shutil.rmtree(stream_dir, ignore_errors=True)
+    wall_sec = time.time() - started
+
+    # 단계별 결과 요약 (동시 실행 중인 다른 시트 출력과 섞이지 않게 한 번에 출력)
+    icons = {"success": "✅", "failed": "❌", "skipped": "⏭️"}
+    lines = ["\n" + "=" * 60, f"📋 [시트 {sheet_name}] 단계별 결과 (총 {wall_sec:.1f}초)"]
+    for result in results.values():
+        code = result["returncode"] if result["returncode"] is not None else "-"
+        lines.append(f"   {icons[result['status']]} {result['name']}: 종료 코드 {code} | {result['wall_sec']:.1f}초")
+    lines.append("=" * 60)
+
+    report_path = write_pipeline_report(sheet_name, channel, results, wall_sec, "stream" if stream else "dag")
+    if report_path:
+        lines.append(f"📝 파이프라인 리포트: {report_path}")
+
+    success = all(r["status"] == "success" for r in results.values())
+    if success:
+        lines.append(f"\n✅ 시트 {sheet_name} 파이프라인 완료!")
+    log("\n".join(lines))
+    return success
+
+
+def setup_resource_slots(caps):
+    """
+    배치 실행용 자원 슬롯 폴더 생성 + 환경변수 설정 (엔진 프로세스가 그대로 물려받음)
+    반환: 슬롯 폴더 (실행 후 삭제)
+    """
+    slot_dir = os.path.join(SLOT_ROOT, datetime.now().strftime('%Y%m%d_%H%M%S'))
+    os.makedirs(slot_dir, exist_ok=True)
+    os.environ[SLOT_DIR_ENV] = slot_dir
+    for resource, cap in caps.items():
+        os.environ[f"YTF_MAX_{resource.upper()}"] = str(cap)
+    return slot_dir
+
+
+def load_sheet_list(sheets, sheets_file=None):
+    """ 명령줄 시트 + 시트 목록 파일(한 줄에 하나, # 주석) → 중복 제거된 순서 목록 """
+    names = list(sheets)
+    if sheets_file:
+        with open(sheets_file, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.split("#", 1)[0].strip()
+                if line:
+                    names.append(line)
+    unique = []
+    for name in names:
+        if name not in unique:
+            unique.append(name)
+    return unique
+
+
+def run_batch(sheet_names, channel, stream, max_sheets):
+    """
+    여러 시트를 최대 max_sheets 개까지 동시에 실행 (한 시트가 실패해도 나머지는 계속)
+    반환: {시트: 성공 여부}
+    """
+    outcomes = {}
+    with ThreadPoolExecutor(max_workers=max_sheets) as executor:
+        futures = {executor.submit(run_pipeline_for_sheet, name, channel, stream): name for name in sheet_names}
+        for future in futures:
+            name = futures[future]
             try:
-                choice = input().strip().lower()
-                if choice != 'y':
-                    print("파이프라인을 중단합니다.")
-                    return False
-            except:
-                print("파이프라인을 중단합니다.")
-                return False
-        
-        # 다음 스크립트 실행 전 잠시 대기 (선택사항)
-        if i < len(SCRIPTS):
-            print(f"\n⏳ 다음 단계로 진행하기 전 3초 대기...")
-            time.sleep(3)
-    
-    print(f"\n✅ 시트 {sheet_number}번 파이프라인 완료!")
-    return True
+                outcomes[name] = future.result()
+            except Exception as e:
+                log(f"❌ [시트 {name}] 파이프라인 오류: {e}")
+                outcomes[name] = False
+    return outcomes
+
 
 def main():
     """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description="자동 파이프라인 (의존성 그래프 실행)")
+    parser.add_argument("sheets", nargs="*",
+                        help="시트 이름(예: Ch01_19go) 또는 목록 번호 (없으면 시트 2번, 3번)")
+    parser.add_argument("--sheets-file", help="실행할 시트 목록 파일 (한 줄에 시트 하나)")
+    parser.add_argument("--max-sheets", type=int, default=1,
+                        help="동시에 실행할 시트 수 (기본 1 = 순서대로, 실패 시 중단)")
+    for resource, cap in DEFAULT_CAPS.items():
+        parser.add_argument(f"--max-{resource}", type=int, default=cap,
+                            help=f"{resource} 전역 동시 실행 상한 (기본 {cap}, 0 = 제한 없음)")
+    parser.add_argument("--channel", help="채널 ID (예: Ch01), 없으면 시트 이름에서 추출")
+    parser.add_argument("--delay-min", type=float, default=DEFAULT_DELAY_MIN,
+                        help=f"시작 전 대기 시간 (분, 기본 {DEFAULT_DELAY_MIN})")
+    parser.add_argument("--stream", action="store_true",
+                        help="그룹 단위 스트리밍 실행 (모든 단계를 동시에 띄우고 준비된 그룹부터 진행)")
+    parser.add_argument("--sheet-backend",
+                        help="시트 백엔드 (google / csv:폴더 / xlsx:파일 / sqlite:파일, 엔진 프로세스가 물려받음)")
+    args = parser.parse_args()
+    if args.sheet_backend:
+        os.environ["YTF_SHEET_BACKEND"] = args.sheet_backend
+    sheet_names = load_sheet_list(args.sheets, args.sheets_file) or list(DEFAULT_SHEETS)
+    caps = {resource: getattr(args, f"max_{resource}") for resource in DEFAULT_CAPS}
+
+    validate_stages(STAGES)
+
     print("=" * 60)
     print("🎬 자동 파이프라인 실행 스크립트")
     print("=" * 60)
-    print("\n실행 순서:")
-    for i, script in enumerate(SCRIPTS, 1):
-        print(f"  {i}. {script['name']} - {script['description']}")
-    print(f"\n시트 2번으로 전체 파이프라인 실행")
-    print(f"→ 완료 후 시트 3번으로도 자동 실행")
-    
-    # 1시간 후 시간 계산
-    start_time = datetime.now() + timedelta(hours=1)
+    print("\n실행 단계:")
+    for i, stage in enumerate(STAGES, 1):
+        deps = ", ".join(s["name"] for s in STAGES if s["key"] in stage["deps"]) or "없음 (바로 시작)"
+        print(f"  {i}. {stage['name']} - {stage['description']} (선행: {deps})")
+    if args.max_sheets > 1:
+        print(f"\n시트 ({len(sheet_names)}개, 동시 {args.max_sheets}개): {', '.join(sheet_names)}")
+    else:
+        print(f"\n시트: {' → '.join(sheet_names)}")
+    print(f"자원 상한: " + ", ".join(f"{r}={c or '제한 없음'}" for r, c in caps.items()))
+
+    # 시작 시간 계산
+    start_time = datetime.now() + timedelta(minutes=args.delay_min)
     print(f"\n⏰ 시작 시간: {start_time.strftime('%Y-%m-%d %H:%M:%S')}")
     print(f"   현재 시간: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    
-    # 1시간 대기
+
+    # 대기
     wait_until_time(start_time)
-    
-    # 시트 2번으로 전체 파이프라인 실행
-    success_2 = run_pipeline_for_sheet(2)
-    
-    if not success_2:
-        print("\n❌ 시트 2번 파이프라인이 실패하여 중단됩니다.")
-        return
-    
-    # 시트 2번 완료 후 잠시 대기
-    print("\n" + "=" * 60)
-    print("⏳ 시트 3번 파이프라인 시작 전 5초 대기...")
-    print("=" * 60)
-    time.sleep(5)
-    
-    # 시트 3번으로 전체 파이프라인 실행
-    success_3 = run_pipeline_for_sheet(3)
-    
-    if not success_3:
-        print("\n❌ 시트 3번 파이프라인이 실패했습니다.")
-        return
-    
+
+    slot_dir = setup_resource_slots(caps)
+    try:
+        if args.max_sheets > 1:
+            outcomes = run_batch(sheet_names, args.channel, args.stream, args.max_sheets)
+        else:
+            outcomes = {}
+            for sheet_name in sheet_names:
+                outcomes[sheet_name] = run_pipeline_for_sheet(sheet_name, args.channel, args.stream)
+                if not outcomes[sheet_name]:
+                    print(f"\n❌ 시트 {sheet_name} 파이프라인이 실패하여 중단됩니다.")
+                    return 1
+    finally:
+        shutil.rmtree(slot_dir, ignore_errors=True)
+
     print("\n" + "=" * 60)
-    print("🎉 모든 파이프라인 작업이 완료되었습니다!")
-    print("   - 시트 2번: 완료 ✅")
-    print("   - 시트 3번: 완료 ✅")
+    if all(outcomes.values()):
+        print("🎉 모든 파이프라인 작업이 완료되었습니다!")
+    else:
+        print("⚠️ 일부 시트 파이프라인이 실패했습니다.")
+    for sheet_name, ok in outcomes.items():
+        print(f"   - 시트 {sheet_name}: {'완료 ✅' if ok else '실패 ❌'}")
     print("=" * 60)
+    return 0 if all(outcomes.values()) else 1
 
 if __name__ == "__main__":
+    exit_code = 1
     try:
-        main()
+        exit_code = main()
     except KeyboardInterrupt:
         print("\n\n⚠️ 사용자에 의해 중단되었습니다.")
     except Exception as e:
@@ -250,4 +453,4 @@ if __name__ == "__main__":
         traceback.print_exc()
     finally:
         input("\n엔터 키를 누르면 종료합니다...")
-
+    sys.exit(exit_code)
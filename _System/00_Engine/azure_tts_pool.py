@@ -0,0 +1,100 @@
+"""
+Azure 음성 합성기 풀 (연결 재사용 + 동시 합성)
+VoiceMaker 가 사용
+
+- 예전: 행마다 키 파일 재검색 + SpeechConfig / AudioOutputConfig / SpeechSynthesizer 새로 생성
+  → 행마다 연결/인증 지연이 붙음
+- 지금: 키/리전은 실행 시작 때 한 번만 읽고, 목소리별 합성기를 만들어 두고 재사용
+    합성기를 만들 때 연결을 미리 열어 둠 (warm) → 행당 지연 = 합성 시간만
+- 출력은 파일 대신 메모리 (result.audio_data, mp3) → 호출한 쪽이 직접 파일로 저장
+- 합성기 1개는 한 번에 1건만 처리 → 빌려 쓰고 반납, 풀 전체에서 최대 size 건까지 동시 합성
+- 오류가 난 합성기는 반납하지 않고 버림 (다음 요청 때 새로 만듦)
+"""
+import threading
+from contextlib import contextmanager
+
+try:
+    import azure.cognitiveservices.speech as speechsdk
+    AZURE_AVAILABLE = True
+except ImportError:
+    AZURE_AVAILABLE = False
+
+DEFAULT_REGION = "koreacentral"
+# mp3 로 받아서 그대로 저장 (Voice/{ID}.mp3)
+OUTPUT_FORMAT_NAME = "Audio24Khz96KBitRateMonoMp3"
+
+
+class AzureSynthesizerPool:
+    """
+    (목소리, 리전)별 SpeechSynthesizer 풀
+    - with pool.acquire(voice_id) as synthesizer: synthesizer.speak_text_async(...).get()
+    - warm(voice_ids): 쓸 목소리의 합성기를 미리 만들고 연결을 열어 둠
+    """
+
+    def __init__(self, key, region=None, size=1):
+        self.key = key
+        self.region = region or DEFAULT_REGION
+        self.size = max(1, int(size))
+        self._slots = threading.BoundedSemaphore(self.size)
+        self._lock = threading.Lock()
+        self._idle = {}  # {목소리: [(합성기, 연결), ...]}
+
+    def _create(self, voice_id):
+        """ 합성기 1개 생성 + 연결 미리 열기 """
+        speech_config = speechsdk.SpeechConfig(subscription=self.key, region=self.region)
+        if voice_id:
+            speech_config.speech_synthesis_voice_name = voice_id
+        speech_config.set_speech_synthesis_output_format(
+            getattr(speechsdk.SpeechSynthesisOutputFormat, OUTPUT_FORMAT_NAME)
+        )
+        # audio_config=None → 스피커/파일로 내보내지 않고 result.audio_data 로만 받음
+        synthesizer = speechsdk.SpeechSynthesizer(speech_config=speech_config, audio_config=None)
+        connection = speechsdk.Connection.from_speech_synthesizer(synthesizer)
+        try:
+            connection.open(True)
+        except Exception as e:
+            # 미리 연결 실패는 치명적이지 않음 (첫 합성 때 SDK 가 다시 연결)
+            print(f"   ⚠️ Azure 연결 미리 열기 실패 ({voice_id}): {e}")
+        print(f"   🔌 Azure 합성기 준비: voice={voice_id or '(기본)'}, region={self.region}")
+        return synthesizer, connection
+
+    def warm(self, voice_ids):
+        """ 목소리별 합성기 1개씩 미리 생성 (이미 있으면 건너뜀) """
+        for voice_id in voice_ids:
+            with self._lock:
+                if self._idle.get(voice_id):
+                    continue
+            entry = self._create(voice_id)
+            with self._lock:
+                self._idle.setdefault(voice_id, []).append(entry)
+
+    @contextmanager
+    def acquire(self, voice_id):
+        """ 합성기 빌리기 (동시 사용 수가 size 면 반납될 때까지 대기) """
+        with self._slots:
+            with self._lock:
+                idle = self._idle.get(voice_id)
+                entry = idle.pop() if idle else None
+            if entry is None:
+                entry = self._create(voice_id)
+            try:
+                yield entry[0]
+            except Exception:
+                self._discard(entry)
+                raise
+            with self._lock:
+                self._idle.setdefault(voice_id, []).append(entry)
+
+    def _discard(self, entry):
+        try:
+            entry[1].close()
+        except Exception:
+            pass
+
+    def close(self):
+        """ 열어 둔 연결 모두 닫기 """
+        with self._lock:
+            entries = [entry for idle in self._idle.values() for entry in idle]
+            self._idle = {}
+        for entry in entries:
+            self._discard(entry)
@@ -0,0 +1,285 @@
+"""
+엔드투엔드 처리량 벤치마크 (가짜 API 서버 + 로컬 시트)
+이미지메이커 -> 켄번 / 보이스메이커 -> 머지파이 를 합성 시트(50 / 200 / 1000행)로 실행해 단계별 성능 측정
+
+- API 는 fake_providers 가짜 서버로 보냄 (provider_endpoints 의 YTF_PROVIDER_BASE + 가짜 키) → 크레딧 소모 없음
+- 시트는 로컬 CSV 백엔드 (sheet_backend, 구글 계정 불필요)
+- 단계는 의존 순서대로 하나씩 실행 (단계별 수치가 서로 섞이지 않게)
+- 단계별 측정
+    처리량  : 성공한 결과 파일 수 / 단계 소요 시간
+    p50/p95 : 결과 파일 1개당 생성 시간 (각 엔진의 실행 매니페스트 duration_sec, run_manifest 참고)
+    CPU     : 엔진 프로세스 + 자식(ffmpeg) CPU 시간, 평균 사용 코어 수
+              (윈도우는 psutil 이 있을 때만 측정, 짧게 끝난 자식 프로세스는 빠질 수 있음)
+- 결과: 표 출력 + _benchmark/{시각}/report.json (엔진 로그도 같은 폴더)
+- 합성 시트 출력 폴더(C:\\YtFactory9\\{채널}\\03_Output\\{시트})는 실행 전에 비우고, --keep 이 없으면 끝나고 삭제
+
+사용법:
+  python benchmark.py                                         → 50 / 200 / 1000행, 전 단계
+  python benchmark.py --rows 50 --stages image voice --latency-scale 0.1
+  python benchmark.py --rows 200 --error 429=0.05 --imagetype flux
+  python benchmark.py --rows 50 --style 동화2D일러스트          (F열 스타일 → Gemini 프롬프트 생성까지 포함)
+"""
+import os
+import sys
+import glob
+import json
+import math
+import time
+import shutil
+import argparse
+import subprocess
+from datetime import datetime
+from auto_pipeline import STAGES, validate_stages
+from sheet_backend import SHEET_COLUMNS, write_book
+from run_manifest import RunManifest, MANIFEST_PREFIX
+from provider_endpoints import PROVIDER_BASE_ENV
+from fake_providers import add_fake_arguments, build_fake, start_server, FAKE_PROMPTS
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(os.path.dirname(CURRENT_DIR))
+BENCH_ROOT = os.path.join(CURRENT_DIR, "_benchmark")
+
+DEFAULT_ROWS = [50, 200, 1000]
+ROWS_PER_GROUP = 4  # 이미지 1장을 쓰는 행 수 (C열 그룹 크기)
+
+# 단계 → 결과 파일을 기록하는 매니페스트 이름
+STAGE_MANIFESTS = {"image": "image", "kenburns": "kenburns", "voice": "voice", "mergy": "clip"}
+
+CPU_SAMPLE_SEC = 0.5
+
+SCRIPT_SAMPLES = [
+    "오늘은 조용한 바닷가 마을에서 있었던 작은 이야기를 들려드리겠습니다.",
+    "할아버지는 매일 아침 같은 시간에 창가에 앉아 편지를 읽으셨습니다.",
+    "그날 밤 도시에는 비가 내렸고, 거리의 불빛이 물웅덩이에 번졌습니다.",
+    "부엌에서는 따뜻한 국이 끓고 있었고, 아이들은 식탁에 모여 앉았습니다.",
+    "누군가 문을 두드렸습니다.",
+]
+
+
+def fake_key_env(base_url):
+    """ 가짜 서버 주소 + 엔진 키 형식에 맞는 가짜 키 (키 파일 없이 실행) """
+    return {
+        PROVIDER_BASE_ENV: base_url,
+        "GEMINI_API_KEYS": ",".join("AIza" + f"FakeBenchKey{i:02d}".ljust(35, "0") for i in range(4)),
+        "ELEVENLABS_API_KEYS": ",".join("sk_" + f"fakebenchkey{i:02d}".ljust(32, "0") for i in range(4)),
+        "DEEPINFRA_API_KEY": "fake-deepinfra-benchmark-key",
+        "FAL_KEY": "fake-fal-benchmark-key",
+    }
+
+
+def synthetic_rows(count, imagetype, voice_tool, style):
+    """ 합성 시트 (헤더 + count 행, ROWS_PER_GROUP 행마다 이미지 그룹 1개) """
+    rows = [list(SHEET_COLUMNS)]
+    for i in range(count):
+        row = [""] * len(SHEET_COLUMNS)
+        row[0] = str(i + 1)
+        row[1] = SCRIPT_SAMPLES[i % len(SCRIPT_SAMPLES)]
+        row[2] = str(i // ROWS_PER_GROUP + 1)
+        if i % ROWS_PER_GROUP == 0:
+            # 그룹 첫 행: 스타일이 있으면 H열을 비워 Gemini 프롬프트 생성부터, 없으면 프롬프트를 미리 채움
+            row[5] = style or ""
+            row[7] = "" if style else FAKE_PROMPTS[(i // ROWS_PER_GROUP) % len(FAKE_PROMPTS)]
+            row[9] = imagetype
+        row[11] = voice_tool
+        rows.append(row)
+    return rows
+
+
+def percentile(values, pct):
+    """ 최근접 순위 백분위수 (값이 없으면 None) """
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[max(int(math.ceil(pct / 100 * len(ordered))) - 1, 0)]
+
+
+def read_artifacts(output_dir, manifest_stage):
+    """ 출력 폴더 아래 해당 단계 매니페스트의 결과 파일별 마지막 기록 """
+    records = []
+    pattern = os.path.join(output_dir, "**", f"{MANIFEST_PREFIX}{manifest_stage}.jsonl")
+    for path in glob.glob(pattern, recursive=True):
+        manifest = RunManifest(os.path.dirname(path), manifest_stage)
+        records.extend(r for r in manifest.records.values() if r.get("stage") != "external")
+    return records
+
+
+def run_measured(cmd, env, log_path):
+    """ 엔진 실행 (출력은 로그 파일로) → (종료 코드, 소요 초, CPU 초 또는 None) """
+    posix = os.name != "nt"
+    cpu_before = os.times()
+    started = time.time()
+    with open(log_path, "w", encoding="utf-8") as log_file:
+        process = subprocess.Popen(cmd, stdin=subprocess.DEVNULL, stdout=log_file, stderr=subprocess.STDOUT,
+                                   cwd=CURRENT_DIR, env=env)
+        sampled = {}
+        while process.poll() is None:
+            if psutil is not None and not posix:
+                # 윈도우: 엔진 + 자식 프로세스의 CPU 시간을 주기적으로 수집 (프로세스별 마지막 값)
+                try:
+                    parent = psutil.Process(process.pid)
+                    for proc in [parent] + parent.children(recursive=True):
+                        times = proc.cpu_times()
+                        sampled[proc.pid] = times.user + times.system
+                except psutil.Error:
+                    pass
+            time.sleep(CPU_SAMPLE_SEC)
+    wall_sec = time.time() - started
+
+    if posix:
+        # 기다린(종료 회수된) 자손 프로세스의 CPU 시간 합계 → ffmpeg 까지 정확히 포함
+        cpu_after = os.times()
+        cpu_sec = (cpu_after.children_user - cpu_before.children_user
+                   + cpu_after.children_system - cpu_before.children_system)
+    elif sampled:
+        cpu_sec = sum(sampled.values())
+    else:
+        cpu_sec = None
+    return process.returncode, wall_sec, cpu_sec
+
+
+def run_stage_bench(stage, title, channel, backend_spec, env, output_dir, run_dir):
+    """ 단계 1개 실행 + 측정 → 결과 dict """
+    cmd = [sys.executable, "-u", os.path.join(CURRENT_DIR, stage["file"]),
+           "--sheet", title, "--channel", channel, "--no-pause", "--sheet-backend", backend_spec]
+    log_path = os.path.join(run_dir, f"{title}_{stage['key']}.log")
+    print(f"   🚀 {stage['name']} 실행 중... (로그: {os.path.basename(log_path)})", flush=True)
+    returncode, wall_sec, cpu_sec = run_measured(cmd, env, log_path)
+
+    records = read_artifacts(output_dir, STAGE_MANIFESTS[stage["key"]])
+    durations = [r["duration_sec"] for r in records if r["status"] == "done"]
+    failed = sum(1 for r in records if r["status"] != "done")
+    result = {
+        "stage": stage["key"],
+        "returncode": returncode,
+        "wall_sec": round(wall_sec, 3),
+        "artifacts_done": len(durations),
+        "artifacts_failed": failed,
+        "throughput_per_sec": round(len(durations) / wall_sec, 3) if wall_sec > 0 else 0.0,
+        "p50_sec": percentile(durations, 50),
+        "p95_sec": percentile(durations, 95),
+        "cpu_sec": round(cpu_sec, 3) if cpu_sec is not None else None,
+        "avg_cores": round(cpu_sec / wall_sec, 2) if cpu_sec is not None and wall_sec > 0 else None,
+        "log": log_path,
+    }
+    status = "✅" if returncode == 0 else f"❌ (종료 코드 {returncode})"
+    print(f"   {status} {stage['name']}: {wall_sec:.1f}초, 결과 {len(durations)}개 (실패 {failed})")
+    return result
+
+
+def format_value(value, digits=2):
+    return "-" if value is None else f"{value:.{digits}f}"
+
+
+def print_table(results):
+    print("\n" + "=" * 96)
+    print(f"{'행수':>6} {'단계':<10} {'종료':>4} {'소요(s)':>9} {'성공':>6} {'실패':>5} "
+          f"{'처리량(/s)':>11} {'p50(s)':>8} {'p95(s)':>8} {'CPU(s)':>9} {'코어':>6}")
+    print("-" * 96)
+    for size in results:
+        for r in size["stages"]:
+            if r.get("skipped"):
+                print(f"{size['rows']:>6} {r['stage']:<10} {'건너뜀':>4}")
+                continue
+            print(f"{size['rows']:>6} {r['stage']:<10} {r['returncode']:>4} {r['wall_sec']:>9.1f} "
+                  f"{r['artifacts_done']:>6} {r['artifacts_failed']:>5} {r['throughput_per_sec']:>11.3f} "
+                  f"{format_value(r['p50_sec']):>8} {format_value(r['p95_sec']):>8} "
+                  f"{format_value(r['cpu_sec'], 1):>9} {format_value(r['avg_cores']):>6}")
+    print("=" * 96)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="엔드투엔드 처리량 벤치마크 (가짜 API 서버 + 로컬 시트)")
+    parser.add_argument("--rows", type=int, nargs="+", default=DEFAULT_ROWS, help="합성 시트 행 수 (기본: 50 200 1000)")
+    parser.add_argument("--stages", nargs="+", choices=[s["key"] for s in STAGES],
+                        help="측정할 단계 (기본: 전체)")
+    parser.add_argument("--channel", default="Ch01", help="출력 채널 (기본: Ch01)")
+    parser.add_argument("--imagetype", default="gemini", choices=["gemini", "flux", "fal"], help="J열 이미지 종류")
+    parser.add_argument("--voice-tool", default="elevenlabs",
+                        help="L열 음성 도구 (가짜 서버는 elevenlabs 만 흉내 냄)")
+    parser.add_argument("--style", help="F열 프롬프트 스타일 (지정하면 Gemini 프롬프트 생성까지 측정)")
+    parser.add_argument("--keep", action="store_true", help="합성 시트/출력 폴더를 지우지 않음")
+    add_fake_arguments(parser)
+    args = parser.parse_args()
+
+    if args.voice_tool != "elevenlabs":
+        print(f"⚠️ 음성 도구 '{args.voice_tool}' 는 가짜 서버가 없어 실제 서비스로 요청합니다.")
+
+    order = validate_stages(STAGES)
+    selected = set(args.stages or order)
+    by_key = {s["key"]: s for s in STAGES}
+
+    run_dir = os.path.join(BENCH_ROOT, datetime.now().strftime("%Y%m%d_%H%M%S"))
+    sheet_dir = os.path.join(run_dir, "sheets")
+    os.makedirs(sheet_dir)
+    backend_spec = f"csv:{sheet_dir}"
+
+    fake = build_fake(args)
+    server = start_server(fake, args.port)
+    base_url = f"http://127.0.0.1:{args.port}"
+    env = dict(os.environ, PYTHONIOENCODING="utf-8", **fake_key_env(base_url))
+    print(f"🧪 가짜 API 서버: {base_url} (지연 배수 {args.latency_scale})")
+
+    titles = {rows: f"{args.channel}_bench{rows}go" for rows in args.rows}
+    write_book(backend_spec, {
+        title: synthetic_rows(rows, args.imagetype, args.voice_tool, args.style) for rows, title in titles.items()
+    })
+
+    results = []
+    try:
+        for rows, title in titles.items():
+            output_dir = os.path.join(PROJECT_ROOT, args.channel, "03_Output", title)
+            shutil.rmtree(output_dir, ignore_errors=True)
+            fake.reset_stats()
+            print(f"\n📊 [{rows}행] 시트 {title}")
+
+            stage_results = []
+            failed_keys = set()
+            for key in order:
+                if key not in selected:
+                    continue
+                stage = by_key[key]
+                if any(dep in failed_keys for dep in stage["deps"]):
+                    print(f"   ⏭️ {stage['name']}: 앞 단계 실패로 건너뜀")
+                    failed_keys.add(key)
+                    stage_results.append({"stage": key, "skipped": True})
+                    continue
+                result = run_stage_bench(stage, title, args.channel, backend_spec, env, output_dir, run_dir)
+                if result["returncode"] != 0:
+                    failed_keys.add(key)
+                stage_results.append(result)
+
+            results.append({"rows": rows, "sheet": title, "stages": stage_results,
+                            "providers": fake.stats_snapshot()})
+            if not args.keep:
+                shutil.rmtree(output_dir, ignore_errors=True)
+    finally:
+        server.shutdown()
+        if not args.keep:
+            shutil.rmtree(sheet_dir, ignore_errors=True)
+
+    print_table(results)
+    report_path = os.path.join(run_dir, "report.json")
+    with open(report_path, "w", encoding="utf-8") as f:
+        json.dump({
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "cpu_count": os.cpu_count(),
+            "latency": {p: [kind, params] for p, (kind, params) in fake.latency.items()},
+            "latency_scale": args.latency_scale,
+            "errors": fake.errors,
+            "imagetype": args.imagetype,
+            "voice_tool": args.voice_tool,
+            "results": results,
+        }, f, ensure_ascii=False, indent=2)
+    print(f"📝 리포트: {report_path}")
+
+    all_ok = all(r.get("returncode") == 0 for size in results for r in size["stages"])
+    return 0 if all_ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,214 @@
+"""
+ElevenLabs 음성 합성 (스트리밍 저장 + 여러 키 동시 사용)
+VoiceMaker 가 사용
+
+- 스트리밍: /v1/text-to-speech/{voice}/stream 응답을 받는 대로 파일에 씀 (전체를 메모리에 모았다 쓰지 않음)
+- 키 풀 (ElevenLabsKeyPool): 스레드 안전, 여러 행이 동시에 요청하면 건강한 키들에 나눠서 보냄
+    처음 사용할 때 키마다 /v1/user/subscription 조회 → 남은 글자 수(예산) + 요금제별 동시 요청 한도
+      (조회 권한이 없는 키는 예산 모름으로 두고 그대로 사용)
+    요청 전에 대본 글자 수만큼 예산을 예약, 실패하면 돌려줌 → 예산이 모자란 키는 건너뜀
+    401/402 (키 오류/잔액 부족) → 이번 실행에서 제외, 429 (요청 제한) → 잠시 쉬었다가 다시 사용
+- 예전 방식 (키를 하나씩 순서대로, 한 번 넘어가면 돌아오지 않음) 대신 남은 예산이 많고 덜 바쁜 키부터 사용
+"""
+import os
+import re
+import glob
+import time
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from provider_endpoints import provider_url
+
+KEY_DIR = r"C:\YtFactory9\_System\02_Key"
+KEY_PATTERN = r'(sk_[a-zA-Z0-9]{30,})'
+
+# 요금제별 동시 요청 한도 (모르는 요금제/조회 실패는 기본값)
+TIER_CONCURRENCY = {"free": 2, "starter": 3, "creator": 5, "pro": 10, "scale": 15, "business": 15}
+DEFAULT_CONCURRENCY = 2
+
+RATE_LIMIT_COOLDOWN_SEC = 2.0
+MAX_ATTEMPTS = 8  # 키 오류/요청 제한으로 다시 시도하는 최대 횟수 (행 1개 기준)
+STREAM_CHUNK_BYTES = 64 * 1024
+REQUEST_TIMEOUT_SEC = (10, 120)  # (연결, 읽기)
+
+
+def load_elevenlabs_keys():
+    """ KeyKey*.txt + 환경변수 ELEVENLABS_API_KEYS (쉼표 구분) 에서 sk_ 키 모으기 (중복 제거, 섞기) """
+    key_files = glob.glob(os.path.join(KEY_DIR, "KeyKey*.txt"))
+    print(f"🔍 키 파일 탐색: {[os.path.basename(k) for k in key_files]}")
+    keys = []
+    for kf in key_files:
+        try:
+            with open(kf, "r", encoding="utf-8") as f:
+                keys.extend(re.findall(KEY_PATTERN, f.read()))
+        except OSError:
+            pass
+    # .env 또는 benchmark.py 의 가짜 키
+    keys.extend(re.findall(KEY_PATTERN, os.getenv("ELEVENLABS_API_KEYS", "")))
+    keys = list(dict.fromkeys(keys))
+    random.shuffle(keys)
+    print(f"🔑 로드된 ElevenLabs 키: {len(keys)}개")
+    return keys
+
+
+class ElevenLabsKeyPool:
+    """
+    ElevenLabs 키 풀 (스레드 안전)
+    - key = pool.acquire(글자 수) → 요청 → pool.release(key, 글자 수, 결과)
+      결과: "success" / "failed" (예산 반환) / "rate_limited" (잠시 쉼) / "dead" (이번 실행에서 제외)
+    - keys: 불러온 전체 키 목록 (비어 있으면 ElevenLabs 사용 불가)
+    """
+
+    def __init__(self, keys):
+        self.keys = list(keys)
+        self._cond = threading.Condition()
+        self._state = {
+            key: {"budget": None, "limit": DEFAULT_CONCURRENCY, "in_flight": 0, "resume_at": 0.0, "dead": False}
+            for key in self.keys
+        }
+        self._budgets_lock = threading.Lock()  # 조회가 끝날 때까지 다른 스레드는 대기
+        self._budgets_loaded = False
+
+    def _query_subscription(self, key):
+        """ 남은 글자 수, 동시 요청 한도 (조회 실패/권한 없음 시 예산 None = 모름) """
+        try:
+            response = requests.get(provider_url("elevenlabs", "/v1/user/subscription"),
+                                    headers={"xi-api-key": key}, timeout=10)
+        except requests.RequestException:
+            return None, DEFAULT_CONCURRENCY
+        # 401 = 키 오류일 수도 있지만 user_read 권한 없이 만든 키도 401 (음성 합성은 가능)
+        # → 예산만 모름으로 두고, 죽은 키 판정은 음성 합성 요청의 401/402 로만
+        if response.status_code != 200:
+            return None, DEFAULT_CONCURRENCY
+        try:
+            info = response.json()
+            remaining = max(int(info.get("character_limit") or 0) - int(info.get("character_count") or 0), 0)
+        except (ValueError, TypeError):
+            return None, DEFAULT_CONCURRENCY
+        limit = TIER_CONCURRENCY.get(str(info.get("tier", "")).lower(), DEFAULT_CONCURRENCY)
+        return remaining, limit
+
+    def load_budgets(self):
+        """ 모든 키의 구독 정보 동시 조회 (처음 한 번) """
+        with self._budgets_lock:
+            if self._budgets_loaded or not self.keys:
+                return
+            with ThreadPoolExecutor(max_workers=min(len(self.keys), 8)) as executor:
+                results = dict(zip(self.keys, executor.map(self._query_subscription, self.keys)))
+            with self._cond:
+                for key, (budget, limit) in results.items():
+                    state = self._state[key]
+                    state.update({"budget": budget, "limit": limit, "dead": budget == 0})
+                self._budgets_loaded = True
+                self._cond.notify_all()
+        alive = [k for k in self.keys if not self._state[k]["dead"]]
+        known = [self._state[k]["budget"] for k in alive if self._state[k]["budget"] is not None]
+        budget_info = f", 남은 글자 {sum(known):,}자" if known else ""
+        print(f"🔑 ElevenLabs 사용 가능 키: {len(alive)}/{len(self.keys)}개{budget_info}, "
+              f"동시 요청 최대 {self.capacity()}건")
+
+    def capacity(self):
+        """ 살아 있는 키들의 동시 요청 한도 합 """
+        with self._cond:
+            return sum(s["limit"] for s in self._state.values() if not s["dead"])
+
+    def _usable(self, state, chars):
+        return not state["dead"] and (state["budget"] is None or state["budget"] >= chars)
+
+    def available(self, chars=1):
+        """ 이 글자 수를 보낼 수 있는 키가 남아 있는지 """
+        with self._cond:
+            return any(self._usable(s, chars) for s in self._state.values())
+
+    def acquire(self, chars):
+        """
+        요청에 쓸 키 빌리기 (예산 예약 + 동시 요청 수 증가)
+        - 예산이 많이 남고 덜 바쁜 키 우선, 모두 바쁘면 빌 때까지 대기
+        - 보낼 수 있는 키가 없으면 None
+        """
+        self.load_budgets()
+        with self._cond:
+            while True:
+                usable = [(k, s) for k, s in self._state.items() if self._usable(s, chars)]
+                if not usable:
+                    return None
+                now = time.time()
+                ready = [(k, s) for k, s in usable if s["in_flight"] < s["limit"] and s["resume_at"] <= now]
+                if ready:
+                    key, state = min(ready, key=lambda item: (
+                        item[1]["in_flight"] / item[1]["limit"],
+                        -(item[1]["budget"] if item[1]["budget"] is not None else float("inf"))
+                    ))
+                    state["in_flight"] += 1
+                    if state["budget"] is not None:
+                        state["budget"] -= chars
+                    return key
+                # 바쁘거나 쉬는 중 → 반납 또는 쉬는 시간 끝날 때까지 대기
+                resume_times = [s["resume_at"] for _, s in usable if s["resume_at"] > now]
+                timeout = max(min(resume_times) - now, 0.05) if resume_times else None
+                self._cond.wait(timeout)
+
+    def release(self, key, chars, result):
+        """ 요청 결과 반영 (success 외에는 예약한 예산 반환) """
+        with self._cond:
+            state = self._state[key]
+            state["in_flight"] -= 1
+            if result != "success" and state["budget"] is not None:
+                state["budget"] += chars
+            if result == "rate_limited":
+                state["resume_at"] = time.time() + RATE_LIMIT_COOLDOWN_SEC
+            elif result == "dead":
+                state["dead"] = True
+            self._cond.notify_all()
+
+
+def stream_speech(text, voice_id, save_path, key_pool, model_id="eleven_multilingual_v2"):
+    """
+    ElevenLabs 스트리밍 합성 → save_path 에 받는 대로 저장
+    키 오류/요청 제한이면 다른 키로 다시 시도, 반환: 성공 여부
+    """
+    url = provider_url("elevenlabs", f"/v1/text-to-speech/{voice_id}/stream")
+    data = {
+        "text": text,
+        "model_id": model_id,
+        "voice_settings": {
+            "stability": 0.5,
+            "similarity_boost": 0.75
+        }
+    }
+    chars = len(text)
+
+    for _ in range(MAX_ATTEMPTS):
+        api_key = key_pool.acquire(chars)
+        if not api_key:
+            print("   ❌ [Key Exhausted] 이 대본을 보낼 수 있는 키가 없습니다. (모든 키 소진 또는 글자 수 부족)")
+            return False
+        headers = {"Accept": "audio/mpeg", "Content-Type": "application/json", "xi-api-key": api_key}
+
+        result = "failed"
+        try:
+            with requests.post(url, json=data, headers=headers, stream=True, timeout=REQUEST_TIMEOUT_SEC) as response:
+                if response.status_code == 200:
+                    with open(save_path, "wb") as f:
+                        for chunk in response.iter_content(chunk_size=STREAM_CHUNK_BYTES):
+                            if chunk:
+                                f.write(chunk)
+                    result = "success"
+                    return True
+                if response.status_code in (401, 402):  # 키 만료/잔액부족
+                    print(f"   ⚠️ 키 오류 ({response.status_code}) {api_key[:8]}... 제외하고 다른 키로 재시도")
+                    result = "dead"
+                elif response.status_code == 429:  # 요청 제한
+                    print(f"   ⚠️ 요청 제한 (429) {api_key[:8]}... 잠시 쉬고 다른 키로 재시도")
+                    result = "rate_limited"
+                else:
+                    print(f"   ❌ API 오류: {response.status_code} - {response.text[:200]}")
+                    return False
+        except Exception as e:
+            print(f"   ❌ 통신 에러: {e}")
+            return False
+        finally:
+            key_pool.release(api_key, chars, result)
+    print(f"   ❌ {MAX_ATTEMPTS}번 시도했지만 실패했습니다.")
+    return False
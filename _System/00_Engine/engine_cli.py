@@ -0,0 +1,115 @@
+"""
+엔진 공통 실행 진입점 (시트/채널/옵션을 인자로 받기)
+ImageMaker / KenBurns / VoiceMaker / Mergy / ShortsDeriver 가 함께 사용
+
+- 더블클릭(.bat) 실행: 인자 없이 실행 → 기존처럼 시트 번호를 입력받음
+- 자동 실행(auto_pipeline): --sheet Ch01_19go [--channel Ch01] [--no-pause] [--stream-dir 경로]
+  → 입력 대기 없이 바로 진행, 종료 코드(0=성공, 1=실패)로 결과 전달
+  → --stream-dir 이 있으면 그룹 단위 스트리밍 모드 (stream_queue 참고)
+  → --sheet-backend csv:폴더 / xlsx:파일 / sqlite:파일 이면 구글 시트 대신 로컬 파일 사용 (sheet_backend 참고)
+"""
+import os
+import re
+import sys
+import argparse
+
+
+def get_engine_options(sheet_name=None, options=None):
+    """
+    실행 옵션 기본값
+    - pause: 종료/오류 시 "엔터 키" 대기
+    - open_folder: 완료 후 결과 폴더 열기
+    - stream_dir: 스트리밍 모드 표시 폴더 (None 이면 기존처럼 한 번에 처리)
+    pause / open_folder 는 시트를 직접 고르는 대화형 실행일 때만 켜짐
+    """
+    interactive = not sheet_name
+    merged = {"pause": interactive, "open_folder": interactive, "stream_dir": None}
+    merged.update(options or {})
+    return merged
+
+
+# 공통 인자 (나머지는 엔진별 추가 인자 → options 에 그대로 들어감)
+COMMON_ARGS = ("sheet", "channel", "no_pause", "stream_dir", "sheet_backend")
+
+
+def parse_engine_args(description="", add_arguments=None):
+    """
+    명령줄 인자 → (sheet_name, channel, options)
+    - add_arguments(parser): 엔진별 추가 인자 등록 (예: ShortsDeriver --rows), 값은 options[dest]
+    """
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("--sheet", help="작업할 시트 이름 (예: Ch01_19go) 또는 목록 번호")
+    parser.add_argument("--channel", help="채널 ID (예: Ch01), 없으면 시트 이름에서 추출")
+    parser.add_argument("--no-pause", action="store_true", help="종료 시 엔터 키 대기 안 함")
+    parser.add_argument("--stream-dir", help="그룹 단위 스트리밍 표시 폴더 (auto_pipeline --stream 이 지정)")
+    parser.add_argument("--sheet-backend", help="시트 백엔드 (google / csv:폴더 / xlsx:파일 / sqlite:파일)")
+    if add_arguments:
+        add_arguments(parser)
+    args = parser.parse_args()
+
+    if args.sheet_backend:
+        # 엔진은 시트를 열 때 환경변수로 백엔드를 고름 (sheet_backend.BACKEND_ENV)
+        os.environ["YTF_SHEET_BACKEND"] = args.sheet_backend
+
+    options = get_engine_options(args.sheet, {"stream_dir": args.stream_dir})
+    options.update({k: v for k, v in vars(args).items() if k not in COMMON_ARGS})
+    if args.no_pause:
+        options["pause"] = False
+        options["open_folder"] = False
+    return args.sheet, args.channel, options
+
+
+def run_main(main, description="", add_arguments=None):
+    """ if __name__ == "__main__": 에서 사용 - main 의 반환값을 종료 코드로 """
+    sheet_name, channel, options = parse_engine_args(description, add_arguments)
+    exit_code = main(sheet_name=sheet_name, channel=channel, options=options)
+    sys.exit(exit_code if exit_code is not None else 0)
+
+
+def select_go_sheet(go_sheets, sheet_name=None, title=""):
+    """
+    'go' 시트 목록에서 작업 시트 선택
+    - sheet_name 이 있으면 이름(대소문자 무시) → 목록 번호 순으로 찾음 (없으면 None)
+    - 없으면 목록을 보여주고 번호 입력을 받음 (기존 방식)
+    """
+    if sheet_name:
+        sheet_name = str(sheet_name).strip()
+        for ws in go_sheets:
+            if ws.title.lower() == sheet_name.lower():
+                print(f"✅ 선택된 시트: '{ws.title}' (자동)")
+                return ws
+        if sheet_name.isdigit() and 0 < int(sheet_name) <= len(go_sheets):
+            ws = go_sheets[int(sheet_name) - 1]
+            print(f"✅ 선택된 시트: '{ws.title}' (자동, {sheet_name}번)")
+            return ws
+        print(f"❌ 시트를 찾을 수 없습니다: {sheet_name}")
+        return None
+
+    print("\n" + "="*40)
+    print(title)
+    print("="*40)
+    for idx, ws in enumerate(go_sheets):
+        print(f" [{idx+1}] {ws.title}")
+
+    while True:
+        try:
+            choice = input("\n번호 입력 >> ").strip()
+            idx = int(choice) - 1
+            if 0 <= idx < len(go_sheets):
+                print(f"✅ 선택된 시트: '{go_sheets[idx].title}'")
+                return go_sheets[idx]
+            print("⚠️ 올바른 번호를 입력하세요.")
+        except ValueError:
+            print("⚠️ 숫자를 입력하세요.")
+        except EOFError:
+            # 입력이 닫힌 상태 (자동 실행인데 --sheet 가 없음)
+            print("❌ 시트 번호를 입력받을 수 없습니다. --sheet 인자를 지정하세요.")
+            return None
+
+
+def resolve_channel(sheet_title, channel=None):
+    """ 채널 ID: 인자로 받은 값 우선, 없으면 시트 이름의 ChXX """
+    if channel:
+        return channel
+    channel_match = re.search(r'Ch\d+', sheet_title)
+    return channel_match.group(0) if channel_match else None
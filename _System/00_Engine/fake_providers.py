@@ -0,0 +1,442 @@
+"""
+가짜 API 서버 (크레딧 없이 처리량 측정)
+benchmark.py 가 사용, 단독 실행도 가능
+
+- 실제 API 와 같은 경로로 응답 (엔진은 provider_endpoints 의 YTF_PROVIDER_BASE 로 연결)
+    POST /v1beta/models/{모델}:predict            Imagen → PNG (base64)
+    POST /v1beta/models/{모델}:generateContent    Gemini 텍스트 → 영어 이미지 프롬프트
+    POST /v1/openai/images/generations            DeepInfra FLUX → PNG (b64_json)
+    POST /v1/text-to-speech/{voice_id}[/stream]   ElevenLabs → MP3 (대본 길이에 비례한 길이)
+    GET  /v1/user/subscription                    ElevenLabs 키별 남은 글자 수 / 요금제 (넉넉한 고정값)
+    POST /fal-ai/...                              Fal 큐 등록 → GET .../requests/{id}/status → GET .../requests/{id}
+    GET  /files/{이름}.png                        Fal 결과 이미지 다운로드
+    GET  /_stats                                  제공자별 요청 수 / 상태 코드 / 평균 지연
+- 지연 분포 (--latency 제공자=분포): fixed:초 / uniform:최소:최대 / normal:평균:표준편차 / lognormal:중앙값:시그마
+- 오류 주입 (--error [제공자:]코드=확률): 요청마다 확률적으로 429 / 403 등 응답
+- 고정 응답: PNG 는 직접 만들어 메모리에 보관, MP3 는 ffmpeg 로 초 단위 길이별 1번만 생성
+
+사용법:
+  python fake_providers.py --port 8765
+  python fake_providers.py --latency imagen=fixed:0.5 --latency-scale 0.2 --error 429=0.05 --error imagen:403=0.01
+  → 엔진 실행 전: set YTF_PROVIDER_BASE=http://127.0.0.1:8765
+"""
+import os
+import re
+import sys
+import json
+import math
+import time
+import uuid
+import zlib
+import base64
+import random
+import struct
+import argparse
+import tempfile
+import threading
+import subprocess
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(os.path.dirname(CURRENT_DIR))
+
+DEFAULT_PORT = 8765
+
+# 제공자별 기본 지연 분포 (대략값, --latency 로 조정)
+DEFAULT_LATENCY = {
+    "imagen": "lognormal:6.0:0.35",
+    "gemini": "lognormal:1.5:0.4",
+    "deepinfra": "lognormal:2.0:0.3",
+    "elevenlabs": "lognormal:1.5:0.35",
+    "fal": "lognormal:5.0:0.4",
+}
+
+# ElevenLabs 가짜 음성 길이: 대본 글자 수 / 초당 글자 수 (1~30초)
+CHARS_PER_SEC = 8
+MAX_AUDIO_SEC = 30
+# 가짜 ElevenLabs 키 1개당 글자 수 한도 (벤치마크에서 예산 부족이 나지 않을 만큼)
+FAKE_CHARACTER_LIMIT = 1_000_000
+
+# PNG 색 조합 (요청마다 번갈아 사용 → 결과 파일이 서로 다름)
+PALETTES = [
+    ((40, 60, 110), (230, 180, 90)),
+    ((20, 90, 60), (240, 220, 160)),
+    ((120, 30, 50), (250, 200, 200)),
+    ((30, 30, 30), (120, 200, 240)),
+]
+
+FAKE_PROMPTS = [
+    "A cinematic wide shot of a quiet village street at dusk, warm lantern light, soft haze, highly detailed",
+    "A close-up portrait of an elderly man reading a letter by the window, natural light, film grain",
+    "An aerial view of a rainy city intersection at night, neon reflections, moody atmosphere, 16:9",
+    "A cozy kitchen with steam rising from a pot, morning sunlight, pastel colors, storybook illustration",
+]
+
+
+def parse_latency(spec):
+    """ "lognormal:1.5:0.3" → ("lognormal", [1.5, 0.3]) """
+    kind, *params = spec.strip().lower().split(":")
+    expected = {"fixed": 1, "uniform": 2, "normal": 2, "lognormal": 2}
+    if kind not in expected or len(params) != expected[kind]:
+        raise ValueError(f"지연 분포 형식 오류: {spec} (예: fixed:1.0 / uniform:0.5:2 / normal:1:0.3 / lognormal:1.5:0.3)")
+    return kind, [float(p) for p in params]
+
+
+def sample_latency(latency, rng):
+    kind, params = latency
+    if kind == "fixed":
+        value = params[0]
+    elif kind == "uniform":
+        value = rng.uniform(params[0], params[1])
+    elif kind == "normal":
+        value = rng.gauss(params[0], params[1])
+    else:
+        value = params[0] * math.exp(rng.gauss(0.0, params[1]))
+    return max(value, 0.0)
+
+
+def parse_error(spec):
+    """ "imagen:403=0.01" → ("imagen", 403, 0.01), "429=0.05" → ("*", 429, 0.05) """
+    provider, _, rest = spec.rpartition(":")
+    code, sep, prob = rest.partition("=")
+    if not sep:
+        raise ValueError(f"오류 주입 형식 오류: {spec} (예: 429=0.05 / imagen:403=0.01)")
+    return provider.strip().lower() or "*", int(code), float(prob)
+
+
+def make_png(width, height, palette):
+    """ 그라데이션 + 줄무늬 PNG (단색이면 인코딩 부하가 비현실적으로 낮아짐) """
+    (r1, g1, b1), (r2, g2, b2) = palette
+    line = bytearray()
+    for x in range(width * 2):
+        t = (x % width) / max(width - 1, 1)
+        stripe = 24 if (x // 40) % 2 else 0
+        line += bytes((
+            min(int(r1 + (r2 - r1) * t) + stripe, 255),
+            min(int(g1 + (g2 - g1) * t) + stripe, 255),
+            min(int(b1 + (b2 - b1) * t) + stripe, 255),
+        ))
+    raw = bytearray()
+    for y in range(height):
+        offset = (y % width) * 3  # 줄마다 밀어서 대각선 무늬
+        raw += b"\x00" + line[offset:offset + width * 3]
+
+    def chunk(tag, data):
+        return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data) & 0xFFFFFFFF)
+
+    return (b"\x89PNG\r\n\x1a\n"
+            + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+            + chunk(b"IDAT", zlib.compress(bytes(raw), 6))
+            + chunk(b"IEND", b""))
+
+
+def find_ffmpeg():
+    path = os.path.join(PROJECT_ROOT, "ffmpeg.exe")
+    return path if os.path.exists(path) else "ffmpeg"
+
+
+class FakeProviders:
+    """ 가짜 서버 상태 (설정 / 고정 응답 캐시 / 통계 / Fal 큐 작업) """
+
+    def __init__(self, latency=None, errors=None, latency_scale=1.0, seed=None, ffmpeg=None):
+        self.latency = {p: parse_latency(s) for p, s in DEFAULT_LATENCY.items()}
+        for provider, spec in (latency or {}).items():
+            self.latency[provider] = parse_latency(spec)
+        self.errors = list(errors or [])  # [(제공자 또는 "*", 코드, 확률)]
+        self.latency_scale = latency_scale
+        self.ffmpeg = ffmpeg or find_ffmpeg()
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.mp3_lock = threading.Lock()  # ffmpeg 생성 중에도 다른 요청은 진행
+        self.png_cache = {}
+        self.mp3_cache = {}
+        self.mp3_dir = tempfile.mkdtemp(prefix="fake_tts_")
+        self.fal_jobs = {}
+        self.stats = {}
+        self.counter = 0
+
+    def next_index(self):
+        with self.lock:
+            self.counter += 1
+            return self.counter
+
+    def delay(self, provider):
+        with self.lock:
+            seconds = sample_latency(self.latency[provider], self.rng) * self.latency_scale
+        time.sleep(seconds)
+        return seconds
+
+    def injected_error(self, provider):
+        with self.lock:
+            for target, code, prob in self.errors:
+                if target in ("*", provider) and self.rng.random() < prob:
+                    return code
+        return None
+
+    def record(self, provider, status, latency_sec):
+        with self.lock:
+            entry = self.stats.setdefault(provider, {"requests": 0, "status": {}, "latency_sum": 0.0})
+            entry["requests"] += 1
+            entry["status"][str(status)] = entry["status"].get(str(status), 0) + 1
+            entry["latency_sum"] += latency_sec
+
+    def reset_stats(self):
+        with self.lock:
+            self.stats.clear()
+
+    def stats_snapshot(self):
+        with self.lock:
+            return {
+                provider: {
+                    "requests": s["requests"],
+                    "status": dict(s["status"]),
+                    "avg_latency_sec": round(s["latency_sum"] / s["requests"], 3) if s["requests"] else 0.0,
+                }
+                for provider, s in self.stats.items()
+            }
+
+    def png(self, width, height, index):
+        key = (width, height, index % len(PALETTES))
+        with self.lock:
+            data = self.png_cache.get(key)
+        if data is None:
+            data = make_png(width, height, PALETTES[key[2]])
+            with self.lock:
+                self.png_cache[key] = data
+        return data
+
+    def mp3(self, text):
+        seconds = min(max(int(math.ceil(len(text) / CHARS_PER_SEC)), 1), MAX_AUDIO_SEC)
+        with self.mp3_lock:
+            data = self.mp3_cache.get(seconds)
+            if data is None:
+                path = os.path.join(self.mp3_dir, f"{seconds}s.mp3")
+                subprocess.run(
+                    [self.ffmpeg, "-y", "-loglevel", "error", "-f", "lavfi",
+                     "-i", f"sine=frequency=220:duration={seconds}",
+                     "-ac", "1", "-ar", "44100", "-b:a", "64k", path],
+                    check=True, stdin=subprocess.DEVNULL
+                )
+                with open(path, "rb") as f:
+                    data = self.mp3_cache[seconds] = f.read()
+        return data
+
+
+def make_handler(fake):
+    """ 요청 처리 클래스 (서버마다 상태를 따로 가짐) """
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        verbose = False
+
+        def log_message(self, format, *args):
+            if self.verbose:
+                super().log_message(format, *args)
+
+        # ---------- 응답 도우미 ----------
+        def send_body(self, status, body, content_type):
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def send_json(self, status, data):
+            self.send_body(status, json.dumps(data).encode("utf-8"), "application/json")
+
+        def send_error_json(self, status):
+            messages = {429: ("RESOURCE_EXHAUSTED", "Rate limit exceeded (fake)"),
+                        403: ("PERMISSION_DENIED", "Quota exceeded for this key (fake)")}
+            name, message = messages.get(status, ("ERROR", f"Injected error {status} (fake)"))
+            self.send_json(status, {"error": {"code": status, "status": name, "message": message},
+                                    "detail": {"status": name, "message": message}})
+
+        def read_json(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            raw = self.rfile.read(length) if length else b""
+            try:
+                return json.loads(raw or b"{}")
+            except ValueError:
+                return {}
+
+        def base_url(self):
+            return f"http://{self.headers.get('Host', f'127.0.0.1:{self.server.server_port}')}"
+
+        def simulate(self, provider):
+            """ 지연 + 오류 주입 (오류를 보냈으면 True) """
+            started = time.time()
+            fake.delay(provider)
+            error = fake.injected_error(provider)
+            if error:
+                fake.record(provider, error, time.time() - started)
+                self.send_error_json(error)
+                return True, started
+            return False, started
+
+        # ---------- 라우팅 ----------
+        def do_GET(self):
+            path = self.path.split("?")[0]
+            if path == "/_stats":
+                return self.send_json(200, fake.stats_snapshot())
+            if path == "/v1/user/subscription":
+                return self.send_json(200, {"tier": "creator", "character_count": 0,
+                                            "character_limit": FAKE_CHARACTER_LIMIT})
+            match = re.match(r"^/files/(\d+)x(\d+)_(\d+)\.png$", path)
+            if match:
+                width, height, index = (int(v) for v in match.groups())
+                return self.send_body(200, fake.png(width, height, index), "image/png")
+            match = re.match(r"^/(.+)/requests/([0-9a-f-]+)(/status)?$", path)
+            if match:
+                return self.fal_poll(match.group(2), bool(match.group(3)))
+            self.send_json(404, {"error": {"code": 404, "message": f"not found: {path}"}})
+
+        def do_POST(self):
+            path = self.path.split("?")[0]
+            body = self.read_json()
+            if path.endswith(":predict"):
+                return self.imagen(body)
+            if path.endswith(":generateContent"):
+                return self.gemini(body)
+            if path == "/v1/openai/images/generations":
+                return self.deepinfra(body)
+            if path.startswith("/v1/text-to-speech/"):
+                return self.elevenlabs(body)
+            if path.startswith("/fal-ai/"):
+                return self.fal_submit(path.lstrip("/"), body)
+            self.send_json(404, {"error": {"code": 404, "message": f"not found: {path}"}})
+
+        # ---------- 제공자별 응답 ----------
+        def imagen(self, body):
+            failed, started = self.simulate("imagen")
+            if failed:
+                return
+            ratio = ((body.get("parameters") or {}).get("aspectRatio") or "16:9")
+            width, height = (720, 1280) if ratio == "9:16" else (1280, 720)
+            png = fake.png(width, height, fake.next_index())
+            fake.record("imagen", 200, time.time() - started)
+            self.send_json(200, {"predictions": [
+                {"bytesBase64Encoded": base64.b64encode(png).decode("ascii"), "mimeType": "image/png"}
+            ]})
+
+        def gemini(self, body):
+            failed, started = self.simulate("gemini")
+            if failed:
+                return
+            text = FAKE_PROMPTS[fake.next_index() % len(FAKE_PROMPTS)]
+            fake.record("gemini", 200, time.time() - started)
+            self.send_json(200, {
+                "candidates": [{"content": {"parts": [{"text": text}], "role": "model"},
+                                "finishReason": "STOP", "index": 0}],
+                "usageMetadata": {"promptTokenCount": 0, "candidatesTokenCount": 0, "totalTokenCount": 0}
+            })
+
+        def deepinfra(self, body):
+            failed, started = self.simulate("deepinfra")
+            if failed:
+                return
+            try:
+                width, height = (int(v) for v in str(body.get("size", "1280x720")).split("x"))
+            except ValueError:
+                width, height = 1280, 720
+            png = fake.png(width, height, fake.next_index())
+            fake.record("deepinfra", 200, time.time() - started)
+            self.send_json(200, {"created": int(time.time()),
+                                 "data": [{"b64_json": base64.b64encode(png).decode("ascii")}]})
+
+        def elevenlabs(self, body):
+            failed, started = self.simulate("elevenlabs")
+            if failed:
+                return
+            audio = fake.mp3(str(body.get("text", "")))
+            fake.record("elevenlabs", 200, time.time() - started)
+            self.send_body(200, audio, "audio/mpeg")
+
+        def fal_submit(self, model, body):
+            error = fake.injected_error("fal")
+            if error:
+                fake.record("fal", error, 0.0)
+                return self.send_error_json(error)
+            with fake.lock:
+                wait_sec = sample_latency(fake.latency["fal"], fake.rng) * fake.latency_scale
+            request_id = str(uuid.uuid4())
+            fake.fal_jobs[request_id] = {"submitted": time.time(), "ready_at": time.time() + wait_sec,
+                                         "index": fake.next_index()}
+            base = f"{self.base_url()}/{model}/requests/{request_id}"
+            self.send_json(200, {"request_id": request_id, "status_url": f"{base}/status", "response_url": base})
+
+        def fal_poll(self, request_id, status_only):
+            job = fake.fal_jobs.get(request_id)
+            if job is None:
+                return self.send_json(404, {"detail": "request not found"})
+            done = time.time() >= job["ready_at"]
+            if status_only:
+                return self.send_json(200, {"status": "COMPLETED" if done else "IN_PROGRESS"})
+            if not done:
+                return self.send_json(400, {"detail": "request is still in progress"})
+            fake.fal_jobs.pop(request_id, None)
+            fake.record("fal", 200, time.time() - job["submitted"])
+            url = f"{self.base_url()}/files/1024x768_{job['index']}.png"
+            self.send_json(200, {"images": [{"url": url, "width": 1024, "height": 768, "content_type": "image/png"}],
+                                 "seed": job["index"]})
+
+    return Handler
+
+
+def start_server(fake, port=DEFAULT_PORT, host="127.0.0.1", verbose=False):
+    """ 백그라운드 스레드로 서버 시작 (benchmark.py 용) → server (server.shutdown() 으로 종료) """
+    handler = make_handler(fake)
+    handler.verbose = verbose
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def build_fake(args):
+    """ 명령줄 인자 → FakeProviders (benchmark.py 와 공용) """
+    latency = {}
+    for spec in args.latency or []:
+        provider, sep, dist = spec.partition("=")
+        if not sep or provider.strip().lower() not in DEFAULT_LATENCY:
+            raise ValueError(f"--latency 형식 오류: {spec} (제공자: {', '.join(DEFAULT_LATENCY)})")
+        latency[provider.strip().lower()] = dist
+    errors = [parse_error(spec) for spec in args.error or []]
+    return FakeProviders(latency, errors, args.latency_scale, args.seed)
+
+
+def add_fake_arguments(parser):
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"가짜 서버 포트 (기본: {DEFAULT_PORT})")
+    parser.add_argument("--latency", action="append", metavar="제공자=분포",
+                        help="지연 분포 (예: imagen=fixed:0.5, elevenlabs=lognormal:1.2:0.3), 여러 번 지정 가능")
+    parser.add_argument("--latency-scale", type=float, default=1.0, help="모든 지연에 곱할 배수 (0 = 지연 없음)")
+    parser.add_argument("--error", action="append", metavar="[제공자:]코드=확률",
+                        help="오류 주입 (예: 429=0.05, imagen:403=0.01), 여러 번 지정 가능")
+    parser.add_argument("--seed", type=int, help="난수 시드 (지연/오류 재현용)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="가짜 API 서버 (Imagen / Gemini / DeepInfra / ElevenLabs / Fal)")
+    add_fake_arguments(parser)
+    parser.add_argument("--verbose", action="store_true", help="요청마다 로그 출력")
+    args = parser.parse_args()
+
+    fake = build_fake(args)
+    server = start_server(fake, args.port, verbose=args.verbose)
+    print(f"🧪 가짜 API 서버 실행 중: http://127.0.0.1:{args.port}")
+    print(f"   엔진 실행 전: set YTF_PROVIDER_BASE=http://127.0.0.1:{args.port}")
+    for provider, (kind, params) in fake.latency.items():
+        print(f"   - {provider}: {kind} {params} × {fake.latency_scale}")
+    for provider, code, prob in fake.errors:
+        print(f"   - 오류 주입: {provider} {code} ({prob:.1%})")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        print("\n📊 요청 통계:")
+        print(json.dumps(fake.stats_snapshot(), ensure_ascii=False, indent=2))
+        server.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,232 @@
+"""
+공통 ffmpeg 실행기 (진행률/처리속도 텔레메트리)
+Mergy / KenBurns / SoundInserter / TitleInserter 가 함께 사용
+
+- ffmpeg 를 `-progress pipe:1 -nostats` 로 실행하고 진행 정보를 실시간 파싱
+- 작업별 fps, 속도 배수(speed), ETA 출력 + 전체 누적 처리량 출력
+- 실행 단위 JSON 타이밍 리포트 저장 (어느 단계/어느 클립이 시간을 잡아먹는지 확인용)
+- 배치 실행(auto_pipeline)에서는 resource_slots 의 "ffmpeg" 슬롯으로 동시 인코딩 수 제한
+"""
+import os
+import json
+import time
+import threading
+import subprocess
+from datetime import datetime
+from resource_slots import resource_slot
+
+# 실행 기록 (프로세스 전체 공유)
+_JOBS = []
+_LOCK = threading.Lock()
+_RUN_STARTED = time.time()
+
+# stderr 는 실패 시 원인 확인용으로 마지막 몇 줄만 보관
+STDERR_TAIL_LINES = 20
+
+
+def _parse_out_time(progress):
+    """ -progress 블록에서 현재 출력 시간(초)을 읽음 """
+    for key in ("out_time_us", "out_time_ms"):
+        value = progress.get(key, "")
+        # ffmpeg 버전에 따라 out_time_ms 도 마이크로초 단위로 찍힘
+        if value and value.lstrip("-").isdigit():
+            return max(int(value) / 1_000_000, 0.0)
+    value = progress.get("out_time", "")
+    if value and ":" in value:
+        try:
+            h, m, s = value.split(":")
+            return int(h) * 3600 + int(m) * 60 + float(s)
+        except ValueError:
+            pass
+    return 0.0
+
+
+def _parse_speed(progress):
+    """ "1.23x" 형식의 speed 값을 float 로 변환 (없으면 0.0) """
+    value = progress.get("speed", "").strip().rstrip("x")
+    try:
+        return float(value)
+    except ValueError:
+        return 0.0
+
+
+def _format_eta(seconds):
+    if seconds is None or seconds < 0:
+        return "--:--"
+    seconds = int(seconds)
+    return f"{seconds // 60:02d}:{seconds % 60:02d}"
+
+
+def run_ffmpeg(cmd, label="", stage="", total_duration=None, check=True, quiet=False):
+    """
+    ffmpeg 명령을 진행률 파싱과 함께 실행합니다.
+    - cmd: [FFMPEG_CMD, ...] 형태의 기존 명령 리스트 (그대로 전달)
+    - label: 작업 이름 (예: 클립 ID, 파일명)
+    - stage: 단계 이름 (예: "Mergy.clip", "KenBurns")
+    - total_duration: 출력 길이(초). 있으면 진행률(%)과 ETA 계산
+    - check: True 면 실패 시 subprocess.CalledProcessError 발생 (stderr 에 마지막 로그 포함)
+    - quiet: True 면 진행 줄을 출력하지 않음 (기록은 유지)
+    반환: 작업 기록 dict (wall_sec, media_sec, avg_speed, avg_fps, returncode ...)
+    """
+    full_cmd = [cmd[0], "-progress", "pipe:1", "-nostats", *cmd[1:]]
+
+    job = {
+        "stage": stage,
+        "label": label,
+        "started": datetime.now().isoformat(timespec="seconds"),
+        "wall_sec": 0.0,
+        "media_sec": 0.0,
+        "frames": 0,
+        "avg_fps": 0.0,
+        "avg_speed": 0.0,
+        "returncode": None,
+    }
+
+    stderr_tail = []
+
+    def read_stderr(pipe):
+        try:
+            for line in iter(pipe.readline, ""):
+                stderr_tail.append(line.rstrip())
+                if len(stderr_tail) > STDERR_TAIL_LINES:
+                    del stderr_tail[0]
+            pipe.close()
+        except Exception:
+            pass
+
+    # 배치 실행 시 프로세스 전체 ffmpeg 동시 실행 수 제한 (대기 시간은 기록에서 제외)
+    with resource_slot("ffmpeg"):
+        started = time.time()
+        process = subprocess.Popen(
+            full_cmd,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            encoding="utf-8",
+            errors="ignore",
+            bufsize=1,
+        )
+        stderr_thread = threading.Thread(target=read_stderr, args=(process.stderr,), daemon=True)
+        stderr_thread.start()
+
+        progress = {}
+        for line in iter(process.stdout.readline, ""):
+            line = line.strip()
+            if "=" not in line:
+                continue
+            key, value = line.split("=", 1)
+            progress[key] = value
+            if key != "progress":
+                continue
+
+            # progress=continue|end 가 한 블록의 끝
+            media_sec = _parse_out_time(progress)
+            speed = _parse_speed(progress)
+            fps = progress.get("fps", "0")
+            job["media_sec"] = media_sec
+            job["frames"] = int(progress.get("frame", "0") or 0)
+
+            if not quiet:
+                if total_duration and total_duration > 0:
+                    percent = min(media_sec / total_duration * 100, 100.0)
+                    eta = (total_duration - media_sec) / speed if speed > 0 else None
+                    print(f"\r   ⏱️ [{label}] {percent:5.1f}% | {fps} fps | {speed:.2f}x | ETA {_format_eta(eta)}   ", end="", flush=True)
+                else:
+                    print(f"\r   ⏱️ [{label}] {media_sec:.1f}s | {fps} fps | {speed:.2f}x   ", end="", flush=True)
+            progress = {}
+
+        returncode = process.wait()
+        stderr_thread.join(timeout=2)
+
+        wall_sec = time.time() - started
+
+    job["wall_sec"] = round(wall_sec, 3)
+    job["media_sec"] = round(job["media_sec"], 3)
+    job["avg_fps"] = round(job["frames"] / wall_sec, 2) if wall_sec > 0 else 0.0
+    job["avg_speed"] = round(job["media_sec"] / wall_sec, 2) if wall_sec > 0 else 0.0
+    job["returncode"] = returncode
+
+    if not quiet:
+        status = "✅" if returncode == 0 else "❌"
+        print(f"\r   ⏱️ [{label}] {status} {job['media_sec']:.1f}s 처리 / {wall_sec:.1f}s 소요 ({job['avg_speed']:.2f}x)        ")
+
+    with _LOCK:
+        _JOBS.append(job)
+
+    if check and returncode != 0:
+        raise subprocess.CalledProcessError(returncode, full_cmd, output=None, stderr="\n".join(stderr_tail))
+
+    job["stderr"] = "\n".join(stderr_tail)
+    return job
+
+
+def get_summary():
+    """ 지금까지 실행된 작업의 단계별 누적 통계 """
+    with _LOCK:
+        jobs = list(_JOBS)
+
+    stages = {}
+    for job in jobs:
+        s = stages.setdefault(job["stage"] or "-", {"jobs": 0, "failed": 0, "wall_sec": 0.0, "media_sec": 0.0})
+        s["jobs"] += 1
+        s["failed"] += 1 if job["returncode"] != 0 else 0
+        s["wall_sec"] += job["wall_sec"]
+        s["media_sec"] += job["media_sec"]
+
+    for s in stages.values():
+        s["wall_sec"] = round(s["wall_sec"], 3)
+        s["media_sec"] = round(s["media_sec"], 3)
+        s["avg_speed"] = round(s["media_sec"] / s["wall_sec"], 2) if s["wall_sec"] > 0 else 0.0
+
+    total_wall = sum(job["wall_sec"] for job in jobs)
+    total_media = sum(job["media_sec"] for job in jobs)
+    return {
+        "run_elapsed_sec": round(time.time() - _RUN_STARTED, 3),
+        "ffmpeg_wall_sec": round(total_wall, 3),
+        "media_sec": round(total_media, 3),
+        "avg_speed": round(total_media / total_wall, 2) if total_wall > 0 else 0.0,
+        "jobs": len(jobs),
+        "stages": stages,
+    }
+
+
+def print_summary():
+    """ 누적 처리량을 콘솔에 출력 """
+    summary = get_summary()
+    if not summary["jobs"]:
+        return
+    print("\n📊 [ffmpeg 처리 통계]")
+    print(f"   총 {summary['jobs']}건 | ffmpeg {summary['ffmpeg_wall_sec']:.1f}s | "
+          f"영상 {summary['media_sec']:.1f}s | 평균 {summary['avg_speed']:.2f}x")
+    for name, s in summary["stages"].items():
+        failed = f", 실패 {s['failed']}" if s["failed"] else ""
+        print(f"   - {name}: {s['jobs']}건{failed} | {s['wall_sec']:.1f}s | {s['avg_speed']:.2f}x")
+
+
+def write_report(report_dir, run_name):
+    """
+    실행 단위 JSON 타이밍 리포트 저장
+    - report_dir/{run_name}_{YYYYmmdd_HHMMSS}.json
+    - 작업별 기록 + 단계별 합계 + 가장 오래 걸린 작업 상위 10개
+    반환: 저장된 리포트 경로 (작업이 없으면 None)
+    """
+    with _LOCK:
+        jobs = [{k: v for k, v in job.items() if k != "stderr"} for job in _JOBS]
+    if not jobs:
+        return None
+
+    if not os.path.exists(report_dir):
+        os.makedirs(report_dir)
+
+    report = {
+        "run": run_name,
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "summary": get_summary(),
+        "slowest": sorted(jobs, key=lambda j: j["wall_sec"], reverse=True)[:10],
+        "jobs": jobs,
+    }
+    report_path = os.path.join(report_dir, f"{run_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    with open(report_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    return report_path
@@ -1,9 +1,21 @@
+"""
+이미지 생성 공용 모듈 (출력 프로필별)
+ImageMaker (롱폼) / ImageMaker_Shorts / 쇼츠 이미지메이커 가 함께 사용
+
+- 키 관리 / 프롬프트 생성 / Imagen·DeepInfra·Fal 호출 / 미드트로·아웃트로 복사 / 메인 루프를 한 곳에서 관리
+  → 속도·안정성 수정이 롱폼과 쇼츠에 한 번에 반영
+- 출력 프로필 (IMAGE_PROFILES)
+    long          : 16:9 (1280x720)
+    shorts        : 1:1 생성 후 1080x1920 블랙바 레이아웃으로 변환 (ImageMaker_Shorts)
+    shorts_square : 1:1 생성만 (블랙바는 쇼츠 이미지컨버터에서, 쇼츠 이미지메이커)
+- 엔진 파일은 run_image_maker(프로필, ...) 만 호출
+"""
 import os
 import glob
 import re
 import time
-import shutil
 import gspread
+from gspread.exceptions import APIError
 from oauth2client.service_account import ServiceAccountCredentials
 import google.generativeai as genai
 import requests
@@ -12,6 +24,13 @@ import random
 import openai
 import fal_client
 from concurrent.futures import ThreadPoolExecutor, as_completed, Future
+from engine_cli import get_engine_options, select_go_sheet, resolve_channel
+from stream_queue import mark_ready
+from resource_slots import uses_resource
+from run_manifest import RunManifest, hash_inputs, write_bytes_atomic, copy_file_atomic
+from sheet_backend import open_sheet_backend
+from provider_endpoints import provider_url, gemini_client_options, fal_run
+from shorts_layout import encode_black_bars
 
 # .env 파일 지원 (선택적)
 try:
@@ -55,6 +74,39 @@ FAL_ROOT_IMAGE_DIR = r"C:\YtFactory9\_System\04_Co_Asset\ImagePrompt\fal_RootIma
 
 LAST_SUCCESSFUL_KEY = None
 
+# ==========================================
+# 1.2. 출력 프로필 (롱폼 16:9 / 쇼츠 1:1)
+# ==========================================
+SHORTS_PROMPT_SUFFIX = "\n\nIMPORTANT: Generate a square (1:1) image. The main subject should be centered and clearly visible. This image will be used in a vertical 9:16 Shorts video format with black bars added automatically."
+
+IMAGE_PROFILES = {
+    "long": {
+        "title": "ImageMaker v9.4 (Speed Optimized)",
+        "aspect_ratio": "16:9",        # Imagen aspectRatio
+        "deepinfra_size": "1280x720",   # DeepInfra FLUX size
+        "fal_image_size": None,         # Fal image_size (None = 모델 기본값)
+        "prompt_suffix": "",            # Gemini 프롬프트 요청 끝에 붙이는 지시
+        "black_bars": False,            # 저장 전에 1080x1920 블랙바 레이아웃으로 변환
+    },
+    "shorts": {
+        "title": "ImageMaker_Shorts v1.0 (Shorts Optimized)",
+        "aspect_ratio": "1:1",
+        "deepinfra_size": "1024x1024",
+        "fal_image_size": "square",
+        "prompt_suffix": SHORTS_PROMPT_SUFFIX,
+        "black_bars": True,
+    },
+    "shorts_square": {
+        "title": "쇼츠 이미지메이커 v1.0 (이미지 생성 전용 - 블랙바 적용 없음)",
+        "aspect_ratio": "1:1",
+        "deepinfra_size": "1024x1024",
+        "fal_image_size": "square",
+        "prompt_suffix": SHORTS_PROMPT_SUFFIX,
+        "black_bars": False,
+    },
+}
+DEFAULT_PROFILE = IMAGE_PROFILES["long"]
+
 # ==========================================
 # 1.5. 키 관리자 (KeyManager) 클래스
 # ==========================================
@@ -217,11 +269,72 @@ class KeyManager:
 # ==========================================
 # 2. 유틸리티 함수 (키 로드 & 템플릿)
 # ==========================================
+def retry_on_quota_exceeded(func, max_retries=5, wait_time=60):
+    """
+    구글 시트 API 429 에러(Quota exceeded) 발생 시 재시도하는 헬퍼 함수
+    
+    Args:
+        func: 실행할 함수 (인자 없이 호출 가능한 람다 또는 함수)
+        max_retries: 최대 재시도 횟수 (기본값: 5)
+        wait_time: 재시도 전 대기 시간(초) (기본값: 60)
+    
+    Returns:
+        함수의 반환값
+    
+    Raises:
+        APIError: 최대 재시도 횟수 초과 시
+    """
+    for attempt in range(max_retries):
+        try:
+            return func()
+        except APIError as e:
+            error_code = None
+            error_msg = str(e).lower()
+            
+            # APIError의 response 속성에서 상태 코드 추출 시도
+            try:
+                if hasattr(e, 'response'):
+                    if isinstance(e.response, dict):
+                        error_code = e.response.get('status')
+                    elif hasattr(e.response, 'status'):
+                        error_code = e.response.status
+            except:
+                pass
+            
+            # 429 에러 또는 "Quota exceeded" 메시지 확인
+            is_quota_error = (
+                error_code == 429 or 
+                "429" in str(e) or 
+                "quota exceeded" in error_msg or 
+                "quota" in error_msg
+            )
+            
+            if is_quota_error:
+                if attempt < max_retries - 1:
+                    print(f"⚠️ 구글 시트 할당량 초과 (429). {wait_time}초 대기 후 재시도합니다... ({attempt + 1}/{max_retries})")
+                    time.sleep(wait_time)
+                    continue
+                else:
+                    print(f"❌ 구글 시트 할당량 초과. 최대 재시도 횟수({max_retries}) 초과.")
+                    raise
+            else:
+                # 429가 아닌 다른 APIError는 즉시 재발생
+                raise
+        except Exception as e:
+            # APIError가 아닌 다른 예외는 즉시 재발생
+            if isinstance(e, APIError):
+                raise
+            # 일반 예외도 그대로 재발생
+            raise
+    # 이론적으로 도달하지 않지만 타입 체커를 위해
+    raise APIError("재시도 실패")
+
 def load_spreadsheet(client):
     """
     Sheet_URL.txt 내용을 읽어서 스프레드시트에 접속.
     - URL 전체를 넣어두면 open_by_url 사용
     - ID만 넣어두면 open_by_key 사용
+    - 429 에러 발생 시 자동 재시도
     """
     if not os.path.exists(SHEET_URL_FILE):
         raise FileNotFoundError(f"Sheet_URL.txt 파일을 찾을 수 없습니다: {SHEET_URL_FILE}")
@@ -232,10 +345,13 @@ def load_spreadsheet(client):
     if not raw:
         raise ValueError("Sheet_URL.txt 파일이 비어 있습니다.")
 
-    if "https://docs.google.com" in raw:
-        return client.open_by_url(raw)
-    else:
-        return client.open_by_key(raw)
+    def _open_spreadsheet():
+        if "https://docs.google.com" in raw:
+            return client.open_by_url(raw)
+        else:
+            return client.open_by_key(raw)
+    
+    return retry_on_quota_exceeded(_open_spreadsheet)
 
 
 def get_gemini_keys():
@@ -253,6 +369,9 @@ def get_gemini_keys():
                 all_keys.extend(found)
         except: pass
 
+    # 환경변수 GEMINI_API_KEYS (쉼표 구분, .env 또는 benchmark.py 의 가짜 키)
+    all_keys.extend(re.findall(r'(AIza[a-zA-Z0-9_-]{35})', os.getenv("GEMINI_API_KEYS", "")))
+
     all_keys = list(set(all_keys))
     random.shuffle(all_keys)
     print(f"🔑 로드된 총 API 키 개수: {len(all_keys)}개")
@@ -497,7 +616,7 @@ def _try_generate_with_key(key, full_prompt, candidate_models, key_manager):
         tuple: (success: bool, result: str or None, key: str, error_type: str or None)
     """
     try:
-        genai.configure(api_key=key)
+        genai.configure(api_key=key, **gemini_client_options())
         
         for model_name in candidate_models:
             try:
@@ -553,100 +672,38 @@ def _try_generate_with_key(key, full_prompt, candidate_models, key_manager):
     return (False, None, key, None)
 
 
-def generate_prompt_text(context, template, key_manager):
+def generate_prompt_text(context, template, api_keys, profile=DEFAULT_PROFILE):
     """
-    Gemini를 사용하여 이미지 프롬프트 생성 (병렬 처리 + 안전한 키 관리)
-    ThreadPoolExecutor를 사용하여 3개 키를 동시에 시도하고, 첫 번째 성공한 결과를 즉시 반환
+    YtFactory3 방식: Gemini를 사용하여 이미지 프롬프트 생성 (단순 순차 시도)
     
     Args:
         context: 상황 설명 텍스트
-        template: 프롬프트 템플릿 (돈경1,2,3)
-        key_manager: KeyManager 인스턴스
+        template: 프롬프트 템플릿
+        api_keys: API 키 리스트
+        profile: 출력 프로필 (쇼츠면 1:1 구도 지시를 덧붙임)
     
     Returns:
-        str or None: 정제된 프롬프트 텍스트
+        str or None: 프롬프트 텍스트
     """
     if not template:
         return None
     
-    # 강력한 침묵 명령 추가 (잡담 금지)
-    silent_instruction = (
-        "\n\n[CRITICAL INSTRUCTION]\n"
-        "1. Output ONLY the final English image prompt.\n"
-        "2. DO NOT write 'Okay', 'Sure', 'Here is', 'Based on', or 'Sandwich rule'.\n"
-        "3. DO NOT wrap the output in quotes or markdown blocks.\n"
-        "4. Start directly with the visual description (e.g., 'Flat 2D vector...')."
-    )
-    
-    full_prompt = f"{template}\n\n[상황설명]\n{context}{silent_instruction}"
-    
-    # 모델명 수정 (404 에러 방지)
-    candidate_models = ['gemini-2.0-flash-exp', 'gemini-1.5-flash-latest', 'gemini-1.5-pro-latest']
-    
-    print(f"  🔄 프롬프트 생성 시작... (병렬 처리 모드)")
+    full_prompt = f"{template}\n\n[상황설명]\n{context}\n\n위 상황을 묘사하는 영어 이미지 프롬프트를 작성해줘.{profile['prompt_suffix']}"
+    candidate_models = ['gemini-2.0-flash-exp', 'gemini-1.5-flash', 'gemini-1.5-pro']
     
-    max_workers = 3  # 안전하게 3개씩만 동시 시도
-    max_rounds = 10  # 최대 10라운드 시도 (3개씩 = 최대 30개 키)
-    
-    for round_num in range(max_rounds):
-        # 이번 라운드에서 사용할 키들 수집
-        keys_to_try = []
-        for _ in range(max_workers):
-            key = key_manager.get_next_key()
-            if key is None:
-                break
-            keys_to_try.append(key)
-        
-        if not keys_to_try:
-            # 사용 가능한 키가 없음
-            if round_num == 0:
-                print(f"  ⚠️ 사용 가능한 키가 없습니다.")
-            break
-        
-        # ThreadPoolExecutor로 병렬 처리
-        executor = ThreadPoolExecutor(max_workers=max_workers)
+    for key in api_keys:
         try:
-            # 시차 공격: 0.1초 간격으로 출발
-            futures = {}
-            for idx, key in enumerate(keys_to_try):
-                future = executor.submit(_try_generate_with_key, key, full_prompt, candidate_models, key_manager)
-                futures[future] = key
-                # 마지막 키가 아니면 0.1초 대기 (시차 공격)
-                if idx < len(keys_to_try) - 1:
-                    time.sleep(0.1)
-            
-            # 첫 번째 성공한 결과를 즉시 반환 (Race Condition)
-            for future in as_completed(futures):
+            genai.configure(api_key=key, **gemini_client_options())
+            for model_name in candidate_models:
                 try:
-                    success, result, used_key, error_type = future.result(timeout=6)  # 타임아웃 6초
-                    
-                    if success and result:
-                        print(f"✅ 프롬프트 생성 성공! ({len(result)}자)")
-                        # 나머지 스레드 즉시 취소 (wait=False로 빠른 종료)
-                        executor.shutdown(wait=False)
-                        # 남은 future들 취소
-                        for f in futures:
-                            if not f.done():
-                                f.cancel()
-                        return result
-                    
-                    # 429 에러인 경우 잠시 대기
-                    if error_type == '429':
-                        time.sleep(2)
-                        
-                except Exception as e:
-                    # 타임아웃 또는 기타 예외
+                    model = genai.GenerativeModel(model_name)
+                    response = model.generate_content(full_prompt)
+                    if response.text:
+                        return response.text.strip()
+                except:
                     continue
-        finally:
-            # 정리: 실행 중인 작업이 있으면 완료될 때까지 기다림
-            executor.shutdown(wait=True)
-        
-        # 이번 라운드에서 성공하지 못했으면 다음 라운드로
-        if round_num < max_rounds - 1:
-            time.sleep(0.5)  # 라운드 간 짧은 대기
-    
-    # 모든 시도 실패
-    print(f"  ❌ 프롬프트 생성 실패")
+        except:
+            continue
     return None
 
 def parse_error_type(response):
@@ -682,151 +739,88 @@ def parse_error_type(response):
         return 'other'
 
 
-def generate_image_file(prompt, filename, key_manager, save_dir):
+def apply_black_bars(image_data):
     """
-    KeyManager를 사용하여 이미지 생성 (개선된 버전)
-    - Alive 키만 빠르게 사용 (Dead 키는 절대 검사하지 않음)
-    - 키별 모델 가용성 추적으로 불필요한 시도 제거
-    - 에러 타입별 스마트 처리
-    - 에러 발생 시 report_status()로 상태 업데이트
+    1:1 이미지를 1080x1920 블랙바 레이아웃으로 변환 (메모리에서 처리, shorts_layout 공용)
+    
+    Args:
+        image_data: 원본 이미지 바이트
     
     Returns:
-        tuple: (success: bool, error_type: str)
-        - success: 성공 여부
-        - error_type: 'success', 'responsible_ai', 'quota', 'rate_limit', 'other', 'max_attempts'
+        bytes or None: 변환된 PNG 바이트 (실패 시 None)
     """
-    save_path = os.path.join(save_dir, f"{filename}.png")
-    
-    # 최대 시도 횟수 (무한 루프 방지)
-    max_attempts = 100
-    attempt = 0
+    try:
+        converted = encode_black_bars(image_data)
+        print(f"   🎨 블랙바 레이아웃 적용 완료 (1080x1920)")
+        # 이미 1080x1920 이면 원본 그대로
+        return converted if converted is not None else image_data
+    except Exception as e:
+        print(f"   ⚠️ 블랙바 레이아웃 적용 실패: {e}")
+        return None
+
+
+def save_generated_image(save_path, image_data, profile):
+    """
+    생성된 이미지를 프로필에 맞게 저장 (블랙바 프로필이면 변환 후 저장)
+    - 원자적 쓰기: 강제 종료돼도 반쪽 png 가 완성본으로 남지 않음
+    Returns:
+        bool: 성공 여부
+    """
+    if profile["black_bars"]:
+        image_data = apply_black_bars(image_data)
+        if image_data is None:
+            return False
+    write_bytes_atomic(save_path, image_data)
+    print(f"-> ✅ 성공! ({save_path})")
+    return True
+
+
+@uses_resource("image")  # 배치 실행 시 전역 동시 요청 수 제한
+def generate_image_file(prompt, filename, api_keys, save_dir, profile=DEFAULT_PROFILE):
+    """
+    YtFactory3 방식의 단순한 이미지 생성 함수
+    - LAST_SUCCESSFUL_KEY 전역 변수 사용
+    - 키를 순차적으로 시도 (성공한 키 우선)
+    - 모델을 순차적으로 시도
     
-    # Responsible AI 위반 추적 (모든 키에서 발생하면 폴백 필요)
-    responsible_ai_count = 0
+    Returns:
+        bool: 성공 여부
+    """
+    global LAST_SUCCESSFUL_KEY
+    save_path = os.path.join(save_dir, f"{filename}.png")
     
-    while attempt < max_attempts:
-        attempt += 1
-        
-        # KeyManager에서 다음 사용할 키 가져오기 (Alive 우선, 없으면 Waiting에서 시간 지난 것)
-        key = key_manager.get_next_key()
-        
-        if key is None:
-            # 사용 가능한 키가 없음 (모두 Dead이거나 아직 Waiting 시간이 안 지남)
-            print(f"-> ⚠️ 사용 가능한 키가 없습니다.")
-            if responsible_ai_count > 5:
-                return (False, 'responsible_ai')
-            return (False, 'other')
-        
+    working_keys = list(api_keys)
+    if LAST_SUCCESSFUL_KEY and LAST_SUCCESSFUL_KEY in working_keys:
+        working_keys.remove(LAST_SUCCESSFUL_KEY)
+        working_keys.insert(0, LAST_SUCCESSFUL_KEY)
+
+    for key in working_keys:
         clean_key = key.strip()
-        
-        # 이 키에서 시도할 모델 리스트 가져오기 (가용성 정보 활용)
-        models_to_try = key_manager.get_available_models_for_key(clean_key)
-        
-        if not models_to_try:
-            # 이 키에서 시도할 모델이 없음 (모두 unavailable)
-            print(f"-> ⚠️ 키에서 사용 가능한 모델이 없습니다. 다음 키로 시도")
-            continue
-        
-        # 여러 모델 시도
-        model_success = False
-        for model_name in models_to_try:
+        for model_name in IMAGE_MODELS_CANDIDATES:
             try:
-                # Imagen API 엔드포인트: predict 사용
-                url = f"https://generativelanguage.googleapis.com/v1beta/models/{model_name}:predict?key={clean_key}"
+                url = provider_url("imagen", f"/v1beta/models/{model_name}:predict?key={clean_key}")
                 payload = {
                     "instances": [{"prompt": prompt}],
-                    "parameters": {"sampleCount": 1, "aspectRatio": "16:9"}
+                    "parameters": {"sampleCount": 1, "aspectRatio": profile["aspect_ratio"]}
                 }
                 
-                response = requests.post(url, json=payload, headers={'Content-Type': 'application/json'}, timeout=10)
+                response = requests.post(url, json=payload, headers={'Content-Type': 'application/json'})
                 
                 if response.status_code == 200:
-                    # 성공: 키를 Alive 상태로 유지, 모델 가용성 기록
                     result = response.json()
                     if result.get('predictions'):
                         b64 = result['predictions'][0]['bytesBase64Encoded']
-                        with open(save_path, "wb") as f: 
-                            f.write(base64.b64decode(b64))
-                        print(f"-> ✅ 성공! (모델: {model_name}, {save_path})")
-                        key_manager.report_status(clean_key, 'success')
-                        key_manager.mark_model_available(clean_key, model_name)
-                        # 전역 변수도 업데이트 (호환성 유지)
-                        global LAST_SUCCESSFUL_KEY
+                        if not save_generated_image(save_path, base64.b64decode(b64), profile):
+                            return False
                         LAST_SUCCESSFUL_KEY = clean_key
-                        return (True, 'success')
-                
-                # 에러 타입 분류
-                error_type = parse_error_type(response)
-                
-                if error_type == 'quota':
-                    # Quota Exceeded: Dead 상태로 즉시 이동 (이번 실행에서 영구 제외)
-                    print(f"-> ⚠️ Quota Exceeded (403) - Dead로 이동")
-                    key_manager.report_status(clean_key, 'quota')
-                    continue  # 다음 모델 시도 (같은 키의 다른 모델도 시도 가능)
-                
-                elif error_type == 'rate_limit':
-                    # Rate Limit: Waiting 상태로 이동 (2초 후 재시도)
-                    print(f"-> ⚠️ Rate Limit (429) - Waiting으로 이동")
-                    key_manager.report_status(clean_key, '429')
-                    time.sleep(2)  # 2초 대기 후 계속 진행
-                    continue  # 다음 모델 시도
-                
-                elif error_type == 'model_not_found':
-                    # 404 에러: 해당 키에서 해당 모델 unavailable 표시
-                    print(f"-> ⚠️ 모델을 찾을 수 없음 (404) - 다음 모델 시도: {model_name}")
-                    key_manager.mark_model_unavailable(clean_key, model_name)
-                    continue  # 다음 모델 시도
-                
-                elif error_type == 'billed_users':
-                    # 유료 계정 필요: 해당 키에서 해당 모델 unavailable 표시 (키는 유지, 다른 모델 시도)
-                    print(f"-> ⚠️ 유료 계정 필요 (400) - 해당 모델 스킵: {model_name}")
-                    key_manager.mark_model_unavailable(clean_key, model_name)
-                    continue  # 다음 모델 시도 (키는 유지)
-                
-                elif error_type == 'responsible_ai':
-                    # Responsible AI 위반: 해당 키에서 해당 모델 unavailable 표시
-                    error_detail = ""
-                    try:
-                        error_json = response.json()
-                        error_detail = error_json.get('error', {}).get('message', '')
-                    except:
-                        pass
-                    print(f"-> ⚠️ Responsible AI 위반 (400): {error_detail[:100]}... - 다음 모델 시도: {model_name}")
-                    key_manager.mark_model_unavailable(clean_key, model_name)
-                    responsible_ai_count += 1
-                    continue  # 다음 모델 시도
-                
+                        return True
+                elif response.status_code == 429:
+                    time.sleep(1)
                 else:
-                    # 기타 에러: 에러 메시지 확인
-                    error_detail = ""
-                    try:
-                        error_json = response.json()
-                        error_detail = error_json.get('error', {}).get('message', '')
-                    except:
-                        pass
-                    if error_detail:
-                        print(f"-> ⚠️ API 에러 ({response.status_code}): {error_detail[:100]}... - 다음 모델 시도")
-                    else:
-                        print(f"-> ⚠️ API 에러 ({response.status_code}) - 다음 모델 시도")
-                    continue  # 다음 모델 시도
-                    
-            except requests.exceptions.Timeout:
-                # 타임아웃: 다음 모델 시도
-                print(f"-> ⚠️ 타임아웃 - 다음 모델 시도: {model_name}")
-                continue
-            except Exception as e:
-                # 기타 예외: 다음 모델 시도
-                print(f"-> ⚠️ 예외 발생 ({model_name}): {e} - 다음 모델 시도")
-                continue
-        
-        # 모든 모델에서 실패한 경우 다음 키로 넘어감 (키는 Dead 처리하지 않음)
-        # Responsible AI 위반이 너무 많이 발생하면 조기 종료 고려 가능
-    
-    # 최대 시도 횟수 초과
-    print(f"-> ❌ 최대 시도 횟수 초과")
-    if responsible_ai_count > 5:
-        return (False, 'responsible_ai')
-    return (False, 'max_attempts')
+                    pass
+            except: 
+                pass
+    return False
 
 
 def get_deepinfra_key():
@@ -879,7 +873,8 @@ def get_fal_key():
     return None
 
 
-def generate_image_file_deepinfra(prompt, filename, deep_key, save_dir):
+@uses_resource("image")  # 배치 실행 시 전역 동시 요청 수 제한
+def generate_image_file_deepinfra(prompt, filename, deep_key, save_dir, profile=DEFAULT_PROFILE):
     """
     홈페이지 공식 방식(OpenAI Client) 적용 + 여러 모델명 시도
     """
@@ -887,7 +882,7 @@ def generate_image_file_deepinfra(prompt, filename, deep_key, save_dir):
     
     # ⭐️ 1. 공식 클라이언트 설정 (URL 조립 실수 원천 봉쇄)
     client = openai.OpenAI(
-        base_url="https://api.deepinfra.com/v1/openai",
+        base_url=provider_url("deepinfra", "/v1/openai"),
         api_key=deep_key
     )
 
@@ -905,7 +900,7 @@ def generate_image_file_deepinfra(prompt, filename, deep_key, save_dir):
             response = client.images.generate(
                 prompt=prompt,
                 model=target_model,
-                size="1280x720",  # 16:9 비율
+                size=profile["deepinfra_size"],  # 롱폼 16:9 / 쇼츠 1:1
                 n=1
             )
 
@@ -915,19 +910,13 @@ def generate_image_file_deepinfra(prompt, filename, deep_key, save_dir):
                 if hasattr(response.data[0], 'b64_json') and response.data[0].b64_json:
                     # b64_json으로 주면 디코딩
                     image_data_b64 = response.data[0].b64_json
-                    with open(save_path, "wb") as f:
-                        f.write(base64.b64decode(image_data_b64))
-                    print(f"-> ✅ 성공! ({save_path})")
-                    return True
+                    return save_generated_image(save_path, base64.b64decode(image_data_b64), profile)
                 elif hasattr(response.data[0], 'url') and response.data[0].url:
                     # URL로 주는 경우 다운로드
                     img_url = response.data[0].url
                     img_res = requests.get(img_url, timeout=10)
                     if img_res.status_code == 200:
-                        with open(save_path, "wb") as f:
-                            f.write(img_res.content)
-                        print(f"-> ✅ 성공! ({save_path})")
-                        return True
+                        return save_generated_image(save_path, img_res.content, profile)
                 
             print("-> ⚠️ 응답은 왔지만 이미지 데이터가 없습니다.")
             # 다음 모델 시도
@@ -966,7 +955,7 @@ def copy_midtro_video(gid, save_dir, channel_name):
     save_path = os.path.join(save_dir, save_filename)
     
     try:
-        shutil.copy2(source_path, save_path)
+        copy_file_atomic(source_path, save_path)
         print(f"  ✅ 미드트로 비디오 복사 완료: {save_path}")
         return True
     except Exception as e:
@@ -992,7 +981,7 @@ def copy_out_video(gid, save_dir, channel_name):
     save_path = os.path.join(save_dir, save_filename)
     
     try:
-        shutil.copy2(source_path, save_path)
+        copy_file_atomic(source_path, save_path)
         print(f"  ✅ 아웃트로 비디오 복사 완료: {save_path}")
         return True
     except Exception as e:
@@ -1090,7 +1079,8 @@ def find_and_upload_fal_image(keyword, fal_key):
         return None
 
 
-def generate_image_fal(prompt, image_url, filename, save_dir, fal_key):
+@uses_resource("image")  # 배치 실행 시 전역 동시 요청 수 제한
+def generate_image_fal(prompt, image_url, filename, save_dir, fal_key, profile=DEFAULT_PROFILE):
     """
     Fal AI를 사용하여 Image-to-Image 또는 Text-to-Image 생성
     
@@ -1100,6 +1090,7 @@ def generate_image_fal(prompt, image_url, filename, save_dir, fal_key):
         filename: 저장할 파일명 (확장자 제외)
         save_dir: 저장할 디렉토리
         fal_key: Fal API 키
+        profile: 출력 프로필 (쇼츠면 정사각형으로 생성)
     
     Returns:
         bool: 성공 여부
@@ -1111,6 +1102,9 @@ def generate_image_fal(prompt, image_url, filename, save_dir, fal_key):
         original_env_key = os.environ.get("FAL_KEY")
         os.environ["FAL_KEY"] = fal_key
         
+        # 쇼츠 프로필은 정사각형으로 생성 (롱폼은 모델 기본 크기)
+        size_arguments = {"image_size": profile["fal_image_size"]} if profile["fal_image_size"] else {}
+        
         # image_url이 있으면 Image-to-Image, 없으면 Text-to-Image
         if image_url:
             # Image-to-Image 모델 사용
@@ -1118,7 +1112,7 @@ def generate_image_fal(prompt, image_url, filename, save_dir, fal_key):
             print(f"  🎨 Fal 이미지 생성 중... [Image-to-Image]", end=" ")
             
             # Fal API 호출 (Image-to-Image)
-            result = fal_client.run(
+            result = fal_run(
                 model,
                 arguments={
                     "prompt": prompt,
@@ -1126,7 +1120,8 @@ def generate_image_fal(prompt, image_url, filename, save_dir, fal_key):
                     "strength": 0.75,  # 원본 이미지 느낌 유지 강도 (0.0~1.0)
                     "guidance_scale": 3.5,
                     "num_inference_steps": 28,
-                    "seed": random.randint(1, 1000000)
+                    "seed": random.randint(1, 1000000),
+                    **size_arguments
                 }
             )
         else:
@@ -1135,13 +1130,14 @@ def generate_image_fal(prompt, image_url, filename, save_dir, fal_key):
             print(f"  🎨 Fal 이미지 생성 중... [Text-to-Image]", end=" ")
             
             # Fal API 호출 (Text-to-Image)
-            result = fal_client.run(
+            result = fal_run(
                 model,
                 arguments={
                     "prompt": prompt,
                     "guidance_scale": 3.5,
                     "num_inference_steps": 28,
-                    "seed": random.randint(1, 1000000)
+                    "seed": random.randint(1, 1000000),
+                    **size_arguments
                 }
             )
         
@@ -1190,10 +1186,7 @@ def generate_image_fal(prompt, image_url, filename, save_dir, fal_key):
         # 이미지 다운로드
         img_response = requests.get(image_url_result, timeout=10)
         if img_response.status_code == 200:
-            with open(save_path, "wb") as f:
-                f.write(img_response.content)
-            print(f"-> ✅ 성공! ({save_path})")
-            return True
+            return save_generated_image(save_path, img_response.content, profile)
         else:
             print(f"-> ❌ 이미지 다운로드 실패 (HTTP {img_response.status_code})")
             return False
@@ -1209,26 +1202,349 @@ def generate_image_fal(prompt, image_url, filename, save_dir, fal_key):
         return False
 
 # ==========================================
-# 4. 메인 실행 (시트 선택 로직 유지)
+# 4. 단계별 일괄 처리 함수들
 # ==========================================
-def main():
-    print(f"🚀 ImageMaker v9.4 (Speed Optimized)")
+def prepare_prompts_batch(selected_sheet, grouped_data, row_mapping, api_keys, profile=DEFAULT_PROFILE):
+    """
+    1단계: 프롬프트 선행 일괄 생성 (병렬 처리)
+    H열이 비어있는 모든 그룹을 찾아서 병렬로 프롬프트를 생성하고, 메모리에 모아둔 후 일괄 업데이트
     
-    # === [자동 선택 로직] ===
-    auto_sheet_file = AUTO_SHEET_FILE
-    selected_sheet_name = None
-    if os.path.exists(auto_sheet_file):
+    Args:
+        selected_sheet: gspread Worksheet 객체
+        grouped_data: 그룹 데이터 딕셔너리
+        row_mapping: 그룹 ID -> 행 번호 매핑
+        api_keys: Gemini API 키 리스트
+        profile: 출력 프로필
+    
+    Returns:
+        dict: {gid: prompt_text} 형태의 딕셔너리
+    """
+    print(f"\n{'='*50}")
+    print(f"📝 [1단계] 프롬프트 일괄 생성 시작...")
+    print(f"{'='*50}")
+    
+    # H열이 비어있는 그룹 찾기
+    groups_needing_prompts = []
+    for gid in grouped_data.keys():
+        row_idx = row_mapping[gid]
         try:
-            with open(auto_sheet_file, 'r', encoding='utf-8') as f:
-                selected_sheet_name = f.read().strip()
-                print(f"🤖 [Auto] 시트 자동 선택됨: {selected_sheet_name}")
-        except: pass
+            h_col_value = retry_on_quota_exceeded(lambda: selected_sheet.cell(row_idx, 8).value)  # H열 = 8번째 컬럼
+            if not h_col_value or len(str(h_col_value).strip()) < 10:
+                groups_needing_prompts.append(gid)
+        except:
+            groups_needing_prompts.append(gid)
+    
+    if not groups_needing_prompts:
+        print(f"✅ 모든 그룹에 프롬프트가 이미 존재합니다.")
+        return {}
+    
+    print(f"📋 프롬프트가 필요한 그룹: {len(groups_needing_prompts)}개")
+    
+    # 프롬프트 생성 작업 정의
+    def generate_single_prompt(gid):
+        """단일 그룹의 프롬프트 생성"""
+        try:
+            style_char = grouped_data[gid]['style']
+            combined_text = " ".join(grouped_data[gid]['texts'])
+            
+            template = load_prompt_template(style_char)
+            if not template:
+                print(f"  ⚠️ [Group {gid}] 템플릿({style_char}.txt) 없음")
+                return (gid, None)
+            
+            prompt = generate_prompt_text(combined_text, template, api_keys, profile)
+            if prompt:
+                return (gid, prompt)
+            else:
+                print(f"  ❌ [Group {gid}] 프롬프트 생성 실패")
+                return (gid, None)
+        except Exception as e:
+            print(f"  ⚠️ [Group {gid}] 프롬프트 생성 중 오류: {str(e)[:50]}")
+            return (gid, None)
+    
+    # 병렬 처리로 프롬프트 생성 (메모리 상에서만)
+    prompt_results = {}  # {gid: prompt_text}
+    max_workers = 5  # 안전한 병렬 처리
+    
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # 모든 그룹에 대해 작업 제출
+        future_to_gid = {executor.submit(generate_single_prompt, gid): gid for gid in groups_needing_prompts}
+        
+        # 완료된 작업부터 처리
+        completed = 0
+        for future in as_completed(future_to_gid):
+            completed += 1
+            gid, prompt = future.result()
+            if prompt:
+                prompt_results[gid] = prompt
+                print(f"  ✅ [{completed}/{len(groups_needing_prompts)}] Group {gid}: 프롬프트 생성 완료 ({len(prompt)}자)")
+            else:
+                print(f"  ⚠️ [{completed}/{len(groups_needing_prompts)}] Group {gid}: 프롬프트 생성 실패")
+    
+    # 시트에 일괄 업데이트 (10개씩 묶어서)
+    if prompt_results:
+        print(f"\n💾 시트에 프롬프트 일괄 업데이트 중... ({len(prompt_results)}개)")
+        cell_updates = []
+        for gid, prompt in prompt_results.items():
+            row_idx = row_mapping[gid]
+            cell_updates.append(gspread.Cell(row_idx, 8, prompt))  # H열 = 8번째 컬럼
+        
+        # 10개씩 묶어서 업데이트 (시트 API 제한 회피)
+        batch_size = 10
+        for i in range(0, len(cell_updates), batch_size):
+            batch = cell_updates[i:i+batch_size]
+            try:
+                retry_on_quota_exceeded(lambda: selected_sheet.update_cells(batch))
+                print(f"  ✅ {min(i+batch_size, len(cell_updates))}/{len(cell_updates)}개 업데이트 완료")
+                time.sleep(0.5)  # 배치 간 짧은 대기
+            except Exception as e:
+                print(f"  ⚠️ 배치 업데이트 중 오류: {str(e)[:50]}")
+        
+        print(f"✅ 프롬프트 일괄 생성 완료! ({len(prompt_results)}개 생성)")
+    else:
+        print(f"⚠️ 생성된 프롬프트가 없습니다.")
+    
+    return prompt_results
+
+
+def process_images_parallel(selected_sheet, grouped_data, row_mapping, sorted_groups,
+                           FINAL_OUTPUT_DIR, channel_name, api_keys, deep_key, fal_key, profile=DEFAULT_PROFILE):
+    """
+    2단계: 이미지 병렬 생성 (속도 최적화)
+    프롬프트가 준비된 상태에서 이미지를 병렬로 생성 (max_workers=5)
+    
+    Args:
+        selected_sheet: gspread Worksheet 객체
+        grouped_data: 그룹 데이터 딕셔너리
+        row_mapping: 그룹 ID -> 행 번호 매핑
+        sorted_groups: 정렬된 그룹 ID 리스트
+        FINAL_OUTPUT_DIR: 출력 디렉토리
+        channel_name: 채널명
+        api_keys: Gemini API 키 리스트 (YtFactory3 방식)
+        deep_key: DeepInfra API 키
+        fal_key: Fal API 키
+        profile: 출력 프로필
+    
+    Returns:
+        set: 실패한 그룹 ID 집합
+    """
+    print(f"\n{'='*50}")
+    print(f"🎨 [2단계] 이미지 생성 시작... (병렬 처리, 5 workers)")
+    print(f"{'='*50}")
+    
+    # 이미지 생성 작업 정의
+    def generate_single_image(gid):
+        """단일 그룹의 이미지 생성"""
+        try:
+            save_filename = f"{gid}_image_group"
+            full_path_png = os.path.join(FINAL_OUTPUT_DIR, f"{save_filename}.png")
+            full_path_mp4 = os.path.join(FINAL_OUTPUT_DIR, f"{save_filename}.mp4")
+            
+            row_idx = row_mapping[gid]
+            
+            # 이미지 또는 비디오 파일 존재 여부 확인
+            image_exists = os.path.exists(full_path_png)
+            video_exists = os.path.exists(full_path_mp4)
+            
+            if image_exists or video_exists:
+                print(f"✅ [Group {gid}] 이미 파일 존재 - 완료")
+                return (gid, True, None)
+            
+            style_char = grouped_data[gid]['style']
+            combined_text = " ".join(grouped_data[gid]['texts'])
+            
+            # 미드트로 체크
+            if "(미드트로)" in combined_text:
+                print(f"⚡ [Group {gid}] 미드트로 감지 -> 비디오 복사 시작")
+                if copy_midtro_video(gid, FINAL_OUTPUT_DIR, channel_name):
+                    return (gid, True, None)
+                else:
+                    return (gid, False, "미드트로 복사 실패")
+            
+            # 아웃트로 체크
+            if "(아웃트로)" in combined_text:
+                print(f"⚡ [Group {gid}] 아웃트로 감지 -> 비디오 복사 시작")
+                if copy_out_video(gid, FINAL_OUTPUT_DIR, channel_name):
+                    return (gid, True, None)
+                else:
+                    return (gid, False, "아웃트로 복사 실패")
+            
+            print(f"⚡ [Group {gid}] 이미지 생성 시작")
+            
+            # J열(imagetype) 확인
+            image_type = "gemini"
+            try:
+                img_type_val = retry_on_quota_exceeded(lambda: selected_sheet.cell(row_idx, 10).value)  # J열 = 10번째 컬럼
+                if img_type_val:
+                    image_type = img_type_val.strip().lower()
+            except:
+                pass
+            
+            # H열에서 프롬프트 가져오기
+            current_prompt = ""
+            try:
+                val = retry_on_quota_exceeded(lambda: selected_sheet.cell(row_idx, 8).value)  # H열 = 8번째 컬럼
+                if val and len(str(val).strip()) > 10:
+                    current_prompt = str(val).strip()
+            except:
+                pass
+            
+            if not current_prompt:
+                print(f"  ⚠️ [Group {gid}] H열에 프롬프트가 없습니다. 스킵합니다.")
+                return (gid, False, "프롬프트 없음")
+            
+            # Flux 모델 사용 시 프롬프트 최적화
+            if image_type == "flux":
+                original_prompt = current_prompt
+                current_prompt = optimize_prompt_for_flux(current_prompt)
+                if original_prompt != current_prompt:
+                    print(f"  ✨ [Group {gid}] Flux 모델용 프롬프트 최적화 완료")
+                    try:
+                        retry_on_quota_exceeded(lambda: selected_sheet.update_cell(row_idx, 8, current_prompt))
+                    except:
+                        pass
+            
+            # 이미지 생성 분기 처리
+            print(f"  🎨 [Group {gid}] 이미지 생성 중... (타입: {image_type}, 프롬프트 길이: {len(current_prompt)}자)")
+            success = False
+            error_type = 'other'
+            
+            if image_type == "fal":
+                if not fal_key:
+                    print(f"  ❌ [Group {gid}] Fal 키가 없어 이미지를 생성할 수 없습니다.")
+                    return (gid, False, "Fal 키 없음")
+                
+                # M열(fal_RootImage) 확인
+                fal_root_keyword = ""
+                try:
+                    fal_root_val = retry_on_quota_exceeded(lambda: selected_sheet.cell(row_idx, 13).value)
+                    if fal_root_val:
+                        fal_root_keyword = fal_root_val.strip()
+                except:
+                    pass
+                
+                image_url = None
+                if fal_root_keyword:
+                    image_url = find_and_upload_fal_image(fal_root_keyword, fal_key)
+                    if not image_url:
+                        print(f"  ⚠️ [Group {gid}] Fal 참조 이미지 업로드 실패. Text-to-Image로 진행합니다.")
+                
+                success = generate_image_fal(current_prompt, image_url, save_filename, FINAL_OUTPUT_DIR, fal_key, profile)
+                
+            elif image_type == "flux":
+                if not deep_key:
+                    print(f"  ❌ [Group {gid}] DeepInfra 키가 없어 FLUX 이미지를 생성할 수 없습니다.")
+                    return (gid, False, "DeepInfra 키 없음")
+                success = generate_image_file_deepinfra(current_prompt, save_filename, deep_key, FINAL_OUTPUT_DIR, profile)
+                
+            else:
+                # 기본값 및 'gemini'일 때 (YtFactory3 방식)
+                success = generate_image_file(current_prompt, save_filename, api_keys, FINAL_OUTPUT_DIR, profile)
+                error_type = 'other' if not success else 'success'
+            
+            if not success:
+                # Responsible AI 위반 시 폴백 시도
+                if error_type == 'responsible_ai' and (deep_key or fal_key):
+                    print(f"  🔄 [Group {gid}] Responsible AI 위반 감지 -> 폴백 시도")
+                    fallback_success = False
+                    
+                    if deep_key:
+                        print(f"  🎨 [Group {gid}] DeepInfra로 폴백 시도 중...")
+                        fallback_success = generate_image_file_deepinfra(current_prompt, save_filename, deep_key, FINAL_OUTPUT_DIR, profile)
+                    
+                    if not fallback_success and fal_key:
+                        print(f"  🎨 [Group {gid}] Fal로 폴백 시도 중...")
+                        image_url = None
+                        try:
+                            fal_root_val = retry_on_quota_exceeded(lambda: selected_sheet.cell(row_idx, 13).value)
+                            if fal_root_val:
+                                fal_root_keyword = fal_root_val.strip()
+                                image_url = find_and_upload_fal_image(fal_root_keyword, fal_key)
+                        except:
+                            pass
+                        fallback_success = generate_image_fal(current_prompt, image_url, save_filename, FINAL_OUTPUT_DIR, fal_key, profile)
+                    
+                    if fallback_success:
+                        print(f"  ✅ [Group {gid}] 폴백 성공!")
+                        success = True
+            
+            if success:
+                return (gid, True, None)
+            else:
+                return (gid, False, f"이미지 생성 실패 ({error_type})")
+                
+        except Exception as e:
+            print(f"  ⚠️ [Group {gid}] 이미지 생성 중 예외: {str(e)[:50]}")
+            return (gid, False, f"예외: {str(e)[:50]}")
+    
+    # 병렬 처리로 이미지 생성
+    failed_groups = set()
+    max_workers = 5  # 5개 동시 실행 (32개 키 활용)
+    
+    # 이미지가 필요한 그룹만 필터링
+    groups_needing_images = []
+    for gid in sorted_groups:
+        save_filename = f"{gid}_image_group"
+        full_path_png = os.path.join(FINAL_OUTPUT_DIR, f"{save_filename}.png")
+        full_path_mp4 = os.path.join(FINAL_OUTPUT_DIR, f"{save_filename}.mp4")
+        
+        if not os.path.exists(full_path_png) and not os.path.exists(full_path_mp4):
+            groups_needing_images.append(gid)
+    
+    if not groups_needing_images:
+        print(f"✅ 모든 그룹에 이미지가 이미 존재합니다.")
+        return failed_groups
+    
+    print(f"📋 이미지가 필요한 그룹: {len(groups_needing_images)}개")
+    
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # 모든 그룹에 대해 작업 제출
+        future_to_gid = {executor.submit(generate_single_image, gid): gid for gid in groups_needing_images}
+        
+        # 완료된 작업부터 처리
+        completed = 0
+        for future in as_completed(future_to_gid):
+            completed += 1
+            gid, success, error_msg = future.result()
+            if success:
+                print(f"  ✅ [{completed}/{len(groups_needing_images)}] Group {gid}: 이미지 생성 완료")
+            else:
+                print(f"  ❌ [{completed}/{len(groups_needing_images)}] Group {gid}: {error_msg}")
+                failed_groups.add(gid)
+    
+    return failed_groups
+
+
+# ==========================================
+# 5. 메인 실행 (시트 선택 로직 유지)
+# ==========================================
+def run_image_maker(profile, sheet_name=None, channel=None, options=None):
+    """
+    이미지 생성 실행 (엔진 파일의 main 이 프로필을 정해서 호출)
+    - profile: IMAGE_PROFILES 의 출력 프로필 (롱폼 / 쇼츠)
+    - sheet_name: 작업 시트 이름 (없으면 번호 입력), channel: 채널 ID (없으면 시트 이름에서 추출)
+    - options["stream_dir"]: 스트리밍 모드면 그룹 이미지가 완성될 때마다 켄번에 알림
+    반환: 종료 코드 (0=성공, 1=실패 또는 이미지가 없는 그룹이 남음)
+    """
+    options = get_engine_options(sheet_name, options)
+    stream_dir = options["stream_dir"]
+    print(f"🚀 {profile['title']}")
+    
+    # === [자동 선택 로직] - 비활성화됨 ===
+    # auto_sheet_file = AUTO_SHEET_FILE
+    selected_sheet_name = None
+    # if os.path.exists(auto_sheet_file):
+    #     try:
+    #         with open(auto_sheet_file, 'r', encoding='utf-8') as f:
+    #             selected_sheet_name = f.read().strip()
+    #             print(f"🤖 [Auto] 시트 자동 선택됨: {selected_sheet_name}")
+    #     except: pass
     # ========================
     
     api_keys = get_gemini_keys()
     if not api_keys:
         print("❌ Gemini 키 없음")
-        return
+        return 1
     
     # KeyManager 인스턴스 생성 (키 상태를 스마트하게 관리)
     key_manager = KeyManager(api_keys)
@@ -1241,13 +1557,16 @@ def main():
     fal_key = get_fal_key()
 
     # 1. 구글 시트 접속
-    try:
+    def connect():
         scope = ['https://spreadsheets.google.com/feeds', 'https://www.googleapis.com/auth/drive']
         creds = ServiceAccountCredentials.from_json_keyfile_name(JSON_KEY_FILE, scope)
-        client = gspread.authorize(creds)
-        doc = load_spreadsheet(client)
+        return load_spreadsheet(gspread.authorize(creds))
+
+    try:
+        # 시트 백엔드 (기본: 구글 시트 로컬 미러, YTF_SHEET_BACKEND 로 로컬 CSV/XLSX/SQLite)
+        doc = open_sheet_backend(SHEET_URL_FILE, connect)
     except Exception as e:
-        print(f"❌ 시트 접속 실패: {e}"); return
+        print(f"❌ 시트 접속 실패: {e}"); return 1
 
     # 2. 'go'가 들어간 시트 찾기 & 사용자 선택
     all_worksheets = doc.worksheets()
@@ -1255,45 +1574,18 @@ def main():
 
     if not go_sheets:
         print("❌ 'go'가 포함된 시트(예: 15go)를 찾을 수 없습니다!")
-        return
-
-    print("\n" + "="*40)
-    print(" 🎨 [ImageMaker] 작업할 시트를 선택하세요")
-    print("="*40)
-    
-    for idx, ws in enumerate(go_sheets):
-        print(f" [{idx+1}] {ws.title}")
-    
-    selected_sheet = None
-    while selected_sheet is None:
-        # [자동 매칭] --------------------------------
-        if selected_sheet_name:
-            for ws in go_sheets:
-                if ws.title == selected_sheet_name:
-                    selected_sheet = ws
-                    break
-            if selected_sheet: break
-        # ---------------------------------------------
-        
-        try:
-            choice = input("\n번호 입력 >> ").strip()
-            idx = int(choice) - 1
-            if 0 <= idx < len(go_sheets):
-                selected_sheet = go_sheets[idx]
-            else:
-                print("⚠️ 올바른 번호를 입력하세요.")
-        except:
-            print("⚠️ 숫자를 입력하세요.")
+        return 1
 
-    print(f"✅ 선택된 시트: '{selected_sheet.title}'")
+    selected_sheet = select_go_sheet(go_sheets, sheet_name, " 🎨 [ImageMaker] 작업할 시트를 선택하세요")
+    if selected_sheet is None:
+        return 1
 
     # 3. 시트 이름에서 채널명 추출 및 폴더 생성
     sheet_title = selected_sheet.title
-    channel_match = re.search(r'Ch\d+', sheet_title)
-    if not channel_match:
+    channel_name = resolve_channel(sheet_title, channel)  # 예: "Ch01"
+    if not channel_name:
         print(f"❌ 시트 이름에서 채널명을 추출할 수 없습니다: {sheet_title}")
-        return
-    channel_name = channel_match.group(0)  # 예: "Ch01"
+        return 1
     
     # 출력 경로: C:\YtFactory9\{channel_name}\03_Output\{sheet_title}
     FINAL_OUTPUT_DIR = f"C:\\YtFactory9\\{channel_name}\\03_Output\\{sheet_title}"
@@ -1301,25 +1593,41 @@ def main():
         os.makedirs(FINAL_OUTPUT_DIR)
     print(f"📂 타겟 폴더: {FINAL_OUTPUT_DIR}")
 
-    # 4. 데이터 로드
+    # 4. 데이터 로드 (YtFactory3 방식: 직접 시도)
     all_values = selected_sheet.get_all_values()
     data_rows = all_values[1:] # 헤더 제외
 
     # 5. 그룹화 (먼저 그룹을 파악)
     grouped_data = {}
     row_mapping = {}
+    # 각 그룹의 첫 번째 행 정보만 저장 (promptABC, imagetype 등)
+    group_first_row_info = {}  # {gid: {'row_idx': i+2, 'promptABC': row[5], 'imagetype': row[9] if len(row)>9 else ''}}
 
     for i, row in enumerate(data_rows):
         if len(row) < 6: continue
         gid = row[2].strip()
-        style = row[5].strip()  # 원본 값 유지 (키워드 지원을 위해 .lower() 제거)
         text = row[1].strip()
         
         if not gid: continue
 
         if gid not in grouped_data:
+            # 그룹의 첫 번째 행일 때만 F열(promptABC)과 J열(imagetype) 읽기
+            style = row[5].strip() if len(row) > 5 else ""  # F열: promptABC (돈경1, 돈경2, 돈경3 등) - 첫 번째 행만
+            imagetype = row[9].strip().lower() if len(row) > 9 and row[9].strip() else "gemini"  # J열: imagetype - 첫 번째 행만
+            
             grouped_data[gid] = {'texts': [], 'style': style}
             row_mapping[gid] = i + 2
+            # 첫 번째 행의 정보만 저장
+            group_first_row_info[gid] = {
+                'row_idx': i + 2,
+                'promptABC': style,
+                'imagetype': imagetype,
+                'prompt': row[7].strip() if len(row) > 7 else ""  # H열: 이미지 프롬프트 (매니페스트 입력 비교용)
+            }
+        else:
+            # 그룹의 나머지 행들은 F열 무시 (비워있어야 함)
+            pass
+        
         grouped_data[gid]['texts'].append(text)
 
     # (비상조치) 스타일 할당 - 그룹의 첫 번째 행(대표 행)만 체크하고 비어있으면 채우기
@@ -1346,6 +1654,7 @@ def main():
             cell_updates.append(gspread.Cell(row_idx, 6, styles[i]))
         
         if cell_updates:
+            # YtFactory3 방식: retry_on_quota_exceeded 사용하지 않고 직접 시도
             selected_sheet.update_cells(cell_updates)
             print(f"✅ {len(cell_updates)}개 그룹에 스타일 할당 완료. 다시 로드합니다.")
             # 다시 로드해서 업데이트된 스타일 반영
@@ -1353,239 +1662,275 @@ def main():
             # 그룹화도 다시 해서 스타일 업데이트
             grouped_data = {}
             row_mapping = {}
+            group_first_row_info = {}
             for i, row in enumerate(data_rows):
                 if len(row) < 6: continue
                 gid = row[2].strip()
-                style = row[5].strip()  # 원본 값 유지 (키워드 지원을 위해 .lower() 제거)
                 text = row[1].strip()
                 
                 if not gid: continue
-                if not style: style = 'a'
 
                 if gid not in grouped_data:
+                    # 그룹의 첫 번째 행일 때만 F열(promptABC)과 J열(imagetype) 읽기
+                    style = row[5].strip() if len(row) > 5 else ""
+                    imagetype = row[9].strip().lower() if len(row) > 9 and row[9].strip() else "gemini"
+                    if not style: style = 'a'
+                    
                     grouped_data[gid] = {'texts': [], 'style': style}
                     row_mapping[gid] = i + 2
+                    # 첫 번째 행의 정보만 저장
+                    group_first_row_info[gid] = {
+                        'row_idx': i + 2,
+                        'promptABC': style,
+                        'imagetype': imagetype,
+                        'prompt': row[7].strip() if len(row) > 7 else ""
+                    }
+                else:
+                    # 그룹의 나머지 행들은 F열 무시 (비워있어야 함)
+                    pass
                 grouped_data[gid]['texts'].append(text)
 
-    sorted_groups = sorted(grouped_data.keys(), key=lambda x: int(x) if x.isdigit() else 9999)
-    print(f"🎯 총 {len(sorted_groups)}개 그룹 처리 시작")
-
-    # 6. 작업 루프 (실패한 그룹 계속 재시도)
-    failed_groups = set(sorted_groups)  # 실패한 그룹 추적
-    cycle_count = 0
+    # F열과 J열 정리: 그룹의 첫 번째 행만 남기고 나머지는 비우기 (선택적, 환경변수로 제어)
+    # YTF_CLEANUP_COLUMNS 환경변수가 설정되어 있거나, 한 번만 실행하도록 제한
+    should_cleanup = os.environ.get("YTF_CLEANUP_COLUMNS", "").lower() in ["1", "true", "yes"]
     
-    while failed_groups:
-        cycle_count += 1
-        if cycle_count > 1:
-            print(f"\n🔄 재시도 사이클 {cycle_count} 시작 (남은 그룹: {len(failed_groups)}개)")
-            print("=" * 50)
-            time.sleep(5)  # 사이클 간 대기
-        
-        current_failed = set()
+    if should_cleanup:
+        print(f"\n🧹 F열(promptABC)과 J열(imagetype) 정리 중...")
+        cells_to_clear = []
         
-        for gid in list(failed_groups):
-            save_filename = f"{gid}_image_group"
-            full_path_png = os.path.join(FINAL_OUTPUT_DIR, f"{save_filename}.png")
-            full_path_mp4 = os.path.join(FINAL_OUTPUT_DIR, f"{save_filename}.mp4")
-            
-            row_idx = row_mapping[gid]
+        for i, row in enumerate(data_rows):
+            if len(row) < 6: continue
+            gid = row[2].strip()
+            if not gid: continue
             
-            # 이미지 또는 비디오 파일 존재 여부 확인
-            image_exists = os.path.exists(full_path_png)
-            video_exists = os.path.exists(full_path_mp4)
-            
-            # 이미지 파일이 삭제되었는지 확인
-            if not image_exists and not video_exists:
-                # 이미지 파일이 없으면 H열 프롬프트도 지우고 다시 생성
+            # 이 행이 그룹의 첫 번째 행인지 확인
+            if gid in row_mapping and row_mapping[gid] == i + 2:
+                # 첫 번째 행이면 유지 (아무것도 안 함)
+                continue
+            else:
+                # 나머지 행이면 F열(6번째 컬럼)과 J열(10번째 컬럼) 비우기
+                row_num = i + 2  # 실제 시트 행 번호 (헤더 제외)
+                
+                # F열 확인 (비어있지 않으면 비우기)
+                if len(row) > 5 and row[5].strip():
+                    cells_to_clear.append(gspread.Cell(row_num, 6, ""))  # F열 = 6번째 컬럼
+                
+                # J열 확인 (비어있지 않으면 비우기)
+                if len(row) > 9 and row[9].strip():
+                    cells_to_clear.append(gspread.Cell(row_num, 10, ""))  # J열 = 10번째 컬럼
+        
+        # 일괄 업데이트 (100개씩 묶어서 - API 호출 최소화)
+        if cells_to_clear:
+            print(f"  📝 {len(cells_to_clear)}개 셀 정리 중...")
+            batch_size = 100  # 배치 크기 증가 (10 -> 100)
+            for batch_start in range(0, len(cells_to_clear), batch_size):
+                batch = cells_to_clear[batch_start:batch_start + batch_size]
                 try:
-                    h_col_value = selected_sheet.cell(row_idx, 8).value  # H열 = 8번째 컬럼
-                    if h_col_value and len(str(h_col_value).strip()) > 0:
-                        print(f"🗑️ [Group {gid}] 이미지 파일 없음 감지 -> H열 프롬프트 삭제 및 재생성")
-                        selected_sheet.update_cell(row_idx, 8, "")  # H열 비우기
+                    # retry_on_quota_exceeded 사용하지 않고 직접 시도 (빠른 실패)
+                    selected_sheet.update_cells(batch)
+                    print(f"  ✅ {min(batch_start + batch_size, len(cells_to_clear))}/{len(cells_to_clear)}개 셀 정리 완료")
+                    time.sleep(0.2)  # 배치 간 짧은 대기 (0.5 -> 0.2)
                 except Exception as e:
-                    print(f"  ⚠️ H열 프롬프트 삭제 중 오류: {e}")
-            elif image_exists or video_exists:
-                # 이미지 또는 비디오 파일이 존재하면 성공으로 간주
-                print(f"✅ [Group {gid}] 이미 파일 존재 - 완료")
-                continue  # 성공한 그룹은 제거
+                    # 에러 발생 시 스킵하고 계속 진행 (정리 실패해도 이미지 생성은 계속)
+                    print(f"  ⚠️ 셀 정리 중 오류 (계속 진행): {str(e)[:50]}")
+                    break  # 에러 발생 시 정리 중단하고 계속 진행
+            print(f"✅ F열과 J열 정리 완료!")
+        else:
+            print(f"✅ F열과 J열이 이미 정리되어 있습니다.")
+    else:
+        # 정리 기능 비활성화 (기본값: 빠른 실행)
+        print(f"💡 F열/J열 정리 기능은 비활성화되어 있습니다. (환경변수 YTF_CLEANUP_COLUMNS=1로 활성화 가능)")
+    
+    sorted_groups = sorted(grouped_data.keys(), key=lambda x: int(x) if x.isdigit() else 9999)
+    print(f"🎯 총 {len(sorted_groups)}개 그룹 처리 시작")
+
+    # ==========================================
+    # 6. 작업 루프 (YtFactory3 방식: 순차 처리)
+    # ==========================================
+    # 📒 실행 매니페스트: 그룹 결과 파일별 입력 해시/상태 기록 → 재실행 시 바뀐 그룹만 다시 생성
+    manifest = RunManifest(FINAL_OUTPUT_DIR, "image")
+    ready_groups = set()
 
+    def group_artifact(gid):
+        """
+        그룹 결과 파일 + 입력 해시 (시트 스냅샷 기준)
+        - 미드트로/아웃트로: {gid}_image_group.mp4 (채널 영상 복사본)
+        - 일반 그룹: {gid}_image_group.png (H열 프롬프트 + J열 imagetype)
+          png 없이 mp4 만 있으면 직접 넣은 영상 → 입력 비교 없이 인정
+        """
+        full_path_png = os.path.join(FINAL_OUTPUT_DIR, f"{gid}_image_group.png")
+        full_path_mp4 = os.path.join(FINAL_OUTPUT_DIR, f"{gid}_image_group.mp4")
+        combined_text = " ".join(grouped_data[gid]['texts'])
+        if "(미드트로)" in combined_text or "(아웃트로)" in combined_text:
+            kind = "midtro" if "(미드트로)" in combined_text else "outro"
+            return full_path_mp4, hash_inputs(kind, channel_name)
+        if not os.path.exists(full_path_png) and os.path.exists(full_path_mp4):
+            return full_path_mp4, None
+        info = group_first_row_info.get(gid, {})
+        return full_path_png, hash_inputs("image", info.get('prompt', ""), info.get('imagetype') or "gemini")
+
+    def notify_group_ready(gid):
+        """ 그룹 완료 처리 + 스트리밍 모드면 다음 단계(켄번)에 바로 알림 """
+        ready_groups.add(gid)
+        mark_ready(stream_dir, "image", gid)
+
+    def record_group(gid, path, input_hash, started, success):
+        """ 생성 결과를 매니페스트에 기록 (성공이면 다음 단계에 알림) """
+        success = bool(success) and os.path.exists(path)
+        manifest.record(path, input_hash, "done" if success else "failed", time.time() - started)
+        if success:
+            notify_group_ready(gid)
+
+    for gid in sorted_groups:
+        save_filename = f"{gid}_image_group"
+        full_path_png = os.path.join(FINAL_OUTPUT_DIR, f"{save_filename}.png")
+        full_path_mp4 = os.path.join(FINAL_OUTPUT_DIR, f"{save_filename}.mp4")
+        
+        # 결과 파일이 있고 입력(프롬프트/타입)이 그대로면 건너뜀
+        artifact_path, artifact_hash = group_artifact(gid)
+        if manifest.is_valid(artifact_path, artifact_hash):
+            notify_group_ready(gid)
+            continue
+        started = time.time()
+        
+        if os.path.exists(artifact_path):
+            print(f"\n⚡ [Group {gid}] 입력 변경 또는 미완료 -> 다시 생성")
+        else:
+            print(f"\n⚡ [Group {gid}] 파일 없음 -> AI 이미지 생성 시작")
+        
+        # 그룹의 대표 행 (첫 번째 행)
+        row_idx = row_mapping[gid]
+        
+        # 그룹의 첫 번째 행 정보만 사용 (F열과 J열은 첫 번째 행에만 있음)
+        first_row_info = group_first_row_info.get(gid)
+        if first_row_info:
+            style_char = first_row_info['promptABC'].strip()
+            image_type = first_row_info['imagetype'].strip().lower() if first_row_info['imagetype'] else "gemini"
+        else:
+            # 정보가 없으면 기본값 사용
             style_char = grouped_data[gid]['style']
+            image_type = "gemini"
+        
+        # 미드트로/아웃트로 체크
+        combined_text = " ".join(grouped_data[gid]['texts'])
+        if "(미드트로)" in combined_text:
+            print(f"⚡ [Group {gid}] 미드트로 감지 -> 비디오 복사 시작")
+            if copy_midtro_video(gid, FINAL_OUTPUT_DIR, channel_name):
+                record_group(gid, full_path_mp4, artifact_hash, started, True)
+                continue
+            else:
+                print(f"  ❌ [Group {gid}] 미드트로 복사 실패")
+                continue
+        
+        if "(아웃트로)" in combined_text:
+            print(f"⚡ [Group {gid}] 아웃트로 감지 -> 비디오 복사 시작")
+            if copy_out_video(gid, FINAL_OUTPUT_DIR, channel_name):
+                record_group(gid, full_path_mp4, artifact_hash, started, True)
+                continue
+            else:
+                print(f"  ❌ [Group {gid}] 아웃트로 복사 실패")
+                continue
+        
+        # 프롬프트 체크 및 생성 (YtFactory3 방식)
+        current_prompt = ""
+        try:
+            # YtFactory3 방식: retry_on_quota_exceeded 사용하지 않고 직접 시도
+            val = selected_sheet.cell(row_idx, 8).value
+            if val and len(str(val).strip()) > 10:
+                current_prompt = str(val).strip()
+        except:
+            pass
+        
+        if not current_prompt:
+            if not style_char:
+                print(f"  ❌ [Group {gid}] F열(promptABC)이 비어있습니다.")
+                continue
             
-            # 그룹의 모든 텍스트를 합쳐서 확인
-            combined_text = " ".join(grouped_data[gid]['texts'])
+            template = load_prompt_template(style_char)
+            if not template:
+                print(f"  ❌ [Group {gid}] 템플릿 파일 없음 (키워드: {style_char})")
+                continue
             
-            # 미드트로 체크: "(미드트로)" 포함 여부 확인
-            if "(미드트로)" in combined_text:
-                print(f"⚡ [Group {gid}] 미드트로 감지 -> 비디오 복사 시작")
-                if copy_midtro_video(gid, FINAL_OUTPUT_DIR, channel_name):
-                    continue  # 성공
-                else:
-                    current_failed.add(gid)  # 실패
-                    continue
+            combined_text = " ".join(grouped_data[gid]['texts'])
+            current_prompt = generate_prompt_text(combined_text, template, api_keys, profile)
             
-            # 아웃트로 체크: "(아웃트로)" 포함 여부 확인
-            if "(아웃트로)" in combined_text:
-                print(f"⚡ [Group {gid}] 아웃트로 감지 -> 비디오 복사 시작")
-                if copy_out_video(gid, FINAL_OUTPUT_DIR, channel_name):
-                    continue  # 성공
-                else:
-                    current_failed.add(gid)  # 실패
-                    continue
-
-            print(f"⚡ [Group {gid}] 파일 없음 -> AI 이미지 생성 시작")
-
-            # J열(imagetype) 확인: 'gemini', 'flux', 또는 'fal'
-            image_type = "gemini"
+            if current_prompt:
+                try:
+                    # YtFactory3 방식: retry_on_quota_exceeded 사용하지 않고 직접 시도
+                    selected_sheet.update_cell(row_idx, 8, current_prompt)
+                except:
+                    pass
+            else:
+                print(f"  ❌ [Group {gid}] 프롬프트 생성 실패")
+                continue
+        
+        # 이미지 타입 확인 (J열에서 다시 한 번 확인 - 시트에서 직접 읽기)
+        if not image_type or image_type == "gemini":
             try:
-                img_type_val = selected_sheet.cell(row_idx, 10).value  # J열 = 10번째 컬럼
+                # YtFactory3 방식: retry_on_quota_exceeded 사용하지 않고 직접 시도
+                img_type_val = selected_sheet.cell(row_idx, 10).value
                 if img_type_val:
                     image_type = img_type_val.strip().lower()
             except:
                 pass
-
-            # 프롬프트 준비 (모든 타입에서 H열이 비어있으면 Gemini로 생성)
-            current_prompt = ""
+        
+        if not image_type:
+            image_type = "gemini"
+        
+        print(f"  📋 [Group {gid}] promptABC: {style_char}, imagetype: {image_type}")
+        
+        # Flux 모델 사용 시 프롬프트 최적화
+        if image_type == "flux":
+            original_prompt = current_prompt
+            current_prompt = optimize_prompt_for_flux(current_prompt)
+            if original_prompt != current_prompt:
+                try:
+                    # YtFactory3 방식: retry_on_quota_exceeded 사용하지 않고 직접 시도
+                    selected_sheet.update_cell(row_idx, 8, current_prompt)
+                except:
+                    pass
+        
+        # 이미지 생성
+        if image_type == "fal":
+            if not fal_key:
+                print(f"  ❌ [Group {gid}] Fal 키가 없어 이미지를 생성할 수 없습니다.")
+                continue
+            
+            fal_root_keyword = ""
             try:
-                val = selected_sheet.cell(row_idx, 8).value  # H열 = 8번째 컬럼
-                if val and len(str(val).strip()) > 10:
-                    current_prompt = str(val).strip()
+                # YtFactory3 방식: retry_on_quota_exceeded 사용하지 않고 직접 시도
+                fal_root_val = selected_sheet.cell(row_idx, 13).value
+                if fal_root_val:
+                    fal_root_keyword = fal_root_val.strip()
             except:
                 pass
-
-            # H열이 비어있으면 프롬프트 생성 (gemini/flux/fal 모두 공통)
-            if not current_prompt:
-                template = load_prompt_template(style_char)
-                if not template:
-                    print(f"  ❌ 템플릿({style_char}.txt) 없음 (J열={image_type})")
-                    current_failed.add(gid)
-                    continue
-
-                print(f"  📝 프롬프트 생성 중... (상황: {combined_text[:50]}...)")
-                current_prompt = generate_prompt_text(combined_text, template, key_manager)
-
-                if current_prompt:
-                    # Flux 모델 사용 시 프롬프트 최적화 (선명도 개선)
-                    if image_type == "flux":
-                        original_prompt = current_prompt
-                        current_prompt = optimize_prompt_for_flux(current_prompt)
-                        if original_prompt != current_prompt:
-                            print(f"  ✨ Flux 모델용 프롬프트 최적화 완료")
-                    
-                    try:
-                        # H열에 프롬프트 저장
-                        selected_sheet.update_cell(row_idx, 8, current_prompt)
-                    except:
-                        pass
-                else:
-                    print(f"  ❌ 프롬프트 생성 실패 (J열={image_type})")
-                    current_failed.add(gid)
-                    continue
-            else:
-                # H열에 이미 프롬프트가 있는 경우에도 Flux 모델이면 최적화 적용
-                if image_type == "flux":
-                    original_prompt = current_prompt
-                    current_prompt = optimize_prompt_for_flux(current_prompt)
-                    if original_prompt != current_prompt:
-                        print(f"  ✨ Flux 모델용 프롬프트 최적화 완료 (기존 프롬프트 수정)")
-                        try:
-                            # 최적화된 프롬프트를 H열에 업데이트
-                            selected_sheet.update_cell(row_idx, 8, current_prompt)
-                        except:
-                            pass
-
-            # 이미지 생성 분기 처리
-            if current_prompt:
-                print(f"  🎨 이미지 생성 시작... (타입: {image_type}, 프롬프트 길이: {len(current_prompt)}자)")
-                success = False
-                error_type = 'other'
-                
-                if image_type == "fal":
-                    # Fal 타입: M열(fal_RootImage) 확인 후 Image-to-Image 생성
-                    if not fal_key:
-                        print("  ❌ Fal 키가 없어 이미지를 생성할 수 없습니다. (J열=fal)")
-                        current_failed.add(gid)
-                        continue
-                    
-                    # M열(fal_RootImage) 확인: 13번째 컬럼 (M=13)
-                    fal_root_keyword = ""
-                    try:
-                        fal_root_val = selected_sheet.cell(row_idx, 13).value
-                        if fal_root_val:
-                            fal_root_keyword = fal_root_val.strip()
-                    except:
-                        pass
-                    
-                    image_url = None
-                    # M열에 값이 있으면 참조 이미지 찾아서 업로드, 없으면 Text-to-Image로 진행
-                    if fal_root_keyword:
-                        image_url = find_and_upload_fal_image(fal_root_keyword, fal_key)
-                        if not image_url:
-                            print("  ⚠️ Fal 참조 이미지를 업로드하지 못했습니다. Text-to-Image로 진행합니다.")
-                            # image_url은 None으로 유지하여 Text-to-Image로 진행
-                    else:
-                        print("  ℹ️ M열(fal_RootImage)이 비어있어 Text-to-Image로 생성합니다.")
-                    
-                    # Fal로 이미지 생성 (image_url이 있으면 Image-to-Image, 없으면 Text-to-Image)
-                    success = generate_image_fal(current_prompt, image_url, save_filename, FINAL_OUTPUT_DIR, fal_key)
-                    
-                elif image_type == "flux":
-                    # Flux 타입: DeepInfra 사용
-                    if not deep_key:
-                        print("  ❌ DeepInfra 키가 없어 FLUX 이미지를 생성할 수 없습니다. (J열=flux)")
-                        current_failed.add(gid)
-                        continue
-                    success = generate_image_file_deepinfra(current_prompt, save_filename, deep_key, FINAL_OUTPUT_DIR)
-                else:
-                    # 기본값 및 'gemini'일 때 (KeyManager 사용)
-                    result = generate_image_file(current_prompt, save_filename, key_manager, FINAL_OUTPUT_DIR)
-                    if isinstance(result, tuple):
-                        success, error_type = result
-                    else:
-                        # 기존 호환성 유지 (tuple이 아닌 경우)
-                        success = result
-                        error_type = 'other' if not success else 'success'
-                
-                if not success:
-                    # Responsible AI 위반이 감지되었고, DeepInfra/Fal 키가 있으면 폴백 시도
-                    if error_type == 'responsible_ai' and (deep_key or fal_key):
-                        print(f"  🔄 Responsible AI 위반 감지 -> DeepInfra/Fal 폴백 시도")
-                        fallback_success = False
-                        
-                        # DeepInfra 우선 시도
-                        if deep_key:
-                            print(f"  🎨 DeepInfra로 폴백 시도 중...")
-                            fallback_success = generate_image_file_deepinfra(current_prompt, save_filename, deep_key, FINAL_OUTPUT_DIR)
-                        
-                        # DeepInfra 실패 시 Fal 시도
-                        if not fallback_success and fal_key:
-                            print(f"  🎨 Fal로 폴백 시도 중...")
-                            image_url = None
-                            # M열 확인 (이미 위에서 확인했지만 다시 확인)
-                            try:
-                                fal_root_val = selected_sheet.cell(row_idx, 13).value
-                                if fal_root_val:
-                                    fal_root_keyword = fal_root_val.strip()
-                                    image_url = find_and_upload_fal_image(fal_root_keyword, fal_key)
-                            except:
-                                pass
-                            fallback_success = generate_image_fal(current_prompt, image_url, save_filename, FINAL_OUTPUT_DIR, fal_key)
-                        
-                        if fallback_success:
-                            print(f"  ✅ 폴백 성공!")
-                            success = True
-                    
-                    if not success:
-                        current_failed.add(gid)  # 실패한 그룹 추가
-        
-        # 실패한 그룹 업데이트
-        failed_groups = current_failed
-        
-        if failed_groups:
-            print(f"\n⚠️ {len(failed_groups)}개 그룹이 실패했습니다. 계속 재시도합니다...")
-            print(f"   실패한 그룹: {sorted(failed_groups, key=lambda x: int(x) if x.isdigit() else 9999)}")
+            
+            image_url = None
+            if fal_root_keyword:
+                image_url = find_and_upload_fal_image(fal_root_keyword, fal_key)
+                if not image_url:
+                    print(f"  ⚠️ [Group {gid}] Fal 참조 이미지 업로드 실패. Text-to-Image로 진행합니다.")
+            
+            success = generate_image_fal(current_prompt, image_url, save_filename, FINAL_OUTPUT_DIR, fal_key, profile)
+            
+        elif image_type == "flux":
+            if not deep_key:
+                print(f"  ❌ [Group {gid}] DeepInfra 키가 없어 FLUX 이미지를 생성할 수 없습니다.")
+                continue
+            success = generate_image_file_deepinfra(current_prompt, save_filename, deep_key, FINAL_OUTPUT_DIR, profile)
+            
         else:
-            print(f"\n✅ 모든 그룹 처리 완료!")
+            # 기본값 및 'gemini'일 때 (YtFactory3 방식)
+            success = generate_image_file(current_prompt, save_filename, api_keys, FINAL_OUTPUT_DIR, profile)
+        
+        # 입력 해시는 실제로 사용한(시트 H열에 저장된) 프롬프트 기준
+        record_group(gid, full_path_png, hash_inputs("image", current_prompt, image_type), started, success)
     
-    print(f"\n🎉 총 {cycle_count} 사이클로 모든 작업 완료!")
+    print(f"\n🎉 모든 그룹 처리 완료!")
 
-if __name__ == "__main__": main()
\ No newline at end of file
+    # 다음 단계(켄번/머지파이)로 넘길 수 없는 그룹이 있으면 실패 코드 (예전 결과만 남은 그룹 포함)
+    missing_groups = [gid for gid in sorted_groups if gid not in ready_groups]
+    if missing_groups:
+        print(f"⚠️ 이미지/영상이 없는 그룹 {len(missing_groups)}개: {', '.join(missing_groups[:20])}")
+        return 1
+    return 0
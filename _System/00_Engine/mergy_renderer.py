@@ -0,0 +1,1048 @@
+"""
+최종 영상 조립 공용 렌더러 (출력 프로파일)
+Mergy (롱폼) / Mergy_Shorts (쇼츠) / ShortsDeriver (롱폼 → 쇼츠 추출) 가 함께 사용
+
+- 롱폼/쇼츠 차이는 OUTPUT_PROFILES 한 곳에만 선언
+    해상도, fps, 비트레이트, 기본 자막 스타일, 자막 안전 영역, 리포트 단계 이름
+- 같은 타임라인(시트 행 순서 + 비디오 커서)을 여러 프로파일로 한 번에 렌더링 가능
+    → 클립마다 소스 디코딩/세그먼트 계산/역재생 캐시를 한 번만 하고
+      ffmpeg 한 번 실행으로 프로파일별 클립을 동시에 출력 (split → 프로파일별 scale/pad + 자막 overlay)
+    → 클립 매니페스트는 프로파일별 단일 출력 명령 기준 해시 → 입력이 그대로인 프로파일은 건너뜀
+- 출력 폴더: 첫 번째(주) 프로파일은 기존과 같은 Clip / Mergy
+  함께 렌더링하는 나머지 프로파일은 Clip_{접미어} / Mergy_{접미어} (예: Clip_Shorts, Mergy_Shorts)
+- 사용법: python Mergy.py (롱폼) / python Mergy_Shorts.py (쇼츠)
+  롱폼 + 쇼츠 동시: YTF_MERGY_PROFILES=long,shorts python Mergy.py --sheet Ch01_19go
+"""
+import os
+import subprocess
+import json
+from contextlib import ExitStack
+import gspread
+from oauth2client.service_account import ServiceAccountCredentials
+from ffmpeg_runner import run_ffmpeg, print_summary, write_report
+from text_overlay import render_text_overlay
+from style_registry import get_style_registry
+from engine_cli import get_engine_options, select_go_sheet, resolve_channel
+from stream_queue import GroupWorkQueue, is_ready, is_stage_done
+from run_manifest import RunManifest, hash_inputs, file_fingerprint, atomic_output
+from sheet_backend import open_sheet_backend
+
+# ==========================================
+# 1. 설정 및 경로 정의
+# ==========================================
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# YtFactory9 절대 경로 기반 설정
+BASE_DIR = r"C:\YtFactory9"
+ASSET_DIR = r"C:\YtFactory9\_System\04_Co_Asset"
+
+# [필수 자산 경로]
+FFMPEG_CMD = r"C:\YtFactory9\ffmpeg.exe"
+FFPROBE_CMD = r"C:\YtFactory9\ffprobe.exe"
+# 기본 폰트 (폴백용) - 실제 사용 폰트는 subtype 기반으로 동적 선택
+FONT_PATH = os.path.join(ASSET_DIR, "Sub", "Fonts", "BMJUA_ttf.ttf")
+# 자막 PNG 캐시 (문구+스타일+해상도 단위, 에피소드 간 공유)
+TEXT_CACHE_DIR = os.path.join(ASSET_DIR, "Sub", "_TextCache")
+# 자막 스타일 / 폰트 폴더 (style_registry 가 한 번만 로드)
+STYLES_DIR = os.path.join(ASSET_DIR, "Sub", "Styles")
+FONTS_DIR = os.path.join(ASSET_DIR, "Sub", "Fonts")
+
+# 스타일 파일에 값이 없을 때 쓰는 자막 기본값
+SUBTITLE_STYLE_DEFAULTS = {
+    "fontsize": 50,
+    "fontcolor": "white",
+    "x": "(w-text_w)/2",
+    "y": "h-100",
+    "box": 1,
+    "boxcolor": "black@0.6",
+    "boxborderw": 10
+}
+
+# 역재생 캐시 렌더링 단위 (초) - reverse 필터가 한 번에 버퍼링하는 최대 길이
+REVERSE_CHUNK_SEC = 2.0
+
+# 클립 인코딩 규격 (모든 클립이 동일해야 최종 병합이 -c copy로 끝남)
+# fps / GOP 길이는 출력 프로파일마다 다름 → get_clip_spec(profile)
+CLIP_SPEC = {
+    "timescale": 15360,      # 비디오 트랙 timebase = 1/15360
+    "pix_fmt": "yuv420p",
+    "profile": "high",
+    "level": "4.0",
+    "gop_sec": 2,            # 2초 고정 GOP (장면 전환 키프레임 비활성화)
+    "sar": "1:1",
+    "sample_rate": 44100,
+    "channels": 2,
+}
+
+# 출력 프로파일 (해상도 / fps / 비트레이트 / 기본 자막 스타일 / 자막 안전 영역)
+# - bitrate: video_maxrate 가 None 이면 기존처럼 CRF 기본값(품질 고정), 값이 있으면 상한 + 버퍼 지정
+# - fit: "pad" = 비율 유지 축소 + 검은 여백 (블랙바) / "crop" = 화면을 꽉 채우고 넘치는 부분 잘라냄
+# - safe_area: (왼, 위, 오른, 아래) 여백 px, 자막 글상자를 이 안으로 당김 (None = 스타일 위치 그대로)
+# - dir_suffix: 주 프로파일이 아닐 때 출력 폴더 접미어 (Clip_{접미어} / Mergy_{접미어})
+OUTPUT_PROFILES = {
+    "long": {
+        "name": "long",
+        "stage": "Mergy",
+        "banner": "🚀 [Mergy] 최종 영상 조립기 (Smart Skip & Sync) 시작",
+        "resolution": (1280, 720),
+        "fit": "pad",
+        "fps": 30,
+        "bitrate": {"video_maxrate": None, "video_bufsize": None, "audio": "192k"},
+        "default_style": "default",
+        "safe_area": None,
+        "dir_suffix": "Long",
+    },
+    "shorts": {
+        "name": "shorts",
+        "stage": "Mergy_Shorts",
+        "banner": "🚀 [Mergy_Shorts] 쇼츠 전용 영상 조립기 시작",
+        "resolution": (720, 1280),
+        "fit": "pad",
+        "fps": 30,
+        "bitrate": {"video_maxrate": None, "video_bufsize": None, "audio": "192k"},
+        "default_style": "default_Shorts",
+        # 쇼츠 플레이어 UI: 하단 제목/채널명, 우측 좋아요·댓글 버튼, 상단 검색바
+        "safe_area": (40, 100, 90, 260),
+        "dir_suffix": "Shorts",
+    },
+}
+# 가로 영상(롱폼 재료) → 세로 화면 가운데 잘라내기 (ShortsDeriver --crop)
+OUTPUT_PROFILES["shorts_crop"] = dict(OUTPUT_PROFILES["shorts"], name="shorts_crop", fit="crop", dir_suffix="ShortsCrop")
+
+# 함께 렌더링할 프로파일 목록 (쉼표 구분, 예: long,shorts) - 없으면 엔진별 기본 프로파일
+PROFILES_ENV = "YTF_MERGY_PROFILES"
+
+# 공통 키/시트 설정 (ImageMaker / VoiceMaker와 동일)
+JSON_KEY_FILE = r"C:\YtFactory9\_System\02_Key\service_account.json"
+SHEET_URL_FILE = r"C:\YtFactory9\_System\00_Engine\YtFactory9_URL.txt"
+
+# 워크플로우별 고유 auto_sheet 파일 (환경변수 우선)
+ENV_AUTO_SHEET = os.environ.get("YTF_AUTO_SHEET_FILE")
+if ENV_AUTO_SHEET and ENV_AUTO_SHEET.strip():
+    AUTO_SHEET_FILE = ENV_AUTO_SHEET.strip()
+else:
+    AUTO_SHEET_FILE = os.path.join(CURRENT_DIR, "_auto_sheet.txt")
+
+# ==========================================
+# 2. 유틸리티 함수
+# ==========================================
+def load_spreadsheet(client):
+    """
+    Sheet_URL.txt 내용을 읽어서 스프레드시트에 접속.
+    - URL 전체를 넣어두면 open_by_url 사용
+    - ID만 넣어두면 open_by_key 사용
+    """
+    if not os.path.exists(SHEET_URL_FILE):
+        raise FileNotFoundError(f"Sheet_URL.txt 파일을 찾을 수 없습니다: {SHEET_URL_FILE}")
+
+    with open(SHEET_URL_FILE, "r", encoding="utf-8") as f:
+        raw = f.read().strip()
+
+    if not raw:
+        raise ValueError("Sheet_URL.txt 파일이 비어 있습니다.")
+
+    if "https://docs.google.com" in raw:
+        return client.open_by_url(raw)
+    else:
+        return client.open_by_key(raw)
+
+
+def resolve_profiles(default_names):
+    """
+    렌더링할 출력 프로파일 목록 (첫 번째가 주 프로파일)
+    - 환경변수 YTF_MERGY_PROFILES 가 있으면 그 목록, 없으면 default_names
+    반환: 프로파일 dict 리스트 (알 수 없는 이름이 있으면 ValueError)
+    """
+    raw = os.environ.get(PROFILES_ENV, "").strip()
+    names = [n.strip() for n in raw.split(",") if n.strip()] if raw else list(default_names)
+    unknown = [n for n in names if n not in OUTPUT_PROFILES]
+    if unknown:
+        raise ValueError(f"알 수 없는 출력 프로파일: {', '.join(unknown)} (가능: {', '.join(OUTPUT_PROFILES)})")
+    # 같은 이름이 두 번 들어와도 한 번만 렌더링
+    return [OUTPUT_PROFILES[n] for n in dict.fromkeys(names)]
+
+
+def get_profile_dirs(root_output, profile, primary):
+    """ 프로파일별 (클립 폴더, 최종 영상 폴더) - 주 프로파일은 기존 폴더 이름 그대로 """
+    suffix = "" if primary else f"_{profile['dir_suffix']}"
+    return os.path.join(root_output, f"Clip{suffix}"), os.path.join(root_output, f"Mergy{suffix}")
+
+
+def get_audio_duration(audio_path):
+    """ 오디오 파일 길이 정밀 측정 (ffprobe, float 리턴) """
+    try:
+        cmd = [
+            FFPROBE_CMD, "-v", "error", "-show_entries",
+            "format=duration", "-of", "default=noprint_wrappers=1:nokey=1", audio_path
+        ]
+        result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+        return float(result.stdout.strip())
+    except:
+        return 0.0
+
+def get_video_duration(video_path):
+    """ 비디오 파일 길이 정밀 측정 (ffprobe, float 리턴) """
+    try:
+        cmd = [
+            FFPROBE_CMD, "-v", "error", "-select_streams", "v:0",
+            "-show_entries", "stream=duration", "-of", "default=noprint_wrappers=1:nokey=1", video_path
+        ]
+        result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+        duration = result.stdout.strip()
+        if duration:
+            return float(duration)
+        # 비디오 스트림 duration이 없으면 format duration 사용
+        cmd = [
+            FFPROBE_CMD, "-v", "error", "-show_entries",
+            "format=duration", "-of", "default=noprint_wrappers=1:nokey=1", video_path
+        ]
+        result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+        return float(result.stdout.strip())
+    except:
+        return 0.0
+
+def get_clip_spec(profile):
+    """ 프로파일의 클립 규격 (CLIP_SPEC + fps / GOP) """
+    spec = dict(CLIP_SPEC)
+    spec["fps"] = profile["fps"]
+    spec["gop"] = profile["fps"] * CLIP_SPEC["gop_sec"]
+    return spec
+
+def get_clip_encode_args(profile):
+    """ 프로파일 클립 규격에 맞춘 인코딩 인자 (모든 클립 생성 명령이 공통 사용) """
+    spec = get_clip_spec(profile)
+    bitrate = profile["bitrate"]
+    args = [
+        "-c:v", "libx264", "-preset", "fast",
+        "-pix_fmt", spec["pix_fmt"],
+        "-profile:v", spec["profile"], "-level:v", spec["level"],
+        "-r", str(spec["fps"]),
+        "-g", str(spec["gop"]), "-keyint_min", str(spec["gop"]), "-sc_threshold", "0",
+        "-video_track_timescale", str(spec["timescale"]),
+    ]
+    if bitrate.get("video_maxrate"):
+        args += ["-maxrate", bitrate["video_maxrate"], "-bufsize", bitrate.get("video_bufsize") or bitrate["video_maxrate"]]
+    args += [
+        "-c:a", "aac", "-b:a", bitrate["audio"],
+        "-ar", str(spec["sample_rate"]), "-ac", str(spec["channels"]),
+    ]
+    return args
+
+def get_profile_video_filter(profile):
+    """ 공통 영상 → 프로파일 화면 (pad: 비율 유지 축소 + 레터박스 / crop: 꽉 채워 가운데 잘라내기) """
+    w, h = profile["resolution"]
+    if profile.get("fit") == "crop":
+        fit_vf = f"scale={w}:{h}:force_original_aspect_ratio=increase,crop={w}:{h},"
+    else:
+        fit_vf = (
+            f"scale={w}:{h}:force_original_aspect_ratio=decrease,"
+            f"pad={w}:{h}:(ow-iw)/2:(oh-ih)/2,"
+        )
+    return f"{fit_vf}setsar=1,fps={profile['fps']},format=yuv420p"
+
+def check_clip_spec(clip_path, profile):
+    """
+    클립의 스트림 파라미터를 ffprobe로 읽어 프로파일 클립 규격과 비교합니다.
+    반환: 불일치 항목 리스트 (비어 있으면 규격 통과)
+    """
+    spec = get_clip_spec(profile)
+    cmd = [
+        FFPROBE_CMD, "-v", "error",
+        "-show_entries",
+        "stream=codec_type,codec_name,pix_fmt,profile,level,r_frame_rate,time_base,"
+        "sample_aspect_ratio,sample_rate,channels,width,height",
+        "-of", "json", clip_path
+    ]
+    try:
+        result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+        streams = json.loads(result.stdout).get("streams", [])
+    except Exception as e:
+        return [f"ffprobe 실패: {e}"]
+
+    video = next((s for s in streams if s.get("codec_type") == "video"), None)
+    audio = next((s for s in streams if s.get("codec_type") == "audio"), None)
+    if not video:
+        return ["비디오 스트림 없음"]
+    if not audio:
+        return ["오디오 스트림 없음"]
+
+    expected_level = int(float(spec["level"]) * 10)
+    checks = [
+        ("codec", video.get("codec_name"), "h264"),
+        ("size", (video.get("width"), video.get("height")), tuple(profile["resolution"])),
+        ("pix_fmt", video.get("pix_fmt"), spec["pix_fmt"]),
+        ("profile", (video.get("profile") or "").lower(), spec["profile"]),
+        ("level", video.get("level"), expected_level),
+        ("fps", video.get("r_frame_rate"), f"{spec['fps']}/1"),
+        ("timebase", video.get("time_base"), f"1/{spec['timescale']}"),
+        ("sar", video.get("sample_aspect_ratio", "1:1"), spec["sar"]),
+        ("audio_codec", audio.get("codec_name"), "aac"),
+        ("sample_rate", str(audio.get("sample_rate")), str(spec["sample_rate"])),
+        ("channels", audio.get("channels"), spec["channels"]),
+    ]
+    return [f"{name}={actual} (규격: {expected})" for name, actual, expected in checks if actual != expected]
+
+def validate_clips_for_concat(clips, profile):
+    """
+    [병합 전 검사] 모든 클립이 프로파일 클립 규격을 따르는지 확인하고,
+    벗어난 클립만 개별 재인코딩하여 -c copy 병합이 가능하도록 맞춥니다.
+    반환: 규격화된 클립 경로 리스트
+    """
+    normalized = []
+    for clip in clips:
+        problems = check_clip_spec(clip, profile)
+        if not problems:
+            normalized.append(clip)
+            continue
+
+        print(f"   ⚠️ 규격 불일치: {os.path.basename(clip)} → {', '.join(problems)}")
+        fixed_clip = clip.replace(".mp4", "_spec.mp4")
+        cmd = [
+            FFMPEG_CMD, "-y", "-i", clip,
+            "-vf", get_profile_video_filter(profile),
+            *get_clip_encode_args(profile),
+            fixed_clip
+        ]
+        try:
+            run_ffmpeg(cmd, label=os.path.basename(clip), stage=f"{profile['stage']}.normalize")
+            os.replace(fixed_clip, clip)
+            print(f"   🔧 규격 맞춤 완료: {os.path.basename(clip)}")
+        except Exception as e:
+            print(f"   💥 규격 맞춤 실패: {e}")
+        normalized.append(clip)
+    return normalized
+
+def ensure_video_has_audio(video_path, stage="Mergy"):
+    """
+    비디오 파일에 오디오 스트림이 있는지 확인하고, 없으면 무음 오디오를 추가
+    반환: 오디오가 있는 비디오 경로 (원본 또는 새로 생성된 파일)
+    """
+    try:
+        # 비디오에 오디오 스트림이 있는지 확인
+        cmd = [
+            FFPROBE_CMD, "-v", "error", "-select_streams", "a:0",
+            "-show_entries", "stream=codec_type", "-of", "default=noprint_wrappers=1:nokey=1",
+            video_path
+        ]
+        result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+
+        # 오디오 스트림이 있으면 원본 반환
+        if result.stdout.strip() == "audio":
+            return video_path
+
+        # 오디오가 없으면 비디오 길이 측정
+        video_duration = get_audio_duration(video_path)
+        if video_duration <= 0:
+            # 비디오 길이를 비디오 스트림으로 측정
+            cmd = [
+                FFPROBE_CMD, "-v", "error", "-select_streams", "v:0",
+                "-show_entries", "stream=duration", "-of", "default=noprint_wrappers=1:nokey=1",
+                video_path
+            ]
+            result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+            try:
+                video_duration = float(result.stdout.strip())
+            except:
+                video_duration = 5.0  # 기본값 5초
+
+        # 무음 오디오 추가
+        output_path = video_path.replace(".mp4", "_with_audio.mp4")
+        print(f"   🔊 오디오 없음 감지 → 무음 오디오 추가 중... ({video_duration:.2f}초)")
+
+        cmd = [
+            FFMPEG_CMD, "-y",
+            "-i", video_path,
+            "-f", "lavfi", "-i", f"anullsrc=channel_layout=stereo:sample_rate=44100",
+            "-c:v", "copy",
+            "-c:a", "aac", "-b:a", "192k",
+            "-ar", str(CLIP_SPEC["sample_rate"]), "-ac", str(CLIP_SPEC["channels"]),
+            "-shortest",
+            "-t", str(video_duration),
+            output_path
+        ]
+
+        run_ffmpeg(cmd, label=os.path.basename(video_path), stage=f"{stage}.audio_pad", total_duration=video_duration)
+        return output_path
+
+    except Exception as e:
+        print(f"   ⚠️ 오디오 추가 실패: {e}, 원본 파일 사용")
+        return video_path
+
+def find_visual_asset(search_dir, gid):
+    """
+    [서열 정리 알고리즘]
+    GID(이미지그룹)를 기준으로 우선순위에 따라 파일을 찾습니다.
+    반환값: (파일경로, 타입: 'video'|'image', 설명)
+    """
+    gid = str(gid).strip()
+
+    # 우선순위 목록 (1~6순위)
+    candidates = [
+        (f"{gid}_source.mp4",      "video", "👑 1순위 (소스 영상)"),
+        (f"{gid}.mp4",             "video", "🥈 2순위 (수동 영상)"),
+        (f"{gid}_source_kb.mp4",   "video", "🥉 3순위 (소스 켄번)"),
+        (f"{gid}_image_group.mp4", "video", "4순위 (AI 켄번)"),
+        (f"{gid}.png",             "image", "5순위 (수동 이미지)"),
+        (f"{gid}_image_group.png", "image", "6순위 (AI 이미지)")
+    ]
+
+    for fname, type_, desc in candidates:
+        path = os.path.join(search_dir, fname)
+        if os.path.exists(path):
+            return path, type_, desc
+
+    return None, None, None
+
+
+def get_reverse_cache(video_path, video_duration, cache_dir, stage="Mergy"):
+    """
+    [역재생 캐시] 소스 영상의 역재생 버전을 에셋당 1회만 렌더링합니다.
+    - reverse 필터는 입력 전체를 RAM에 버퍼링하므로, REVERSE_CHUNK_SEC 단위로 잘라
+      조각별로 역재생한 뒤 역순으로 이어붙임 (메모리 사용량이 조각 크기로 고정)
+    - 캐시가 원본보다 최신이면 그대로 재사용
+    반환: 역재생 캐시 경로 (실패 시 None)
+    """
+    if not os.path.exists(cache_dir):
+        os.makedirs(cache_dir)
+
+    base_name = os.path.splitext(os.path.basename(video_path))[0]
+    cache_path = os.path.join(cache_dir, f"{base_name}_reverse.mp4")
+
+    if os.path.exists(cache_path) and os.path.getmtime(cache_path) >= os.path.getmtime(video_path):
+        return cache_path
+
+    print(f"   ⏪ 역재생 캐시 생성 중: {os.path.basename(cache_path)} ({video_duration:.2f}초)")
+
+    chunk_paths = []
+    chunk_start = 0.0
+    chunk_idx = 0
+    try:
+        while chunk_start < video_duration:
+            chunk_len = min(REVERSE_CHUNK_SEC, video_duration - chunk_start)
+            chunk_path = os.path.join(cache_dir, f"{base_name}_rev{chunk_idx:04d}.mp4")
+            cmd = [
+                FFMPEG_CMD, "-y",
+                "-ss", f"{chunk_start:.3f}", "-t", f"{chunk_len:.3f}",
+                "-i", video_path,
+                "-an", "-vf", "reverse",
+                "-c:v", "libx264", "-preset", "fast", "-crf", "18", "-pix_fmt", "yuv420p",
+                chunk_path
+            ]
+            run_ffmpeg(cmd, label=f"{base_name} rev{chunk_idx:04d}", stage=f"{stage}.reverse", total_duration=chunk_len, quiet=True)
+            chunk_paths.append(chunk_path)
+            chunk_start += chunk_len
+            chunk_idx += 1
+
+        # 마지막 조각부터 역순으로 이어붙이면 전체 역재생 영상이 됨
+        list_txt = os.path.join(cache_dir, f"{base_name}_rev_list.txt")
+        with open(list_txt, "w", encoding="utf-8") as f:
+            for chunk_path in reversed(chunk_paths):
+                safe_path = chunk_path.replace("\\", "/").replace("'", "'\\''")
+                f.write(f"file '{safe_path}'\n")
+
+        temp_path = cache_path.replace(".mp4", "_tmp.mp4")
+        cmd = [
+            FFMPEG_CMD, "-y", "-f", "concat", "-safe", "0",
+            "-i", list_txt, "-c", "copy", temp_path
+        ]
+        run_ffmpeg(cmd, label=os.path.basename(cache_path), stage=f"{stage}.reverse", total_duration=video_duration)
+        os.replace(temp_path, cache_path)
+        os.remove(list_txt)
+        return cache_path
+    except Exception as e:
+        print(f"   ⚠️ 역재생 캐시 생성 실패: {e}, reverse 필터로 대체")
+        return None
+    finally:
+        for chunk_path in chunk_paths:
+            if os.path.exists(chunk_path):
+                os.remove(chunk_path)
+
+
+def get_subtitle_style(subtype, profile):
+    r"""
+    시트 E열(Subtype)을 기반으로 자막 스타일 설정을 로드합니다.
+    우선순위:
+      1) _System\04_Co_Asset\Sub\Styles\{subtype}.json 파일에서 스타일 로드
+      2) 프로파일 기본 스타일: default.json (롱폼) / default_Shorts.json (쇼츠)
+      3) 하드코딩된 기본값
+    스타일 파일은 레지스트리가 한 번만 파싱해 두고, 파일이 수정된 경우에만 다시 읽습니다.
+    반환값: dict (fontfile, fontsize, fontcolor, x, y, box, boxcolor, boxborderw)
+    """
+    registry = get_style_registry(STYLES_DIR, FONTS_DIR, FONT_PATH)
+    subtype_clean = (subtype or "").strip()
+
+    if subtype_clean:
+        # 대소문자 구분하여 파일명 매칭 (Chapter.json, Talk.json 등)
+        objects = registry.get(subtype_clean)
+        if objects:
+            return registry.build_style(objects[0], SUBTITLE_STYLE_DEFAULTS)
+        registry.warn_once(f"subtype:{subtype_clean}", f"   ⚠️ 스타일 파일 없음/로드 실패: {subtype_clean}.json, 기본 스타일 사용")
+
+    # 폴백: 프로파일 기본 스타일
+    default_style = profile["default_style"]
+    objects = registry.get(default_style)
+    if objects:
+        return registry.build_style(objects[0], SUBTITLE_STYLE_DEFAULTS)
+
+    # 최종 폴백: 하드코딩된 기본값
+    registry.warn_once(default_style, f"   ⚠️ 기본값 사용 (스타일 파일 없음: {default_style}.json)")
+    return registry.build_style({}, SUBTITLE_STYLE_DEFAULTS)
+
+
+def build_timeline_filter(task, duration, start_time, reverse_dir, stage="Mergy"):
+    """
+    한 컷의 공통 영상/음성 필터 (프로파일과 무관, 원본 해상도 그대로)
+    - 이미지: 정지 화면 / 비디오: 커서(start_time)부터 정방향-역방향-정방향 반복
+    반환: (입력 인자, 필터 문자열) - 출력 라벨은 [base_v], [a]
+    """
+    if task['v_type'] == 'image':
+        # 🖼️ 이미지 -> 단순 정지 화면
+        input_args = ["-loop", "1", "-i", task['visual'], "-i", task['audio']]
+        return input_args, "[0:v]setsar=1,setpts=PTS-STARTPTS[base_v];[1:a]apad[a]"
+
+    # 🎥 비디오 -> 정방향-역방향-정방향 반복 패턴
+    video_duration = get_video_duration(task['visual'])
+    loop_chain = (
+        f"[0:v]loop=loop=-1:size=32767:start=0,"
+        f"trim=start={start_time}:duration={duration},"
+        f"setpts=PTS-STARTPTS,setsar=1[base_v];[1:a]apad[a]"
+    )
+
+    if video_duration <= 0:
+        # 비디오 길이를 측정할 수 없으면 기본 루프 사용
+        return ["-i", task['visual'], "-i", task['audio']], loop_chain
+
+    # 필요한 세그먼트 계산
+    segments = []
+    remaining_time = duration
+    is_forward = True
+    current_pos = start_time % video_duration
+
+    while remaining_time > 0:
+        if is_forward:
+            # 정방향 재생
+            segment_duration = min(remaining_time, video_duration - current_pos)
+            if segment_duration > 0:
+                segments.append({
+                    'start': current_pos,
+                    'duration': segment_duration,
+                    'reverse': False
+                })
+                remaining_time -= segment_duration
+                current_pos += segment_duration
+                if current_pos >= video_duration:
+                    current_pos = 0
+                    is_forward = False
+        else:
+            # 역방향 재생 (되감기)
+            segment_duration = min(remaining_time, video_duration)
+            if segment_duration > 0:
+                segments.append({
+                    'start': video_duration - segment_duration,
+                    'duration': segment_duration,
+                    'reverse': True
+                })
+                remaining_time -= segment_duration
+                is_forward = True
+
+    # 세그먼트가 없으면 기본 처리
+    if not segments:
+        return ["-i", task['visual'], "-i", task['audio']], loop_chain
+
+    # 역방향 세그먼트는 미리 렌더링된 역재생 캐시에서 잘라옴 (reverse 필터 RAM 버퍼링 방지)
+    reverse_path = None
+    if any(seg['reverse'] for seg in segments):
+        reverse_path = get_reverse_cache(task['visual'], video_duration, reverse_dir, stage)
+
+    # 세그먼트마다 입력 단계에서 -ss/-t로 탐색 (처음부터 디코딩하지 않음)
+    input_args = []
+    segment_filters = []
+    for i, seg in enumerate(segments):
+        if seg['reverse'] and reverse_path:
+            # 원본 [start, start+duration] 역재생 = 캐시의 [D-start-duration, D-start]
+            seek = max(video_duration - seg['start'] - seg['duration'], 0.0)
+            input_args += ["-ss", f"{seek:.3f}", "-t", f"{seg['duration']:.3f}", "-i", reverse_path]
+            base_vf = "setpts=PTS-STARTPTS"
+        else:
+            input_args += ["-ss", f"{seg['start']:.3f}", "-t", f"{seg['duration']:.3f}", "-i", task['visual']]
+            base_vf = "setpts=PTS-STARTPTS"
+            if seg['reverse']:
+                base_vf = f"{base_vf},reverse"
+        # concat 필터는 SAR/픽셀 포맷이 같아야 함 (역재생 캐시는 재인코딩본)
+        segment_filters.append(f"[{i}:v]{base_vf},setsar=1,format=yuv420p[seg{i}]")
+    input_args += ["-i", task['audio']]
+    audio_idx = len(segments)
+
+    # concat 필터 생성
+    concat_inputs = "".join([f"[seg{i}]" for i in range(len(segments))])
+    concat_filter = f"{concat_inputs}concat=n={len(segments)}:v=1[base_v]"
+
+    return input_args, ";".join(segment_filters) + ";" + concat_filter + f";[{audio_idx}:a]apad[a]"
+
+
+def build_clip_command(input_args, filter_chain, outputs, duration):
+    """
+    공통 타임라인 필터 → 프로파일별 출력 (ffmpeg 한 번에 여러 클립)
+    - outputs: [(프로파일, 자막 PNG 또는 None), ...]
+    반환: (공통 명령, 출력별 인자 리스트) - 출력 경로는 각 인자 뒤에 붙여서 사용
+    """
+    input_args = list(input_args)
+    filters = [filter_chain]
+    count = len(outputs)
+    if count == 1:
+        video_labels, audio_labels = ["[base_v]"], ["[a]"]
+    else:
+        # 디코딩/세그먼트 조립은 한 번, 프로파일 수만큼 복제
+        video_labels = [f"[vs{i}]" for i in range(count)]
+        audio_labels = [f"[as{i}]" for i in range(count)]
+        filters.append(f"[base_v]split={count}{''.join(video_labels)}")
+        filters.append(f"[a]asplit={count}{''.join(audio_labels)}")
+
+    for i, (profile, subtitle_png) in enumerate(outputs):
+        chain = f"{video_labels[i]}{get_profile_video_filter(profile)}"
+        # 자막 PNG 합성 (자막이 없으면 그대로 통과)
+        if subtitle_png:
+            png_idx = input_args.count("-i")
+            input_args += ["-i", subtitle_png]
+            filters.append(f"{chain}[pv{i}];[pv{i}][{png_idx}:v]overlay=0:0[v{i}]")
+        else:
+            filters.append(f"{chain}[v{i}]")
+
+    cmd = [FFMPEG_CMD, "-y", *input_args, "-filter_complex", ";".join(filters)]
+    output_args = [
+        [
+            "-map", f"[v{i}]", "-map", audio_labels[i],
+            *get_clip_encode_args(profile),  # 프로파일 클립 규격 강제 (병합 시 -c copy 보장)
+            "-t", str(duration),  # Drift 방지용 강제 길이
+        ]
+        for i, (profile, _) in enumerate(outputs)
+    ]
+    return cmd, output_args
+
+
+def concat_clips(clips, final_mp4, profile, timeline_duration):
+    """
+    클립들을 최종 영상 하나로 병합 (임시 파일에 병합 후 이름 변경)
+    1차: -c copy (빠름) / 실패 시 2차: 재인코딩
+    반환: 성공 여부
+    """
+    list_txt = os.path.join(os.path.dirname(final_mp4), "mylist.txt")
+    with open(list_txt, "w", encoding='utf-8') as f:
+        for clip in clips:
+            safe_path = clip.replace("\\", "/").replace("'", "'\\''")
+            f.write(f"file '{safe_path}'\n")
+
+    # 최종 영상도 임시 파일에 병합 후 이름 변경 (실패/중단 시 이전 완성본 유지)
+    with atomic_output(final_mp4) as out:
+        # 1차 시도: Copy Mode (빠름)
+        merge_cmd = [
+            FFMPEG_CMD, "-y", "-f", "concat", "-safe", "0",
+            "-i", list_txt, "-c", "copy", out.path
+        ]
+
+        success = False
+        try:
+            run_ffmpeg(merge_cmd, label=os.path.basename(final_mp4), stage=f"{profile['stage']}.concat", total_duration=timeline_duration)
+            print(f"🎉 [성공] {os.path.basename(final_mp4)} 생성 완료! ({profile['name']})")
+            success = True
+        except:
+            # 클립 규격 검사를 통과했다면 여기 도달하지 않아야 함 (최후의 안전장치)
+            print("⚠️ 고속 병합 실패. 재인코딩 모드로 전환합니다...")
+
+            # 2차 시도: Re-encode Mode (호환성 향상)
+            merge_encode = [
+                FFMPEG_CMD, "-y", "-f", "concat", "-safe", "0",
+                "-i", list_txt,
+                "-c:v", "libx264", "-preset", "fast", "-pix_fmt", "yuv420p",
+                "-c:a", "aac", "-b:a", profile["bitrate"]["audio"],
+                "-avoid_negative_ts", "make_zero",
+                out.path
+            ]
+            try:
+                run_ffmpeg(merge_encode, label=os.path.basename(final_mp4), stage=f"{profile['stage']}.concat_reencode", total_duration=timeline_duration)
+                print(f"🎉 [성공] 재인코딩 병합 완료! ({os.path.basename(final_mp4)}, {profile['name']})")
+                success = True
+            except Exception as e:
+                print(f"💥 최종 병합 실패: {e}")
+        out.ok = success
+
+    if os.path.exists(list_txt): os.remove(list_txt)
+    return out.ok
+
+# ==========================================
+# 3. 타임라인 조립 (시트 행 → 클립 → 최종 영상, ShortsDeriver 도 사용)
+# ==========================================
+def check_required_files(options):
+    """ ffmpeg / ffprobe / 기본 폰트 확인 (없으면 안내 후 False) """
+    if not os.path.exists(FFMPEG_CMD) or not os.path.exists(FFPROBE_CMD):
+        print("🚨 [오류] ffmpeg.exe 또는 ffprobe.exe가 없습니다.")
+        print(f"👉 경로: {CURRENT_DIR}")
+        if options["pause"]: input("엔터 키를 누르면 종료합니다...")
+        return False
+
+    if not os.path.exists(FONT_PATH):
+        print(f"🚨 [오류] 폰트 파일이 없습니다.\n👉 경로: {FONT_PATH}")
+        if options["pause"]: input("엔터 키를 누르면 종료합니다...")
+        return False
+    return True
+
+
+def collect_tasks(rows, root_output, voice_dir, stream_dir=None, row_numbers=None):
+    """
+    🛑 사전 전수 조사 (Zero-Trash Check): 시트 행 → 클립 작업 목록
+    - rows: 헤더를 제외한 시트 행 (rows[0] = 시트 2행)
+    - row_numbers: 포함할 시트 행 번호 집합 (None = 전체)
+    - stream_dir: 스트리밍 모드면 재료 확인을 그룹 차례로 미룸
+    반환: (작업 목록, 누락 로그)
+    """
+    missing_log = []
+    tasks = []
+
+    for i, row in enumerate(rows):
+        if row_numbers is not None and (i + 2) not in row_numbers: continue
+        if len(row) < 3: continue
+
+        row_id = row[0].strip()        # A열: ID
+        script = row[1].strip()        # B열: Script
+        gid = row[2].strip()           # C열: Image Group
+        subtype = row[4].strip() if len(row) > 4 else ""  # E열: Subtype (옵션)
+
+        if not row_id or not gid: continue
+
+        audio_path = os.path.join(voice_dir, f"{row_id}.mp3")
+        if stream_dir:
+            # 📡 스트리밍 모드: 재료는 윗단계가 만드는 중 → 그룹 차례가 올 때 확인
+            tasks.append({
+                "id": row_id, "row": i + 2, "gid": gid, "script": script, "audio": audio_path,
+                "visual": None, "v_type": None, "v_desc": None, "subtype": subtype
+            })
+            continue
+
+        # 1. 오디오 확인
+        if not os.path.exists(audio_path):
+            missing_log.append(f"❌ [Row {i+2}] 오디오 없음: {row_id}.mp3")
+            continue
+
+        # 2. 시각 자료 확인 (C열 GID 기준)
+        visual_path, v_type, v_desc = find_visual_asset(root_output, gid)
+        if not visual_path:
+            missing_log.append(f"❌ [Row {i+2}] 시각자료 없음 (Group: {gid}) - 1~6순위 파일 전멸")
+            continue
+
+        tasks.append({
+            "id": row_id,
+            "row": i + 2,          # 시트 행 번호
+            "gid": gid,
+            "script": script,
+            "audio": audio_path,
+            "visual": visual_path,
+            "v_type": v_type,
+            "v_desc": v_desc,
+            "subtype": subtype
+        })
+    return tasks, missing_log
+
+
+def report_missing(missing_log, options):
+    """ 재료 누락 안내 (쓰레기 영상 생성 방지를 위해 중단) """
+    print(" [실패] 💥")
+    print("\n" + "="*60)
+    print("🚨 [치명적 오류] 재료가 부족하여 작업을 시작할 수 없습니다.")
+    print("   (쓰레기 영상 생성을 방지하기 위해 시스템을 중단합니다)")
+    print("="*60)
+    for log in missing_log:
+        print(log)
+    print("="*60)
+    print("👉 부족한 파일을 채워넣고 다시 실행해주세요.")
+    if options["pause"]: input("엔터 키를 누르면 종료합니다...")
+
+
+def build_targets(profiles, output_root):
+    """
+    프로파일별 출력 대상 (클립 폴더 / 최종 폴더 / 클립 매니페스트 / 결과)
+    - 첫 번째 프로파일은 output_root 의 Clip / Mergy, 나머지는 접미어 폴더
+    """
+    targets = []
+    for idx, profile in enumerate(profiles):
+        clip_dir, final_dir = get_profile_dirs(output_root, profile, idx == 0)
+        if not os.path.exists(clip_dir): os.makedirs(clip_dir)
+        if not os.path.exists(final_dir): os.makedirs(final_dir)
+        targets.append({
+            "profile": profile,
+            "clip_dir": clip_dir,
+            "final_dir": final_dir,
+            # 📒 클립 매니페스트: 입력(재료 파일/자막/필터/인코딩 설정)이 그대로인 클립만 재사용
+            #    기록 없는 예전 클립은 인정하지 않음 (E열 스타일 변경이 반영되도록 다시 생성)
+            "manifest": RunManifest(clip_dir, "clip", adopt_external=False),
+            "clips": {},  # 행 ID → (클립 경로, 길이) - 병합은 항상 시트 순서대로
+        })
+    return targets
+
+
+def make_clip_renderer(targets, reverse_dir, stage):
+    """
+    클립 렌더링 함수 render_clip(task) 생성
+    - 같은 렌더러로 렌더링한 작업들이 하나의 타임라인 (그룹별 비디오 커서 공유)
+    - 모든 대상 프로파일을 ffmpeg 한 번에 출력
+    """
+    # 🕒 [핵심] 비디오 커서 (각 그룹별로 어디까지 재생했는지 기억) - 모든 프로파일이 같은 타임라인 사용
+    video_cursors = {}
+
+    def render_clip(task):
+        file_id = task['id']
+        gid = task['gid']
+        duration = get_audio_duration(task['audio'])
+
+        # ----------------------------------------------------
+        # 🕵️ [Continuity Logic] 영상 시간 계산 (생성 여부와 무관하게 필수!)
+        # 파일이 있든 없든 이 계산은 무조건 해야 다음 영상이 이어집니다.
+        # ----------------------------------------------------
+        start_time = 0.0
+        if task['v_type'] == 'video':
+            if gid not in video_cursors:
+                video_cursors[gid] = 0.0
+            start_time = video_cursors[gid]
+            # 다음 컷을 위해 커서 업데이트 (누적)
+            video_cursors[gid] += duration
+
+        # ==========================================
+        # 🎬 생성 작업 시작 (E열 스타일 등 입력이 바뀐 클립만 재생성 - 아래 매니페스트 비교)
+        # ==========================================
+        print(f"🔨 [{file_id}] 조립: {task['v_desc']} ({duration:.3f}s)")
+
+        # 행별 Subtype(E열) 기반 자막 스타일 적용
+        subtype_value = task.get('subtype', '').strip()
+        if not subtype_value:
+            print(f"   ⚠️ E열이 비어있습니다. 기본 스타일 사용 ({', '.join(t['profile']['default_style'] for t in targets)}.json)")
+
+        # 세그먼트 계산 / 역재생 캐시는 프로파일과 무관 → 한 번만
+        input_args, filter_chain = build_timeline_filter(task, duration, start_time, reverse_dir, stage)
+        fingerprints = (file_fingerprint(task['visual']), file_fingerprint(task['audio']))
+
+        pending = []  # (대상, (프로파일, 자막 PNG), 클립 경로, 입력 해시)
+        for target in targets:
+            profile = target["profile"]
+            style = get_subtitle_style(subtype_value, profile)
+            # 자막은 투명 PNG로 한 번만 렌더링 (같은 문구/스타일/해상도는 캐시 재사용) → overlay로 합성
+            subtitle_png = render_text_overlay(
+                [(task['script'], style)], profile["resolution"], TEXT_CACHE_DIR, profile["safe_area"]
+            )
+            output = (profile, subtitle_png)
+            output_clip = os.path.join(target["clip_dir"], f"{file_id}_clip.mp4")
+
+            # 해시는 프로파일 단독 명령 기준 (함께 렌더링하는 프로파일 구성이 바뀌어도 클립 재사용)
+            # 자막 PNG 는 내용 기반 파일명이라 명령에 포함됨 → 명령 + 재료 파일 지문이 곧 입력
+            cmd, output_args = build_clip_command(input_args, filter_chain, [output], duration)
+            input_hash = hash_inputs(cmd[1:] + output_args[0], *fingerprints)
+            if target["manifest"].is_valid(output_clip, input_hash):
+                target["clips"][file_id] = (output_clip, duration)
+                continue
+            pending.append((target, output, output_clip, input_hash))
+
+        if not pending:
+            print(f"   ⏩ 입력 변경 없음, 기존 클립 재사용")
+            return
+        if len(pending) < len(targets):
+            print(f"   ⏩ 입력 변경 없는 프로파일은 기존 클립 재사용 → {', '.join(t['profile']['name'] for t, _, _, _ in pending)}만 생성")
+
+        cmd, output_args = build_clip_command(input_args, filter_chain, [output for _, output, _, _ in pending], duration)
+        try:
+            with ExitStack() as stack:
+                outs = [
+                    stack.enter_context(target["manifest"].produce(output_clip, input_hash))
+                    for target, _, output_clip, input_hash in pending
+                ]
+                for args, out in zip(output_args, outs):
+                    cmd += args + [out.path]
+                run_ffmpeg(cmd, label=file_id, stage=f"{stage}.clip", total_duration=duration)
+                for out in outs:
+                    out.ok = True
+            for target, _, output_clip, _ in pending:
+                target["clips"][file_id] = (output_clip, duration)
+        except Exception as e:
+            print(f"   💥 생성 실패: {e}")
+
+    return render_clip
+
+
+def finalize_targets(targets, tasks):
+    """
+    4. 최종 병합 (Finalize) - 프로파일마다 시트 순서대로 클립 병합
+    반환: 모든 프로파일 성공 여부
+    """
+    success = True
+    for target in targets:
+        profile = target["profile"]
+        clip_results = target["clips"]
+        valid_clips = [clip_results[t['id']][0] for t in tasks if t['id'] in clip_results]
+        timeline_duration = sum(clip_results[t['id']][1] for t in tasks if t['id'] in clip_results)  # 병합 ETA 계산용
+
+        if not valid_clips:
+            print(f"\n❌ [{profile['name']}] 병합할 클립이 없습니다.")
+            success = False
+            continue
+
+        print("\n" + "="*50)
+        print(f"🔗 최종 병합 시작 (Finalize) - {profile['name']} {profile['resolution'][0]}x{profile['resolution'][1]}")
+
+        # 🔍 [병합 전 검사] 클립 규격 확인 → 불일치 클립만 개별 보정
+        print("🔍 클립 규격 검사 중...")
+        valid_clips = validate_clips_for_concat(valid_clips, profile)
+
+        final_mp4 = os.path.join(target["final_dir"], "Final_Complete.mp4")
+        if not concat_clips(valid_clips, final_mp4, profile, timeline_duration):
+            success = False
+    return success
+
+# ==========================================
+# 4. 메인 로직
+# ==========================================
+def run_mergy(default_profiles, sheet_name=None, channel=None, options=None):
+    """
+    최종 영상 조립 실행
+    - default_profiles: 출력 프로파일 이름 목록 (예: ["long"]), 환경변수 YTF_MERGY_PROFILES 가 우선
+    - sheet_name: 작업 시트 이름 (없으면 번호 입력), channel: 채널 ID (없으면 시트 이름에서 추출)
+    - options: {"pause": 종료 시 엔터 대기, "open_folder": 완료 후 폴더 열기,
+                "stream_dir": 스트리밍 모드 (재료가 준비된 그룹부터 클립 렌더링)}
+    반환: 종료 코드 (0=성공, 1=실패)
+    """
+    options = get_engine_options(sheet_name, options)
+    stream_dir = options["stream_dir"]
+    try:
+        profiles = resolve_profiles(default_profiles)
+    except ValueError as e:
+        print(f"❌ {e}"); return 1
+    primary = profiles[0]
+    stage = primary["stage"]
+
+    print(f"\n{primary['banner']}")
+    if len(profiles) > 1:
+        print(f"🎞️ 출력 프로파일 {len(profiles)}개 동시 렌더링: {', '.join(p['name'] for p in profiles)}")
+    print("=" * 60)
+
+    # 🛑 [Check 0] 필수 실행 파일 확인
+    if not check_required_files(options):
+        return 1
+
+    # 1. 구글 시트 연결
+    def connect():
+        scope = ['https://spreadsheets.google.com/feeds', 'https://www.googleapis.com/auth/drive']
+        creds = ServiceAccountCredentials.from_json_keyfile_name(JSON_KEY_FILE, scope)
+        return load_spreadsheet(gspread.authorize(creds))
+
+    try:
+        # 시트 백엔드 (기본: 구글 시트 로컬 미러, YTF_SHEET_BACKEND 로 로컬 CSV/XLSX/SQLite)
+        doc = open_sheet_backend(SHEET_URL_FILE, connect)
+    except Exception as e:
+        print(f"❌ 시트 접속 실패: {e}"); return 1
+
+    # 2. 시트 선택
+    all_worksheets = doc.worksheets()
+    go_sheets = [ws for ws in all_worksheets if "go" in ws.title.lower()]
+
+    if not go_sheets:
+        print("❌ 'go' 시트가 없습니다."); return 1
+
+    selected_sheet = select_go_sheet(go_sheets, sheet_name, " 🎬 작업할 시트를 선택하세요")
+    if selected_sheet is None:
+        return 1
+    SHEET_NAME = selected_sheet.title
+
+    # 시트 이름에서 채널명 추출 (예: Ch01_2go -> Ch01)
+    sheet_title = SHEET_NAME
+    channel_name = resolve_channel(sheet_title, channel)
+    if not channel_name:
+        print(f"❌ 시트 이름에서 채널명을 추출할 수 없습니다: {sheet_title}")
+        return 1
+
+    # 📂 폴더 경로 설정 (YtFactory9 표준 구조)
+    ROOT_OUTPUT = f"C:\\YtFactory9\\{channel_name}\\03_Output\\{SHEET_NAME}"
+    VOICE_DIR = os.path.join(ROOT_OUTPUT, "Voice")
+    REVERSE_DIR = os.path.join(ROOT_OUTPUT, "Reverse")  # 소스 영상별 역재생 캐시 (프로파일 공유)
+    REPORT_DIR = os.path.join(ROOT_OUTPUT, "Reports")   # ffmpeg 타이밍 리포트
+
+    if not os.path.exists(ROOT_OUTPUT): os.makedirs(ROOT_OUTPUT)
+    targets = build_targets(profiles, ROOT_OUTPUT)
+
+    # 데이터 로드
+    rows = selected_sheet.get_all_values()[1:] # 헤더 제외
+
+    # ---------------------------------------------------------
+    # 🛑 [Step 1] 사전 전수 조사 (Zero-Trash Check)
+    # ---------------------------------------------------------
+    print("\n🧐 [무결성 검사] 재료 전수 조사 중...", end="")
+    tasks, missing_log = collect_tasks(rows, ROOT_OUTPUT, VOICE_DIR, stream_dir)
+
+    # 결과 판정
+    if missing_log:
+        report_missing(missing_log, options)
+        return 1
+    elif stream_dir:
+        print(" [스트리밍] 📡")
+        print(f"✅ 총 {len(tasks)}개 컷: 재료가 준비되는 그룹부터 조립합니다.\n")
+    else:
+        print(" [통과] ✨")
+        print(f"✅ 모든 재료가 완벽합니다! 총 {len(tasks)}개 컷 조립을 시작합니다.\n")
+
+    # ==========================================
+    # 3. 클립 생성 루프 (Continuity & Drift Fix)
+    # ==========================================
+    render_clip = make_clip_renderer(targets, REVERSE_DIR, stage)
+
+    if stream_dir:
+        # 📡 [스트리밍] 그룹(GID) 단위 작업 큐: 켄번 결과 + 그룹 행들의 음성이 모두 준비되면 바로 렌더링
+        # 같은 그룹의 행들은 비디오 커서가 이어지므로 시트 순서대로 한 번에 처리
+        group_tasks = {}
+        for task in tasks:
+            group_tasks.setdefault(task['gid'], []).append(task)
+        queue = GroupWorkQueue()
+        for gid, items in group_tasks.items():
+            queue.put(gid, items)
+
+        def group_ready(gid):
+            if not (is_ready(stream_dir, "kenburns", gid) or is_stage_done(stream_dir, "kenburns")):
+                return False
+            voice_done = is_stage_done(stream_dir, "voice")
+            for task in group_tasks[gid]:
+                if not (is_ready(stream_dir, "voice", task['id']) or voice_done):
+                    return False
+                if not os.path.exists(task['audio']):
+                    return False
+            return find_visual_asset(ROOT_OUTPUT, gid)[0] is not None
+
+        def render_group(gid, items):
+            visual_path, v_type, v_desc = find_visual_asset(ROOT_OUTPUT, gid)
+            for task in items:
+                task.update(visual=visual_path, v_type=v_type, v_desc=v_desc)
+                render_clip(task)
+
+        leftover = queue.drain(
+            group_ready, render_group,
+            lambda: is_stage_done(stream_dir, "kenburns") and is_stage_done(stream_dir, "voice")
+        )
+        if leftover:
+            # 윗단계가 모두 끝났는데 재료가 없는 그룹 → 최종 병합 안 함 (쓰레기 영상 방지)
+            print("\n🚨 [치명적 오류] 재료가 끝내 준비되지 않은 그룹이 있어 병합하지 않습니다.")
+            for gid, items in leftover.items():
+                print(f"❌ [Group {gid}] 행 {', '.join(t['id'] for t in items)}")
+            print_summary()
+            write_report(REPORT_DIR, stage)
+            return 1
+    else:
+        for task in tasks:
+            render_clip(task)
+
+    # ==========================================
+    # 4. 최종 병합 (Finalize) - 프로파일마다
+    # ==========================================
+    success = finalize_targets(targets, tasks)
+
+    # 📊 처리 통계 + 실행 리포트 저장
+    print_summary()
+    report_path = write_report(REPORT_DIR, stage)
+    if report_path:
+        print(f"📝 타이밍 리포트: {report_path}")
+
+    if success and options["open_folder"]:
+        os.startfile(targets[0]["final_dir"])
+    return 0 if success else 1
@@ -0,0 +1,69 @@
+"""
+외부 API 주소 모음 (가짜 서버로 돌리기)
+image_generation (이미지메이커 롱폼/쇼츠) / VoiceMaker 가 함께 사용
+
+- 평소: 실제 주소 (Imagen / Gemini / DeepInfra / ElevenLabs / Fal)
+- 환경변수 YTF_PROVIDER_BASE=http://127.0.0.1:8765 이면 모든 요청을 그 서버로 보냄
+  → fake_providers.py (가짜 서버) + benchmark.py (처리량 측정) 에서 사용, 크레딧 소모 없음
+  → 경로는 실제 API 와 같음 (서버 주소만 바뀜)
+- Fal 은 fal_client 가 https 고정이라, 가짜 서버 모드에서는 큐 API 를 requests 로 직접 호출
+"""
+import os
+import time
+
+PROVIDER_BASE_ENV = "YTF_PROVIDER_BASE"
+
+DEFAULT_BASES = {
+    "imagen": "https://generativelanguage.googleapis.com",
+    "gemini": "https://generativelanguage.googleapis.com",
+    "deepinfra": "https://api.deepinfra.com",
+    "elevenlabs": "https://api.elevenlabs.io",
+    "fal": "https://queue.fal.run",
+}
+
+FAL_POLL_SEC = 0.2
+FAL_TIMEOUT_SEC = 300
+
+
+def provider_override():
+    """ 가짜 서버 주소 (없으면 None = 실제 API) """
+    base = os.environ.get(PROVIDER_BASE_ENV, "").strip()
+    return base.rstrip("/") or None
+
+
+def provider_url(provider, path=""):
+    """ 제공자 기본 주소 + 경로 (예: provider_url("elevenlabs", "/v1/text-to-speech/abc")) """
+    return (provider_override() or DEFAULT_BASES[provider]) + path
+
+
+def gemini_client_options():
+    """ genai.configure(api_key=..., **gemini_client_options()) 에 넘길 추가 인자 """
+    base = provider_override()
+    if not base:
+        return {}
+    # gRPC 대신 REST 로 보내야 http 주소(가짜 서버)를 쓸 수 있음
+    return {"transport": "rest", "client_options": {"api_endpoint": base}}
+
+
+def fal_run(model, arguments):
+    """ fal_client.run 과 같은 결과(dict) 반환 """
+    base = provider_override()
+    if not base:
+        import fal_client
+        return fal_client.run(model, arguments=arguments)
+
+    import requests
+    headers = {"Authorization": f"Key {os.environ.get('FAL_KEY', '')}"}
+    response = requests.post(f"{base}/{model}", json=arguments, headers=headers, timeout=30)
+    response.raise_for_status()
+    queued = response.json()
+    deadline = time.time() + FAL_TIMEOUT_SEC
+    while time.time() < deadline:
+        status = requests.get(queued["status_url"], headers=headers, timeout=30)
+        status.raise_for_status()
+        if status.json().get("status") == "COMPLETED":
+            result = requests.get(queued["response_url"], headers=headers, timeout=30)
+            result.raise_for_status()
+            return result.json()
+        time.sleep(FAL_POLL_SEC)
+    raise TimeoutError(f"Fal 큐 응답 시간 초과: {model}")
@@ -0,0 +1,127 @@
+"""
+프로세스 간 공유 자원 슬롯 (동시 실행 수 전역 제한)
+auto_pipeline 배치 모드 + ffmpeg_runner / VoiceMaker / ImageMaker 가 함께 사용
+
+- 자원 종류: "ffmpeg" (인코딩), "tts" (음성 합성 요청), "image" (이미지 생성 요청)
+- auto_pipeline 이 환경변수로 슬롯 폴더와 자원별 상한을 넘겨줌
+    YTF_SLOT_DIR   : 슬롯 잠금 파일 폴더 (배치 실행마다 새로 생성)
+    YTF_MAX_FFMPEG / YTF_MAX_TTS / YTF_MAX_IMAGE : 자원별 동시 실행 상한 (0 또는 없음 = 제한 없음)
+- 슬롯 = {폴더}/{자원}/slot{번호}.lock 파일 (O_EXCL 생성으로 선점, 내용은 PID)
+  → 여러 엔진 프로세스가 같은 상한을 나눠 씀, 비정상 종료된 프로세스의 슬롯은 자동 회수
+- 환경변수가 없으면(단독 실행) 아무것도 하지 않음
+"""
+import os
+import time
+import threading
+import functools
+from contextlib import contextmanager
+
+SLOT_DIR_ENV = "YTF_SLOT_DIR"
+SLOT_POLL_SEC = 0.5
+
+_HELD = threading.local()
+
+
+def get_cap(resource):
+    """ 자원별 동시 실행 상한 (0 = 제한 없음) """
+    try:
+        return max(int(os.environ.get(f"YTF_MAX_{resource.upper()}", "0") or 0), 0)
+    except ValueError:
+        return 0
+
+
+def _pid_alive(pid):
+    """ 슬롯을 잡은 프로세스가 아직 살아있는지 (죽었으면 슬롯 회수) """
+    if pid <= 0:
+        return False
+    if os.name == "nt":
+        import ctypes
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.OpenProcess(0x1000, False, pid)  # PROCESS_QUERY_LIMITED_INFORMATION
+        if not handle:
+            return False
+        exit_code = ctypes.c_ulong()
+        kernel32.GetExitCodeProcess(handle, ctypes.byref(exit_code))
+        kernel32.CloseHandle(handle)
+        return exit_code.value == 259  # STILL_ACTIVE
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _try_take(slot_path):
+    try:
+        fd = os.open(slot_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+    except FileExistsError:
+        # 주인이 죽은 슬롯이면 지우고 다음 차례에 다시 시도
+        try:
+            with open(slot_path, "r", encoding="utf-8") as f:
+                owner = int(f.read().strip() or 0)
+        except (OSError, ValueError):
+            return False
+        if owner and not _pid_alive(owner):
+            try:
+                os.remove(slot_path)
+            except OSError:
+                pass
+        return False
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(str(os.getpid()))
+    return True
+
+
+def _acquire(slot_dir, resource, cap):
+    resource_dir = os.path.join(slot_dir, resource)
+    os.makedirs(resource_dir, exist_ok=True)
+    waiting_printed = False
+    while True:
+        for i in range(cap):
+            slot_path = os.path.join(resource_dir, f"slot{i}.lock")
+            if _try_take(slot_path):
+                return slot_path
+        if not waiting_printed:
+            print(f"   🚦 [{resource}] 동시 실행 상한({cap}) 도달, 빈 슬롯 대기 중...")
+            waiting_printed = True
+        time.sleep(SLOT_POLL_SEC)
+
+
+@contextmanager
+def resource_slot(resource):
+    """
+    자원 슬롯 1개를 잡고 실행 (with resource_slot("ffmpeg"): ...)
+    - 같은 스레드에서 이미 잡은 자원이면 다시 잡지 않음 (중첩 호출 교착 방지)
+    """
+    slot_dir = os.environ.get(SLOT_DIR_ENV)
+    cap = get_cap(resource)
+    held = getattr(_HELD, "resources", None)
+    if held is None:
+        held = _HELD.resources = set()
+    if not slot_dir or cap <= 0 or resource in held:
+        yield
+        return
+
+    slot_path = _acquire(slot_dir, resource, cap)
+    held.add(resource)
+    try:
+        yield
+    finally:
+        held.discard(resource)
+        try:
+            os.remove(slot_path)
+        except OSError:
+            pass
+
+
+def uses_resource(resource):
+    """ 함수 전체를 자원 슬롯 안에서 실행하는 데코레이터 (API 요청 함수용) """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with resource_slot(resource):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,223 @@
+"""
+실행 매니페스트 (중단 후 재실행 시 이어하기)
+ImageMaker / KenBurns / VoiceMaker / Mergy 가 함께 사용
+
+- 결과 파일(아티팩트)마다 기록: 입력 해시, 생성 단계, 상태, 소요 시간, 파일 크기
+    {출력 폴더}/_manifest_{단계}.jsonl  (한 줄 = 기록 1건, 같은 파일은 마지막 기록이 유효)
+- 결과 파일은 임시 파일(.이름.part.확장자)에 쓴 뒤 이름 변경 → 강제 종료돼도 반쪽 파일이 완성본으로 남지 않음
+- 재실행 시 "파일 있음" 대신 is_valid 로 판단
+    기록 없음 = 매니페스트 밖에서 생긴 파일 (도입 전 결과, 직접 넣은 파일)
+      → 그대로 인정하고 기록 (입력 해시 미상)
+    우리가 쓴 파일인데 기록과 크기가 다르거나 (잘림/손상), 상태가 done 이 아니거나, 입력 해시가 바뀌었으면 다시 생성
+"""
+import os
+import json
+import time
+import shutil
+import hashlib
+import threading
+from contextlib import contextmanager
+
+MANIFEST_PREFIX = "_manifest_"
+
+
+def hash_inputs(*parts):
+    """ 입력 값들 → 짧은 해시 (순서/타입까지 반영) """
+    raw = json.dumps(parts, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+
+
+def file_fingerprint(path):
+    """ 윗단계 결과 파일을 입력으로 쓸 때의 지문 (크기 + 수정 시각) """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return [os.path.basename(path), stat.st_size, int(stat.st_mtime)]
+
+
+def part_path(path):
+    """ 임시 파일 경로 (확장자 유지 → ffmpeg 포맷 판단 가능, 점으로 시작 → glob 에 안 잡힘) """
+    folder, name = os.path.split(path)
+    stem, ext = os.path.splitext(name)
+    return os.path.join(folder, f".{stem}.part{ext}")
+
+
+def _remove_quietly(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def write_bytes_atomic(path, data):
+    """ 바이트를 임시 파일에 쓴 뒤 이름 변경 """
+    temp_path = part_path(path)
+    try:
+        with open(temp_path, "wb") as f:
+            f.write(data)
+        os.replace(temp_path, path)
+    except Exception:
+        _remove_quietly(temp_path)
+        raise
+
+
+def copy_file_atomic(source_path, path):
+    """ shutil.copy2 의 원자적 버전 """
+    temp_path = part_path(path)
+    try:
+        shutil.copy2(source_path, temp_path)
+        os.replace(temp_path, path)
+    except Exception:
+        _remove_quietly(temp_path)
+        raise
+
+
+class ArtifactOutput:
+    """ produce() / atomic_output() 이 넘겨주는 임시 출력 (path 에 쓰고, 성공이면 ok = True) """
+
+    def __init__(self, final_path):
+        self.final_path = final_path
+        self.path = part_path(final_path)
+        self.ok = False
+
+
+@contextmanager
+def atomic_output(final_path):
+    """
+    with atomic_output(경로) as out: ffmpeg ... out.path; out.ok = (성공 여부)
+    - ok 이고 임시 파일이 비어있지 않을 때만 최종 경로로 이름 변경, 아니면 임시 파일 삭제
+    """
+    out = ArtifactOutput(final_path)
+    _remove_quietly(out.path)  # 이전 실행이 남긴 임시 파일
+    try:
+        yield out
+    except Exception:
+        _remove_quietly(out.path)
+        raise
+    if out.ok and os.path.exists(out.path) and os.path.getsize(out.path) > 0:
+        os.replace(out.path, final_path)
+    else:
+        out.ok = False
+        _remove_quietly(out.path)
+
+
+class RunManifest:
+    """
+    출력 폴더 + 단계별 매니페스트
+    - is_valid(path, input_hash): 재사용 가능한 결과인지
+    - record(path, input_hash, status, duration_sec): 결과 기록 (스레드 안전)
+    - produce(path, input_hash): 원자적 쓰기 + 소요 시간 측정 + 기록을 한 번에
+    - adopt_external=False: 매니페스트 밖에서 생긴 파일을 인정하지 않음 (항상 다시 만들던 클립 등)
+    """
+
+    def __init__(self, folder, stage, adopt_external=True):
+        self.folder = folder
+        self.stage = stage
+        self.adopt_external = adopt_external
+        self.path = os.path.join(folder, f"{MANIFEST_PREFIX}{stage}.jsonl")
+        self.records = {}
+        self.lock = threading.Lock()
+        self.load()
+
+    def key(self, path):
+        return os.path.relpath(path, self.folder).replace("\\", "/")
+
+    def load(self):
+        """ 매니페스트 읽기 (강제 종료로 잘린 마지막 줄은 무시) + 중복 기록이 많으면 압축 """
+        self.records = {}
+        if not os.path.exists(self.path):
+            return
+        lines = 0
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                lines += 1
+                try:
+                    record = json.loads(line)
+                    self.records[record["artifact"]] = record
+                except (ValueError, KeyError):
+                    continue
+        if lines > 2 * len(self.records) + 100:
+            self.compact()
+
+    def compact(self):
+        """ 파일별 마지막 기록만 남겨 다시 씀 """
+        temp_path = part_path(self.path)
+        with open(temp_path, "w", encoding="utf-8") as f:
+            for record in self.records.values():
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        os.replace(temp_path, self.path)
+
+    def _append(self, record):
+        os.makedirs(self.folder, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self.records[record["artifact"]] = record
+
+    def record(self, path, input_hash, status, duration_sec=0.0, error=None):
+        # 실패 기록에도 그 시점의 파일 크기를 남김 (예전 결과가 그대로 남았는지 구분용)
+        size = os.path.getsize(path) if os.path.exists(path) else 0
+        record = {
+            "artifact": self.key(path),
+            "stage": self.stage,
+            "input_hash": input_hash,
+            "status": status,
+            "duration_sec": round(duration_sec, 3),
+            "bytes": size,
+            "at": time.strftime("%Y-%m-%d %H:%M:%S")
+        }
+        if error:
+            record["error"] = str(error)[:200]
+        with self.lock:
+            self._append(record)
+        return record
+
+    def is_valid(self, path, input_hash=None):
+        """
+        재사용 가능한 결과인지
+        - input_hash 가 None 이면 입력 비교는 생략 (파일 상태만 확인)
+        """
+        if not os.path.exists(path):
+            return False
+        size = os.path.getsize(path)
+        if size <= 0:
+            return False
+        with self.lock:
+            record = self.records.get(self.key(path))
+            if record is not None and record["bytes"] != size:
+                # 매니페스트가 만든 파일인데 크기가 다름 → 잘렸거나 깨진 결과, 다시 생성
+                return False
+            if record is None:
+                # 매니페스트 밖에서 생긴 파일 → 인정하고 기록 (입력 해시는 모름)
+                if not self.adopt_external:
+                    return False
+                self._append({
+                    "artifact": self.key(path), "stage": "external", "input_hash": None,
+                    "status": "done", "duration_sec": 0.0, "bytes": size,
+                    "at": time.strftime("%Y-%m-%d %H:%M:%S")
+                })
+                return True
+        if record["status"] != "done":
+            return False
+        if input_hash is not None and record["input_hash"] is not None and record["input_hash"] != input_hash:
+            return False
+        return True
+
+    @contextmanager
+    def produce(self, path, input_hash):
+        """
+        with manifest.produce(경로, 입력해시) as out: (out.path 에 쓰기) ; out.ok = 성공 여부
+        - 성공: 최종 경로로 이름 변경 후 done 기록 / 실패·예외: failed 기록
+        """
+        started = time.time()
+        error = None
+        out = None
+        try:
+            with atomic_output(path) as out:
+                yield out
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            ok = out is not None and out.ok and error is None
+            self.record(path, input_hash, "done" if ok else "failed", time.time() - started, error)
@@ -0,0 +1,358 @@
+"""
+시트 백엔드 선택 (구글 시트 / 로컬 CSV·XLSX·SQLite)
+ImageMaker / KenBurns / VoiceMaker / Mergy / SoundInserter / TitleInserter / SourceHunter 가 함께 사용
+
+- 환경변수 YTF_SHEET_BACKEND (또는 엔진/auto_pipeline 의 --sheet-backend) 로 선택
+    (없음) / google        : 구글 시트 (sheet_mirror 로컬 미러 경유, 서비스 계정 키 필요)
+    csv:폴더               : 폴더 안의 시트이름.csv 파일 하나 = 시트 하나
+    xlsx:파일.xlsx         : 엑셀 파일의 시트 탭 = 시트 (openpyxl 필요)
+    sqlite:파일.sqlite     : sheet_mirror 와 같은 구조의 로컬 DB
+    접두어 없이 경로만 주면 확장자(.xlsx / .sqlite / .db) 또는 폴더 여부로 판단
+- 로컬 백엔드는 네트워크/구글 계정 없이 동작 (부하 테스트, 노트북 작업용)
+- 로컬 파일 쓰기: 메모리에 바로 반영 + 모아 두었다가 FLUSH_BATCH 개마다, 그리고 종료 시 파일에 저장
+    저장할 때는 잠금 파일로 다른 엔진 프로세스와 순서를 맞추고, 파일을 다시 읽어 그 위에 내 쓰기만 덮어씀
+    → ImageMaker(H열) / VoiceMaker(D열) 가 같은 파일에 동시에 써도 서로의 값을 지우지 않음
+- 모든 백엔드가 같은 열 규약(A~P, SHEET_COLUMNS)을 따름, 로컬 파일 헤더가 다르면 경고만 출력
+- 현재 시트를 로컬 파일로 떠두기: python sheet_backend.py snapshot xlsx:C:\\Test\\book.xlsx
+"""
+import os
+import sys
+import csv
+import time
+import atexit
+import argparse
+import threading
+from contextlib import contextmanager
+from sheet_mirror import SheetMirror, MirroredWorksheet, open_sheet_mirror, FLUSH_BATCH
+
+BACKEND_ENV = "YTF_SHEET_BACKEND"
+
+# 로컬 파일 잠금 (저장 중인 프로세스가 강제 종료돼 남은 잠금은 이 시간이 지나면 회수)
+LOCK_STALE_SEC = 60
+LOCK_POLL_SEC = 0.05
+LOCK_TIMEOUT_SEC = 120
+
+# 시트 열 규약 (A~P, 1행 = 헤더) - check_columns_usage.py 참고
+SHEET_COLUMNS = [
+    "id",             # A: 행 ID (음성/클립 파일명)
+    "script",         # B: 대본
+    "image_group",    # C: 이미지 그룹 (GID)
+    "duration",       # D: 음성 길이 (VoiceMaker 가 채움)
+    "subtype",        # E: 자막 스타일
+    "promptABC",      # F: 프롬프트 스타일 키워드
+    "",               # G: (공란)
+    "image_prompt",   # H: 이미지 프롬프트 (ImageMaker 가 채움)
+    "voice",          # I: 성우
+    "imagetype",      # J: gemini / flux / fal
+    "sound",          # K: 효과음
+    "voice_tool",     # L: edge / azure / elevenlabs
+    "fal_RootImage",  # M: Fal 참조 이미지 키워드
+    "title",          # N: 제목
+    "subtitle",       # O: 부제목
+    "title_style",    # P: 제목 스타일
+]
+
+
+def parse_backend_spec(spec):
+    """ 백엔드 지정 문자열 → (종류, 경로) """
+    spec = (spec or "").strip()
+    if not spec or spec.lower() == "google":
+        return "google", None
+    kind, sep, path = spec.partition(":")
+    # 접두어 없음 (윈도우 드라이브 문자 C:\ 도 접두어로 보지 않음)
+    if not sep or len(kind) == 1 or kind.lower() not in ("csv", "xlsx", "sqlite"):
+        path = spec
+        ext = os.path.splitext(path)[1].lower()
+        if ext == ".xlsx":
+            kind = "xlsx"
+        elif ext in (".sqlite", ".db"):
+            kind = "sqlite"
+        else:
+            kind = "csv"
+    return kind.lower(), path
+
+
+def check_header(title, header):
+    """ 로컬 시트 헤더가 열 규약과 다르면 경고 (엔진은 열 위치로 읽으므로 진행은 함) """
+    expected = [c.lower() for c in SHEET_COLUMNS]
+    actual = [str(c).strip().lower() for c in header]
+    mismatched = [
+        f"{chr(ord('A') + i)}='{actual[i]}'(규약 '{expected[i]}')"
+        for i in range(min(len(actual), len(expected)))
+        if expected[i] and actual[i] and actual[i] != expected[i]
+    ]
+    if mismatched:
+        print(f"   ⚠️ [{title}] 헤더가 열 규약과 다릅니다: {', '.join(mismatched[:5])}")
+
+
+def _to_text(value):
+    """ 셀 값 → 문자열 (엑셀 숫자 1.0 → '1', 빈 칸 → '') """
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+@contextmanager
+def file_lock(lock_path):
+    """ 프로세스 간 잠금 (O_EXCL 잠금 파일, 내용은 PID) """
+    started = time.time()
+    while True:
+        try:
+            fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            break
+        except FileExistsError:
+            try:
+                if time.time() - os.path.getmtime(lock_path) > LOCK_STALE_SEC:
+                    os.remove(lock_path)
+                    continue
+            except OSError:
+                continue  # 그 사이 주인이 풀었음
+            if time.time() - started > LOCK_TIMEOUT_SEC:
+                raise TimeoutError(f"시트 파일 잠금을 얻지 못했습니다: {lock_path}")
+            time.sleep(LOCK_POLL_SEC)
+    try:
+        os.write(fd, str(os.getpid()).encode("ascii"))
+        os.close(fd)
+        yield
+    finally:
+        try:
+            os.remove(lock_path)
+        except OSError:
+            pass
+
+
+def _temp_path(path):
+    """ 저장용 임시 파일 (프로세스/스레드마다 다른 이름, 확장자 유지) """
+    folder, name = os.path.split(path)
+    base, ext = os.path.splitext(name)
+    return os.path.join(folder, f".{base}.{os.getpid()}.{threading.get_ident()}.tmp{ext}")
+
+
+def _set_cell(rows, row, col, value):
+    while len(rows) < row:
+        rows.append([])
+    cells = rows[row - 1]
+    while len(cells) < col:
+        cells.append("")
+    cells[col - 1] = "" if value is None else str(value)
+
+
+class LocalBook:
+    """
+    로컬 파일 시트 묶음 공통 (시트 목록 / 읽기 / 셀 쓰기)
+    - 하위 클래스: load() → {시트: 행 목록}, save(titles) → 파일에 저장, lock_path() → 잠금 파일 경로
+    - 쓰기는 pending 에 모았다가 flush() 에서 파일을 다시 읽고 그 위에 반영 (다른 프로세스의 쓰기 보존)
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.RLock()
+        self.pending = []  # [(시트, 행, 열, 값), ...]
+        self.sheets = self.load()
+        for title, rows in self.sheets.items():
+            if rows:
+                check_header(title, rows[0])
+
+    def worksheets(self):
+        return [MirroredWorksheet(self, title) for title in self.sheets]
+
+    def worksheet(self, title):
+        return MirroredWorksheet(self, title)
+
+    def read_rows(self, title):
+        return [list(r) for r in self.sheets.get(title, [])]
+
+    def write_cells(self, title, updates):
+        """ 메모리에 반영 + pending 적재 (FLUSH_BATCH 개가 넘으면 바로 저장) """
+        with self.lock:
+            rows = self.sheets.setdefault(title, [])
+            for row, col, value in updates:
+                _set_cell(rows, row, col, value)
+                self.pending.append((title, row, col, value))
+            count = len(self.pending)
+        if count >= FLUSH_BATCH:
+            self.flush()
+
+    def apply_cell(self, title, row, col, value):
+        """ 저장 전 셀 1개 반영 (하위 클래스용, 기본은 할 일 없음) """
+
+    def flush(self):
+        """ 잠금 → 파일 다시 읽기 → 밀린 쓰기 반영 → 저장, 반환: 성공 여부 """
+        with self.lock:
+            if not self.pending:
+                return True
+            try:
+                with file_lock(self.lock_path()):
+                    self.sheets = self.load()
+                    titles = []
+                    for title, row, col, value in self.pending:
+                        _set_cell(self.sheets.setdefault(title, []), row, col, value)
+                        self.apply_cell(title, row, col, value)
+                        if title not in titles:
+                            titles.append(title)
+                    self.save(titles)
+            except Exception as e:
+                print(f"   ⚠️ 로컬 시트 저장 실패 ({len(self.pending)}칸): {str(e)[:80]}")
+                return False
+            self.pending = []
+            return True
+
+
+class CsvBook(LocalBook):
+    """ 폴더 안의 *.csv (UTF-8, 엑셀에서 저장한 BOM 포함 파일도 허용) """
+
+    def load(self):
+        if not os.path.isdir(self.path):
+            raise FileNotFoundError(f"CSV 시트 폴더를 찾을 수 없습니다: {self.path}")
+        sheets = {}
+        for name in sorted(os.listdir(self.path)):
+            # 점으로 시작 = 저장 중인 임시 파일
+            if name.lower().endswith(".csv") and not name.startswith("."):
+                with open(os.path.join(self.path, name), "r", encoding="utf-8-sig", newline="") as f:
+                    sheets[os.path.splitext(name)[0]] = [row for row in csv.reader(f)]
+        return sheets
+
+    def lock_path(self):
+        return os.path.join(self.path, ".sheets.lock")
+
+    def save(self, titles):
+        for title in titles:
+            csv_path = os.path.join(self.path, f"{title}.csv")
+            temp_path = _temp_path(csv_path)
+            with open(temp_path, "w", encoding="utf-8-sig", newline="") as f:
+                csv.writer(f).writerows(self.sheets[title])
+            os.replace(temp_path, csv_path)
+
+
+class XlsxBook(LocalBook):
+    """ 엑셀 파일 (시트 탭 = 시트, 값만 읽음) """
+
+    def load(self):
+        try:
+            import openpyxl
+        except ImportError:
+            raise ImportError("xlsx 시트 백엔드를 쓰려면 openpyxl 이 필요합니다. (pip install openpyxl)")
+        if not os.path.exists(self.path):
+            raise FileNotFoundError(f"엑셀 파일을 찾을 수 없습니다: {self.path}")
+        self.workbook = openpyxl.load_workbook(self.path)
+        sheets = {}
+        for ws in self.workbook.worksheets:
+            rows = [[_to_text(v) for v in row] for row in ws.iter_rows(values_only=True)]
+            for cells in rows:
+                while cells and cells[-1] == "":
+                    cells.pop()
+            sheets[ws.title] = rows
+        return sheets
+
+    def lock_path(self):
+        return self.path + ".lock"
+
+    def apply_cell(self, title, row, col, value):
+        # flush 에서 다시 읽은 통합 문서에 반영 (서식/다른 셀은 그대로)
+        ws = self.workbook[title] if title in self.workbook.sheetnames else self.workbook.create_sheet(title)
+        ws.cell(row=row, column=col, value="" if value is None else str(value))
+
+    def save(self, titles):
+        # 저장 중 끊겨도 원본 엑셀 파일이 깨지지 않게 임시 파일에 저장 후 교체 (통합 문서 전체를 flush 당 1번)
+        temp_path = _temp_path(self.path)
+        try:
+            self.workbook.save(temp_path)
+            os.replace(temp_path, self.path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+
+def open_sqlite_book(path):
+    """ sheet_mirror 구조의 로컬 SQLite (원격 없음) """
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"SQLite 시트 파일을 찾을 수 없습니다: {path}")
+    book = SheetMirror(path)
+    if not book.has_sheets():
+        raise ValueError(f"SQLite 시트 파일에 시트가 없습니다: {path}")
+    for ws in book.worksheets():
+        rows = book.read_rows(ws.title)
+        if rows:
+            check_header(ws.title, rows[0])
+    return book
+
+
+def open_sheet_backend(sheet_url_file, connect, spec=None):
+    """
+    설정된 백엔드로 스프레드시트 열기 (기존 doc 과 같은 방식으로 사용)
+    - connect / sheet_url_file 은 구글 시트 백엔드에서만 사용
+    """
+    kind, path = parse_backend_spec(spec if spec is not None else os.environ.get(BACKEND_ENV))
+    if kind == "google":
+        return open_sheet_mirror(sheet_url_file, connect)
+
+    print(f"🗂️ 로컬 시트 백엔드: {kind} ({path})")
+    if kind == "sqlite":
+        return open_sqlite_book(path)
+    book = CsvBook(path) if kind == "csv" else XlsxBook(path)
+    # 남은 쓰기는 종료 시 저장
+    atexit.register(book.flush)
+    return book
+
+
+def write_book(spec, sheets):
+    """ {시트: 행 목록} → 로컬 백엔드 파일로 저장 (스냅샷용) """
+    kind, path = parse_backend_spec(spec)
+    if kind == "google":
+        raise ValueError("스냅샷 대상은 로컬 백엔드(csv/xlsx/sqlite)여야 합니다.")
+    if kind == "csv":
+        os.makedirs(path, exist_ok=True)
+        for title, rows in sheets.items():
+            with open(os.path.join(path, f"{title}.csv"), "w", encoding="utf-8-sig", newline="") as f:
+                csv.writer(f).writerows(rows)
+    elif kind == "xlsx":
+        import openpyxl
+        workbook = openpyxl.Workbook()
+        workbook.remove(workbook.active)
+        for title, rows in sheets.items():
+            ws = workbook.create_sheet(title[:31])
+            for row in rows:
+                ws.append(row)
+        workbook.save(path)
+    else:
+        if os.path.exists(path):
+            os.remove(path)
+        book = SheetMirror(path)
+        for position, (title, rows) in enumerate(sheets.items()):
+            book.db.execute("INSERT INTO sheets (title, position, synced_at) VALUES (?, ?, 0)", (title, position))
+            book.store_rows(title, rows)
+        book.db.commit()
+        book.close()
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="시트 백엔드 도구")
+    sub = parser.add_subparsers(dest="command", required=True)
+    snap = sub.add_parser("snapshot", help="현재 백엔드의 'go' 시트를 로컬 파일로 저장")
+    snap.add_argument("target", help="저장 위치 (예: xlsx:C:\\Test\\book.xlsx, csv:C:\\Test\\sheets, sqlite:book.sqlite)")
+    snap.add_argument("--source", help=f"읽을 백엔드 (기본: {BACKEND_ENV} 또는 google)")
+    args = parser.parse_args()
+
+    import gspread
+    from oauth2client.service_account import ServiceAccountCredentials
+    from KenBurns import JSON_KEY_FILE, SHEET_URL_FILE, load_spreadsheet
+
+    def connect():
+        scope = ['https://spreadsheets.google.com/feeds', 'https://www.googleapis.com/auth/drive']
+        creds = ServiceAccountCredentials.from_json_keyfile_name(JSON_KEY_FILE, scope)
+        return load_spreadsheet(gspread.authorize(creds))
+
+    doc = open_sheet_backend(SHEET_URL_FILE, connect, args.source)
+    sheets = {ws.title: ws.get_all_values() for ws in doc.worksheets() if "go" in ws.title.lower()}
+    path = write_book(args.target, sheets)
+    print(f"✅ 시트 {len(sheets)}개 저장: {path}")
+    for title, rows in sheets.items():
+        print(f"   - {title}: {max(len(rows) - 1, 0)}행")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,359 @@
+"""
+구글 시트 로컬 미러 (SQLite)
+ImageMaker / KenBurns / VoiceMaker / Mergy / SoundInserter / TitleInserter / SourceHunter 가 함께 사용
+
+- 엔진 시작 시 doc.worksheets() + get_all_values() 대신 로컬 DB 에서 바로 읽음
+- 동기화 (open_sheet_mirror 호출 시 1회)
+    1) 밀린 쓰기(outbox)부터 시트에 일괄 반영
+    2) 스프레드시트 수정 시각이 마지막 동기화 이후 그대로면 값을 받지 않음
+    3) 바뀌었으면 'go' 시트 전체를 요청 1번(values_batch_get)으로 받아 행 해시가 다른 행만 갱신
+    4) 받은 값 위에 아직 시트에 못 보낸 outbox 값을 다시 덮어씀
+       (미러 DB 는 여러 엔진 프로세스가 공유 → 다른 프로세스의 로컬 쓰기를 동기화가 되돌리지 않도록)
+    - YTF_SHEET_MAX_AGE 초를 주면 마지막 동기화가 그 안일 때 시트에 접속하지 않음 (기본 0 = 매번 수정 시각 확인)
+    - 접속 실패(오프라인) 시 미러에 있는 값으로 계속 진행
+- 쓰기 (update_cell / update_cells)
+    로컬에 즉시 반영 + outbox 에 쌓았다가 FLUSH_BATCH 개마다, 그리고 종료 시 시트별 update_cells 1번으로 반영
+    강제 종료로 못 보낸 쓰기는 다음 실행의 동기화 때 먼저 보냄
+- 기존 gspread 워크시트와 같은 방식으로 사용: ws.title / get_all_values() / cell(r, c).value /
+  update_cell(r, c, v) / update_cells([gspread.Cell, ...])
+"""
+import os
+import json
+import time
+import atexit
+import sqlite3
+import hashlib
+import threading
+import gspread
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+MIRROR_DIR = os.path.join(CURRENT_DIR, "_sheet_mirror")
+
+# 이 시간(초) 안에 동기화했으면 시트에 접속하지 않음 (기본 0 = 매번 수정 시각 확인)
+MAX_AGE_ENV = "YTF_SHEET_MAX_AGE"
+# 쌓인 쓰기가 이 개수를 넘으면 바로 시트에 반영
+FLUSH_BATCH = 50
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS sheets (title TEXT PRIMARY KEY, position INTEGER, synced_at REAL);
+CREATE TABLE IF NOT EXISTS rows (
+    title TEXT, row_idx INTEGER, hash TEXT, cells TEXT,
+    PRIMARY KEY (title, row_idx)
+);
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    title TEXT, row_idx INTEGER, col_idx INTEGER, value TEXT, queued_at REAL
+);
+"""
+
+
+def _row_hash(cells):
+    return hashlib.sha1(json.dumps(cells, ensure_ascii=False).encode("utf-8")).hexdigest()[:16]
+
+
+def _a1_title(title):
+    """ 범위 표기용 시트 이름 ('시트 이름') """
+    return "'" + title.replace("'", "''") + "'"
+
+
+def _remote_update_time(doc):
+    """ 스프레드시트 마지막 수정 시각 (gspread 버전에 따라 속성/메서드, 못 구하면 None) """
+    try:
+        getter = getattr(doc, "get_lastUpdateTime", None)
+        if callable(getter):
+            return getter()
+        return getattr(doc, "lastUpdateTime", None)
+    except Exception:
+        return None
+
+
+class MirrorCell:
+    """ cell() 반환값 (gspread.Cell 과 같은 row / col / value) """
+
+    def __init__(self, row, col, value):
+        self.row = row
+        self.col = col
+        self.value = value
+
+
+class MirroredWorksheet:
+    """
+    미러 DB / 로컬 시트 파일을 읽고 쓰는 워크시트 (gspread Worksheet 대신 사용)
+    - book: read_rows(title) / write_cells(title, [(행, 열, 값), ...]) 를 가진 객체 (SheetMirror, sheet_backend 의 로컬 북)
+    """
+
+    def __init__(self, book, title):
+        self.book = book
+        self.title = title
+
+    def __repr__(self):
+        return f"<MirroredWorksheet '{self.title}'>"
+
+    def get_all_values(self):
+        """ 전체 값 (gspread 처럼 가장 긴 행 길이에 맞춰 빈 문자열로 채움) """
+        rows = self.book.read_rows(self.title)
+        width = max((len(r) for r in rows), default=0)
+        return [r + [""] * (width - len(r)) for r in rows]
+
+    def row_values(self, row):
+        rows = self.book.read_rows(self.title)
+        return list(rows[row - 1]) if 0 < row <= len(rows) else []
+
+    def cell(self, row, col):
+        values = self.row_values(row)
+        value = values[col - 1] if 0 < col <= len(values) else ""
+        return MirrorCell(row, col, value if value != "" else None)
+
+    def update_cell(self, row, col, value):
+        self.book.write_cells(self.title, [(row, col, value)])
+
+    def update_cells(self, cells):
+        self.book.write_cells(self.title, [(c.row, c.col, c.value) for c in cells])
+
+
+class SheetMirror:
+    """
+    스프레드시트 1개의 로컬 미러
+    - connect: 원격 스프레드시트(gspread Spreadsheet)를 여는 함수 (필요할 때만 호출)
+      None 이면 원격 없는 로컬 SQLite 시트 (sheet_backend 의 sqlite 백엔드, 쓰기를 outbox 에 쌓지 않음)
+    """
+
+    def __init__(self, db_path, connect=None):
+        self.db_path = db_path
+        self.connect = connect
+        self.doc = None
+        self.offline = False
+        self.lock = threading.RLock()
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self.db = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.executescript(_SCHEMA)
+        self.db.commit()
+
+    # ---------- 원격 ----------
+    def remote(self):
+        """ 원격 스프레드시트 (접속 실패 시 None, 한 번 실패하면 이번 실행 동안 오프라인) """
+        if self.doc is None and not self.offline and self.connect is not None:
+            try:
+                self.doc = self.connect()
+            except Exception as e:
+                print(f"   📴 시트 접속 실패, 로컬 미러로 진행합니다: {str(e)[:80]}")
+                self.offline = True
+        return self.doc
+
+    def get_meta(self, key, default=None):
+        row = self.db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def set_meta(self, key, value):
+        self.db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, str(value)))
+
+    def sync(self, max_age=0.0):
+        """
+        원격 → 로컬 동기화 (밀린 쓰기 먼저 반영)
+        반환: 동기화 결과 문자열 (로그용)
+        """
+        with self.lock:
+            synced_at = float(self.get_meta("synced_at", 0) or 0)
+            pending = self.db.execute("SELECT COUNT(*) FROM outbox").fetchone()[0]
+            if not pending and synced_at and time.time() - synced_at < max_age:
+                return f"최근 동기화 ({time.time() - synced_at:.0f}초 전), 접속 생략"
+
+            doc = self.remote()
+            if doc is None:
+                return "오프라인"
+            if pending and not self.flush():
+                return "밀린 쓰기 반영 실패, 로컬 값 유지"
+
+            remote_time = _remote_update_time(doc)
+            if remote_time and str(remote_time) == self.get_meta("remote_updated") and self.has_sheets():
+                self.set_meta("synced_at", time.time())
+                self.db.commit()
+                return "변경 없음"
+
+            worksheets = doc.worksheets()
+            titles = [ws.title for ws in worksheets]
+            targets = [t for t in titles if "go" in t.lower()]
+            values = self.fetch_values(doc, worksheets, targets)
+
+            changed = 0
+            now = time.time()
+            # 받은 값 저장 ~ outbox 덮어쓰기를 한 트랜잭션으로 (그 사이 다른 프로세스의 쓰기는 끝날 때까지 대기)
+            self.db.commit()
+            self.db.execute("BEGIN IMMEDIATE")
+            pending_cells = self.pending_cells()
+            self.db.execute("DELETE FROM sheets WHERE title NOT IN (%s)" % ",".join("?" * len(titles)), titles)
+            for position, title in enumerate(titles):
+                self.db.execute("INSERT OR REPLACE INTO sheets (title, position, synced_at) VALUES (?, ?, ?)",
+                                (title, position, now))
+            for title in targets:
+                changed += self.store_rows(title, values.get(title, []), pending_cells.get(title))
+            self.db.execute("DELETE FROM rows WHERE title NOT IN (%s)" % ",".join("?" * len(targets)), targets)
+            if remote_time:
+                self.set_meta("remote_updated", remote_time)
+            self.set_meta("synced_at", now)
+            self.db.commit()
+            return f"시트 {len(targets)}개, 변경 {changed}행"
+
+    def fetch_values(self, doc, worksheets, targets):
+        """ 대상 시트 값 전체를 한 번에 받기 (values_batch_get 이 없으면 시트별로) """
+        if not targets:
+            return {}
+        batch_get = getattr(doc, "values_batch_get", None)
+        if callable(batch_get):
+            result = batch_get([_a1_title(t) for t in targets])
+            ranges = result.get("valueRanges", [])
+            return {title: ranges[i].get("values", []) if i < len(ranges) else [] for i, title in enumerate(targets)}
+        by_title = {ws.title: ws for ws in worksheets}
+        return {title: by_title[title].get_all_values() for title in targets}
+
+    def pending_cells(self):
+        """ 아직 시트에 못 보낸 쓰기 {시트: {(행, 열): 값}} (같은 셀은 마지막 값) """
+        pending = {}
+        for title, row, col, value in self.db.execute("SELECT title, row_idx, col_idx, value FROM outbox ORDER BY id"):
+            pending.setdefault(title, {})[(row, col)] = value
+        return pending
+
+    def store_rows(self, title, values, pending=None):
+        """
+        행 해시가 다른 행만 갱신 + 줄어든 행 삭제, 반환: 바뀐 행 수
+        - pending: 받은 값 위에 덮어쓸 로컬 쓰기 {(행, 열): 값} (outbox)
+        """
+        values = [[str(c) for c in cells] for cells in values]
+        for (row, col), value in sorted((pending or {}).items()):
+            while len(values) < row:
+                values.append([])
+            cells = values[row - 1]
+            while len(cells) < col:
+                cells.append("")
+            cells[col - 1] = value
+        existing = dict(self.db.execute("SELECT row_idx, hash FROM rows WHERE title = ?", (title,)).fetchall())
+        changed = 0
+        for row_idx, cells in enumerate(values, start=1):
+            while cells and cells[-1] == "":
+                cells.pop()
+            row_hash = _row_hash(cells)
+            if existing.get(row_idx) != row_hash:
+                self.db.execute("INSERT OR REPLACE INTO rows (title, row_idx, hash, cells) VALUES (?, ?, ?, ?)",
+                                (title, row_idx, row_hash, json.dumps(cells, ensure_ascii=False)))
+                changed += 1
+        removed = self.db.execute("DELETE FROM rows WHERE title = ? AND row_idx > ?", (title, len(values))).rowcount
+        return changed + removed
+
+    def has_sheets(self):
+        return self.db.execute("SELECT COUNT(*) FROM sheets").fetchone()[0] > 0
+
+    # ---------- 로컬 읽기/쓰기 ----------
+    def worksheets(self):
+        with self.lock:
+            titles = [r[0] for r in self.db.execute("SELECT title FROM sheets ORDER BY position")]
+        return [MirroredWorksheet(self, title) for title in titles]
+
+    def worksheet(self, title):
+        return MirroredWorksheet(self, title)
+
+    def read_rows(self, title):
+        with self.lock:
+            rows = self.db.execute("SELECT row_idx, cells FROM rows WHERE title = ? ORDER BY row_idx", (title,)).fetchall()
+        values = []
+        for row_idx, cells in rows:
+            while len(values) < row_idx - 1:
+                values.append([])
+            values.append(json.loads(cells))
+        return values
+
+    def write_cells(self, title, updates):
+        """ 로컬 반영 + outbox 적재 (FLUSH_BATCH 개가 넘으면 바로 시트에 반영) """
+        with self.lock:
+            now = time.time()
+            rows = {}
+            for row, col, value in updates:
+                value = "" if value is None else str(value)
+                if row not in rows:
+                    found = self.db.execute("SELECT cells FROM rows WHERE title = ? AND row_idx = ?", (title, row)).fetchone()
+                    rows[row] = json.loads(found[0]) if found else []
+                cells = rows[row]
+                while len(cells) < col:
+                    cells.append("")
+                cells[col - 1] = value
+                if self.connect is not None:
+                    self.db.execute("INSERT INTO outbox (title, row_idx, col_idx, value, queued_at) VALUES (?, ?, ?, ?, ?)",
+                                    (title, row, col, value, now))
+            for row, cells in rows.items():
+                while cells and cells[-1] == "":
+                    cells.pop()
+                self.db.execute("INSERT OR REPLACE INTO rows (title, row_idx, hash, cells) VALUES (?, ?, ?, ?)",
+                                (title, row, _row_hash(cells), json.dumps(cells, ensure_ascii=False)))
+            self.db.commit()
+            pending = self.db.execute("SELECT COUNT(*) FROM outbox").fetchone()[0]
+        if pending >= FLUSH_BATCH:
+            self.flush()
+
+    def flush(self):
+        """ 밀린 쓰기를 시트별 update_cells 1번으로 반영 (같은 셀은 마지막 값만), 반환: 성공 여부 """
+        with self.lock:
+            pending = self.db.execute("SELECT id, title, row_idx, col_idx, value FROM outbox ORDER BY id").fetchall()
+            if not pending:
+                return True
+            doc = self.remote()
+            if doc is None:
+                return False
+            latest = {}
+            for _id, title, row, col, value in pending:
+                latest[(title, row, col)] = value
+            by_title = {}
+            for (title, row, col), value in latest.items():
+                by_title.setdefault(title, []).append(gspread.Cell(row, col, value))
+            try:
+                for title, cells in by_title.items():
+                    doc.worksheet(title).update_cells(cells)
+            except Exception as e:
+                print(f"   ⚠️ 시트 쓰기 반영 실패 (다음 실행 때 다시 시도): {str(e)[:80]}")
+                return False
+            self.db.execute("DELETE FROM outbox WHERE id <= ?", (pending[-1][0],))
+            self.db.commit()
+            print(f"   📤 시트 쓰기 {len(latest)}칸 반영 ({len(by_title)}개 시트)")
+            return True
+
+    def close(self):
+        """ 남은 쓰기 반영 후 DB 닫기 (종료 시 atexit 로 호출, 여러 번 불려도 안전) """
+        if self.db is None:
+            return
+        self.flush()
+        with self.lock:
+            self.db.close()
+            self.db = None
+
+
+def _mirror_path(sheet_url_file):
+    """ 스프레드시트(URL/ID)별 미러 DB 경로 """
+    with open(sheet_url_file, "r", encoding="utf-8") as f:
+        raw = f.read().strip()
+    if not raw:
+        raise ValueError("Sheet_URL.txt 파일이 비어 있습니다.")
+    return os.path.join(MIRROR_DIR, f"sheet_{hashlib.sha1(raw.encode('utf-8')).hexdigest()[:10]}.sqlite")
+
+
+def open_sheet_mirror(sheet_url_file, connect, max_age=None):
+    """
+    미러를 열고 동기화 (기존 doc = load_spreadsheet(client) 대신 사용)
+    - connect: 원격 스프레드시트를 여는 함수 (최근 동기화됐으면 호출하지 않음)
+    - 오프라인인데 미러도 비어있으면 예외
+    """
+    if not os.path.exists(sheet_url_file):
+        raise FileNotFoundError(f"Sheet_URL.txt 파일을 찾을 수 없습니다: {sheet_url_file}")
+    if max_age is None:
+        try:
+            max_age = float(os.environ.get(MAX_AGE_ENV, "0") or 0)
+        except ValueError:
+            max_age = 0.0
+
+    mirror = SheetMirror(_mirror_path(sheet_url_file), connect)
+    started = time.time()
+    status = mirror.sync(max_age)
+    if not mirror.has_sheets():
+        raise ConnectionError("시트에 접속할 수 없고 로컬 미러도 비어 있습니다.")
+    print(f"🗂️ 시트 미러: {status} ({time.time() - started:.1f}초)")
+    atexit.register(mirror.close)
+    return mirror
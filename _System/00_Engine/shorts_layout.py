@@ -0,0 +1,194 @@
+"""
+쇼츠 블랙바 레이아웃 (1:1 이미지 → 1080x1920 세로 캔버스)
+image_generation (쇼츠 이미지메이커) / 쇼츠 이미지컨버터 가 함께 사용
+
+- encode_black_bars: 이미지 바이트 → 블랙바 PNG 바이트 (디스크 왕복 없이 메모리에서 처리)
+- convert_folder: 폴더 일괄 변환
+    프로세스 풀로 병렬 디코딩/리사이즈/PNG 압축 (CPU 작업이라 스레드보다 빠름)
+    결과는 임시 파일에 쓴 뒤 이름 변경 (원자적 쓰기), 원본 파일은 덮어쓰지 않음
+    원본 내용 해시 + 레이아웃/압축 설정이 같으면 건너뜀 ({출력 폴더}/_manifest_shorts_convert.jsonl)
+- PNG 압축 설정: compress_level 0(빠름, 큼) ~ 9(느림, 작음), optimize=True 면 추가 압축 (느림)
+"""
+import io
+import os
+import time
+import hashlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from run_manifest import RunManifest, hash_inputs, write_bytes_atomic, copy_file_atomic
+
+# 레이아웃이 바뀌면 올려서 기존 변환 결과 무효화
+LAYOUT_VERSION = 1
+CANVAS_SIZE = (1080, 1920)
+PASTE_Y = 420  # 1:1 이미지를 상단에서 420px 아래에 배치 (1080x1080 기준 세로 중앙)
+
+# PIL 기본값(6)보다 낮춰 저장 시간 단축 (용량은 조금 늘어남)
+DEFAULT_PNG_OPTIONS = {"compress_level": 3, "optimize": False}
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".webp", ".bmp")
+# 제자리 변환 전 원본(1:1)을 보관하는 하위 폴더
+ORIGINAL_DIR_NAME = "_Square"
+MANIFEST_STAGE = "shorts_convert"
+
+
+def get_png_options(compress_level=None, optimize=None):
+    """ PNG 저장 설정 (None 인 항목은 기본값) """
+    options = dict(DEFAULT_PNG_OPTIONS)
+    if compress_level is not None:
+        options["compress_level"] = max(0, min(int(compress_level), 9))
+    if optimize is not None:
+        options["optimize"] = bool(optimize)
+    return options
+
+
+def render_black_bars(image):
+    """ PIL 이미지 → 1080x1920 블랙바 캔버스 (너비 1080 에 맞춰 비율 유지 리사이즈) """
+    from PIL import Image
+    canvas_w = CANVAS_SIZE[0]
+    if image.mode not in ("RGB", "RGBA"):
+        image = image.convert("RGB")
+    width, height = image.size
+    target_height = int(height * (canvas_w / width))
+    if (width, height) != (canvas_w, target_height):
+        # reducing_gap: 큰 원본은 정수배 축소를 먼저 해서 LANCZOS 계산량을 줄임
+        image = image.resize((canvas_w, target_height), Image.Resampling.LANCZOS, reducing_gap=3.0)
+    canvas = Image.new("RGB", CANVAS_SIZE, (0, 0, 0))
+    canvas.paste(image, (0, PASTE_Y))
+    return canvas
+
+
+def encode_black_bars(image_data, png_options=None):
+    """
+    이미지 바이트 → 블랙바 레이아웃 PNG 바이트
+    이미 1080x1920 이면 None (변환 불필요), 디코딩 실패 시 예외
+    """
+    from PIL import Image
+    image = Image.open(io.BytesIO(image_data))
+    if image.size == CANVAS_SIZE:
+        return None
+    output = io.BytesIO()
+    render_black_bars(image).save(output, "PNG", **(png_options or DEFAULT_PNG_OPTIONS))
+    return output.getvalue()
+
+
+def _convert_job(source_path, output_path, png_options):
+    """ 프로세스 풀 작업 1건: (성공 여부, 소요 시간, 오류 메시지) """
+    started = time.time()
+    try:
+        with open(source_path, "rb") as f:
+            data = encode_black_bars(f.read(), png_options)
+        if data is None:
+            # 이미 세로 캔버스 크기 → 그대로 복사
+            if os.path.abspath(source_path) != os.path.abspath(output_path):
+                copy_file_atomic(source_path, output_path)
+        else:
+            write_bytes_atomic(output_path, data)
+        return True, time.time() - started, None
+    except Exception as e:
+        return False, time.time() - started, str(e)
+
+
+def get_output_name(filename):
+    """ 숫자 파일명(1.png)은 {숫자}_image_group.png, 나머지는 같은 이름의 .png """
+    stem = os.path.splitext(filename)[0]
+    if stem.isdigit():
+        return f"{stem}_image_group.png"
+    return f"{stem}.png"
+
+
+def list_images(folder_path):
+    """ 폴더 안의 이미지 파일 (대소문자 무시, 이름순, 점으로 시작하는 임시 파일 제외) """
+    return sorted(
+        os.path.join(folder_path, name) for name in os.listdir(folder_path)
+        if name.lower().endswith(IMAGE_EXTENSIONS) and not name.startswith(".")
+        and os.path.isfile(os.path.join(folder_path, name))
+    )
+
+
+def _is_canvas_size(path):
+    try:
+        from PIL import Image
+        with Image.open(path) as image:
+            return image.size == CANVAS_SIZE
+    except Exception:
+        return False
+
+
+def _content_hash(path):
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def plan_conversions(folder_path, output_dir, manifest, png_options):
+    """
+    변환할 작업 목록 → ([(원본, 출력, 입력 해시)], 건너뛴 개수)
+    - 출력이 원본과 같은 파일이면(제자리 변환) 원본을 _Square 폴더에 먼저 보관하고 그 사본을 원본으로 사용
+    """
+    jobs = []
+    skipped = 0
+    for source_path in list_images(folder_path):
+        filename = os.path.basename(source_path)
+        output_path = os.path.join(output_dir, get_output_name(filename))
+
+        if os.path.abspath(source_path) == os.path.abspath(output_path):
+            if _is_canvas_size(source_path):
+                # 이미 변환된 결과 (원본은 _Square 에 보관돼 있음)
+                print(f"   ⏭️ {filename}: 이미 블랙바 레이아웃 (1080x1920) - 스킵")
+                skipped += 1
+                continue
+            original_path = os.path.join(folder_path, ORIGINAL_DIR_NAME, filename)
+            os.makedirs(os.path.dirname(original_path), exist_ok=True)
+            copy_file_atomic(source_path, original_path)
+            source_path = original_path
+
+        input_hash = hash_inputs(_content_hash(source_path), LAYOUT_VERSION, png_options)
+        if manifest.is_valid(output_path, input_hash):
+            print(f"   ⏭️ {filename} → {os.path.basename(output_path)}: 원본 변경 없음 - 스킵")
+            skipped += 1
+            continue
+        jobs.append((source_path, output_path, input_hash))
+    return jobs, skipped
+
+
+def convert_folder(folder_path, output_dir=None, workers=None, png_options=None):
+    """
+    폴더 내 이미지를 블랙바 레이아웃으로 일괄 변환
+    - output_dir: 결과 폴더 (기본: 원본 폴더 - 숫자 파일명은 새 이름으로, 나머지는 원본 보관 후 교체)
+    - workers: 프로세스 수 (기본: CPU 수)
+    반환: (성공 개수, 실패 개수, 건너뛴 개수)
+    """
+    output_dir = output_dir or folder_path
+    png_options = png_options or get_png_options()
+    os.makedirs(output_dir, exist_ok=True)
+    # 기록 없는 예전 결과는 인정하지 않음 (원본이 바뀌었을 수 있으므로 한 번 다시 변환)
+    manifest = RunManifest(output_dir, MANIFEST_STAGE, adopt_external=False)
+
+    jobs, skipped = plan_conversions(folder_path, output_dir, manifest, png_options)
+    if not jobs:
+        return 0, 0, skipped
+
+    workers = max(1, min(workers or os.cpu_count() or 1, len(jobs)))
+    print(f"⚙️ {len(jobs)}개 변환 (프로세스 {workers}개, PNG 압축 {png_options['compress_level']}"
+          f"{', optimize' if png_options['optimize'] else ''})")
+
+    success_count = 0
+    fail_count = 0
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(_convert_job, source_path, output_path, png_options): (source_path, output_path, input_hash)
+            for source_path, output_path, input_hash in jobs
+        }
+        for idx, future in enumerate(as_completed(futures), 1):
+            source_path, output_path, input_hash = futures[future]
+            ok, elapsed, error = future.result()
+            manifest.record(output_path, input_hash, "done" if ok else "failed", elapsed, error)
+            label = f"[{idx}/{len(jobs)}] {os.path.basename(source_path)} → {os.path.basename(output_path)}"
+            if ok:
+                success_count += 1
+                print(f"{label} ✅ 완료 ({elapsed:.2f}초)")
+            else:
+                fail_count += 1
+                print(f"{label} ❌ 실패: {error}")
+    return success_count, fail_count, skipped
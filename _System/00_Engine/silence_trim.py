@@ -0,0 +1,204 @@
+"""
+음성 무음 구간 제거 (TTS 앞/뒤 무음 자르기 + 문장 사이 긴 쉼 줄이기)
+VoiceMaker 가 사용
+
+- mp3 → PCM 임시 파일 (ffmpeg) → NumPy 로 10ms 프레임 RMS(dBFS) 계산 → 임계값보다 작으면 무음
+- 앞/뒤 무음: 첫 소리 앞 keep_head 초, 마지막 소리 뒤 keep_tail 초만 남김 (자음 잘림 방지)
+- max_pause (초) 를 주면 내부 무음이 그보다 길 때 가운데를 잘라 max_pause 로 줄임
+  잘린 경계에는 짧은 페이드 (딸깍 소리 방지)
+- 자르기는 ffmpeg 필터 (atrim + afade + concat) 로 원본에서 바로 인코딩 → 손실 압축은 1번
+    속도/피치 후처리가 있는 행은 audio_prosody 가 같은 필터 뒤에 속도/피치를 붙여 한 번에 처리
+- 디코딩/인코딩 모두 ffmpeg_runner 로 실행 → "ffmpeg" 자원 슬롯으로 동시 실행 수 제한, 타이밍 리포트에 기록
+- 결과는 임시 파일에 인코딩 후 교체, 새 길이(초)는 ffmpeg 진행 정보(out_time) 그대로 반환 → D열에 기록
+- 출력 규격 (44.1kHz 모노 mp3) 은 encode_args() 하나로 통일 → audio_prosody 도 같은 값 사용
+- NumPy 가 없으면 아무것도 하지 않음 (원본 유지)
+"""
+import os
+from ffmpeg_runner import run_ffmpeg
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+FFMPEG_CMD = r"C:\YtFactory9\ffmpeg.exe"
+
+# 디코딩 규격 (음성이라 모노, Mergy 클립과 같은 샘플레이트)
+SAMPLE_RATE = 44100
+MP3_BITRATE = "192k"
+STAGE = "VoiceMaker.trim"
+
+DEFAULT_TRIM_OPTIONS = {
+    "threshold_db": -45.0,   # 이 값보다 조용한 프레임 = 무음
+    "frame_sec": 0.01,       # RMS 계산 단위
+    "keep_head": 0.05,       # 첫 소리 앞에 남길 여유
+    "keep_tail": 0.15,       # 마지막 소리 뒤에 남길 여유 (문장 끝 여운)
+    "max_pause": None,       # 내부 무음 최대 길이 (None = 내부는 그대로)
+    "fade_sec": 0.005,       # 잘린 경계 페이드
+    "min_gain_sec": 0.05,    # 줄어드는 길이가 이보다 작으면 다시 인코딩하지 않음
+}
+
+
+def get_trim_options(**overrides):
+    """ 기본값 + 지정 값 (None 인 항목은 기본값 유지, max_pause 는 None 허용) """
+    options = dict(DEFAULT_TRIM_OPTIONS)
+    for key, value in overrides.items():
+        if value is not None or key == "max_pause":
+            options[key] = value
+    return options
+
+
+def decode_pcm(audio_path):
+    """ 오디오 파일 → int16 모노 샘플 배열 (PCM 임시 파일 경유) """
+    folder, name = os.path.split(audio_path)
+    pcm_path = os.path.join(folder, f".{os.path.splitext(name)[0]}.trim.pcm")
+    cmd = [
+        FFMPEG_CMD, "-y", "-v", "error", "-i", audio_path,
+        "-f", "s16le", "-acodec", "pcm_s16le", "-ac", "1", "-ar", str(SAMPLE_RATE), pcm_path
+    ]
+    try:
+        job = run_ffmpeg(cmd, label=f"{name} (분석)", stage=STAGE, check=False, quiet=True)
+        if job["returncode"] != 0:
+            raise RuntimeError(job.get("stderr", "").strip()[-200:] or "ffmpeg 디코딩 실패")
+        return np.fromfile(pcm_path, dtype=np.int16)
+    finally:
+        if os.path.exists(pcm_path):
+            os.remove(pcm_path)
+
+
+def frame_levels_db(samples, frame_len):
+    """ 프레임별 RMS (dBFS, 0 = 최대 음량) - 마지막 자투리 프레임은 0 으로 채워 계산 """
+    frame_count = -(-len(samples) // frame_len)
+    padded = np.zeros(frame_count * frame_len, dtype=np.float32)
+    padded[:len(samples)] = samples / 32768.0
+    rms = np.sqrt(np.mean(padded.reshape(frame_count, frame_len) ** 2, axis=1))
+    return 20.0 * np.log10(np.maximum(rms, 1e-10))
+
+
+def find_keep_ranges(samples, options):
+    """
+    남길 구간 [(시작 샘플, 끝 샘플), ...]
+    소리가 전혀 없으면 None (묵음 파일은 자르지 않음)
+    """
+    frame_len = max(1, int(SAMPLE_RATE * options["frame_sec"]))
+    voiced = frame_levels_db(samples, frame_len) > options["threshold_db"]
+    if not voiced.any():
+        return None
+
+    first = int(np.argmax(voiced))
+    last = len(voiced) - 1 - int(np.argmax(voiced[::-1]))
+    start = max(0, first * frame_len - int(options["keep_head"] * SAMPLE_RATE))
+    end = min(len(samples), (last + 1) * frame_len + int(options["keep_tail"] * SAMPLE_RATE))
+
+    max_pause = options.get("max_pause")
+    if not max_pause:
+        return [(start, end)]
+
+    # 첫 소리 ~ 마지막 소리 사이의 무음 구간 (프레임 단위 시작/끝)
+    inner = voiced[first:last + 1].astype(np.int8)
+    edges = np.diff(np.concatenate(([1], inner, [1])))
+    gap_starts = np.flatnonzero(edges == -1) + first
+    gap_ends = np.flatnonzero(edges == 1) + first
+    max_gap_frames = max(1, int(max_pause / options["frame_sec"]))
+
+    ranges = []
+    cursor = start
+    for gap_start, gap_end in zip(gap_starts, gap_ends):
+        if gap_end - gap_start <= max_gap_frames:
+            continue
+        # 무음 앞뒤로 max_pause 의 절반씩 남기고 가운데를 잘라냄
+        half = max_gap_frames // 2
+        cut_from = int(gap_start + half) * frame_len
+        cut_to = int(gap_end - (max_gap_frames - half)) * frame_len
+        ranges.append((cursor, cut_from))
+        cursor = cut_to
+    ranges.append((cursor, end))
+    return ranges
+
+
+def analyze_silence(audio_path, options=None):
+    """
+    남길 구간 분석 → ([(시작 초, 끝 초), ...], 원본 길이 초)
+    자를 것이 없거나(줄어드는 길이 < min_gain_sec) 분석 실패 / NumPy 없음 → None
+    """
+    if not NUMPY_AVAILABLE:
+        return None
+    options = options or DEFAULT_TRIM_OPTIONS
+    try:
+        samples = decode_pcm(audio_path)
+    except Exception as e:
+        print(f"   ⚠️ 무음 분석 실패 (원본 유지): {e}")
+        return None
+    if len(samples) == 0:
+        return None
+    ranges = find_keep_ranges(samples, options)
+    if ranges is None:
+        return None
+    kept = sum(end - start for start, end in ranges)
+    if (len(samples) - kept) / SAMPLE_RATE < options["min_gain_sec"]:
+        return None
+    return [(start / SAMPLE_RATE, end / SAMPLE_RATE) for start, end in ranges], len(samples) / SAMPLE_RATE
+
+
+def encode_args():
+    """ 음성 mp3 출력 인자 (무음 제거 / 속도·피치 공통) """
+    return ["-ar", str(SAMPLE_RATE), "-ac", "1", "-c:a", "libmp3lame", "-b:a", MP3_BITRATE]
+
+
+def kept_seconds(ranges):
+    return sum(end - start for start, end in ranges)
+
+
+def build_trim_filter(ranges, total_sec, fade_sec=DEFAULT_TRIM_OPTIONS["fade_sec"], output="trimmed"):
+    """
+    남길 구간 → -filter_complex 조각 (입력 [0:a], 출력 [output])
+    구간마다 atrim, 잘린 경계에만 짧은 페이드, 여러 구간이면 concat
+    """
+    parts = []
+    for index, (start, end) in enumerate(ranges):
+        length = end - start
+        fade = min(fade_sec, length / 2)
+        chain = [f"atrim=start={start:.6f}:end={end:.6f}", "asetpts=PTS-STARTPTS"]
+        if fade > 0 and start > 0:
+            chain.append(f"afade=t=in:d={fade:.6f}")
+        if fade > 0 and end < total_sec:
+            chain.append(f"afade=t=out:st={length - fade:.6f}:d={fade:.6f}")
+        label = output if len(ranges) == 1 else f"seg{index}"
+        parts.append(f"[0:a]{','.join(chain)}[{label}]")
+    if len(ranges) > 1:
+        inputs = "".join(f"[seg{index}]" for index in range(len(ranges)))
+        parts.append(f"{inputs}concat=n={len(ranges)}:v=0:a=1[{output}]")
+    return ";".join(parts)
+
+
+def trim_silence_file(audio_path, options=None):
+    """
+    mp3 무음 구간 제거 (제자리 교체, 인코딩 1번)
+    반환: (새 길이 초, 줄어든 초) / 자를 것이 없거나 실패하면 None (원본 유지)
+    """
+    options = options or DEFAULT_TRIM_OPTIONS
+    analysis = analyze_silence(audio_path, options)
+    if analysis is None:
+        return None
+    ranges, total_sec = analysis
+
+    folder, name = os.path.split(audio_path)
+    temp_path = os.path.join(folder, f".{os.path.splitext(name)[0]}.trim.mp3")
+    cmd = [
+        FFMPEG_CMD, "-y", "-v", "error", "-i", audio_path, "-vn",
+        "-filter_complex", build_trim_filter(ranges, total_sec, options["fade_sec"]), "-map", "[trimmed]",
+        *encode_args(), temp_path
+    ]
+    try:
+        job = run_ffmpeg(cmd, label=name, stage=STAGE, check=False, quiet=True)
+        if job["returncode"] != 0:
+            print(f"   ⚠️ 무음 제거 실패 (원본 유지): {job.get('stderr', '').strip()[-200:]}")
+            return None
+        os.replace(temp_path, audio_path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+    # 실제 인코딩된 길이 (진행 정보가 없으면 남긴 구간 합계)
+    new_sec = job["media_sec"] or kept_seconds(ranges)
+    return new_sec, max(total_sec - new_sec, 0.0)
@@ -0,0 +1,132 @@
+"""
+그룹 단위 스트리밍 실행 도우미 (auto_pipeline --stream)
+ImageMaker / KenBurns / VoiceMaker / Mergy 가 함께 사용
+
+- 모든 단계를 동시에 띄우고, 그룹(GID) / 행(ID) 단위 "준비 완료" 표시 파일로 이어달리기
+    이미지메이커: 그룹 이미지 완성 → image/{gid}.ok
+    켄번:         image/{gid}.ok 를 보고 변환 → kenburns/{gid}.ok
+    보이스메이커: 행 음성 완성 → voice/{id}.ok
+    머지파이:     그룹의 kenburns + 그 그룹 행들의 voice 가 모두 준비되면 클립 렌더링
+- 단계 프로세스가 끝나면 auto_pipeline 이 _done/{stage}.json 기록
+  → 아래 단계는 "윗단계가 끝났는데 아직 준비 안 된 그룹" 을 누락으로 판단
+- 표시 파일은 결과 파일이 완전히 저장된 뒤에만 만들어짐 (쓰는 중인 파일을 읽지 않음)
+"""
+import os
+import json
+import time
+
+# 준비된 그룹이 없을 때 다시 확인하는 간격 (초)
+STREAM_POLL_SEC = 2.0
+
+
+def _safe_key(key):
+    """ 파일명으로 쓸 수 없는 문자 치환 """
+    return "".join(c if c.isalnum() or c in "-_." else "_" for c in str(key).strip())
+
+
+def mark_ready(stream_dir, stage, key):
+    """ stage 에서 key(그룹/행) 결과가 완성되었음을 기록 """
+    if not stream_dir:
+        return
+    stage_dir = os.path.join(stream_dir, stage)
+    os.makedirs(stage_dir, exist_ok=True)
+    # 임시 파일에 key 를 다 쓴 뒤 이름 변경 → 다른 프로세스가 빈 표시 파일을 읽지 않음
+    marker_path = os.path.join(stage_dir, f"{_safe_key(key)}.ok")
+    temp_path = marker_path + ".tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        f.write(str(key))
+    os.replace(temp_path, marker_path)
+
+
+def is_ready(stream_dir, stage, key):
+    return os.path.exists(os.path.join(stream_dir, stage, f"{_safe_key(key)}.ok"))
+
+
+def list_ready(stream_dir, stage):
+    """ stage 에서 완성된 key 목록 (원래 key 문자열) """
+    stage_dir = os.path.join(stream_dir, stage)
+    if not os.path.isdir(stage_dir):
+        return []
+    keys = []
+    for name in sorted(os.listdir(stage_dir)):
+        if name.endswith(".ok"):
+            try:
+                with open(os.path.join(stage_dir, name), "r", encoding="utf-8") as f:
+                    key = f.read().strip()
+            except OSError:
+                continue
+            # 빈 key 는 건너뜀 (예전 방식으로 쓰는 중인 표시 파일)
+            if key:
+                keys.append(key)
+    return keys
+
+
+def mark_stage_done(stream_dir, stage, returncode):
+    """ 단계 프로세스 종료 기록 (auto_pipeline 이 호출) """
+    done_dir = os.path.join(stream_dir, "_done")
+    os.makedirs(done_dir, exist_ok=True)
+    temp_path = os.path.join(done_dir, f"{stage}.json.tmp")
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump({"stage": stage, "returncode": returncode}, f)
+    os.replace(temp_path, os.path.join(done_dir, f"{stage}.json"))
+
+
+def is_stage_done(stream_dir, stage):
+    return os.path.exists(os.path.join(stream_dir, "_done", f"{stage}.json"))
+
+
+def follow_ready(stream_dir, upstream_stage, handle, poll_sec=STREAM_POLL_SEC):
+    """
+    윗단계가 완성 표시한 key 를 발견되는 대로 handle(key) 로 처리 (윗단계가 끝날 때까지 반복)
+    반환: 처리한 key 목록
+    """
+    handled = []
+    seen = set()
+    while True:
+        # 확인 순서 주의: 종료 여부를 먼저 본 뒤 목록을 읽어야 마지막 표시를 놓치지 않음
+        upstream_done = is_stage_done(stream_dir, upstream_stage)
+        new_keys = [k for k in list_ready(stream_dir, upstream_stage) if k not in seen]
+        for key in new_keys:
+            seen.add(key)
+            handle(key)
+            handled.append(key)
+        if not new_keys:
+            if upstream_done:
+                return handled
+            time.sleep(poll_sec)
+
+
+class GroupWorkQueue:
+    """
+    GID 를 키로 하는 작업 큐 (입력이 준비된 그룹부터 처리)
+    - put(gid, item): 그룹 작업 등록 (등록 순서 = 처리 우선순위)
+    - drain(is_ready, handle, upstream_done): 준비된 그룹을 handle(gid, item) 으로 처리,
+      윗단계가 모두 끝났는데도 준비되지 않은 그룹은 남겨서 반환
+    """
+
+    def __init__(self, poll_sec=STREAM_POLL_SEC):
+        self.poll_sec = poll_sec
+        self.pending = {}
+
+    def put(self, gid, item):
+        self.pending[gid] = item
+
+    def __len__(self):
+        return len(self.pending)
+
+    def drain(self, is_ready, handle, upstream_done):
+        waiting_printed = False
+        while self.pending:
+            done_before_scan = upstream_done()
+            ready = [gid for gid in self.pending if is_ready(gid)]
+            for gid in ready:
+                handle(gid, self.pending.pop(gid))
+                waiting_printed = False
+            if not ready:
+                if done_before_scan:
+                    break
+                if not waiting_printed:
+                    print(f"   ⏳ 입력 대기 중... (남은 그룹 {len(self.pending)}개)")
+                    waiting_printed = True
+                time.sleep(self.poll_sec)
+        return dict(self.pending)
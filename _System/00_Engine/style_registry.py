@@ -0,0 +1,203 @@
+"""
+자막/제목 스타일 레지스트리
+mergy_renderer (Mergy / Mergy_Shorts) / TitleInserter 가 함께 사용
+
+- Sub/Styles/*.json 을 실행당 1회만 읽고 파싱 (파일 mtime 이 바뀐 스타일만 다시 파싱)
+- 스키마 검사: 모르는 키 / 타입 오류는 파일 로드 시 한 번만 경고
+- 폰트 경로(Sub/Fonts)는 폰트 이름당 한 번만 확인
+- 주석(//), 후행 쉼표, 줄 끝 쉼표 누락을 허용 (기존 스타일 파일 호환)
+- title_1.json 처럼 객체가 연달아 있는 파일은 객체 목록으로 보관 (제목, 부제목 순)
+"""
+import os
+import re
+import json
+import glob
+
+# 스타일 JSON 에서 쓸 수 있는 키와 허용 타입
+STYLE_SCHEMA = {
+    "fontfile": (str,),
+    "font": (str,),
+    "fontsize": (int, float),
+    "fontcolor": (str,),
+    "x": (int, float, str),
+    "y": (int, float, str),
+    "box": (int, bool),
+    "boxcolor": (str,),
+    "boxborderw": (int, float),
+    "borderw": (int, float),
+    "bordercolor": (str,),
+    "start": (int, float),
+    "duration": (int, float, type(None)),
+}
+
+# 줄 끝이 값으로 끝나고 다음 줄이 키로 시작하면 쉼표 누락으로 판단
+_VALUE_END = re.compile(r'("|\d|true|false|null|[}\]])$')
+
+
+def strip_json_comments(content):
+    """ // 주석 제거 (문자열 안의 // 는 유지) """
+    cleaned_lines = []
+    for line in content.split('\n'):
+        if '//' in line:
+            comment_idx = line.find('//')
+            if line[:comment_idx].count('"') % 2 == 0:
+                line = line[:comment_idx]
+        cleaned_lines.append(line.rstrip())
+    return '\n'.join(cleaned_lines)
+
+
+def repair_missing_commas(content):
+    """
+    줄 끝 쉼표 누락 보정 (예: "fontfile": "a.ttf" ↵ "fontsize": 80)
+    반환: (보정된 내용, 보정한 줄 수)
+    """
+    lines = content.split('\n')
+    fixed = 0
+    for i, line in enumerate(lines):
+        stripped = line.rstrip()
+        if not stripped or not _VALUE_END.search(stripped):
+            continue
+        next_line = next((l.strip() for l in lines[i + 1:] if l.strip()), "")
+        if next_line.startswith('"'):
+            lines[i] = stripped + ','
+            fixed += 1
+    return '\n'.join(lines), fixed
+
+
+def parse_style_objects(content):
+    """
+    스타일 JSON 내용을 객체 목록으로 파싱
+    - 단일 객체 / 배열 / 연속된 객체({...}{...}) 모두 지원
+    반환: (객체 목록, 쉼표 보정 줄 수)
+    """
+    cleaned = strip_json_comments(content)
+    cleaned, fixed = repair_missing_commas(cleaned)
+    # 후행 쉼표 제거
+    cleaned = re.sub(r',(\s*[}\]])', r'\1', cleaned)
+
+    decoder = json.JSONDecoder()
+    objects = []
+    pos = 0
+    while True:
+        while pos < len(cleaned) and cleaned[pos].isspace():
+            pos += 1
+        if pos >= len(cleaned):
+            break
+        data, pos = decoder.raw_decode(cleaned, pos)
+        if isinstance(data, list):
+            objects.extend(data)
+        else:
+            objects.append(data)
+
+    if not objects or not all(isinstance(o, dict) for o in objects):
+        raise ValueError("JSON 객체를 찾을 수 없습니다")
+    return objects, fixed
+
+
+def validate_style(data):
+    """ 스키마 검사: 문제 목록 반환 (빈 목록이면 정상) """
+    problems = []
+    for key, value in data.items():
+        if key not in STYLE_SCHEMA:
+            problems.append(f"알 수 없는 키 '{key}'")
+        elif not isinstance(value, STYLE_SCHEMA[key]):
+            problems.append(f"'{key}' 타입 오류 ({type(value).__name__})")
+    return problems
+
+
+class StyleRegistry:
+    """
+    스타일 폴더 캐시 (생성 시 전체 1회 로드, 이후 파일별 mtime 비교로 변경분만 재로드)
+    - get(name): 해당 스타일의 객체 목록 (폰트 경로 해석 완료) / 없거나 파싱 실패면 None
+    - build_style(data, defaults): 기본값을 채운 렌더링용 스타일 dict
+    """
+
+    def __init__(self, styles_dir, fonts_dir, default_font):
+        self.styles_dir = styles_dir
+        self.fonts_dir = fonts_dir
+        self.default_font = default_font
+        self.entries = {}
+        self.fonts = {}
+        self.warned = set()
+        self.load_all()
+
+    def warn_once(self, key, message):
+        """ 같은 경고는 실행당 한 번만 출력 """
+        if key not in self.warned:
+            self.warned.add(key)
+            print(message)
+
+    def resolve_font(self, font_name):
+        """ 폰트 이름 → 실제 경로 (없으면 기본 폰트) """
+        if not font_name:
+            return self.default_font
+        if font_name not in self.fonts:
+            font_candidate = os.path.join(self.fonts_dir, font_name)
+            if os.path.exists(font_candidate):
+                self.fonts[font_name] = font_candidate
+            else:
+                print(f"   ⚠️ 폰트 파일을 찾을 수 없습니다: {font_name}, 기본 폰트 사용")
+                self.fonts[font_name] = self.default_font
+        return self.fonts[font_name]
+
+    def _load(self, name, style_path, mtime):
+        """ 스타일 파일 1개 파싱 + 검사 + 폰트 해석 """
+        entry = {"mtime": mtime, "objects": None}
+        try:
+            with open(style_path, "r", encoding="utf-8") as f:
+                objects, fixed = parse_style_objects(f.read())
+            if fixed:
+                print(f"   🔧 [{name}.json] 쉼표 누락 {fixed}곳 자동 보정")
+            resolved = []
+            for data in objects:
+                for problem in validate_style(data):
+                    print(f"   ⚠️ [{name}.json] {problem}")
+                font_name = data.get("fontfile") or data.get("font")
+                data = {k: v for k, v in data.items() if k in STYLE_SCHEMA and k != "font"}
+                data["fontfile"] = self.resolve_font(font_name)
+                resolved.append(data)
+            entry["objects"] = resolved
+        except Exception as e:
+            print(f"   ⚠️ 스타일 로드 실패 ({name}.json): {e}")
+        self.entries[name] = entry
+        return entry
+
+    def load_all(self):
+        """ 스타일 폴더 전체 로드 """
+        for style_path in sorted(glob.glob(os.path.join(self.styles_dir, "*.json"))):
+            name = os.path.splitext(os.path.basename(style_path))[0]
+            self._load(name, style_path, os.path.getmtime(style_path))
+        loaded = sum(1 for e in self.entries.values() if e["objects"])
+        print(f"   🎨 스타일 {loaded}개 로드 완료 ({self.styles_dir})")
+
+    def get(self, name):
+        """ 스타일 객체 목록 (파일이 수정됐으면 다시 파싱) """
+        style_path = os.path.join(self.styles_dir, f"{name}.json")
+        if not os.path.exists(style_path):
+            self.entries.pop(name, None)
+            return None
+        mtime = os.path.getmtime(style_path)
+        entry = self.entries.get(name)
+        if entry is None or entry["mtime"] != mtime:
+            if entry is not None:
+                print(f"   🔄 스타일 변경 감지, 다시 로드: {name}.json")
+            entry = self._load(name, style_path, mtime)
+        return entry["objects"]
+
+    def build_style(self, data, defaults):
+        """ 스타일 객체에 기본값을 채워 렌더링용 dict 생성 (defaults 에 있는 키만 사용) """
+        style = {"fontfile": data.get("fontfile") or self.default_font}
+        for key, value in defaults.items():
+            style[key] = data.get(key, value)
+        return style
+
+
+_REGISTRIES = {}
+
+
+def get_style_registry(styles_dir, fonts_dir, default_font):
+    """ 스타일 폴더별 레지스트리 (프로세스당 1개) """
+    key = (os.path.normcase(os.path.abspath(styles_dir)), fonts_dir, default_font)
+    if key not in _REGISTRIES:
+        _REGISTRIES[key] = StyleRegistry(styles_dir, fonts_dir, default_font)
+    return _REGISTRIES[key]
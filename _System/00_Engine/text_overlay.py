@@ -0,0 +1,185 @@
+"""
+자막/제목 텍스트 오버레이 캐시 (Pillow)
+mergy_renderer (Mergy / Mergy_Shorts) / TitleInserter 가 함께 사용
+
+- (텍스트, 스타일, 폰트, 해상도) 조합을 투명 PNG 한 장으로 1회만 렌더링
+- 같은 조합은 클립/에피소드가 달라도 캐시 파일을 그대로 재사용
+- ffmpeg 에서는 overlay 필터로 합성 → drawtext 특수문자 이스케이프 문제 없음
+- 스타일 키는 drawtext 와 동일 (fontfile, fontsize, fontcolor, x, y, box, boxcolor, boxborderw,
+  borderw, bordercolor) / x, y 에는 drawtext 식 (w, h, text_w, text_h, tw, th) 사용 가능
+- safe_area (왼, 위, 오른, 아래 여백 px) 를 주면 글상자가 그 안에 들어오도록 위치를 당김
+  (쇼츠 하단 제목/우측 버튼 영역 등 플랫폼 UI 에 자막이 가리지 않게)
+"""
+import os
+import ast
+import json
+import operator
+import hashlib
+from PIL import Image, ImageDraw, ImageFont, ImageColor
+
+# 렌더링 방식이 바뀌면 올려서 기존 캐시 무효화
+RENDER_VERSION = 1
+
+# 렌더링 결과에 영향을 주는 스타일 키 (캐시 키 계산용)
+STYLE_KEYS = ("fontfile", "fontsize", "fontcolor", "x", "y", "box", "boxcolor", "boxborderw",
+              "borderw", "bordercolor")
+
+_FONT_CACHE = {}
+
+
+def _load_font(font_path, font_size):
+    """ 폰트 파일은 (경로, 크기)당 한 번만 로드 """
+    key = (font_path, int(font_size))
+    if key not in _FONT_CACHE:
+        _FONT_CACHE[key] = ImageFont.truetype(font_path, int(font_size))
+    return _FONT_CACHE[key]
+
+
+def parse_color(value, default="white"):
+    """
+    drawtext 색상 표기를 RGBA 튜플로 변환
+    - "white", "#FFD700", "0xFFD700", "black@0.6" (@ 뒤는 불투명도 0~1)
+    """
+    text = str(value or default).strip()
+    alpha = 1.0
+    if "@" in text:
+        text, alpha_str = text.split("@", 1)
+        try:
+            alpha = float(alpha_str)
+        except ValueError:
+            alpha = 1.0
+    if text.lower().startswith("0x"):
+        text = "#" + text[2:]
+    try:
+        rgb = ImageColor.getrgb(text)[:3]
+    except ValueError:
+        rgb = ImageColor.getrgb(default)[:3]
+    return (*rgb, int(max(0.0, min(alpha, 1.0)) * 255))
+
+
+_BINARY_OPS = {
+    ast.Add: operator.add, ast.Sub: operator.sub,
+    ast.Mult: operator.mul, ast.Div: operator.truediv,
+}
+_UNARY_OPS = {ast.UAdd: operator.pos, ast.USub: operator.neg}
+
+
+def _eval_node(node, names):
+    """ 숫자 / 위치 변수 / 사칙연산만 계산 (그 외 노드는 ValueError) """
+    if isinstance(node, ast.Expression):
+        return _eval_node(node.body, names)
+    if isinstance(node, ast.Constant) and type(node.value) in (int, float):
+        return node.value
+    if isinstance(node, ast.Name) and node.id in names:
+        return names[node.id]
+    if isinstance(node, ast.BinOp) and type(node.op) in _BINARY_OPS:
+        return _BINARY_OPS[type(node.op)](_eval_node(node.left, names), _eval_node(node.right, names))
+    if isinstance(node, ast.UnaryOp) and type(node.op) in _UNARY_OPS:
+        return _UNARY_OPS[type(node.op)](_eval_node(node.operand, names))
+    raise ValueError(f"허용되지 않는 위치식: {ast.dump(node)[:40]}")
+
+
+def eval_position(expr, w, h, text_w, text_h, default=0):
+    """ drawtext 위치식 계산 (예: "(w-text_w)/2", "h-th-180", 100) - eval 대신 ast 로 사칙연산만 """
+    if isinstance(expr, (int, float)):
+        return int(expr)
+    expr = str(expr).strip()
+    if not expr:
+        return default
+    names = {
+        "w": w, "h": h, "W": w, "H": h,
+        "main_w": w, "main_h": h,
+        "text_w": text_w, "text_h": text_h, "tw": text_w, "th": text_h,
+    }
+    try:
+        return int(_eval_node(ast.parse(expr, mode="eval"), names))
+    except (SyntaxError, ValueError, TypeError, ZeroDivisionError, OverflowError):
+        return default
+
+
+def get_cache_key(layers, resolution, safe_area=None):
+    """ (텍스트, 스타일, 폰트 파일 상태, 해상도, 안전 영역) 해시 """
+    payload = []
+    for text, style in layers:
+        font_path = style.get("fontfile", "")
+        font_stat = ""
+        if font_path and os.path.exists(font_path):
+            st = os.stat(font_path)
+            font_stat = f"{st.st_size}:{int(st.st_mtime)}"
+        draw_style = {k: style[k] for k in STYLE_KEYS if k in style}
+        payload.append({"text": text, "style": draw_style, "font": font_stat})
+    key = {"v": RENDER_VERSION, "res": list(resolution), "layers": payload}
+    if safe_area:
+        # 안전 영역이 없을 때는 키를 그대로 두어 기존 캐시 유지
+        key["safe"] = list(safe_area)
+    raw = json.dumps(key, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def clamp_to_safe_area(x, y, box_w, box_h, width, height, safe_area, pad=0):
+    """ 글상자(여백 pad 포함)가 안전 영역 밖으로 나가면 안쪽으로 당긴 (x, y) """
+    left, top, right, bottom = safe_area
+    x = max(min(x, width - right - pad - box_w), left + pad)
+    y = max(min(y, height - bottom - pad - box_h), top + pad)
+    return x, y
+
+
+def _draw_layer(draw, text, style, width, height, safe_area=None):
+    font = _load_font(style["fontfile"], style.get("fontsize", 50))
+    border_w = int(style.get("borderw", 0) or 0)
+
+    left, top, right, bottom = draw.multiline_textbbox((0, 0), text, font=font, stroke_width=border_w)
+    text_w, text_h = right - left, bottom - top
+
+    x = eval_position(style.get("x", "(w-text_w)/2"), width, height, text_w, text_h, (width - text_w) // 2)
+    y = eval_position(style.get("y", "h-100"), width, height, text_w, text_h, height - 100)
+
+    has_box = int(style.get("box", 0) or 0)
+    pad = int(style.get("boxborderw", 0) or 0) if has_box else 0
+    if safe_area:
+        x, y = clamp_to_safe_area(x, y, text_w, text_h, width, height, safe_area, pad)
+
+    if has_box:
+        draw.rectangle(
+            [x - pad, y - pad, x + text_w + pad, y + text_h + pad],
+            fill=parse_color(style.get("boxcolor"), "white")
+        )
+
+    draw.multiline_text(
+        (x - left, y - top), text, font=font,
+        fill=parse_color(style.get("fontcolor"), "black"),
+        stroke_width=border_w,
+        stroke_fill=parse_color(style.get("bordercolor"), "black") if border_w else None,
+    )
+
+
+def render_text_overlay(layers, resolution, cache_dir, safe_area=None):
+    """
+    텍스트 레이어들을 화면 크기의 투명 PNG 한 장으로 렌더링 (캐시 우선)
+    - layers: [(텍스트, 스타일 dict), ...] (예: 제목 + 부제목)
+    - resolution: (가로, 세로)
+    - safe_area: (왼, 위, 오른, 아래) 여백 px (없으면 스타일 위치 그대로)
+    반환: PNG 경로 (그릴 텍스트가 없으면 None)
+    """
+    layers = [(text.strip(), style) for text, style in layers if text and text.strip()]
+    if not layers:
+        return None
+
+    if not os.path.exists(cache_dir):
+        os.makedirs(cache_dir)
+
+    width, height = resolution
+    png_path = os.path.join(cache_dir, f"{get_cache_key(layers, resolution, safe_area)}.png")
+    if os.path.exists(png_path):
+        return png_path
+
+    canvas = Image.new("RGBA", (width, height), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(canvas)
+    for text, style in layers:
+        _draw_layer(draw, text, style, width, height, safe_area)
+
+    # 병렬 실행 시 반쯤 쓰인 파일이 보이지 않도록 임시 파일 → 이름 변경
+    temp_path = f"{png_path}.{os.getpid()}.tmp"
+    canvas.save(temp_path, format="PNG")
+    os.replace(temp_path, png_path)
+    return png_path
@@ -0,0 +1,206 @@
+"""
+목소리 레지스트리 (voices_edge / voices_azure / voices_elevenlabs.txt)
+VoiceMaker 가 사용 (Edge / Azure / ElevenLabs 공통)
+
+- 세 파일 모두 같은 형식: 호출이름,스타일,성별,ID,속도,피치,설명
+  헤더/주석(#)/구분선(=, [)/칸이 모자란 메모 줄은 건너뜀 → 도구별 호출이름 접두어 목록('선희'/'인준'...) 불필요
+- 색인 3개 (dict, 행마다 O(1) 조회): 호출이름 / 정규화 이름 (대소문자·공백·_·- 무시) / 목소리 ID
+- 실행 간 캐시: 00_Engine/_voice_registry_cache.json
+    원본 파일들의 수정 시각/크기가 그대로면 파싱 생략, 하나라도 바뀌면 다시 파싱해서 저장
+- validate_rows: 시트 I열(목소리)/L열(음성 도구) 전체를 합성 시작 전에 검사 → 오타를 바로 알려줌
+"""
+import os
+import re
+import json
+from run_manifest import write_bytes_atomic
+
+CACHE_VERSION = 1
+DEFAULT_CACHE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "_voice_registry_cache.json")
+
+TOOLS = ("edge", "azure", "elevenlabs")
+TOOL_LABELS = {"edge": "Edge", "azure": "Azure", "elevenlabs": "ElevenLabs"}
+DEFAULT_ELEVENLABS_MODEL = "eleven_multilingual_v2"
+
+# Edge/Azure 전체 목소리 ID (예: ko-KR-InJoonNeural) - 기존 판정 그대로
+_NEURAL_ID_HINTS = ("ko-", "-Neural", "en-")
+# ElevenLabs 목소리 ID (20자리 영숫자)
+_ELEVENLABS_ID = re.compile(r"^[A-Za-z0-9]{20}$")
+
+# 무음 행 (미드트로/아웃트로) 은 목소리 검사 제외
+SILENCE_MARKERS = ("(미드트로)", "(아웃트로)")
+
+
+def normalize_name(name):
+    """ 정규화 이름: 소문자, 공백/밑줄/하이픈 제거 (예: '선희 기본' == '선희_기본') """
+    return re.sub(r"[\s_\-]+", "", (name or "").strip().lower())
+
+
+def looks_like_voice_id(tool, text):
+    """ 호출이름이 아니라 목소리 ID 를 직접 적은 것인지 """
+    text = (text or "").strip()
+    if tool == "elevenlabs":
+        return bool(_ELEVENLABS_ID.match(text))
+    return any(hint in text for hint in _NEURAL_ID_HINTS)
+
+
+def parse_voice_file(path, tool):
+    """ 목소리 파일 1개 → {호출이름: 정보} (파일이 없으면 빈 dict) """
+    entries = {}
+    if not os.path.exists(path):
+        print(f"⚠️ {os.path.basename(path)} 파일을 찾을 수 없습니다: {path}")
+        return entries
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            # 빈 줄 / 주석 / 구분선
+            if not line or line[0] in "#=[":
+                continue
+            # 설명 칸에 쉼표가 있을 수 있으므로 최대 7칸으로 분리
+            parts = [p.strip() for p in line.split(",", 6)]
+            # 헤더 / 칸이 모자란 메모 줄
+            if len(parts) < 4 or parts[0] == "호출이름" or parts[0].lower() == "call_name":
+                continue
+            call_name, style, gender, voice_id = parts[:4]
+            if not call_name or not voice_id:
+                continue
+            info = {
+                "id": voice_id,
+                "style": style or "General",
+                "gender": gender,
+                "rate": parts[4] if len(parts) > 4 else "0",
+                "pitch": parts[5] if len(parts) > 5 else "0",
+                "description": parts[6] if len(parts) > 6 else "",
+            }
+            if tool == "elevenlabs":
+                # 모델 칸은 없으므로 기본값 고정
+                info["model"] = DEFAULT_ELEVENLABS_MODEL
+            entries[call_name] = info
+    return entries
+
+
+def _source_signature(path):
+    """ 캐시 유효성 판단용 (수정 시각, 크기) - 파일이 없으면 None """
+    try:
+        stat = os.stat(path)
+        return [stat.st_mtime_ns, stat.st_size]
+    except OSError:
+        return None
+
+
+class VoiceRegistry:
+    """
+    도구별 목소리 색인
+    - find(tool, 입력): 호출이름 → 정규화 이름 → 목소리 ID 순서로 조회, 없으면 None
+    - validate_rows(rows): 시트 행 검사 → [(시트 행 번호, 메시지)]
+    """
+
+    def __init__(self, entries):
+        self.entries = {tool: entries.get(tool, {}) for tool in TOOLS}
+        self.by_norm = {}
+        self.by_id = {}
+        for tool, voices in self.entries.items():
+            self.by_norm[tool] = {normalize_name(name): info for name, info in voices.items()}
+            # 같은 ID 가 여러 호출이름에 있으면 첫 번째 (보통 '_기본') 를 대표로
+            by_id = {}
+            for info in voices.values():
+                by_id.setdefault(info["id"], info)
+            self.by_id[tool] = by_id
+
+    def names(self, tool):
+        return list(self.entries[tool])
+
+    def find(self, tool, voice_input):
+        """ 입력(호출이름/변형/ID) → (정보, 찾은 방식) / 없으면 (None, None) """
+        text = (voice_input or "").strip()
+        if not text:
+            return None, None
+        info = self.entries[tool].get(text)
+        if info:
+            return info, "name"
+        info = self.by_norm[tool].get(normalize_name(text))
+        if info:
+            return info, "normalized"
+        info = self.by_id[tool].get(text)
+        if info:
+            return info, "id"
+        return None, None
+
+    def check_voice(self, tool, voice_input):
+        """ 목소리 입력 검사 → 문제 메시지 (정상이면 None) """
+        text = (voice_input or "").strip()
+        if not text or looks_like_voice_id(tool, text):
+            return None
+        if self.find(tool, text)[0]:
+            return None
+        # 비슷한 이름 제안 (정규화 이름에 입력이 포함되거나 반대)
+        norm = normalize_name(text)
+        similar = [name for name in self.entries[tool] if norm in normalize_name(name) or normalize_name(name) in norm]
+        hint = f" (비슷한 이름: {', '.join(similar[:5])})" if similar else ""
+        return f"'{text}' 목소리가 voices_{tool}.txt 에 없습니다{hint}"
+
+    def validate_rows(self, rows, extra_check=None):
+        """
+        시트 I열(목소리)/L열(음성 도구) 검사 (헤더 제외한 행 목록, 시트 행 번호 = 인덱스 + 2)
+        - extra_check(tool, 목소리): True 면 통과 (예: ElevenLabs 예전 방식 04_Asset/Voice 성우 txt)
+        반환: [(시트 행 번호, 메시지)]
+        """
+        problems = []
+        for i, row in enumerate(rows):
+            file_id = row[0].strip() if len(row) > 0 else ""
+            script = row[1].strip() if len(row) > 1 else ""
+            if not file_id or not script or any(marker in script for marker in SILENCE_MARKERS):
+                continue
+            voice = row[8].strip() if len(row) > 8 else ""
+            tool = row[11].strip().lower() if len(row) > 11 else ""
+            if tool and tool not in TOOLS:
+                problems.append((i + 2, f"음성 도구 '{tool}' 를 알 수 없습니다 (edge / azure / elevenlabs)"))
+                continue
+            message = self.check_voice(tool or "edge", voice)
+            if message and extra_check and extra_check(tool or "edge", voice):
+                message = None
+            if message:
+                problems.append((i + 2, message))
+        return problems
+
+
+def load_voice_registry(voice_files, cache_path=DEFAULT_CACHE_FILE):
+    """
+    목소리 파일들 → VoiceRegistry (원본이 그대로면 실행 간 캐시 사용)
+    - voice_files: {"edge": 경로, "azure": 경로, "elevenlabs": 경로}
+    """
+    sources = {tool: [path, _source_signature(path)] for tool, path in voice_files.items()}
+    try:
+        with open(cache_path, "r", encoding="utf-8") as f:
+            cached = json.load(f)
+        if cached.get("version") == CACHE_VERSION and cached.get("sources") == sources:
+            return VoiceRegistry(cached["entries"]), True
+    except (OSError, ValueError, KeyError):
+        pass
+
+    entries = {}
+    for tool, path in voice_files.items():
+        try:
+            entries[tool] = parse_voice_file(path, tool)
+        except Exception as e:
+            print(f"❌ {os.path.basename(path)} 파일 읽기 실패: {e}")
+            entries[tool] = {}
+    try:
+        data = {"version": CACHE_VERSION, "sources": sources, "entries": entries}
+        write_bytes_atomic(cache_path, json.dumps(data, ensure_ascii=False).encode("utf-8"))
+    except OSError as e:
+        print(f"   ⚠️ 목소리 캐시 저장 실패 (다음 실행 때 다시 파싱): {e}")
+    return VoiceRegistry(entries), False
+
+
+_REGISTRIES = {}
+
+
+def get_voice_registry(voice_files, cache_path=DEFAULT_CACHE_FILE):
+    """ 프로세스당 1번 로드 (같은 파일 묶음이면 재사용) """
+    key = tuple(sorted(voice_files.items()))
+    if key not in _REGISTRIES:
+        registry, from_cache = load_voice_registry(voice_files, cache_path)
+        counts = " / ".join(f"{TOOL_LABELS[tool]} {len(registry.entries[tool])}개" for tool in TOOLS)
+        print(f"✅ 목소리 레지스트리 로드 완료: {counts}{' (캐시)' if from_cache else ''}")
+        _REGISTRIES[key] = registry
+    return _REGISTRIES[key]